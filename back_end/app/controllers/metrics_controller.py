@@ -0,0 +1,12 @@
+from aiohttp import web
+
+from app.utils import metrics
+
+routes = web.RouteTableDef()
+
+
+@routes.get("/metrics")
+async def get_metrics(request: web.Request) -> web.Response:
+    """Metrics dạng Prometheus text (rỗng giá trị nếu METRICS_ENABLED tắt)."""
+    return web.Response(text=metrics.render_prometheus(), content_type="text/plain", charset="utf-8",
+                        headers={"Cache-Control": "no-cache"})
@@ -0,0 +1,15 @@
+from aiohttp import web
+
+from app.controllers import metrics_controller
+from app.controllers.v1 import chain_controller, credential_controller
+
+API_V1_PREFIX = "/api/v1"
+
+
+def setup_routes(app: web.Application) -> None:
+    """Gộp route của các controller v1 vào ứng dụng dưới /api/v1, /metrics ở gốc."""
+    app.add_routes(metrics_controller.routes)
+    v1 = web.Application()
+    v1.add_routes(chain_controller.routes)
+    v1.add_routes(credential_controller.routes)
+    app.add_subapp(API_V1_PREFIX, v1)
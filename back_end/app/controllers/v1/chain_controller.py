@@ -0,0 +1,120 @@
+from aiohttp import web
+
+from app.dependencies import get_blockchain, get_chain_query, get_cursor, get_limit
+from app.services.LightClientService import LightClientService
+
+routes = web.RouteTableDef()
+
+# Block đã chốt không bao giờ đổi: cho phép client / proxy cache vĩnh viễn
+_IMMUTABLE = "public, max-age=31536000, immutable"
+_REVALIDATE = "no-cache"
+# Số block gom lại trước mỗi lần ghi ra socket khi export
+_EXPORT_FLUSH_BLOCKS = 64
+MAX_EXPORT_BLOCKS = 100_000
+
+
+def _block_response(request: web.Request, block) -> web.Response:
+    query = get_chain_query(request)
+    etag = f'"{block.block_hash}"'
+    cache_control = _IMMUTABLE if query.is_finalized(block.index) else _REVALIDATE
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+
+    # Block xác định bởi hash nên ETag khớp là nội dung khớp
+    if etag in request.headers.get("If-None-Match", ""):
+        return web.Response(status=304, headers=headers)
+    return web.Response(body=query.block_json(block), content_type="application/json", headers=headers)
+
+
+@routes.get("/head")
+async def get_head(request: web.Request) -> web.Response:
+    head = get_chain_query(request).head()
+    if head is None:
+        raise web.HTTPNotFound(reason="chain is empty")
+    return web.json_response(head, headers={"Cache-Control": _REVALIDATE})
+
+
+@routes.get("/blocks")
+async def list_blocks(request: web.Request) -> web.Response:
+    blocks, next_cursor = get_chain_query(request).list_blocks(get_cursor(request), get_limit(request))
+    return web.json_response({
+        "items": [
+            {
+                "height": b.index,
+                "block_hash": b.block_hash,
+                "timestamp": b.block_header.timestamp,
+                "tx_count": len(b.transactions),
+            }
+            for b in blocks
+        ],
+        "next_cursor": next_cursor,
+    })
+
+
+@routes.get(r"/blocks/{height:\d+}")
+async def get_block_by_height(request: web.Request) -> web.Response:
+    block = get_chain_query(request).block_by_height(int(request.match_info["height"]))
+    if block is None:
+        raise web.HTTPNotFound(reason="block not found")
+    return _block_response(request, block)
+
+
+@routes.get("/blocks/hash/{block_hash}")
+async def get_block_by_hash(request: web.Request) -> web.Response:
+    block = get_chain_query(request).block_by_hash(request.match_info["block_hash"])
+    if block is None:
+        raise web.HTTPNotFound(reason="block not found")
+    return _block_response(request, block)
+
+
+@routes.get("/txs/{tx_id}")
+async def get_transaction(request: web.Request) -> web.Response:
+    tx_id = request.match_info["tx_id"]
+    found = get_chain_query(request).transaction(tx_id)
+    if found is not None:
+        tx, height, position = found
+        return web.json_response(
+            {"status": "confirmed", "height": height, "position": position, "transaction": tx.to_dict()}
+        )
+
+    pending = get_blockchain(request).mempool.get(tx_id)
+    if pending is not None:
+        return web.json_response({"status": "pending", "transaction": pending.to_dict()})
+    raise web.HTTPNotFound(reason="transaction not found")
+
+
+@routes.get("/txs/{tx_id}/proof")
+async def get_transaction_proof(request: web.Request) -> web.Response:
+    """Proof bundle cho light client (xem LightClientService.verify_credential)."""
+    bundle = LightClientService.build_proof(get_chain_query(request), request.match_info["tx_id"])
+    if bundle is None:
+        raise web.HTTPNotFound(reason="transaction not confirmed")
+    return web.json_response(bundle)
+
+
+@routes.get("/export/blocks")
+async def export_blocks(request: web.Request) -> web.StreamResponse:
+    """Xuất block trong [start, end] dạng NDJSON, ghi dần ra socket."""
+    query = get_chain_query(request)
+    try:
+        start = int(request.query.get("start", 0))
+        end = int(request.query.get("end", query.height()))
+    except ValueError:
+        raise web.HTTPBadRequest(reason="start / end must be integers")
+    if end < start or end - start + 1 > MAX_EXPORT_BLOCKS:
+        raise web.HTTPBadRequest(reason=f"range must contain 1..{MAX_EXPORT_BLOCKS} blocks")
+
+    response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+    response.enable_chunked_encoding()
+    await response.prepare(request)
+
+    buffer = []
+    for block in query.iter_range(start, end):
+        buffer.append(query.block_json(block))
+        if len(buffer) >= _EXPORT_FLUSH_BLOCKS:
+            # write() chờ khi bộ đệm socket đầy: client chậm không làm phình bộ nhớ
+            await response.write(b"\n".join(buffer) + b"\n")
+            buffer = []
+    if buffer:
+        await response.write(b"\n".join(buffer) + b"\n")
+    await response.write_eof()
+    return response
@@ -0,0 +1,33 @@
+from aiohttp import web
+
+from app.dependencies import get_credential_index, get_cursor, get_limit, query_index
+
+routes = web.RouteTableDef()
+
+
+@routes.get("/credentials/{token_id}")
+async def get_credential(request: web.Request) -> web.Response:
+    index = get_credential_index(request)
+    record = await query_index(index, index.get_by_token, request.match_info["token_id"])
+    if record is None:
+        raise web.HTTPNotFound(reason="credential not found")
+    return web.json_response(record)
+
+
+@routes.get("/credentials")
+async def find_credentials(request: web.Request) -> web.Response:
+    """Tra cứu theo student_id, recipient (địa chỉ) hoặc institution (có phân trang)."""
+    index = get_credential_index(request)
+    query = request.query
+    if "student_id" in query:
+        items = await query_index(index, index.find_by_student, query["student_id"])
+        return web.json_response({"items": items, "next_cursor": None})
+    if "recipient" in query:
+        items = await query_index(index, index.find_by_recipient, query["recipient"])
+        return web.json_response({"items": items, "next_cursor": None})
+    if "institution" in query:
+        items, next_cursor = await query_index(
+            index, index.list_by_institution, query["institution"], get_cursor(request), get_limit(request)
+        )
+        return web.json_response({"items": items, "next_cursor": next_cursor})
+    raise web.HTTPBadRequest(reason="one of student_id, recipient, institution is required")
@@ -0,0 +1,433 @@
+"""
+Mã hoá nhị phân chuẩn (canonical) cho Transaction, BlockHeader và Block.
+
+Mọi field có độ dài thay đổi đều có tiền tố độ dài 4 byte (big-endian).
+Field dạng hex (pubkey, chữ ký, hash) được lưu bằng bytes thô, nhỏ hơn
+một nửa so với chuỗi hex. Kết quả mã hoá được memo trên chính đối tượng
+(thuộc tính `_memo`) và bị xoá khi field tương ứng thay đổi.
+"""
+import hashlib
+import json
+import os
+import struct
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.models.Block import Block
+from app.models.BlockHeader import BlockHeader
+from app.models.Transaction import Transaction
+
+# Cho phép verify dữ liệu cũ được ký bằng JSON (trước khi có codec nhị phân)
+LEGACY_JSON_COMPAT = os.getenv("LEGACY_JSON_COMPAT", "True").lower() == "true"
+
+# Tiền tố phân biệt loại dữ liệu (domain separation) + phiên bản codec
+TX_SIGNING_MAGIC = b"EDUTX\x01"
+HEADER_MAGIC = b"EDUHD\x01"
+BLOCK_SIGNING_MAGIC = b"EDUBK\x01"
+
+_U32 = struct.Struct(">I")
+_U64 = struct.Struct(">Q")
+_F64 = struct.Struct(">d")
+
+# Tag cho field dạng chuỗi: bytes thô (từ hex) hoặc text UTF-8
+_TAG_RAW = b"\x00"
+_TAG_TEXT = b"\x01"
+
+
+# ==================== Ghi ====================
+def _pack_bytes(data: bytes) -> bytes:
+    return _U32.pack(len(data)) + data
+
+
+def _pack_str(value: str) -> bytes:
+    return _pack_bytes(value.encode("utf-8"))
+
+
+def _pack_hex(value: str) -> bytes:
+    """Chuỗi hex thường (chữ thường, độ dài chẵn) được lưu dạng bytes thô."""
+    if value and len(value) % 2 == 0 and value == value.lower():
+        try:
+            raw = bytes.fromhex(value)
+        except ValueError:
+            raw = None
+        # fromhex bỏ qua khoảng trắng: chỉ nhận khi đổi ngược được đúng chuỗi cũ,
+        # nếu không hai chuỗi khác nhau sẽ có cùng bản mã hoá
+        if raw is not None and raw.hex() == value:
+            return _TAG_RAW + _pack_bytes(raw)
+    return _TAG_TEXT + _pack_str(value)
+
+
+def _pack_raw(raw: Any) -> bytes:
+    """Field lưu bằng HexField: bytes thô (cùng kết quả với _pack_hex) hoặc chuỗi."""
+    if isinstance(raw, bytes):
+        return _TAG_RAW + _pack_bytes(raw)
+    return _pack_hex(raw)
+
+
+# ==================== Đọc ====================
+class _Reader:
+    def __init__(self, data: bytes, offset: int = 0):
+        self.data = memoryview(data)
+        self.offset = offset
+
+    def take(self, size: int) -> bytes:
+        end = self.offset + size
+        if end > len(self.data):
+            raise ValueError("dữ liệu mã hoá bị cắt cụt")
+        chunk = self.data[self.offset:end].tobytes()
+        self.offset = end
+        return chunk
+
+    def expect(self, magic: bytes) -> None:
+        if self.take(len(magic)) != magic:
+            raise ValueError("sai magic/phiên bản codec")
+
+    def u32(self) -> int:
+        return _U32.unpack(self.take(4))[0]
+
+    def u64(self) -> int:
+        return _U64.unpack(self.take(8))[0]
+
+    def f64(self) -> float:
+        return _F64.unpack(self.take(8))[0]
+
+    def bytes_(self) -> bytes:
+        return self.take(self.u32())
+
+    def str_(self) -> str:
+        return self.bytes_().decode("utf-8")
+
+    def raw_(self) -> Any:
+        """Như hex_() nhưng trả bytes thô (gán thẳng vào HexField, không qua hex)."""
+        tag = self.take(1)
+        if tag == _TAG_RAW:
+            return self.bytes_()
+        return self.str_()
+
+    def hex_(self) -> str:
+        tag = self.take(1)
+        if tag == _TAG_RAW:
+            return self.bytes_().hex()
+        return self.str_()
+
+    def json_(self) -> Any:
+        return json.loads(self.bytes_().decode("utf-8"))
+
+
+# ==================== Transaction ====================
+def transaction_signing_data(tx: Transaction) -> bytes:
+    """Dữ liệu ký của transaction (không gồm signature, tx_id, tx_hash)."""
+    data = tx._memo.get("signing")
+    if data is None:
+        payload = tx._payload
+        if not isinstance(payload, bytes):
+            # Giữ lại JSON chuẩn để compact() không phải dumps lại
+            payload = tx._memo["payload_json"] = json.dumps(
+                payload, sort_keys=True, separators=(",", ":")
+            ).encode("utf-8")
+        data = b"".join((
+            TX_SIGNING_MAGIC,
+            _pack_raw(tx._sender_pubkey),
+            _pack_raw(tx._sender_address),
+            _pack_raw(tx._recipient_address),
+            _pack_bytes(payload),
+            _F64.pack(float(tx.timestamp)),
+        ))
+        tx._memo["signing"] = data
+    return data
+
+
+def transaction_hash(tx: Transaction) -> bytes:
+    """SHA256 của dữ liệu ký (dùng làm tx_hash)."""
+    digest = tx._memo.get("hash")
+    if digest is None:
+        digest = hashlib.sha256(transaction_signing_data(tx)).digest()
+        tx._memo["hash"] = digest
+    return digest
+
+
+def encode_transaction(tx: Transaction) -> bytes:
+    """Mã hoá đầy đủ transaction (gồm cả chữ ký và id)."""
+    data = tx._memo.get("encoded")
+    if data is None:
+        data = b"".join((
+            _pack_bytes(transaction_signing_data(tx)),
+            _pack_raw(tx._signature),
+            _pack_raw(tx._tx_id),
+            _pack_raw(tx._tx_hash),
+        ))
+        tx._memo["encoded"] = data
+    return data
+
+
+def transaction_leaf_hash(tx: Transaction) -> bytes:
+    """Hash lá Merkle: SHA256 của bản mã hoá đầy đủ."""
+    digest = tx._memo.get("leaf_hash")
+    if digest is None:
+        digest = hashlib.sha256(encode_transaction(tx)).digest()
+        tx._memo["leaf_hash"] = digest
+    return digest
+
+
+def _read_transaction(reader: _Reader) -> Transaction:
+    signing = reader.bytes_()
+    body = _Reader(signing)
+    body.expect(TX_SIGNING_MAGIC)
+    tx = Transaction(
+        sender_pubkey=body.raw_(),
+        sender_address=body.raw_(),
+        recipient_address=body.raw_(),
+        payload=body.json_(),
+        timestamp=body.f64(),
+    )
+    tx.signature = reader.raw_()
+    tx.tx_id = reader.raw_()
+    tx.tx_hash = reader.raw_()
+    tx._memo["signing"] = signing
+    return tx
+
+
+def decode_transaction(data: bytes) -> Transaction:
+    return _read_transaction(_Reader(data))
+
+
+def _read_raw_tx_id(data: bytes) -> Any:
+    """tx_id trong bản mã hoá đầy đủ (bỏ qua dữ liệu ký và chữ ký)."""
+    reader = _Reader(data)
+    reader.offset = 4 + reader.u32()
+    reader.raw_()
+    return reader.raw_()
+
+
+# ==================== BlockHeader ====================
+def encode_header(header: BlockHeader) -> bytes:
+    data = header._memo.get("encoded")
+    if data is None:
+        data = b"".join((
+            HEADER_MAGIC,
+            _U64.pack(header.index),
+            _pack_raw(header._pre_hash),
+            _pack_raw(header._merkle_root),
+            _pack_raw(header._validator_pubkey),
+            _F64.pack(float(header.timestamp)),
+        ))
+        header._memo["encoded"] = data
+    return data
+
+
+def _read_header(reader: _Reader) -> BlockHeader:
+    reader.expect(HEADER_MAGIC)
+    return BlockHeader(
+        index=reader.u64(),
+        pre_hash=reader.raw_(),
+        merkle_root=reader.raw_(),
+        validator_pubkey=reader.raw_(),
+        timestamp=reader.f64(),
+    )
+
+
+def decode_header(data: bytes) -> BlockHeader:
+    return _read_header(_Reader(data))
+
+
+# ==================== Block ====================
+def block_signing_data(block: Block) -> bytes:
+    """
+    Dữ liệu ký của block: block_id, index và header.
+    Transactions đã được cam kết qua merkle_root trong header nên không
+    cần mã hoá lại từng transaction.
+    """
+    header_data = encode_header(block.block_header)
+    cached = block._memo.get("signing")
+    # Header được memo riêng: nếu header đổi thì bytes của nó là object mới
+    if cached is not None and cached[0] is header_data:
+        return cached[1]
+
+    data = b"".join((
+        BLOCK_SIGNING_MAGIC,
+        _pack_str(block.block_id),
+        _U64.pack(block.index),
+        _pack_bytes(header_data),
+    ))
+    block._memo["signing"] = (header_data, data)
+    block._memo.pop("hash", None)
+    return data
+
+
+def block_hash(block: Block) -> bytes:
+    data = block_signing_data(block)
+    digest = block._memo.get("hash")
+    if digest is None:
+        digest = hashlib.sha256(data).digest()
+        block._memo["hash"] = digest
+    return digest
+
+
+def encode_block(block: Block) -> bytes:
+    """Mã hoá đầy đủ block (dùng để lưu trữ / truyền qua mạng)."""
+    parts: List[bytes] = [
+        _pack_bytes(block_signing_data(block)),
+        _pack_raw(block._block_hash),
+        _pack_raw(block._validator_signature),
+        _U32.pack(len(block.transactions)),
+    ]
+    if isinstance(block.transactions, LazyTransactions):
+        # Block nạp từ đĩa: dùng lại bản mã hoá gốc, không giải mã transaction
+        parts.extend(map(_pack_bytes, block.transactions.encoded()))
+    else:
+        parts.extend(_pack_bytes(encode_transaction(tx)) for tx in block.transactions)
+    return b"".join(parts)
+
+
+def _read_block_signing(signing: bytes) -> Tuple[str, int, BlockHeader]:
+    body = _Reader(signing)
+    body.expect(BLOCK_SIGNING_MAGIC)
+    block_id = body.str_()
+    index = body.u64()
+    header = decode_header(body.bytes_())
+    return block_id, index, header
+
+
+def decode_block(data: bytes) -> Block:
+    reader = _Reader(data)
+    signing = reader.bytes_()
+    block_id, index, header = _read_block_signing(signing)
+    block_hash_raw = reader.raw_()
+    signature = reader.raw_()
+    count = reader.u32()
+    transactions = [decode_transaction(reader.bytes_()) for _ in range(count)]
+
+    block = Block(index=index, block_id=block_id, block_header=header, transactions=transactions)
+    block.block_hash = block_hash_raw
+    block.validator_signature = signature
+    return block
+
+
+class LazyTransactions:
+    """
+    Danh sách transaction chỉ đọc, giải mã từng transaction khi được truy cập
+    lần đầu (block cũ nạp từ đĩa thường chỉ cần header hoặc vài transaction).
+    """
+
+    __slots__ = ("_encoded", "_decoded")
+
+    def __init__(self, encoded: List[bytes]):
+        self._encoded = encoded
+        self._decoded: List[Optional[Transaction]] = [None] * len(encoded)
+
+    def __len__(self) -> int:
+        return len(self._encoded)
+
+    def _get(self, position: int) -> Transaction:
+        tx = self._decoded[position]
+        if tx is None:
+            tx = self._decoded[position] = decode_transaction(self._encoded[position])
+            tx._memo["encoded"] = self._encoded[position]
+        return tx
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self._get(i) for i in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError(position)
+        return self._get(position)
+
+    def __iter__(self) -> Iterator[Transaction]:
+        return map(self._get, range(len(self)))
+
+    def encoded(self) -> List[bytes]:
+        return self._encoded
+
+    def raw_ids(self) -> List[Any]:
+        """tx_id (dạng lưu trong HexField) của từng transaction, không giải mã transaction."""
+        return [
+            tx._tx_id if tx is not None else _read_raw_tx_id(data)
+            for tx, data in zip(self._decoded, self._encoded)
+        ]
+
+    def nbytes(self) -> int:
+        """Tổng kích thước bản mã hoá của các transaction."""
+        return sum(map(len, self._encoded))
+
+
+def decode_block_lazy(data: bytes) -> Block:
+    """Như decode_block nhưng transactions là LazyTransactions (giải mã khi cần)."""
+    reader = _Reader(data)
+    block_id, index, header = _read_block_signing(reader.bytes_())
+    block_hash_raw = reader.raw_()
+    signature = reader.raw_()
+    count = reader.u32()
+    transactions = LazyTransactions([reader.bytes_() for _ in range(count)])
+
+    block = Block(index=index, block_id=block_id, block_header=header, transactions=transactions)
+    block.block_hash = block_hash_raw
+    block.validator_signature = signature
+    return block
+
+
+def encode_signed_header(block: Block) -> bytes:
+    """Header đã ký của block (không có transactions): dùng cho đồng bộ header trước."""
+    return b"".join((
+        _pack_bytes(block_signing_data(block)),
+        _pack_raw(block._block_hash),
+        _pack_raw(block._validator_signature),
+    ))
+
+
+def _read_signed_header(reader: _Reader) -> Block:
+    block_id, index, header = _read_block_signing(reader.bytes_())
+    block = Block(index=index, block_id=block_id, block_header=header, transactions=[])
+    block.block_hash = reader.raw_()
+    block.validator_signature = reader.raw_()
+    return block
+
+
+def decode_signed_header(data: bytes) -> Block:
+    """Trả về block chưa có transactions."""
+    return _read_signed_header(_Reader(data))
+
+
+def encode_compact_block(block: Block) -> bytes:
+    """Block rút gọn để relay: header đã ký và danh sách tx_id."""
+    parts: List[bytes] = [encode_signed_header(block), _U32.pack(len(block.transactions))]
+    parts.extend(_pack_raw(tx._tx_id) for tx in block.transactions)
+    return b"".join(parts)
+
+
+def decode_compact_block(data: bytes) -> Tuple[Block, List[str]]:
+    """Trả về (block chưa có transactions, danh sách tx_id theo thứ tự)."""
+    reader = _Reader(data)
+    block = _read_signed_header(reader)
+    tx_ids = [reader.hex_() for _ in range(reader.u32())]
+    return block, tx_ids
+
+
+# ==================== Dữ liệu JSON cũ ====================
+def legacy_transaction_signing_data(tx: Transaction) -> bytes:
+    """Dữ liệu ký JSON cũ của transaction (chỉ dùng cho chế độ tương thích)."""
+    data: Dict[str, Any] = {
+        "sender_pubkey": tx.sender_pubkey,
+        "sender_address": tx.sender_address,
+        "recipient_address": tx.recipient_address,
+        "payload": tx.payload,
+        "timestamp": tx.timestamp,
+    }
+    return json.dumps(data, sort_keys=True).encode()
+
+
+def legacy_block_signing_data(block: Block) -> bytes:
+    """Dữ liệu ký JSON cũ của block (chỉ dùng cho chế độ tương thích)."""
+    data = {
+        "block_id": block.block_id,
+        "index": block.index,
+        "header": {
+            "index": block.block_header.index,
+            "pre_hash": block.block_header.pre_hash,
+            "merkle_root": block.block_header.merkle_root,
+            "validator_pubkey": block.block_header.validator_pubkey,
+            "timestamp": block.block_header.timestamp,
+        },
+        "transactions": [tx.to_dict() for tx in block.transactions],
+    }
+    return json.dumps(data, sort_keys=True).encode()
@@ -0,0 +1,134 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Set
+
+from ecdsa import VerifyingKey, SECP256k1
+from ecdsa.ellipticcurve import PointJacobi
+
+
+class VerifyingKeyCache:
+    """
+    Cache LRU cho VerifyingKey đã parse.
+
+    - Key thường: giữ tối đa `max_size` key, bỏ key ít dùng nhất khi đầy.
+    - Key "nóng" (dùng >= `hot_threshold` lần): tính sẵn bảng nhân điểm
+      (precompute) để verify nhanh hơn.
+    - Key được pin (authority set): luôn precompute và không bao giờ bị bỏ.
+    """
+
+    def __init__(self, max_size: int = 1024, hot_threshold: int = 8):
+        if max_size < 1:
+            raise ValueError("max_size phải >= 1")
+        self.max_size = max_size
+        self.hot_threshold = hot_threshold
+
+        self._keys: "OrderedDict[str, VerifyingKey]" = OrderedDict()
+        self._uses: Dict[str, int] = {}
+        self._precomputed: Set[str] = set()
+        self._pinned: Dict[str, VerifyingKey] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _parse(pubkey_hex: str) -> VerifyingKey:
+        # Giống VerifyingKey.from_string nhưng gắn order cho điểm,
+        # cần thiết để có thể precompute bảng nhân về sau
+        point = PointJacobi.from_bytes(
+            SECP256k1.curve, bytes.fromhex(pubkey_hex), order=SECP256k1.order
+        )
+        return VerifyingKey.from_public_point(point, curve=SECP256k1)
+
+    def get(self, pubkey_hex: str) -> VerifyingKey:
+        """Lấy VerifyingKey từ cache, parse và lưu lại nếu chưa có."""
+        with self._lock:
+            vk = self._pinned.get(pubkey_hex)
+            if vk is not None:
+                self.hits += 1
+                return vk
+
+            vk = self._keys.get(pubkey_hex)
+            if vk is not None:
+                self.hits += 1
+                self._keys.move_to_end(pubkey_hex)
+                uses = self._uses[pubkey_hex] + 1
+                self._uses[pubkey_hex] = uses
+                if uses >= self.hot_threshold and pubkey_hex not in self._precomputed:
+                    vk.precompute()
+                    self._precomputed.add(pubkey_hex)
+                return vk
+
+            self.misses += 1
+
+        # Parse ngoài lock, key sai định dạng sẽ raise cho caller xử lý
+        vk = self._parse(pubkey_hex)
+
+        with self._lock:
+            existing = self._keys.get(pubkey_hex)
+            if existing is not None:
+                return existing
+            self._keys[pubkey_hex] = vk
+            self._uses[pubkey_hex] = 1
+            while len(self._keys) > self.max_size:
+                evicted, _ = self._keys.popitem(last=False)
+                self._uses.pop(evicted, None)
+                self._precomputed.discard(evicted)
+        return vk
+
+    def pin(self, pubkey_hex: str) -> VerifyingKey:
+        """Pin key (vd: validator trong authority set) và precompute ngay."""
+        with self._lock:
+            vk = self._pinned.get(pubkey_hex)
+            if vk is not None:
+                return vk
+            vk = self._keys.pop(pubkey_hex, None)
+            self._uses.pop(pubkey_hex, None)
+            precomputed = pubkey_hex in self._precomputed
+            self._precomputed.discard(pubkey_hex)
+
+        if vk is None:
+            vk = self._parse(pubkey_hex)
+        if not precomputed:
+            vk.precompute()
+
+        with self._lock:
+            self._pinned[pubkey_hex] = vk
+        return vk
+
+    def unpin(self, pubkey_hex: str) -> None:
+        with self._lock:
+            self._pinned.pop(pubkey_hex, None)
+
+    def sync_pinned(self, pubkeys: Iterable[str]) -> None:
+        """Đồng bộ danh sách key được pin với authority set hiện tại."""
+        wanted = set(pubkeys)
+        for pubkey_hex in list(self._pinned):
+            if pubkey_hex not in wanted:
+                self.unpin(pubkey_hex)
+        for pubkey_hex in wanted:
+            self.pin(pubkey_hex)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._keys.clear()
+            self._uses.clear()
+            self._precomputed.clear()
+            self._pinned.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Bộ đếm hit/miss và kích thước cache."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._keys),
+                "pinned": len(self._pinned),
+                "precomputed": len(self._precomputed) + len(self._pinned),
+            }
+
+
+# Cache dùng chung cho toàn bộ node (mỗi worker process có cache riêng)
+verifying_key_cache = VerifyingKeyCache()
@@ -0,0 +1,94 @@
+"""
+Băm file lớn (PDF văn bằng) mà không nạp cả file vào bộ nhớ.
+
+- mmap: hệ điều hành nạp từng trang khi cần, hashlib đọc thẳng từ vùng map.
+- stream: đọc lần lượt vào một bộ đệm dùng lại (readinto), không tạo bytes mới.
+hashlib nhả GIL khi băm nên nhiều thread có thể băm song song.
+"""
+import hashlib
+import json
+import mmap
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(path: str, use_mmap: bool = True, chunk_size: int = DEFAULT_CHUNK_SIZE) -> str:
+    """SHA256 (hex) của file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        # File rỗng không map được
+        if use_mmap and size > 0:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mm, "madvise"):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                with memoryview(mm) as view:
+                    for offset in range(0, size, chunk_size):
+                        digest.update(view[offset:offset + chunk_size])
+        else:
+            buffer = bytearray(chunk_size)
+            with memoryview(buffer) as view:
+                while True:
+                    n = f.readinto(buffer)
+                    if not n:
+                        break
+                    digest.update(view[:n])
+    return digest.hexdigest()
+
+
+# (kích thước, mtime_ns): file đổi nội dung thì gần như chắc chắn đổi một trong hai
+FileStamp = Tuple[int, int]
+
+
+def file_stamp(path: str) -> FileStamp:
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+class FileHashCache:
+    """
+    Cache hash theo (đường dẫn, kích thước, mtime), lưu ra file JSON.
+    Chạy lại trên cùng kho lưu trữ sẽ bỏ qua file không đổi.
+    """
+
+    def __init__(self, cache_path: Optional[str] = None):
+        self.cache_path = cache_path
+        self._entries: Dict[str, Tuple[int, int, str]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        if cache_path and os.path.exists(cache_path):
+            try:
+                with open(cache_path, "r", encoding="utf-8") as f:
+                    self._entries = {k: tuple(v) for k, v in json.load(f).items()}
+            except (OSError, ValueError):
+                # Cache hỏng thì băm lại từ đầu
+                self._entries = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, path: str, stamp: FileStamp) -> Optional[str]:
+        entry = self._entries.get(os.path.abspath(path))
+        if entry is not None and (entry[0], entry[1]) == stamp:
+            return entry[2]
+        return None
+
+    def put(self, path: str, stamp: FileStamp, digest: str) -> None:
+        with self._lock:
+            self._entries[os.path.abspath(path)] = (stamp[0], stamp[1], digest)
+            self._dirty = True
+
+    def save(self) -> None:
+        if not self.cache_path or not self._dirty:
+            return
+        path = Path(self.cache_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({k: list(v) for k, v in self._entries.items()}, f)
+        os.replace(tmp_path, path)
+        self._dirty = False
@@ -0,0 +1,67 @@
+"""
+Field dạng hex (hash, pubkey, chữ ký) của model được lưu bằng bytes thô.
+
+Chuỗi hex chiếm gấp đôi bytes thô (cộng phần đầu của str). HexField lưu
+bytes trong slot `_<tên>` và trả lại đúng chuỗi ban đầu khi đọc, nên
+to_dict/from_dict và bản mã hoá codec không đổi. Chuỗi không phải hex
+thường (vd: địa chỉ dạng text, "") được giữ nguyên là str.
+"""
+from typing import Any, Dict, Union
+
+Raw = Union[bytes, str]
+
+# Pubkey lặp lại rất nhiều (cùng đơn vị cấp bằng / validator): dùng chung một object
+_INTERN_LIMIT = 4096
+_interned: Dict[bytes, bytes] = {}
+
+
+def to_raw(value: Any) -> Any:
+    """Chuỗi hex thường (chữ thường, độ dài chẵn) -> bytes; giá trị khác giữ nguyên."""
+    if isinstance(value, str) and value and len(value) % 2 == 0:
+        try:
+            raw = bytes.fromhex(value)
+        except ValueError:
+            return value
+        # fromhex bỏ qua khoảng trắng: chỉ nhận khi đổi ngược được đúng chuỗi cũ
+        if raw.hex() == value:
+            return raw
+    return value
+
+
+def to_hex(raw: Any) -> Any:
+    return raw.hex() if isinstance(raw, bytes) else raw
+
+
+def intern_raw(raw: Any) -> Any:
+    if not isinstance(raw, bytes):
+        return raw
+    cached = _interned.get(raw)
+    if cached is None:
+        if len(_interned) >= _INTERN_LIMIT:
+            _interned.clear()
+        _interned[raw] = cached = raw
+    return cached
+
+
+class HexField:
+    """Descriptor: đọc / ghi chuỗi hex, lưu bytes thô trong slot `_<tên>`."""
+
+    __slots__ = ("name", "member", "intern")
+
+    def __init__(self, intern: bool = False):
+        self.intern = intern
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+        self.member = owner.__dict__["_" + name]
+
+    def __get__(self, obj: Any, owner: type = None) -> Any:
+        if obj is None:
+            return self
+        raw = self.member.__get__(obj, owner)
+        # Viết thẳng thay vì gọi to_hex: đường đọc tx_id / pubkey rất nóng
+        return raw.hex() if raw.__class__ is bytes else raw
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        raw = to_raw(value)
+        self.member.__set__(obj, intern_raw(raw) if self.intern else raw)
@@ -0,0 +1,103 @@
+import hashlib
+from typing import Iterable, List, Optional, Tuple
+
+# Mỗi bước của proof: (hash node anh em, node anh em nằm bên trái?)
+ProofStep = Tuple[bytes, bool]
+
+
+def _hash_pair(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(left + right).digest()
+
+
+class MerkleTree:
+    """
+    Merkle tree làm việc trên digest nhị phân (32 byte), lưu sẵn mọi node nội.
+
+    - append(): O(log n), chỉ tính lại đường đi từ lá mới lên gốc
+    - root: O(1)
+    - proof(i): O(log n), proof nhỏ gọn để chứng minh lá i nằm trong cây
+
+    Khi một tầng có số node lẻ, node cuối được ghép với chính nó
+    (giống cách calculate_merkle_root cũ).
+    """
+
+    def __init__(self, leaves: Optional[Iterable[bytes]] = None):
+        self._levels: List[List[bytes]] = [[]]
+        if leaves is not None:
+            for leaf in leaves:
+                self.append(leaf)
+
+    def __len__(self) -> int:
+        return len(self._levels[0])
+
+    def append(self, leaf: bytes) -> None:
+        """Thêm một lá (digest) và cập nhật các node trên đường lên gốc."""
+        if len(leaf) != 32:
+            raise ValueError("leaf phải là digest SHA256 32 byte")
+
+        self._levels[0].append(leaf)
+        index = len(self._levels[0]) - 1
+        level = 0
+
+        while len(self._levels[level]) > 1:
+            nodes = self._levels[level]
+            parent = index // 2
+            left = nodes[2 * parent]
+            right = nodes[2 * parent + 1] if 2 * parent + 1 < len(nodes) else left
+
+            if level + 1 == len(self._levels):
+                self._levels.append([])
+            upper = self._levels[level + 1]
+            node = _hash_pair(left, right)
+            if parent < len(upper):
+                upper[parent] = node
+            else:
+                upper.append(node)
+
+            index = parent
+            level += 1
+
+    @property
+    def root(self) -> bytes:
+        """Merkle root dạng bytes (b"" nếu cây rỗng)."""
+        if not self._levels[0]:
+            return b""
+        return self._levels[-1][0]
+
+    def root_hex(self) -> str:
+        return self.root.hex()
+
+    def leaf(self, index: int) -> bytes:
+        return self._levels[0][index]
+
+    def proof(self, index: int) -> List[ProofStep]:
+        """Inclusion proof cho lá thứ `index`."""
+        if not 0 <= index < len(self):
+            raise IndexError("leaf index out of range")
+
+        steps: List[ProofStep] = []
+        for nodes in self._levels[:-1]:
+            if index % 2 == 0:
+                sibling = nodes[index + 1] if index + 1 < len(nodes) else nodes[index]
+                steps.append((sibling, False))
+            else:
+                steps.append((nodes[index - 1], True))
+            index //= 2
+        return steps
+
+    @staticmethod
+    def verify_proof(leaf: bytes, proof: List[ProofStep], root: bytes) -> bool:
+        """Kiểm tra inclusion proof mà không cần phần còn lại của block."""
+        node = leaf
+        for sibling, sibling_is_left in proof:
+            node = _hash_pair(sibling, node) if sibling_is_left else _hash_pair(node, sibling)
+        return node == root
+
+    @staticmethod
+    def proof_to_hex(proof: List[ProofStep]) -> List[List]:
+        """Chuyển proof sang dạng JSON được (gửi cho bên xác minh)."""
+        return [[sibling.hex(), sibling_is_left] for sibling, sibling_is_left in proof]
+
+    @staticmethod
+    def proof_from_hex(data: List[List]) -> List[ProofStep]:
+        return [(bytes.fromhex(sibling), bool(sibling_is_left)) for sibling, sibling_is_left in data]
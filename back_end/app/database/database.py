@@ -1,5 +1,7 @@
 import sqlite3
-conn = sqlite3.connect('NCKH_educhain.db')
+
+DEFAULT_DB_PATH = 'NCKH_educhain.db'
+
 schema_sql = """
 pragma foreign_keys = ON;
 -------------------------------------------------
@@ -39,6 +41,9 @@ CREATE TABLE IF NOT EXISTS nft (
     is_valid INTEGER DEFAULT 1,
     minted_at INTEGER,
 
+    tx_id TEXT,
+    block_index INTEGER,
+
     FOREIGN KEY (metadata_id) REFERENCES nft_metadata(metadata_id) ON DELETE CASCADE,
     FOREIGN KEY (recipient_id) REFERENCES client(client_id)
 );
@@ -91,6 +96,7 @@ CREATE TABLE IF NOT EXISTS block (
 CREATE TABLE IF NOT EXISTS block_transactions (
     block_id TEXT,
     tx_id TEXT,
+    position INTEGER,
 
     PRIMARY KEY (block_id, tx_id),
 
@@ -98,6 +104,31 @@ CREATE TABLE IF NOT EXISTS block_transactions (
     FOREIGN KEY (tx_id) REFERENCES transactions(tx_id) ON DELETE CASCADE
 );
 
+-------------------------------------------------
+-- Index tra cứu văn bằng (credential)
+-------------------------------------------------
+CREATE INDEX IF NOT EXISTS idx_nft_metadata_student ON nft_metadata(student_id, metadata_id);
+CREATE INDEX IF NOT EXISTS idx_nft_metadata_institution ON nft_metadata(institution, metadata_id);
+CREATE INDEX IF NOT EXISTS idx_nft_metadata_ref ON nft(metadata_id, nft_id);
+CREATE INDEX IF NOT EXISTS idx_nft_recipient ON nft(recipient_id, nft_id);
+
+CREATE INDEX IF NOT EXISTS idx_block_index_num ON block(index_num);
+CREATE INDEX IF NOT EXISTS idx_block_hash ON block(block_hash);
+
+-------------------------------------------------
+-- Chỉ mục block_hash / tx_id của chain (ChainIndexRepository)
+-- Khoá là bytes thô, vị trí tx gói thành (height << 32) | position
+-------------------------------------------------
+CREATE TABLE IF NOT EXISTS chain_block_index (
+    block_hash BLOB PRIMARY KEY,
+    height INTEGER NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS chain_tx_index (
+    tx_id BLOB PRIMARY KEY,
+    location INTEGER NOT NULL
+) WITHOUT ROWID;
+
 -------------------------------------------------
 -- Node
 -------------------------------------------------
@@ -109,14 +140,15 @@ CREATE TABLE IF NOT EXISTS node (
 );
 """
 
-def init_db():
-     conn = sqlite3.connect('NCKH_educhain.db')
+def init_db(db_path: str = DEFAULT_DB_PATH):
+     conn = sqlite3.connect(db_path)
      cursor = conn.cursor()
      
      cursor.executescript(schema_sql)
      conn.commit()
      
      cursor.close()
+     conn.close()
      print("Database initialized successfully.")
      
 if __name__ == "__main__":
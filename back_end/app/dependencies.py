@@ -0,0 +1,52 @@
+import asyncio
+from functools import partial
+from typing import Any, Callable, Optional
+
+from aiohttp import web
+
+from app.models.BlockChain import BlockChain
+from app.repositories.CredentialRepository import CredentialRepository
+from app.services.ChainQueryService import ChainQueryService
+
+# Đối tượng dùng chung của ứng dụng API (đặt trong create_app, xem app/main.py)
+BLOCKCHAIN_KEY = web.AppKey("blockchain", BlockChain)
+QUERY_KEY = web.AppKey("chain_query", ChainQueryService)
+
+
+def get_blockchain(request: web.Request) -> BlockChain:
+    return request.config_dict[BLOCKCHAIN_KEY]
+
+
+def get_chain_query(request: web.Request) -> ChainQueryService:
+    return request.config_dict[QUERY_KEY]
+
+
+def get_credential_index(request: web.Request):
+    index = get_blockchain(request).credential_index
+    if index is None:
+        raise web.HTTPServiceUnavailable(reason="credential index is disabled")
+    return index
+
+
+async def query_index(index, method: Callable[..., Any], *args: Any) -> Any:
+    """Gọi truy vấn của chỉ mục văn bằng; bản SQLite chạy trong thread pool để không chặn event loop."""
+    if isinstance(index, CredentialRepository):
+        return await asyncio.get_running_loop().run_in_executor(None, partial(method, *args))
+    return method(*args)
+
+
+def get_limit(request: web.Request, default: int = 20, maximum: int = 200) -> int:
+    try:
+        limit = int(request.query.get("limit", default))
+    except ValueError:
+        raise web.HTTPBadRequest(reason="limit must be an integer")
+    if limit < 1:
+        raise web.HTTPBadRequest(reason="limit must be >= 1")
+    return min(limit, maximum)
+
+
+def get_cursor(request: web.Request) -> Optional[str]:
+    cursor = request.query.get("cursor") or None
+    if cursor is not None and not cursor.isdigit():
+        raise web.HTTPBadRequest(reason="invalid cursor")
+    return cursor
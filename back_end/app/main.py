@@ -0,0 +1,153 @@
+"""
+API đọc dữ liệu chain (aiohttp).
+
+Cách chạy (từ thư mục back_end):
+    python -m app.main --db NCKH_educhain.db --port 8080
+    # Kèm mạng P2P, đồng bộ ban đầu từ các peer
+    python -m app.main --db node2.db --port 8081 --p2p-port 9001 --peer 127.0.0.1:9000 --sync \
+        --genesis-hash <block_hash của genesis>
+    # Lưu block trong block log (segment + mmap) thay vì SQLite
+    python -m app.main --db NCKH_educhain.db --block-log blocks/ --port 8080
+    # Chỉ mục block_hash/tx_id nằm trong SQLite thay vì RAM
+    python -m app.main --db NCKH_educhain.db --block-log blocks/ --disk-index
+"""
+import argparse
+import asyncio
+from typing import AsyncIterator, Callable, List, Optional
+
+from aiohttp import web
+
+from app.controllers.router import setup_routes
+from app.dependencies import BLOCKCHAIN_KEY, QUERY_KEY
+from app.models.BlockChain import BlockChain
+from app.models.ChainWindow import DEFAULT_HOT_BLOCKS, DEFAULT_MAX_BYTES
+from app.services.ChainQueryService import DEFAULT_FINALITY_DEPTH, ChainQueryService
+from app.utils import metrics
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def create_app(blockchain: BlockChain, finality_depth: int = DEFAULT_FINALITY_DEPTH) -> web.Application:
+    app = web.Application()
+    app[BLOCKCHAIN_KEY] = blockchain
+    app[QUERY_KEY] = ChainQueryService(blockchain, finality_depth=finality_depth)
+    setup_routes(app)
+    return app
+
+
+def load_blockchain(
+    db_path: str,
+    snapshot_dir: Optional[str] = None,
+    block_log_dir: Optional[str] = None,
+    hot_blocks: int = DEFAULT_HOT_BLOCKS,
+    max_chain_bytes: int = DEFAULT_MAX_BYTES,
+    disk_index: bool = False,
+) -> BlockChain:
+    from app.repositories.BlockLogRepository import BlockLogRepository
+    from app.repositories.BlockRepository import BlockRepository
+    from app.repositories.ChainIndexRepository import ChainIndexRepository
+    from app.repositories.CredentialRepository import CredentialRepository
+    from app.services.BlockChainService import BlockChainService
+
+    blockchain = BlockChain()
+    blockchain.chain.hot_blocks = hot_blocks
+    blockchain.chain.max_bytes = max_chain_bytes
+    # Chỉ mục văn bằng luôn nằm trong SQLite; block có thể nằm trong block log
+    blockchain.block_store = BlockLogRepository(block_log_dir) if block_log_dir else BlockRepository(db_path)
+    blockchain.credential_index = CredentialRepository(db_path)
+    if disk_index:
+        blockchain.chain_index = ChainIndexRepository(db_path)
+    if blockchain.block_store.get_height() >= 0:
+        BlockChainService.restore_from_store(blockchain, snapshot_dir)
+    return blockchain
+
+
+def _log_sync_result(task: "asyncio.Task") -> None:
+    # Task đồng bộ chạy nền: lỗi phải được ghi lại, không thì mất im lặng
+    if task.cancelled():
+        return
+    error = task.exception()
+    if error is not None:
+        logger.error(f"Đồng bộ ban đầu thất bại: {error!r}", exc_info=error)
+    else:
+        logger.info(f"Đồng bộ ban đầu xong: {task.result()}")
+
+
+def p2p_context(
+    blockchain: BlockChain, port: int, peers: List[str], sync: bool, genesis_hash: Optional[str] = None
+) -> Callable[[web.Application], AsyncIterator[None]]:
+    """cleanup_ctx chạy GossipNode cùng event loop với API."""
+    from app.network.gossip import GossipNode
+    from app.network.sync import InitialSync
+
+    async def context(app: web.Application) -> AsyncIterator[None]:
+        node = GossipNode(blockchain)
+        await node.start("0.0.0.0", port)
+        for address in peers:
+            host, peer_port = address.rsplit(":", 1)
+            try:
+                await node.connect(host, int(peer_port))
+            except OSError as e:
+                logger.warning(f"Không kết nối được peer {address}: {e}")
+        sync_task = None
+        if sync:
+            sync_task = asyncio.get_running_loop().create_task(InitialSync(node, genesis_hash=genesis_hash).run())
+            sync_task.add_done_callback(_log_sync_result)
+        yield
+        if sync_task is not None:
+            sync_task.cancel()
+        await node.stop()
+
+    return context
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="API đọc dữ liệu chain")
+    parser.add_argument("--db", default="NCKH_educhain.db")
+    parser.add_argument("--snapshot-dir", default=None)
+    parser.add_argument("--block-log", default=None, help="Thư mục block log (mặc định: lưu block trong --db)")
+    parser.add_argument("--hot-blocks", type=int, default=DEFAULT_HOT_BLOCKS, help="Số block mới nhất giữ đầy đủ trong RAM")
+    parser.add_argument(
+        "--max-chain-mb", type=int, default=DEFAULT_MAX_BYTES // 2**20, help="Trần bộ nhớ cho block trong RAM (MiB)"
+    )
+    parser.add_argument("--disk-index", action="store_true", help="Giữ chỉ mục block_hash/tx_id trong --db thay vì RAM")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--p2p-port", type=int, default=None, help="Cổng P2P (mặc định: tắt)")
+    parser.add_argument("--peer", action="append", default=[], help="host:port của peer, lặp lại được")
+    parser.add_argument("--sync", action="store_true", help="Đồng bộ ban đầu từ các peer khi khởi động")
+    parser.add_argument(
+        "--genesis-hash", default=None, help="block_hash genesis được chấp nhận (bắt buộc khi --sync trên node rỗng)"
+    )
+    parser.add_argument("--metrics", action="store_true", help="Bật metrics (như METRICS_ENABLED=true)")
+    parser.add_argument("--metrics-log-interval", type=float, default=0, help="Ghi snapshot metrics ra log (giây, 0: tắt)")
+    args = parser.parse_args()
+
+    if args.metrics:
+        metrics.enable()
+    reporter = None
+    if args.metrics_log_interval > 0:
+        reporter = metrics.MetricsReporter(logger, args.metrics_log_interval).start()
+    try:
+        blockchain = load_blockchain(
+            args.db, args.snapshot_dir, args.block_log,
+            hot_blocks=args.hot_blocks, max_chain_bytes=args.max_chain_mb * 2**20,
+            disk_index=args.disk_index,
+        )
+        if args.sync and args.p2p_port is not None and len(blockchain.chain) == 0 and not args.genesis_hash:
+            # Không ghim genesis thì peer đầu tiên quyết định node theo chain nào
+            parser.error("--sync trên node chưa có block cần --genesis-hash")
+        app = create_app(blockchain)
+        if args.p2p_port is not None:
+            app.cleanup_ctx.append(
+                p2p_context(blockchain, args.p2p_port, args.peer, args.sync, genesis_hash=args.genesis_hash)
+            )
+        web.run_app(app, host=args.host, port=args.port)
+    finally:
+        if reporter is not None:
+            reporter.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,9 @@
 import hashlib
 import json
-from typing import List
+from typing import Any, Dict, List
 from ecdsa import SigningKey, SECP256k1, VerifyingKey
 
+from app.core.hexfield import HexField
 from app.models.BlockHeader import BlockHeader
 from app.models.Transaction import Transaction
 
@@ -12,11 +13,47 @@ from app.models.Transaction import Transaction
 
 
 class Block:
+    __slots__ = ("_memo", "block_id", "index", "block_header", "transactions", "_block_hash", "_validator_signature")
+
+    # Field nằm trong dữ liệu ký của block
+    _SIGNING_FIELDS = frozenset({"block_id", "index", "block_header"})
+
+    # Lưu bằng bytes thô, đọc ra chuỗi hex như cũ
+    block_hash = HexField()
+    validator_signature = HexField()
+
     def __init__(self, index: int, block_id: str, block_header: BlockHeader, transactions: List[Transaction]):
+        self._memo: Dict[str, Any] = {}
         self.block_id = block_id
         self.index = index
         self.block_header = block_header
         self.transactions = transactions
-        self.block_hash: str = ""
-        self.validator_signature: str = ""
+        self.block_hash = ""
+        self.validator_signature = ""
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in Block._SIGNING_FIELDS:
+            self._memo.clear()
+        object.__setattr__(self, name, value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "block_id": self.block_id,
+            "index": self.index,
+            "block_hash": self.block_hash,
+            "validator_signature": self.validator_signature,
+            "block_header": self.block_header.to_dict(),
+            "transactions": [tx.to_dict() for tx in self.transactions],
+        }
 
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> "Block":
+        block = Block(
+            index=data["index"],
+            block_id=data["block_id"],
+            block_header=BlockHeader.from_dict(data["block_header"]),
+            transactions=[Transaction.from_dict(tx) for tx in data.get("transactions", [])],
+        )
+        block.block_hash = data.get("block_hash", "")
+        block.validator_signature = data.get("validator_signature", "")
+        return block
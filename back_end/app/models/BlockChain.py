@@ -1,18 +1,81 @@
-from typing import List, Dict, Any
+from collections import deque
+from typing import Deque, Dict, Any, Optional, Union
 
 from app.models.Block import Block
-from app.models.Transaction import Transaction
+from app.models.BlockTemplate import BlockTemplate
+from app.models.BlockTree import DEFAULT_MAX_REORG_DEPTH, BlockTree
+from app.models.ChainIndex import ChainIndex
+from app.models.ChainWindow import ChainWindow
+from app.models.HeaderColumns import HeaderColumns
+from app.models.Mempool import Mempool
+from app.repositories.BlockLogRepository import BlockLogRepository
+from app.repositories.BlockRepository import BlockRepository
+from app.repositories.ChainIndexRepository import ChainIndexRepository
 
 
 class BlockChain:
     def __init__(self):
-        self.chain: List[Block] = []
-        #TODO: Thêm model Transaction
-        self.mempool: List[Transaction] = []
+        # Header của chain lưu theo cột (gọn, dùng cho đồng bộ / light client)
+        self.headers: HeaderColumns = HeaderColumns()
+        # Dùng như list block; chỉ giữ cửa sổ block mới nhất, block cũ nạp lại từ block_store
+        self.chain: ChainWindow = ChainWindow(self.headers)
+        # block_hash -> height, tx_id -> (height, position); cập nhật trong append_block
+        self.chain_index: Union[ChainIndex, ChainIndexRepository] = ChainIndex()
+        # Nhánh cạnh tranh và undo log của các block cuối (để đổi nhánh)
+        self.block_tree: BlockTree = BlockTree()
+        self.undo_logs: Deque[Dict[str, Any]] = deque()
+        self.max_reorg_depth: int = DEFAULT_MAX_REORG_DEPTH
+        self.mempool: Mempool = Mempool()
+        # Giới hạn mỗi block và block đang được lắp dần từ mempool
+        self.max_block_txs: int = 5_000
+        self.max_block_bytes: int = 2 * 1024 * 1024
+        self.block_template: BlockTemplate = BlockTemplate(self.max_block_txs, self.max_block_bytes)
         self.super_validator_pubkey: str = ""
         self.authority_set: set[str] = set()
         self.state_db: Dict[str, Any] = {}
+        # Số thread thực thi transaction song song trong add_block (1: tuần tự)
+        self.execution_workers: int = 1
+        # Checkpoint trạng thái định kỳ (None: tắt)
+        self.snapshot_dir: Optional[str] = None
+        self.snapshot_interval: int = 1000
+        # Chỉ mục tra cứu văn bằng (CredentialIndex / CredentialRepository; None: tắt)
+        self.credential_index = None
+
+    @property
+    def block_store(self) -> Optional[Union[BlockRepository, BlockLogRepository]]:
+        """Nơi lưu block bền vững: SQLite hoặc block log (None: chỉ giữ trong bộ nhớ)."""
+        return self.chain.store
+
+    @block_store.setter
+    def block_store(self, store: Optional[Union[BlockRepository, BlockLogRepository]]) -> None:
+        self.chain.store = store
 
     def get_last_block(self) -> Block:
         return self.chain[-1]
 
+    def append_block(self, block: Block) -> None:
+        """Thêm block vào cuối chain (cả bản header theo cột và chỉ mục)."""
+        self.chain.append(block)
+        self.chain_index.add_block(block)
+
+    def pop_block(self) -> Block:
+        """Bỏ block cuối chain (khi đổi nhánh); block_store do BlockChainService cắt sau."""
+        block = self.chain[-1]
+        self.chain.truncate(block.index - 1)
+        self.chain_index.remove_block(block)
+        return block
+
+    def known_height(self, block_hash: str) -> Optional[int]:
+        """Chiều cao của block đã biết, trên chain chính hoặc trên một nhánh của block_tree."""
+        height = self.chain_index.block_height(block_hash)
+        if height is None:
+            block = self.block_tree.get(block_hash)
+            height = block.index if block is not None else None
+        return height
+
+    def reset_blocks(self) -> None:
+        # Chỉ mục giữ nguyên: block giống hệt được bỏ qua khi thêm lại, block khác thì bị thay
+        self.chain.clear()
+        self.block_tree.clear()
+        self.undo_logs.clear()
+
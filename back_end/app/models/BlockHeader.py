@@ -1,7 +1,22 @@
 import time
+from typing import Any, Dict
+
+from app.core.hexfield import HexField
+
 
 class BlockHeader:
+    __slots__ = ("_memo", "index", "_pre_hash", "_merkle_root", "_validator_pubkey", "timestamp", "none")
+
+    # Field nằm trong bản mã hoá của header (xem app/core/codec.py)
+    _ENCODED_FIELDS = frozenset({"index", "pre_hash", "merkle_root", "validator_pubkey", "timestamp"})
+
+    # Lưu bằng bytes thô, đọc ra chuỗi hex như cũ
+    pre_hash = HexField()
+    merkle_root = HexField()
+    validator_pubkey = HexField(intern=True)
+
     def __init__(self, index: int, pre_hash: str,merkle_root: str, validator_pubkey: str, timestamp: float = None, none: float = None):
+        self._memo: Dict[str, Any] = {}
         self.index = index
         self.pre_hash = pre_hash
         self.merkle_root = merkle_root
@@ -9,6 +24,30 @@ class BlockHeader:
         self.timestamp = timestamp or time.time()
         self.none = none
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in BlockHeader._ENCODED_FIELDS:
+            self._memo.clear()
+        object.__setattr__(self, name, value)
+
     def __repr__(self):
         return f"<BlockHeader index={self.index}"
-    
\ No newline at end of file
+    
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "index": self.index,
+            "pre_hash": self.pre_hash,
+            "merkle_root": self.merkle_root,
+            "validator_pubkey": self.validator_pubkey,
+            "timestamp": self.timestamp,
+        }
+
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> "BlockHeader":
+        return BlockHeader(
+            index=data["index"],
+            pre_hash=data["pre_hash"],
+            merkle_root=data["merkle_root"],
+            validator_pubkey=data["validator_pubkey"],
+            timestamp=data.get("timestamp"),
+        )
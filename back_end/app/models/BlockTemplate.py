@@ -0,0 +1,48 @@
+from typing import List, Set
+
+from app.core import codec
+from app.core.merkle import MerkleTree
+from app.models.Transaction import Transaction
+
+
+class BlockTemplate:
+    """
+    Block đang được lắp dần: danh sách transaction, Merkle tree và tổng
+    kích thước được cập nhật ngay khi transaction được nhận vào mempool.
+    Khi mine chỉ còn tính hash header và ký.
+    """
+
+    def __init__(self, max_txs: int, max_bytes: int):
+        self.max_txs = max_txs
+        self.max_bytes = max_bytes
+        self.transactions: List[Transaction] = []
+        self.tx_ids: Set[str] = set()
+        self.tree = MerkleTree()
+        self.total_bytes = 0
+        # Có transaction đã rời mempool (bị đẩy ra): Merkle tree chỉ thêm được
+        # nên template phải dựng lại trước khi mine
+        self.stale = False
+
+    def __len__(self) -> int:
+        return len(self.transactions)
+
+    def is_full(self) -> bool:
+        return len(self.transactions) >= self.max_txs or self.total_bytes >= self.max_bytes
+
+    def try_add(self, tx: Transaction) -> bool:
+        """Thêm transaction nếu còn chỗ (O(log n)); False nếu block đã đầy."""
+        tx_id = tx.tx_id
+        if tx_id in self.tx_ids or len(self.transactions) >= self.max_txs:
+            return False
+        size = len(codec.encode_transaction(tx))
+        if self.total_bytes + size > self.max_bytes:
+            return False
+
+        self.transactions.append(tx)
+        self.tx_ids.add(tx_id)
+        self.tree.append(codec.transaction_leaf_hash(tx))
+        self.total_bytes += size
+        return True
+
+    def merkle_root(self) -> str:
+        return self.tree.root_hex()
@@ -0,0 +1,74 @@
+from typing import Callable, Dict, List, Optional
+
+from app.models.Block import Block
+
+# Đổi nhánh sâu hơn số block này bị từ chối (chỉ giữ undo log chừng ấy block)
+DEFAULT_MAX_REORG_DEPTH = 100
+
+
+class BlockTree:
+    """
+    Các block thuộc nhánh cạnh tranh (không nằm trên chain chính), theo block_hash.
+    Chain chính nằm trong BlockChain.chain; cây chỉ giữ phần rẽ ra từ đó và
+    block của nhánh cũ sau khi đổi nhánh (để có thể đổi lại).
+
+    Fork choice tất định: nhánh cao hơn thắng, cùng chiều cao thì block_hash
+    nhỏ hơn thắng, nên mọi node thấy cùng tập block đều chọn cùng một đỉnh.
+    """
+
+    def __init__(self):
+        self._blocks: Dict[str, Block] = {}
+
+    def __len__(self) -> int:
+        return len(self._blocks)
+
+    def __contains__(self, block_hash: str) -> bool:
+        return block_hash in self._blocks
+
+    @staticmethod
+    def prefers(candidate: Block, tip: Block) -> bool:
+        """True nếu đỉnh `candidate` được chọn thay cho `tip`."""
+        if candidate.index != tip.index:
+            return candidate.index > tip.index
+        return candidate.block_hash < tip.block_hash
+
+    def add(self, block: Block) -> None:
+        self._blocks[block.block_hash] = block
+
+    def get(self, block_hash: str) -> Optional[Block]:
+        return self._blocks.get(block_hash)
+
+    def remove(self, block_hash: str) -> Optional[Block]:
+        return self._blocks.pop(block_hash, None)
+
+    def branch(self, tip: Block, is_main: Callable[[str], bool]) -> Optional[List[Block]]:
+        """
+        Các block từ chỗ rẽ khỏi chain chính tới `tip` (theo chiều cao tăng dần);
+        None nếu thiếu block ở giữa. is_main(block_hash) -> block có trên chain chính không.
+        """
+        branch = [tip]
+        while not is_main(branch[-1].block_header.pre_hash):
+            parent = self._blocks.get(branch[-1].block_header.pre_hash)
+            if parent is None:
+                return None
+            branch.append(parent)
+        branch.reverse()
+        return branch
+
+    def remove_descendants(self, block_hash: str) -> int:
+        """Bỏ block và mọi block nối sau nó (vd: block không hợp lệ)."""
+        doomed = {block_hash}
+        for block in sorted(self._blocks.values(), key=lambda b: b.index):
+            if block.block_header.pre_hash in doomed:
+                doomed.add(block.block_hash)
+        return sum(self._blocks.pop(h, None) is not None for h in doomed)
+
+    def prune(self, min_height: int) -> int:
+        """Bỏ block thấp hơn min_height: không còn đổi nhánh tới được."""
+        stale = [h for h, block in self._blocks.items() if block.index < min_height]
+        for block_hash in stale:
+            del self._blocks[block_hash]
+        return len(stale)
+
+    def clear(self) -> None:
+        self._blocks.clear()
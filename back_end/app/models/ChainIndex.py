@@ -0,0 +1,85 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core import codec
+from app.core.hexfield import to_raw
+from app.models.Block import Block
+
+# Vị trí transaction gói trong một số nguyên: (height << 32) | position
+_POSITION_BITS = 32
+_POSITION_MASK = (1 << _POSITION_BITS) - 1
+
+
+def pack_location(height: int, position: int) -> int:
+    return (height << _POSITION_BITS) | position
+
+
+def unpack_location(location: int) -> Tuple[int, int]:
+    return location >> _POSITION_BITS, location & _POSITION_MASK
+
+
+def block_tx_keys(block: Block) -> List[Any]:
+    """Khoá tx_id (bytes thô như trong HexField) của các transaction trong block."""
+    if isinstance(block.transactions, codec.LazyTransactions):
+        # Block nạp từ block log: đọc tx_id thẳng từ bản mã hoá
+        return block.transactions.raw_ids()
+    return [tx._tx_id for tx in block.transactions]
+
+
+class ChainIndex:
+    """
+    Chỉ mục block_hash -> height và tx_id -> (height, position) trong bộ nhớ.
+    Khoá lưu bằng bytes thô (32 byte thay vì chuỗi hex 64 ký tự), vị trí
+    transaction gói trong một số nguyên.
+    Bản SQLite cùng giao diện (không cần giữ trong RAM): app/repositories/ChainIndexRepository.py
+    """
+
+    def __init__(self):
+        self._heights: Dict[Any, int] = {}
+        self._txs: Dict[Any, int] = {}
+        self.height = -1
+
+    def __len__(self) -> int:
+        return len(self._txs)
+
+    def add_block(self, block: Block) -> None:
+        """Thêm block kế tiếp; block đã có (vd: khi khởi động lại) được bỏ qua."""
+        if block.index <= self.height:
+            if self._heights.get(block._block_hash) == block.index:
+                return
+            # Block khác ở cùng chiều cao: bỏ phần chỉ mục từ đó trở đi
+            self.truncate(block.index - 1)
+        self._heights[block._block_hash] = block.index
+        for position, key in enumerate(block_tx_keys(block)):
+            self._txs[key] = pack_location(block.index, position)
+        self.height = block.index
+
+    def remove_block(self, block: Block) -> None:
+        """Bỏ chỉ mục của block cuối (khi đổi nhánh); chi phí theo số transaction của block."""
+        if self._heights.get(block._block_hash) != block.index:
+            return
+        del self._heights[block._block_hash]
+        for key in block_tx_keys(block):
+            self._txs.pop(key, None)
+        self.height = min(self.height, block.index - 1)
+
+    def truncate(self, height: int) -> None:
+        """Bỏ chỉ mục của các block cao hơn height (duyệt toàn bộ, dùng khi khởi động lại)."""
+        if height >= self.height:
+            return
+        limit = pack_location(height + 1, 0)
+        self._heights = {k: h for k, h in self._heights.items() if h <= height}
+        self._txs = {k: loc for k, loc in self._txs.items() if loc < limit}
+        self.height = height
+
+    def block_height(self, block_hash: str) -> Optional[int]:
+        return self._heights.get(to_raw(block_hash))
+
+    def tx_location(self, tx_id: str) -> Optional[Tuple[int, int]]:
+        location = self._txs.get(to_raw(tx_id))
+        return unpack_location(location) if location is not None else None
+
+    def has_tx(self, tx_id: str) -> bool:
+        return to_raw(tx_id) in self._txs
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,160 @@
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Iterator, List, Tuple
+
+from app.core import codec
+from app.models.Block import Block
+from app.models.HeaderColumns import HeaderColumns
+from app.utils import metrics
+
+_CACHE_HITS = metrics.counter("block_cache_hits_total", "Số lần đọc block cũ trúng LRU cache")
+_CACHE_MISSES = metrics.counter("block_cache_misses_total", "Số lần phải nạp block cũ từ block_store")
+_RESIDENT_BYTES = metrics.gauge("chain_resident_bytes", "Kích thước (mã hoá) các block đang giữ trong bộ nhớ")
+
+DEFAULT_HOT_BLOCKS = 1_000
+DEFAULT_CACHE_BLOCKS = 256
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def _block_bytes(block: Block) -> int:
+    """Ước lượng kích thước block theo bản mã hoá (transaction đã memo nên rẻ)."""
+    if isinstance(block.transactions, codec.LazyTransactions):
+        tx_bytes = block.transactions.nbytes()
+    else:
+        tx_bytes = sum(len(codec.encode_transaction(tx)) for tx in block.transactions)
+    return len(codec.block_signing_data(block)) + tx_bytes
+
+
+class ChainWindow:
+    """
+    Chain dùng như một list block (len, chain[i], chain[-1], slice, duyệt)
+    nhưng chỉ giữ trong bộ nhớ:
+
+    - `hot_blocks` block mới nhất (đầy đủ),
+    - header của mọi block (HeaderColumns),
+    - LRU cache `cache_blocks` block cũ nạp lại từ block_store (block log trả
+      về block có transaction giải mã khi cần).
+
+    Tổng kích thước (mã hoá) của block đang giữ không vượt `max_bytes`: cache
+    bị bỏ trước, sau đó tới block cũ nhất của cửa sổ (luôn giữ block cuối).
+    Chưa có block_store thì không bỏ block nào (chain nằm hết trong bộ nhớ).
+    """
+
+    def __init__(
+        self,
+        headers: HeaderColumns,
+        hot_blocks: int = DEFAULT_HOT_BLOCKS,
+        cache_blocks: int = DEFAULT_CACHE_BLOCKS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        if hot_blocks < 1:
+            raise ValueError("hot_blocks phải >= 1")
+        self.headers = headers
+        self.hot_blocks = hot_blocks
+        self.cache_blocks = cache_blocks
+        self.max_bytes = max_bytes
+        self.store = None
+        # (block, kích thước) của các block mới nhất, theo chiều cao tăng dần
+        self._hot: Deque[Tuple[Block, int]] = deque()
+        self._cache: "OrderedDict[int, Tuple[Block, int]]" = OrderedDict()
+        self._bytes = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    # ==================== Sequence ====================
+    def __len__(self) -> int:
+        return len(self.headers)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __getitem__(self, height):
+        if isinstance(height, slice):
+            return [self._block(h) for h in range(*height.indices(len(self)))]
+        if height < 0:
+            height += len(self)
+        if not 0 <= height < len(self):
+            raise IndexError(height)
+        return self._block(height)
+
+    def __iter__(self) -> Iterator[Block]:
+        for height in range(len(self)):
+            yield self._block(height)
+
+    def hot(self) -> List[Block]:
+        """Các block đang nằm trong cửa sổ (không nạp gì từ đĩa)."""
+        return [block for block, _ in self._hot]
+
+    # ==================== Thêm / xoá ====================
+    def append(self, block: Block) -> None:
+        size = _block_bytes(block)
+        self.headers.append(block)
+        self._hot.append((block, size))
+        self._bytes += size
+        self._shrink()
+
+    def truncate(self, height: int) -> None:
+        """Bỏ các block cao hơn height (khi đổi nhánh); chi phí theo số block bị bỏ."""
+        removed = len(self) - max(height + 1, 0)
+        if removed <= 0:
+            return
+        for _ in range(min(removed, len(self._hot))):
+            self._bytes -= self._hot.pop()[1]
+        for h in [h for h in self._cache if h > height]:
+            self._bytes -= self._cache.pop(h)[1]
+        self.headers.truncate(height)
+        _RESIDENT_BYTES.set(self._bytes)
+
+    def clear(self) -> None:
+        self.headers.clear()
+        self._hot.clear()
+        self._cache.clear()
+        self._bytes = 0
+        _RESIDENT_BYTES.set(0)
+
+    # ==================== Đọc ====================
+    def _block(self, height: int) -> Block:
+        first_hot = len(self) - len(self._hot)
+        if height >= first_hot:
+            return self._hot[height - first_hot][0]
+
+        cached = self._cache.get(height)
+        if cached is not None:
+            self._cache.move_to_end(height)
+            self.cache_hits += 1
+            _CACHE_HITS.inc()
+            return cached[0]
+
+        self.cache_misses += 1
+        _CACHE_MISSES.inc()
+        block = self.store.get_block_by_height(height)
+        if block is None:
+            raise LookupError(f"block_store thiếu block {height}")
+        size = _block_bytes(block)
+        self._cache[height] = (block, size)
+        self._bytes += size
+        self._shrink()
+        return block
+
+    def _shrink(self) -> None:
+        if self.store is not None:
+            while len(self._hot) > self.hot_blocks:
+                self._bytes -= self._hot.popleft()[1]
+        while self._cache and (len(self._cache) > self.cache_blocks or self._bytes > self.max_bytes):
+            self._bytes -= self._cache.popitem(last=False)[1][1]
+        if self.store is not None:
+            while len(self._hot) > 1 and self._bytes > self.max_bytes:
+                self._bytes -= self._hot.popleft()[1]
+        _RESIDENT_BYTES.set(self._bytes)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "height": len(self) - 1,
+            "hot_blocks": len(self._hot),
+            "cached_blocks": len(self._cache),
+            "resident_bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "hit_rate": self.cache_hits / lookups if lookups else None,
+        }
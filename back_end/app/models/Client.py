@@ -1,6 +1,8 @@
 from typing import Dict, Any
 
 class client:
+     __slots__ = ("pubkey", "address", "client_id")
+
      def __init__(self, pubkey: str, address: str, client_id: str):
           self.pubkey = pubkey
           self.address = address
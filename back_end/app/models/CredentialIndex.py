@@ -0,0 +1,71 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class CredentialIndex:
+    """
+    Chỉ mục văn bằng trong bộ nhớ: tra theo token_id, student_id,
+    địa chỉ người nhận và liệt kê theo trường (institution) có phân trang.
+    Bản SQLite cùng giao diện: app/repositories/CredentialRepository.py
+    """
+
+    def __init__(self):
+        self._by_token: Dict[str, Dict[str, Any]] = {}
+        self._by_student: Dict[str, List[str]] = {}
+        self._by_recipient: Dict[str, List[str]] = {}
+        # Danh sách token theo thứ tự mint, cursor là vị trí trong danh sách
+        self._by_institution: Dict[str, List[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._by_token)
+
+    def add_many(self, records: Iterable[Dict[str, Any]]) -> None:
+        for record in records:
+            token_id = record["token_id"]
+            if token_id in self._by_token:
+                continue
+            self._by_token[token_id] = record
+            self._by_student.setdefault(record.get("student_id"), []).append(token_id)
+            self._by_recipient.setdefault(record.get("recipient_address"), []).append(token_id)
+            self._by_institution.setdefault(record.get("institution"), []).append(token_id)
+
+    def remove_many(self, token_ids: Iterable[str]) -> None:
+        """Bỏ văn bằng của block bị huỷ khi đổi nhánh (token mới nhất nằm cuối danh sách)."""
+        for token_id in token_ids:
+            record = self._by_token.pop(token_id, None)
+            if record is None:
+                continue
+            for lists, key in (
+                (self._by_student, record.get("student_id")),
+                (self._by_recipient, record.get("recipient_address")),
+                (self._by_institution, record.get("institution")),
+            ):
+                tokens = lists[key]
+                for i in range(len(tokens) - 1, -1, -1):
+                    if tokens[i] == token_id:
+                        del tokens[i]
+                        break
+                if not tokens:
+                    del lists[key]
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        return iter(list(self._by_token.values()))
+
+    def get_by_token(self, token_id: str) -> Optional[Dict[str, Any]]:
+        return self._by_token.get(token_id)
+
+    def find_by_student(self, student_id: str) -> List[Dict[str, Any]]:
+        return [self._by_token[t] for t in self._by_student.get(student_id, [])]
+
+    def find_by_recipient(self, address: str) -> List[Dict[str, Any]]:
+        return [self._by_token[t] for t in self._by_recipient.get(address, [])]
+
+    def list_by_institution(
+        self, institution: str, cursor: Optional[str] = None, limit: int = 50
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Trả về (trang kết quả, cursor của trang sau hoặc None)."""
+        tokens = self._by_institution.get(institution, [])
+        start = int(cursor) if cursor else 0
+        page = tokens[start:start + limit]
+        end = start + len(page)
+        next_cursor = str(end) if end < len(tokens) else None
+        return [self._by_token[t] for t in page], next_cursor
@@ -0,0 +1,79 @@
+import json
+import os
+import struct
+from typing import Iterable
+
+_MAGIC = b"NCKH-HDRS1"
+_U32 = struct.Struct(">I")
+
+HASH_SIZE = 32
+
+
+class HeaderChain:
+    """
+    Chuỗi header đã kiểm tra của light client, lưu gọn: mỗi block chỉ giữ
+    block_hash và merkle_root (2 x 32 byte) trong hai bytearray liền nhau.
+    Chữ ký validator được kiểm tra một lần khi thêm header; block_hash cam kết
+    toàn bộ header (kể cả merkle_root) nên không cần giữ phần còn lại.
+    """
+
+    def __init__(self, authority_set: Iterable[str]):
+        self.authority_set = set(authority_set)
+        self._hashes = bytearray()
+        self._roots = bytearray()
+
+    def __len__(self) -> int:
+        return len(self._hashes) // HASH_SIZE
+
+    @property
+    def height(self) -> int:
+        return len(self) - 1
+
+    def append(self, block_hash: bytes, merkle_root: bytes) -> None:
+        # Block rỗng không có merkle_root: lưu 32 byte 0 (không proof nào khớp)
+        self._hashes += block_hash
+        self._roots += merkle_root or bytes(HASH_SIZE)
+
+    def block_hash(self, height: int) -> bytes:
+        start = height * HASH_SIZE
+        return bytes(self._hashes[start:start + HASH_SIZE])
+
+    def merkle_root(self, height: int) -> bytes:
+        start = height * HASH_SIZE
+        return bytes(self._roots[start:start + HASH_SIZE])
+
+    def nbytes(self) -> int:
+        """Số byte dữ liệu header đang giữ."""
+        return len(self._hashes) + len(self._roots)
+
+    # ==================== Lưu / nạp ====================
+    def save(self, path: str) -> None:
+        meta = json.dumps({"authority_set": sorted(self.authority_set)}).encode("utf-8")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_MAGIC + _U32.pack(len(meta)) + meta + _U32.pack(len(self)))
+            f.write(self._hashes)
+            f.write(self._roots)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def load(path: str) -> "HeaderChain":
+        with open(path, "rb") as f:
+            data = f.read()
+        if not data.startswith(_MAGIC):
+            raise ValueError(f"{path} không phải file header chain")
+        offset = len(_MAGIC)
+        meta_size = _U32.unpack_from(data, offset)[0]
+        offset += 4
+        meta = json.loads(data[offset:offset + meta_size].decode("utf-8"))
+        offset += meta_size
+        count = _U32.unpack_from(data, offset)[0]
+        offset += 4
+        size = count * HASH_SIZE
+        if len(data) != offset + 2 * size:
+            raise ValueError(f"{path} bị cắt cụt")
+
+        chain = HeaderChain(meta["authority_set"])
+        chain._hashes = bytearray(data[offset:offset + size])
+        chain._roots = bytearray(data[offset + size:])
+        return chain
@@ -0,0 +1,153 @@
+from array import array
+from typing import Any, Dict, List
+
+from app.core.hexfield import to_raw
+from app.models.Block import Block
+from app.models.BlockHeader import BlockHeader
+
+HASH_SIZE = 32
+SIGNATURE_SIZE = 64
+GENESIS_PRE_HASH = "0" * 64
+
+
+class HeaderColumns:
+    """
+    Header của toàn bộ chain lưu theo cột, mỗi cột là một mảng liền nhau:
+    timestamp (array 'd'), block_hash và merkle_root (32 byte / block),
+    chữ ký validator (64 byte / block), validator (chỉ số vào bảng pubkey).
+    index chính là vị trí, pre_hash là block_hash của block trước và
+    block_id theo mẫu "GENESIS" / "BLOCK_<index>".
+
+    Giá trị không theo khuôn (block_id khác mẫu, hash không phải 32 byte,
+    merkle_root rỗng, ...) được giữ nguyên trong `_irregular` nên header
+    dựng lại luôn giống hệt header gốc.
+    """
+
+    def __init__(self):
+        self._timestamps = array("d")
+        self._validators = array("I")
+        self._hashes = bytearray()
+        self._merkle_roots = bytearray()
+        self._signatures = bytearray()
+        self._pubkeys: List[str] = []
+        self._pubkey_ids: Dict[str, int] = {}
+        # height -> {field: giá trị gốc} cho field không lưu được trong cột
+        self._irregular: Dict[int, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._timestamps)
+
+    @property
+    def height(self) -> int:
+        return len(self) - 1
+
+    @staticmethod
+    def _default_block_id(height: int) -> str:
+        return "GENESIS" if height == 0 else f"BLOCK_{height}"
+
+    def _pack_fixed(self, height: int, field: str, value: str, size: int, column: bytearray) -> None:
+        raw = to_raw(value)
+        # Ô toàn 0 mang nghĩa chuỗi rỗng
+        if isinstance(raw, bytes) and len(raw) == size and any(raw):
+            column += raw
+        else:
+            column += bytes(size)
+            if value != "":
+                self._irregular.setdefault(height, {})[field] = value
+
+    def append(self, block: Block) -> None:
+        height = len(self)
+        header = block.block_header
+        irregular: Dict[str, Any] = {}
+        if block.index != height:
+            irregular["index"] = block.index
+        if header.index != block.index:
+            irregular["header_index"] = header.index
+        if block.block_id != self._default_block_id(height):
+            irregular["block_id"] = block.block_id
+        expected_pre_hash = self.block_hash(height - 1) if height else GENESIS_PRE_HASH
+        if header.pre_hash != expected_pre_hash:
+            irregular["pre_hash"] = header.pre_hash
+        if irregular:
+            self._irregular[height] = irregular
+
+        pubkey = header.validator_pubkey
+        pubkey_id = self._pubkey_ids.get(pubkey)
+        if pubkey_id is None:
+            pubkey_id = self._pubkey_ids[pubkey] = len(self._pubkeys)
+            self._pubkeys.append(pubkey)
+
+        self._pack_fixed(height, "block_hash", block.block_hash, HASH_SIZE, self._hashes)
+        self._pack_fixed(height, "merkle_root", header.merkle_root, HASH_SIZE, self._merkle_roots)
+        self._pack_fixed(height, "validator_signature", block.validator_signature, SIGNATURE_SIZE, self._signatures)
+        self._validators.append(pubkey_id)
+        self._timestamps.append(header.timestamp)
+
+    def clear(self) -> None:
+        self.__init__()
+
+    def truncate(self, height: int) -> None:
+        """Bỏ header của các block cao hơn height (khi đổi nhánh)."""
+        keep = max(height + 1, 0)
+        if keep >= len(self):
+            return
+        del self._timestamps[keep:]
+        del self._validators[keep:]
+        del self._hashes[keep * HASH_SIZE:]
+        del self._merkle_roots[keep * HASH_SIZE:]
+        del self._signatures[keep * SIGNATURE_SIZE:]
+        for h in [h for h in self._irregular if h >= keep]:
+            del self._irregular[h]
+
+    # ==================== Đọc ====================
+    def _fixed(self, height: int, field: str, size: int, column: bytearray) -> str:
+        extra = self._irregular.get(height)
+        if extra is not None and field in extra:
+            return extra[field]
+        raw = column[height * size:(height + 1) * size]
+        return raw.hex() if any(raw) else ""
+
+    def block_hash(self, height: int) -> str:
+        return self._fixed(height, "block_hash", HASH_SIZE, self._hashes)
+
+    def timestamp(self, height: int) -> float:
+        return self._timestamps[height]
+
+    def validator_pubkey(self, height: int) -> str:
+        return self._pubkeys[self._validators[height]]
+
+    def header(self, height: int) -> BlockHeader:
+        if not 0 <= height < len(self):
+            raise IndexError(height)
+        extra = self._irregular.get(height, {})
+        pre_hash = extra.get("pre_hash")
+        if pre_hash is None:
+            pre_hash = self.block_hash(height - 1) if height else GENESIS_PRE_HASH
+        return BlockHeader(
+            index=extra.get("header_index", extra.get("index", height)),
+            pre_hash=pre_hash,
+            merkle_root=self._fixed(height, "merkle_root", HASH_SIZE, self._merkle_roots),
+            validator_pubkey=self.validator_pubkey(height),
+            timestamp=self._timestamps[height],
+        )
+
+    def signed_header(self, height: int) -> Block:
+        """Block chỉ có header đã ký (không có transactions)."""
+        extra = self._irregular.get(height, {})
+        block = Block(
+            index=extra.get("index", height),
+            block_id=extra.get("block_id", self._default_block_id(height)),
+            block_header=self.header(height),
+            transactions=[],
+        )
+        block.block_hash = self.block_hash(height)
+        block.validator_signature = self._fixed(height, "validator_signature", SIGNATURE_SIZE, self._signatures)
+        return block
+
+    def nbytes(self) -> int:
+        """Số byte của các cột (không tính bảng pubkey và phần không theo khuôn)."""
+        return (
+            self._timestamps.itemsize * len(self._timestamps)
+            + self._validators.itemsize * len(self._validators)
+            + len(self._hashes) + len(self._merkle_roots) + len(self._signatures)
+        )
@@ -0,0 +1,157 @@
+import bisect
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.core import codec
+from app.models.Transaction import Transaction
+
+
+class Mempool:
+    """
+    Mempool có chỉ mục và giới hạn kích thước.
+
+    - Chỉ mục theo tx_id (O(1)), transaction trùng tx_id bị từ chối.
+    - Hàng đợi theo từng sender (sender_pubkey), sắp theo timestamp.
+    - Giới hạn số lượng / tổng byte: khi vượt, bỏ transaction đến sớm nhất.
+      Mỗi sender có thêm giới hạn riêng để một sender không chiếm hết mempool.
+    - remove_included(): chỉ xoá đúng các transaction đã vào block (O(k)).
+    """
+
+    def __init__(self, max_count: int = 50_000, max_bytes: int = 64 * 1024 * 1024, max_per_sender: int = 5_000):
+        self.max_count = max_count
+        self.max_bytes = max_bytes
+        self.max_per_sender = max_per_sender
+
+        # tx_id -> Transaction, theo thứ tự đến (OrderedDict: bỏ phần tử đầu O(1))
+        self._txs: "OrderedDict[str, Transaction]" = OrderedDict()
+        # tx_id -> (sender, khoá sắp xếp trong hàng đợi sender, kích thước byte)
+        self._meta: Dict[str, Tuple[str, Tuple[float, int], int]] = {}
+        # sender -> [(timestamp, seq, tx_id)] đã sắp xếp
+        self._by_sender: Dict[str, List[Tuple[float, int, str]]] = {}
+        self._seq = 0
+        self.total_bytes = 0
+
+        self.evicted = 0
+        self.rejected = 0
+
+    def __len__(self) -> int:
+        return len(self._txs)
+
+    def __iter__(self) -> Iterator[Transaction]:
+        return iter(list(self._txs.values()))
+
+    def __contains__(self, item) -> bool:
+        tx_id = item.tx_id if isinstance(item, Transaction) else item
+        return tx_id in self._txs
+
+    def get(self, tx_id: str) -> Optional[Transaction]:
+        return self._txs.get(tx_id)
+
+    def copy(self) -> List[Transaction]:
+        return list(self._txs.values())
+
+    def iter_pending(self) -> Iterator[Transaction]:
+        """Duyệt theo thứ tự đến, không sao chép (không sửa mempool khi đang duyệt)."""
+        return iter(self._txs.values())
+
+    # ==================== Thêm ====================
+    def add(self, tx: Transaction, evicted: Optional[List[Transaction]] = None) -> bool:
+        """
+        Thêm transaction (đã kiểm tra chữ ký). False nếu trùng hoặc bị từ chối.
+        Transaction cũ bị đẩy ra khi vượt giới hạn được thêm vào `evicted`.
+        """
+        # tx_id lưu dạng bytes thô (HexField): đọc một lần
+        tx_id = tx.tx_id
+        if not tx_id or tx_id in self._txs:
+            self.rejected += 1
+            return False
+
+        sender = tx.sender_pubkey
+        queue = self._by_sender.get(sender)
+        if queue is not None and len(queue) >= self.max_per_sender:
+            self.rejected += 1
+            return False
+
+        size = len(codec.encode_transaction(tx))
+        if size > self.max_bytes:
+            self.rejected += 1
+            return False
+
+        self._seq += 1
+        key = (float(tx.timestamp), self._seq)
+        self._txs[tx_id] = tx
+        self._meta[tx_id] = (sender, key, size)
+        if queue is None:
+            queue = self._by_sender[sender] = []
+        bisect.insort(queue, (key[0], key[1], tx_id))
+        self.total_bytes += size
+
+        while len(self._txs) > self.max_count or self.total_bytes > self.max_bytes:
+            oldest = self._remove(next(iter(self._txs)))
+            self.evicted += 1
+            if evicted is not None:
+                evicted.append(oldest)
+
+        return tx_id in self._txs
+
+    # ==================== Xoá ====================
+    def _remove(self, tx_id: str) -> Optional[Transaction]:
+        tx = self._txs.pop(tx_id, None)
+        if tx is None:
+            return None
+
+        sender, key, size = self._meta.pop(tx_id)
+        queue = self._by_sender[sender]
+        entry = (key[0], key[1], tx_id)
+        i = bisect.bisect_left(queue, entry)
+        if i < len(queue) and queue[i] == entry:
+            del queue[i]
+        if not queue:
+            del self._by_sender[sender]
+
+        self.total_bytes -= size
+        return tx
+
+    def remove(self, tx_id: str) -> Optional[Transaction]:
+        return self._remove(tx_id)
+
+    def remove_included(self, transactions: Iterable[Transaction]) -> int:
+        """Xoá các transaction đã được đưa vào block; trả về số đã xoá."""
+        removed = 0
+        for tx in transactions:
+            if self._remove(tx.tx_id) is not None:
+                removed += 1
+        return removed
+
+    def clear(self) -> None:
+        self._txs.clear()
+        self._meta.clear()
+        self._by_sender.clear()
+        self.total_bytes = 0
+
+    # ==================== Truy vấn ====================
+    def sender_queue(self, sender_pubkey: str) -> List[Transaction]:
+        """Transaction đang chờ của một sender, theo timestamp."""
+        return [self._txs[tx_id] for _, _, tx_id in self._by_sender.get(sender_pubkey, [])]
+
+    def ordered(self) -> Iterator[Transaction]:
+        """
+        Duyệt toàn bộ mempool theo timestamp, luôn giữ đúng thứ tự
+        trong từng hàng đợi sender.
+        """
+        entries = sorted(
+            entry for queue in self._by_sender.values() for entry in queue
+        )
+        for _, _, tx_id in entries:
+            tx = self._txs.get(tx_id)
+            if tx is not None:
+                yield tx
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "count": len(self._txs),
+            "bytes": self.total_bytes,
+            "senders": len(self._by_sender),
+            "evicted": self.evicted,
+            "rejected": self.rejected,
+        }
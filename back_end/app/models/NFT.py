@@ -6,9 +6,15 @@ import hashlib
 
 
 class NFT:
+     __slots__ = (
+          "token_id", "isssuer_pubkey", "metadata", "recipient_address",
+          "issuer_signature", "is_valid", "revoked", "minted_at",
+     )
+
      def __init__(self, isssuer_pubkey: str, metadata: NFTmetadata,recipient_address:client):
-          seed = f"{self.isssuer_pubkey}{metadata.student_id}|{metadata.issued_at}|{recipient_address.address}"
-          self.token_id = hashlib.sha256(seed.encode()).hexdigest()
+          self.token_id = NFT.compute_token_id(
+               isssuer_pubkey, metadata.student_id, metadata.issued_at, recipient_address.address
+          )
           
           self.isssuer_pubkey = isssuer_pubkey
           self.metadata = metadata
@@ -16,4 +22,46 @@ class NFT:
           self.issuer_signature: Optional[str] = None
           self.is_valid = True
           self.revoked = None
-          self.minted_at = None
\ No newline at end of file
+          self.minted_at = None
+
+     # token_id suy ra cố định từ issuer, sinh viên, ngày cấp và người nhận
+     @staticmethod
+     def compute_token_id(issuer_pubkey: str, student_id: Any, issued_at: Any, recipient_address: str) -> str:
+          seed = f"{issuer_pubkey}{student_id}|{issued_at}|{recipient_address}"
+          return hashlib.sha256(seed.encode()).hexdigest()
+
+     # Tính lại token_id từ NFT dạng dict (payload mint) để đối chiếu
+     @staticmethod
+     def token_id_of(data: Dict[str, Any]) -> str:
+          metadata = data.get("metadata") or {}
+          return NFT.compute_token_id(
+               data.get("issuer_pubkey", ""),
+               metadata.get("student_id"),
+               metadata.get("issued_at"),
+               (data.get("recipient") or {}).get("address", ""),
+          )
+
+     def to_dict(self) -> Dict[str, Any]:
+          return {
+               "token_id": self.token_id,
+               "issuer_pubkey": self.isssuer_pubkey,
+               "metadata": self.metadata.to_dict(),
+               "recipient": self.recipient_address.to_dict(),
+               "issuer_signature": self.issuer_signature,
+               "is_valid": self.is_valid,
+               "revoked": self.revoked,
+               "minted_at": self.minted_at
+          }
+     @staticmethod
+     def from_dict(data: Dict[str, Any]):
+          nft = NFT(
+               isssuer_pubkey=data["issuer_pubkey"],
+               metadata=NFTmetadata.from_dict(data["metadata"]),
+               recipient_address=client.from_dict(data["recipient"])
+          )
+          nft.token_id = data.get("token_id", nft.token_id)
+          nft.issuer_signature = data.get("issuer_signature")
+          nft.is_valid = data.get("is_valid", True)
+          nft.revoked = data.get("revoked")
+          nft.minted_at = data.get("minted_at")
+          return nft
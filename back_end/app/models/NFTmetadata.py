@@ -2,6 +2,8 @@ from typing import Dict, Any
 from datetime import datetime
 
 class NFTmetadata:
+     __slots__ = ("student_id", "degree_type", "pdf_url", "pdf_hash", "institution", "issued_at")
+
      def __init__(self, student_id:str ,
                   degree_type: str, pdf_url: str, pdf_hash: str, institution: str, issued_at: int):
           self.student_id = student_id
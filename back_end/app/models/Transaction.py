@@ -1,6 +1,9 @@
+import json
 import time
 from typing import Dict, Any, Optional
 
+from app.core.hexfield import HexField
+
 
 class Transaction:
     """
@@ -15,8 +18,31 @@ class Transaction:
         - signature: str (Chữ ký của người gửi giao dịch)
         - timestamp: float
         - tx_hash: str
+
+    Bản mã hoá nhị phân và hash được memo trong `_memo`, tự động bị xoá
+    khi gán lại field. Nếu sửa payload tại chỗ thì phải gọi invalidate().
+
+    Để tiết kiệm bộ nhớ khi giữ cả chain: dùng __slots__, field hex được lưu
+    bằng bytes thô (HexField) và compact() đóng băng payload thành JSON chuẩn.
     """
 
+    __slots__ = (
+        "_memo", "_tx_id", "_sender_pubkey", "_sender_address", "_recipient_address",
+        "_payload", "_signature", "timestamp", "_tx_hash",
+    )
+
+    # Field thuộc dữ liệu ký: đổi field này thì xoá toàn bộ memo
+    _SIGNING_FIELDS = frozenset({"sender_pubkey", "sender_address", "recipient_address", "payload", "timestamp"})
+    # Field chỉ có trong bản mã hoá đầy đủ
+    _ENCODED_FIELDS = frozenset({"tx_id", "signature", "tx_hash"})
+
+    tx_id = HexField()
+    sender_pubkey = HexField(intern=True)
+    sender_address = HexField(intern=True)
+    recipient_address = HexField()
+    signature = HexField()
+    tx_hash = HexField()
+
     def __init__(
         self,
         tx_id: str = "",
@@ -28,6 +54,7 @@ class Transaction:
         timestamp: Optional[float] = None,
         tx_hash: str = "",
     ) -> None:
+        self._memo: Dict[str, Any] = {}
         self.tx_id = tx_id
         self.sender_pubkey = sender_pubkey
         self.sender_address = sender_address
@@ -37,7 +64,47 @@ class Transaction:
         self.timestamp = timestamp if timestamp is not None else time.time()
         self.tx_hash = tx_hash
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in Transaction._SIGNING_FIELDS:
+            self._memo.clear()
+        elif name in Transaction._ENCODED_FIELDS:
+            self._memo.pop("encoded", None)
+            self._memo.pop("leaf_hash", None)
+        object.__setattr__(self, name, value)
+
+    @property
+    def payload(self) -> Dict[str, Any]:
+        # Payload đã đóng băng: mỗi lần đọc trả về một bản giải mã mới
+        if isinstance(self._payload, bytes):
+            return json.loads(self._payload)
+        return self._payload
+
+    @payload.setter
+    def payload(self, value: Dict[str, Any]) -> None:
+        self._payload = value
+
+    def payload_json(self) -> str:
+        """JSON chuẩn của payload (payload đã đóng băng thì không cần giải mã)."""
+        if isinstance(self._payload, bytes):
+            return self._payload.decode("utf-8")
+        return json.dumps(self._payload, sort_keys=True, separators=(",", ":"))
+
+    def invalidate(self) -> None:
+        """Xoá memo (dùng khi sửa payload tại chỗ)."""
+        self._memo.clear()
 
+    def compact(self) -> None:
+        """
+        Thu gọn transaction đã vào chain: bỏ memo và lưu payload dạng JSON
+        chuẩn (đúng bytes trong dữ liệu ký). Transaction trong chain không
+        được sửa nữa nên sửa tại chỗ bản payload đọc ra không có tác dụng.
+        """
+        if not isinstance(self._payload, bytes):
+            frozen = self._memo.get("payload_json")
+            if frozen is None:
+                frozen = json.dumps(self._payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
+            object.__setattr__(self, "_payload", frozen)
+        self._memo.clear()
 
     def to_dict(self) -> Dict[str, Any]:
         """Chuyển transaction sang dictionary."""
@@ -0,0 +1,451 @@
+"""
+Lớp mạng asyncio: lan truyền (gossip) transaction và block giữa các node.
+
+- Transaction: INV (gom theo chu kỳ inv_interval) -> GETDATA -> TX.
+- Block: đẩy thẳng block rút gọn (CMPCTBLOCK: header + tx_id) tới peer;
+  peer dựng lại block từ mempool, chỉ xin các transaction thiếu (GETBLOCKTXN).
+- Mỗi peer có tập id đã biết (Peer.known): không gửi lại thứ peer đã có.
+- Đồng bộ ban đầu (app/network/sync.py) hỏi - đáp qua request():
+  GETHEADERS -> HEADERS, GETBLOCKS -> BLOCKS.
+"""
+import asyncio
+import itertools
+import time
+import uuid
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from ecdsa import SigningKey
+
+from app.core import codec
+from app.models.Block import Block
+from app.models.BlockChain import BlockChain
+from app.models.Transaction import Transaction
+from app.network import protocol
+from app.network.peer import DEFAULT_SEND_QUEUE_SIZE, Peer, SeenSet
+from app.services.BlockChainService import BlockChainService
+from app.services.BlockService import BlockService
+from app.services.ChainQueryService import ChainQueryService
+from app.services.TransactionService import TransactionService
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_INV_INTERVAL = 0.02
+DEFAULT_SEEN_SIZE = 500_000
+DEFAULT_REQUEST_TIMEOUT = 30.0
+# Hạn chờ transaction đã GETDATA / transaction thiếu của block rút gọn
+DEFAULT_FETCH_TIMEOUT = 5.0
+
+
+class GossipNode:
+    def __init__(
+        self,
+        blockchain: BlockChain,
+        node_id: Optional[str] = None,
+        compact_blocks: bool = True,
+        inv_interval: float = DEFAULT_INV_INTERVAL,
+        send_queue_size: int = DEFAULT_SEND_QUEUE_SIZE,
+        fetch_timeout: float = DEFAULT_FETCH_TIMEOUT,
+    ):
+        self.blockchain = blockchain
+        self.node_id = node_id or uuid.uuid4().hex[:12]
+        self.compact_blocks = compact_blocks
+        self.inv_interval = inv_interval
+        self.send_queue_size = send_queue_size
+        self.fetch_timeout = fetch_timeout
+        self.query = ChainQueryService(blockchain)
+        self.peers: Set[Peer] = set()
+        self.stats: Counter = Counter()
+        # Thời điểm (perf_counter) nhận được lần đầu: dùng đo độ trễ lan truyền
+        self.arrivals: Dict[str, float] = {}
+        # Hook cho lớp trên (vd: đồng bộ khi thấy block ở xa phía trước)
+        self.on_block: Optional[Callable[[Block], None]] = None
+        self.on_orphan: Optional[Callable[[Peer, Block], None]] = None
+
+        # Transaction đã xử lý (trong mempool hoặc đã vào block): không xin lại
+        self._seen_txs = SeenSet(DEFAULT_SEEN_SIZE)
+        self._seen_blocks = SeenSet(DEFAULT_SEEN_SIZE)
+        # tx_id -> (peer được xin, hạn chờ): quá hạn thì được xin lại từ peer khác
+        self._requested_txs: Dict[str, Tuple[Peer, float]] = {}
+        # block_hash -> (block rút gọn, tx_id, danh sách tx đang dựng, peer gửi, hạn chờ)
+        self._pending_compact: Dict[str, Tuple[Block, List[str], List[Optional[Transaction]], Peer, float]] = {}
+        self._next_expiry = 0.0
+        # req -> (peer được hỏi, future chờ câu trả lời)
+        self._responses: Dict[str, Tuple[Peer, asyncio.Future]] = {}
+        self._request_ids = itertools.count()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._flush_task: Optional[asyncio.Task] = None
+        self.port: Optional[int] = None
+
+        # Chỉ các block trong cửa sổ: block cũ hơn không còn được gossip
+        for block in blockchain.chain.hot():
+            self._seen_blocks.add(block.block_hash)
+            for tx in block.transactions:
+                self._seen_txs.add(tx.tx_id)
+
+    # ==================== Kết nối ====================
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        self._server = await asyncio.start_server(self._on_inbound, host, port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._flush_task = asyncio.get_running_loop().create_task(self._flush_loop())
+        return self.port
+
+    async def connect(self, host: str, port: int) -> Peer:
+        reader, writer = await asyncio.open_connection(host, port)
+        return self._add_peer(reader, writer, outbound=True)
+
+    async def _on_inbound(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._add_peer(reader, writer, outbound=False)
+
+    def _add_peer(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, outbound: bool) -> Peer:
+        peer = Peer(reader, writer, outbound=outbound, send_queue_size=self.send_queue_size)
+        peer.start()
+        self.peers.add(peer)
+        task = asyncio.get_running_loop().create_task(self._peer_loop(peer))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return peer
+
+    async def _peer_loop(self, peer: Peer) -> None:
+        head = self.query.head()
+        await peer.send(protocol.HELLO, protocol.encode_json({
+            "node_id": self.node_id,
+            "height": head["height"] if head else -1,
+            "head": head["block_hash"] if head else None,
+        }))
+        try:
+            while not peer.closed:
+                msg_type, body = await protocol.read_frame(peer.reader)
+                peer.stats[f"recv_{protocol.MESSAGE_NAMES.get(msg_type, msg_type)}"] += 1
+                await self._dispatch(peer, msg_type, body)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except Exception as e:
+            logger.warning(f"[{self.node_id}] ngắt peer {peer.address}: {e}")
+        finally:
+            await peer.close()
+            self.peers.discard(peer)
+            for tx_id in [t for t, (p, _) in self._requested_txs.items() if p is peer]:
+                del self._requested_txs[tx_id]
+            for block_hash in [h for h, pending in self._pending_compact.items() if pending[3] is peer]:
+                del self._pending_compact[block_hash]
+            for req in [r for r, (p, _) in self._responses.items() if p is peer]:
+                future = self._responses.pop(req)[1]
+                if not future.done():
+                    future.set_exception(ConnectionError(f"mất kết nối tới peer {peer.address}"))
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.inv_interval)
+            for peer in list(self.peers):
+                await peer.flush_inv()
+            now = time.monotonic()
+            if now >= self._next_expiry:
+                self._expire_fetches(now)
+                self._next_expiry = now + self.fetch_timeout
+
+    def _expire_fetches(self, now: float) -> None:
+        """Bỏ các yêu cầu quá hạn (peer không trả lời) để không giữ chúng mãi."""
+        for tx_id in [t for t, (_, deadline) in self._requested_txs.items() if deadline <= now]:
+            del self._requested_txs[tx_id]
+        for block_hash in [h for h, pending in self._pending_compact.items() if pending[4] <= now]:
+            del self._pending_compact[block_hash]
+
+    async def stop(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for peer in list(self.peers):
+            await peer.close()
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self.peers.clear()
+
+    # ==================== API cho node ====================
+    def submit_transaction(self, tx: Transaction) -> bool:
+        """Nhận transaction từ client (đã ký), đưa vào mempool và thông báo cho peer."""
+        if tx.tx_id in self._seen_txs or not BlockChainService.add_transaction_to_mempool(self.blockchain, tx):
+            return False
+        self._accept_tx(tx, source=None)
+        return True
+
+    async def mine(self, private_key: SigningKey, public_key_hex: str) -> Block:
+        """Mine block từ mempool, áp dụng vào chain rồi relay cho peer."""
+        block = BlockChainService.mine_block(self.blockchain, private_key, public_key_hex)
+        BlockChainService.add_block(self.blockchain, block)
+        self.mark_block(block)
+        await self._relay_block(block, source=None)
+        return block
+
+    async def request(self, peer: Peer, msg_type: int, query: Dict[str, Any],
+                      timeout: float = DEFAULT_REQUEST_TIMEOUT) -> List[bytes]:
+        """Gửi câu hỏi (GETHEADERS / GETBLOCKS) và chờ các blob của câu trả lời."""
+        req = f"{self.node_id}:{next(self._request_ids)}"
+        future = asyncio.get_running_loop().create_future()
+        self._responses[req] = (peer, future)
+        try:
+            if not await peer.send(msg_type, protocol.encode_json({**query, "req": req})):
+                raise ConnectionError(f"không gửi được tới peer {peer.address}")
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._responses.pop(req, None)
+
+    # ==================== Xử lý message ====================
+    async def _dispatch(self, peer: Peer, msg_type: int, body: bytes) -> None:
+        if msg_type == protocol.HELLO:
+            hello = protocol.decode_json(body)
+            peer.node_id, peer.height = hello["node_id"], hello["height"]
+        elif msg_type == protocol.INV:
+            await self._on_inv(peer, protocol.decode_json(body))
+        elif msg_type == protocol.GETDATA:
+            await self._on_getdata(peer, protocol.decode_json(body))
+        elif msg_type == protocol.TX:
+            self._on_tx(peer, codec.decode_transaction(body))
+        elif msg_type == protocol.CMPCTBLOCK:
+            block, tx_ids = codec.decode_compact_block(body)
+            await self._on_compact_block(peer, block, tx_ids)
+        elif msg_type == protocol.GETBLOCKTXN:
+            await self._on_getblocktxn(peer, protocol.decode_json(body))
+        elif msg_type == protocol.BLOCKTXN:
+            await self._on_blocktxn(peer, protocol.unpack_blobs(body))
+        elif msg_type == protocol.BLOCK:
+            await self._on_block(peer, codec.decode_block(body))
+        elif msg_type == protocol.GETHEADERS:
+            await self._on_getheaders(peer, protocol.decode_json(body))
+        elif msg_type == protocol.GETBLOCKS:
+            await self._on_getblocks(peer, protocol.decode_json(body))
+        elif msg_type in (protocol.HEADERS, protocol.BLOCKS):
+            self._on_response(peer, protocol.unpack_blobs(body))
+        elif msg_type == protocol.NOTFOUND:
+            self._on_notfound(peer, protocol.decode_json(body))
+        else:
+            self.stats["unknown_message"] += 1
+
+    async def _on_inv(self, peer: Peer, inv: dict) -> None:
+        if inv["kind"] != protocol.KIND_TX:
+            return
+        wanted = []
+        now = time.monotonic()
+        deadline = now + self.fetch_timeout
+        for tx_id in inv["ids"]:
+            peer.known.add(tx_id)
+            if tx_id in self._seen_txs:
+                continue
+            requested = self._requested_txs.get(tx_id)
+            if requested is not None and requested[1] > now:
+                continue
+            self._requested_txs[tx_id] = (peer, deadline)
+            wanted.append(tx_id)
+        if wanted:
+            await peer.send(protocol.GETDATA, protocol.encode_json({"kind": protocol.KIND_TX, "ids": wanted}))
+
+    async def _on_getdata(self, peer: Peer, request: dict) -> None:
+        missing = []
+        if request["kind"] == protocol.KIND_TX:
+            for tx_id in request["ids"]:
+                tx = self.blockchain.mempool.get(tx_id)
+                if tx is None:
+                    missing.append(tx_id)
+                else:
+                    peer.known.add(tx_id)
+                    await peer.send(protocol.TX, codec.encode_transaction(tx), droppable=True)
+        else:
+            for block_hash in request["ids"]:
+                block = self.query.block_by_hash(block_hash)
+                if block is None:
+                    missing.append(block_hash)
+                else:
+                    peer.known.add(block_hash)
+                    await peer.send(protocol.BLOCK, codec.encode_block(block))
+        if missing:
+            await peer.send(protocol.NOTFOUND, protocol.encode_json({"kind": request["kind"], "ids": missing}))
+
+    def _on_notfound(self, peer: Peer, notfound: dict) -> None:
+        if notfound["kind"] == protocol.KIND_TX:
+            for tx_id in notfound["ids"]:
+                self._requested_txs.pop(tx_id, None)
+            return
+        # Peer không còn block rút gọn đã gửi: bỏ để nhận block từ peer khác
+        for block_hash in notfound["ids"]:
+            pending = self._pending_compact.get(block_hash)
+            if pending is not None and pending[3] is peer:
+                del self._pending_compact[block_hash]
+
+    def _on_tx(self, peer: Peer, tx: Transaction) -> None:
+        self._requested_txs.pop(tx.tx_id, None)
+        peer.known.add(tx.tx_id)
+        if tx.tx_id in self._seen_txs:
+            self.stats["duplicate_tx"] += 1
+            return
+        if not BlockChainService.add_transaction_to_mempool(self.blockchain, tx):
+            self._seen_txs.add(tx.tx_id)
+            self.stats["rejected_tx"] += 1
+            return
+        self._accept_tx(tx, source=peer)
+
+    def _accept_tx(self, tx: Transaction, source: Optional[Peer]) -> None:
+        self._seen_txs.add(tx.tx_id)
+        self.arrivals.setdefault(tx.tx_id, time.perf_counter())
+        self.stats["accepted_tx"] += 1
+        for peer in self.peers:
+            if peer is not source:
+                peer.queue_inv(protocol.KIND_TX, tx.tx_id)
+
+    async def _on_getheaders(self, peer: Peer, query: dict) -> None:
+        # Header lấy từ bản lưu theo cột, không cần chạm tới block đầy đủ
+        headers = self.blockchain.headers
+        start = max(query["start"], 0)
+        end = min(start + min(query["limit"], protocol.MAX_HEADERS) - 1, headers.height)
+        blobs = [query["req"].encode("utf-8")]
+        blobs.extend(codec.encode_signed_header(headers.signed_header(h)) for h in range(start, end + 1))
+        await peer.send(protocol.HEADERS, protocol.pack_blobs(blobs))
+
+    async def _on_getblocks(self, peer: Peer, query: dict) -> None:
+        start = query["start"]
+        end = min(query["end"], start + protocol.MAX_BLOCKS - 1)
+        blobs = [query["req"].encode("utf-8")]
+        size = 0
+        for block in self.query.iter_range(start, end):
+            data = codec.encode_block(block)
+            # Luôn trả ít nhất một block để bên hỏi tiến lên được
+            if size and size + len(data) > protocol.MAX_BLOCKS_BYTES:
+                break
+            blobs.append(data)
+            size += len(data)
+        await peer.send(protocol.BLOCKS, protocol.pack_blobs(blobs))
+
+    def _on_response(self, peer: Peer, blobs: List[bytes]) -> None:
+        pending = self._responses.get(blobs[0].decode("utf-8"))
+        if pending is None or pending[0] is not peer or pending[1].done():
+            self.stats["unexpected_response"] += 1
+            return
+        pending[1].set_result(blobs[1:])
+
+    async def _on_compact_block(self, peer: Peer, block: Block, tx_ids: List[str]) -> None:
+        peer.known.add(block.block_hash)
+        peer.height = max(peer.height, block.index)
+        for tx_id in tx_ids:
+            peer.known.add(tx_id)
+        if block.block_hash in self._seen_blocks:
+            return
+        pending = self._pending_compact.get(block.block_hash)
+        if pending is not None and pending[4] > time.monotonic():
+            return
+        if not self._connects(peer, block):
+            return
+
+        mempool = self.blockchain.mempool
+        txs = [mempool.get(tx_id) for tx_id in tx_ids]
+        missing = [tx_id for tx_id, tx in zip(tx_ids, txs) if tx is None]
+        if not missing:
+            await self._accept_block(peer, block, txs, prevalidated=set(tx_ids))
+            return
+
+        self.stats["compact_missing_txs"] += len(missing)
+        self._pending_compact[block.block_hash] = (block, tx_ids, txs, peer, time.monotonic() + self.fetch_timeout)
+        await peer.send(protocol.GETBLOCKTXN, protocol.encode_json({"block_hash": block.block_hash, "ids": missing}))
+
+    async def _on_getblocktxn(self, peer: Peer, request: dict) -> None:
+        # Block vừa relay có thể nằm trên nhánh phụ
+        block = self.query.block_by_hash(request["block_hash"]) or self.blockchain.block_tree.get(request["block_hash"])
+        if block is None:
+            await peer.send(protocol.NOTFOUND, protocol.encode_json({
+                "kind": protocol.KIND_BLOCK, "ids": [request["block_hash"]],
+            }))
+            return
+        wanted = set(request["ids"])
+        blobs = [request["block_hash"].encode("utf-8")]
+        blobs.extend(codec.encode_transaction(tx) for tx in block.transactions if tx.tx_id in wanted)
+        await peer.send(protocol.BLOCKTXN, protocol.pack_blobs(blobs))
+
+    async def _on_blocktxn(self, peer: Peer, blobs: List[bytes]) -> None:
+        block_hash = blobs[0].decode("utf-8")
+        pending = self._pending_compact.pop(block_hash, None)
+        if pending is None:
+            return
+        block, tx_ids, txs = pending[:3]
+        received = {tx.tx_id: tx for tx in map(codec.decode_transaction, blobs[1:])}
+        prevalidated = {tx_id for tx_id, tx in zip(tx_ids, txs) if tx is not None}
+        txs = [tx if tx is not None else received.get(tx_id) for tx_id, tx in zip(tx_ids, txs)]
+        if any(tx is None for tx in txs):
+            self.stats["rejected_block"] += 1
+            return
+        await self._accept_block(peer, block, txs, prevalidated)
+
+    async def _on_block(self, peer: Peer, block: Block) -> None:
+        peer.known.add(block.block_hash)
+        peer.height = max(peer.height, block.index)
+        if block.block_hash in self._seen_blocks or not self._connects(peer, block):
+            return
+        mempool = self.blockchain.mempool
+        prevalidated = {tx.tx_id for tx in block.transactions if tx.tx_id in mempool}
+        await self._accept_block(peer, block, list(block.transactions), prevalidated)
+
+    def _connects(self, peer: Peer, block: Block) -> bool:
+        """
+        Block có nối vào block đã biết không (đỉnh chain, block cũ hơn hoặc một
+        nhánh trong block_tree); block ở xa phía trước mà chưa biết cha là orphan.
+        """
+        if not self.blockchain.chain:
+            return False
+        last = self.blockchain.get_last_block()
+        if block.index == last.index + 1 and block.block_header.pre_hash == last.block_hash:
+            return True
+        if self.blockchain.known_height(block.block_header.pre_hash) == block.index - 1:
+            return True
+        if block.index > last.index + 1:
+            self.stats["orphan_block"] += 1
+            if self.on_orphan is not None:
+                self.on_orphan(peer, block)
+        return False
+
+    async def _accept_block(self, peer: Peer, block: Block, txs: List[Transaction], prevalidated: Set[str]) -> None:
+        block.transactions = txs
+        # Transaction lấy từ mempool đã được kiểm tra chữ ký khi nhận vào
+        if (
+            BlockService.calculate_hash(block) != block.block_hash
+            or block.block_header.merkle_root != BlockService.calculate_merkle_root(txs)
+            or not BlockService.verify_block(block)
+            or not all(tx.tx_id in prevalidated or TransactionService.is_valid(tx) for tx in txs)
+        ):
+            self.stats["rejected_block"] += 1
+            return
+        try:
+            on_main_chain = BlockChainService.add_block(self.blockchain, block)
+        except ValueError:
+            self.stats["rejected_block"] += 1
+            return
+
+        self.mark_block(block)
+        if on_main_chain:
+            self.stats["accepted_block"] += 1
+            if self.on_block is not None:
+                self.on_block(block)
+        else:
+            self.stats["fork_block"] += 1
+        # Block nhánh phụ cũng được relay để các node cùng thấy mọi nhánh
+        await self._relay_block(block, source=peer)
+
+    def mark_block(self, block: Block) -> None:
+        """Ghi nhận block đã vào chain (kể cả block do đồng bộ ban đầu áp dụng)."""
+        self._seen_blocks.add(block.block_hash)
+        self.arrivals.setdefault(block.block_hash, time.perf_counter())
+        for tx in block.transactions:
+            self._seen_txs.add(tx.tx_id)
+            self._requested_txs.pop(tx.tx_id, None)
+
+    async def _relay_block(self, block: Block, source: Optional[Peer]) -> None:
+        if self.compact_blocks:
+            msg_type, body = protocol.CMPCTBLOCK, codec.encode_compact_block(block)
+        else:
+            msg_type, body = protocol.BLOCK, codec.encode_block(block)
+        for peer in list(self.peers):
+            if peer is source or block.block_hash in peer.known:
+                continue
+            peer.known.add(block.block_hash)
+            await peer.send(msg_type, body)
@@ -0,0 +1,135 @@
+import asyncio
+from collections import Counter, OrderedDict
+from typing import Dict, Hashable, List, Optional
+
+from app.network import protocol
+
+DEFAULT_SEND_QUEUE_SIZE = 1024
+DEFAULT_KNOWN_SIZE = 100_000
+DEFAULT_SEND_TIMEOUT = 5.0
+# Số id tối đa trong một message INV
+MAX_INV_IDS = 5_000
+
+
+class SeenSet:
+    """Tập id có giới hạn: quá max_size thì bỏ id cũ nhất."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._items: "OrderedDict[Hashable, None]" = OrderedDict()
+
+    def add(self, key: Hashable) -> None:
+        if key in self._items:
+            return
+        self._items[key] = None
+        if len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class Peer:
+    """
+    Một kết nối tới peer.
+
+    - known: id (transaction / block) mà peer đã có hoặc đã được báo,
+      không bao giờ gửi lại cho peer đó.
+    - Gửi qua hàng đợi có giới hạn, một task ghi ra socket và chờ drain():
+      peer chậm làm hàng đợi đầy -> message bỏ được (INV, TX) bị bỏ, message
+      quan trọng chờ tối đa send_timeout rồi ngắt kết nối peer.
+    """
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        outbound: bool = False,
+        send_queue_size: int = DEFAULT_SEND_QUEUE_SIZE,
+        known_size: int = DEFAULT_KNOWN_SIZE,
+        send_timeout: float = DEFAULT_SEND_TIMEOUT,
+    ):
+        self.reader = reader
+        self.writer = writer
+        self.outbound = outbound
+        self.send_timeout = send_timeout
+        self.node_id: Optional[str] = None
+        self.height = -1
+        self.known = SeenSet(known_size)
+        self.stats: Counter = Counter()
+        self.closed = False
+        self._queue: "asyncio.Queue[Optional[bytes]]" = asyncio.Queue(maxsize=send_queue_size)
+        self._pending_inv: Dict[str, List[str]] = {protocol.KIND_TX: [], protocol.KIND_BLOCK: []}
+        self._writer_task: Optional[asyncio.Task] = None
+
+    @property
+    def address(self) -> str:
+        peername = self.writer.get_extra_info("peername")
+        return f"{peername[0]}:{peername[1]}" if peername else "?"
+
+    def start(self) -> None:
+        self._writer_task = asyncio.get_running_loop().create_task(self._write_loop())
+
+    async def _write_loop(self) -> None:
+        try:
+            while True:
+                data = await self._queue.get()
+                if data is None:
+                    break
+                self.writer.write(data)
+                await self.writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.closed = True
+            self.writer.close()
+
+    async def send(self, msg_type: int, body: bytes, droppable: bool = False) -> bool:
+        """Đưa message vào hàng đợi gửi; False nếu bị bỏ hoặc peer đã đóng."""
+        if self.closed:
+            return False
+        data = protocol.frame(msg_type, body)
+        if droppable:
+            try:
+                self._queue.put_nowait(data)
+            except asyncio.QueueFull:
+                self.stats["dropped"] += 1
+                return False
+        else:
+            try:
+                await asyncio.wait_for(self._queue.put(data), self.send_timeout)
+            except asyncio.TimeoutError:
+                # Peer quá chậm: ngắt thay vì để bộ nhớ phình ra
+                self.stats["send_timeout"] += 1
+                await self.close()
+                return False
+        self.stats[f"sent_{protocol.MESSAGE_NAMES.get(msg_type, msg_type)}"] += 1
+        self.stats["bytes_sent"] += len(data)
+        return True
+
+    def queue_inv(self, kind: str, item_id: str) -> None:
+        """Gom id để thông báo ở lần flush_inv kế tiếp (bỏ qua id peer đã biết)."""
+        if item_id in self.known:
+            return
+        self.known.add(item_id)
+        self._pending_inv[kind].append(item_id)
+
+    async def flush_inv(self) -> None:
+        for kind, ids in self._pending_inv.items():
+            if not ids:
+                continue
+            self._pending_inv[kind] = []
+            for i in range(0, len(ids), MAX_INV_IDS):
+                await self.send(protocol.INV, protocol.encode_json({"kind": kind, "ids": ids[i:i + MAX_INV_IDS]}),
+                                droppable=True)
+
+    async def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+        self.writer.close()
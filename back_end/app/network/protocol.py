@@ -0,0 +1,83 @@
+"""
+Giao thức giữa các node: mỗi frame = độ dài body (u32) + loại message (u8) + body.
+
+Body của TX / BLOCK / CMPCTBLOCK dùng mã hoá nhị phân trong app/core/codec.py,
+các message điều khiển (HELLO, INV, GETDATA, ...) dùng JSON.
+"""
+import asyncio
+import json
+import struct
+from typing import Any, List, Tuple
+
+# Loại message
+HELLO = 0
+INV = 1              # {"kind": "tx" | "block", "ids": [...]}: thông báo có dữ liệu mới
+GETDATA = 2          # {"kind", "ids"}: xin dữ liệu đã được thông báo
+TX = 3               # codec.encode_transaction
+BLOCK = 4            # codec.encode_block
+CMPCTBLOCK = 5       # codec.encode_compact_block: header + tx_id
+GETBLOCKTXN = 6      # {"block_hash", "ids"}: xin các transaction thiếu của block rút gọn
+BLOCKTXN = 7         # pack_blobs([block_hash, tx...])
+NOTFOUND = 8         # {"kind", "ids"}
+# Đồng bộ ban đầu (hỏi - đáp, blob đầu của câu trả lời là "req" của câu hỏi)
+GETHEADERS = 9       # {"req", "start", "limit"}
+HEADERS = 10         # pack_blobs([req, codec.encode_signed_header...])
+GETBLOCKS = 11       # {"req", "start", "end"}: block trong [start, end]
+BLOCKS = 12          # pack_blobs([req, codec.encode_block...]), có thể ít hơn số block xin
+
+MESSAGE_NAMES = {
+    HELLO: "hello", INV: "inv", GETDATA: "getdata", TX: "tx", BLOCK: "block",
+    CMPCTBLOCK: "cmpctblock", GETBLOCKTXN: "getblocktxn", BLOCKTXN: "blocktxn", NOTFOUND: "notfound",
+    GETHEADERS: "getheaders", HEADERS: "headers", GETBLOCKS: "getblocks", BLOCKS: "blocks",
+}
+
+KIND_TX = "tx"
+KIND_BLOCK = "block"
+
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+MAX_HEADERS = 2_000
+MAX_BLOCKS = 500
+# Câu trả lời BLOCKS dừng thêm block khi vượt ngưỡng này
+MAX_BLOCKS_BYTES = MAX_FRAME_SIZE // 2
+
+_FRAME_HEADER = struct.Struct(">IB")
+_U32 = struct.Struct(">I")
+
+
+def frame(msg_type: int, body: bytes) -> bytes:
+    return _FRAME_HEADER.pack(len(body), msg_type) + body
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Tuple[int, bytes]:
+    """Đọc một frame; IncompleteReadError khi peer đóng kết nối."""
+    length, msg_type = _FRAME_HEADER.unpack(await reader.readexactly(_FRAME_HEADER.size))
+    if length > MAX_FRAME_SIZE:
+        raise ValueError(f"frame quá lớn: {length} bytes")
+    return msg_type, await reader.readexactly(length)
+
+
+def encode_json(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+def decode_json(body: bytes) -> Any:
+    return json.loads(body.decode("utf-8"))
+
+
+def pack_blobs(blobs: List[bytes]) -> bytes:
+    return _U32.pack(len(blobs)) + b"".join(_U32.pack(len(blob)) + blob for blob in blobs)
+
+
+def unpack_blobs(body: bytes) -> List[bytes]:
+    view = memoryview(body)
+    count = _U32.unpack_from(view, 0)[0]
+    offset = 4
+    blobs = []
+    for _ in range(count):
+        size = _U32.unpack_from(view, offset)[0]
+        offset += 4
+        if offset + size > len(view):
+            raise ValueError("blob bị cắt cụt")
+        blobs.append(view[offset:offset + size].tobytes())
+        offset += size
+    return blobs
@@ -0,0 +1,308 @@
+"""
+Đồng bộ ban đầu kiểu header trước (headers-first) cho node mới hoặc bị tụt lại.
+
+1. Tải chuỗi header đã ký từ peer cao nhất và kiểm tra: liên kết pre_hash,
+   block_hash, validator thuộc authority set, chữ ký validator. Chưa cần
+   thân block nên peer gửi chain giả bị phát hiện ngay từ đầu.
+2. Tải thân block song song từ nhiều peer theo cửa sổ trượt: mỗi yêu cầu là
+   một đoạn [start, end]; chỉ xin các đoạn nằm trong `window` block tính từ
+   block kế tiếp cần áp dụng nên bộ đệm có giới hạn. Peer lỗi / chậm bị loại,
+   đoạn của nó được trả lại cho peer khác.
+3. Thân block được đối chiếu với header đã kiểm tra (merkle_root, chữ ký
+   transaction) rồi áp dụng đúng thứ tự qua BlockChainService.add_block.
+
+Tiếp tục sau gián đoạn: điểm bắt đầu luôn là đỉnh chain hiện tại. Với
+block_store, node khởi động lại bằng restore_from_store rồi chạy lại sync.
+Node chưa có gì nhận genesis từ peer, chỉ khi khớp genesis_hash đã ghim
+(app.main từ chối --sync trên node rỗng nếu thiếu --genesis-hash).
+"""
+import asyncio
+import heapq
+import time
+from collections import Counter
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from app.core import codec
+from app.models.Block import Block
+from app.network import protocol
+from app.network.gossip import DEFAULT_REQUEST_TIMEOUT, GossipNode
+from app.network.peer import Peer
+from app.services.BlockChainService import BlockChainService
+from app.services.BlockService import BlockService
+from app.services.TransactionService import TransactionService
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_WINDOW = 2_000
+DEFAULT_REQUESTS_PER_PEER = 2
+
+# progress(số block đã áp dụng, tổng số block cần đồng bộ)
+ProgressCallback = Callable[[int, int], None]
+
+
+class InitialSync:
+    def __init__(
+        self,
+        node: GossipNode,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        window: int = DEFAULT_WINDOW,
+        requests_per_peer: int = DEFAULT_REQUESTS_PER_PEER,
+        verify_workers: int = 1,
+        request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+        progress: Optional[ProgressCallback] = None,
+        genesis_hash: Optional[str] = None,
+    ):
+        if batch_size < 1 or window < batch_size:
+            raise ValueError("cần 1 <= batch_size <= window")
+        self.node = node
+        self.blockchain = node.blockchain
+        self.batch_size = batch_size
+        self.window = window
+        self.requests_per_peer = requests_per_peer
+        self.verify_workers = verify_workers
+        self.request_timeout = request_timeout
+        self.progress = progress
+        self.genesis_hash = genesis_hash
+        self.bad_peers: Set[Peer] = set()
+        self.blocks_from: Counter = Counter()
+        self.bytes_received = 0
+        self._txs_applied = 0
+
+        self._headers: List[Block] = []
+        self._ranges: List[Tuple[int, int]] = []
+        self._ready: Dict[int, List[Block]] = {}
+        self._next = 0
+        self._target = -1
+        self._workers_alive = 0
+        self._cond: Optional[asyncio.Condition] = None
+
+    # ==================== Genesis ====================
+    async def _bootstrap_genesis(self, peers: List[Peer]) -> bool:
+        """Chain rỗng: lấy genesis từ peer, validator của genesis là authority set ban đầu."""
+        for peer in peers:
+            try:
+                blobs = await self.node.request(peer, protocol.GETBLOCKS, {"start": 0, "end": 0}, self.request_timeout)
+            except (ConnectionError, asyncio.TimeoutError):
+                continue
+            if len(blobs) != 1:
+                continue
+            genesis = codec.decode_block(blobs[0])
+            if (
+                genesis.index != 0
+                or genesis.transactions
+                or BlockService.calculate_hash(genesis) != genesis.block_hash
+                or (self.genesis_hash is not None and genesis.block_hash != self.genesis_hash)
+            ):
+                logger.warning(f"Genesis từ peer {peer.address} không hợp lệ")
+                self.bad_peers.add(peer)
+                continue
+            BlockChainService.install_genesis(self.blockchain, genesis)
+            self.node.mark_block(genesis)
+            return True
+        return False
+
+    # ==================== Header ====================
+    async def _download_headers(self, peers: List[Peer]) -> None:
+        for peer in peers:
+            failed = False
+            while not failed:
+                prev = self._headers[-1] if self._headers else self.blockchain.get_last_block()
+                try:
+                    blobs = await self.node.request(
+                        peer, protocol.GETHEADERS,
+                        {"start": prev.index + 1, "limit": protocol.MAX_HEADERS}, self.request_timeout,
+                    )
+                except (ConnectionError, asyncio.TimeoutError):
+                    failed = True
+                    break
+                self.bytes_received += sum(map(len, blobs))
+
+                for blob in blobs:
+                    header = codec.decode_signed_header(blob)
+                    reason = BlockService.check_signed_header(
+                        header, prev.index, prev.block_hash, self.blockchain.authority_set
+                    )
+                    if reason is not None:
+                        logger.warning(f"Header {header.index} từ peer {peer.address} không hợp lệ: {reason}")
+                        self.bad_peers.add(peer)
+                        failed = True
+                        break
+                    self._headers.append(header)
+                    prev = header
+                if len(blobs) < protocol.MAX_HEADERS:
+                    break
+                # Nhường event loop giữa các lô header (kiểm tra chữ ký tốn CPU)
+                await asyncio.sleep(0)
+            if not failed:
+                return
+
+    # ==================== Thân block ====================
+    async def _check_bodies(self, start: int, end: int, blobs: List[bytes]) -> List[Block]:
+        """Đối chiếu thân block với header đã kiểm tra; ValueError nếu sai."""
+        bodies = [codec.decode_block(blob) for blob in blobs]
+        if not bodies:
+            raise ValueError("peer không có block")
+        if len(bodies) > end - start + 1:
+            raise ValueError("peer trả thừa block")
+
+        first = self._headers[0].index
+        headers = self._headers[start - first:start - first + len(bodies)]
+        for header, body in zip(headers, bodies):
+            if body.block_hash != header.block_hash:
+                raise ValueError(f"block {header.index} không khớp header")
+            if BlockService.calculate_merkle_root(body.transactions) != header.block_header.merkle_root:
+                raise ValueError(f"merkle_root của block {header.index} sai")
+
+        transactions = [tx for body in bodies for tx in body.transactions]
+        valid = await asyncio.get_running_loop().run_in_executor(
+            None, partial(TransactionService.is_valid_batch, transactions, max_workers=self.verify_workers)
+        )
+        if not all(valid):
+            raise ValueError("chữ ký transaction sai")
+
+        # Gắn transactions vào header đã kiểm tra (giữ nguyên chữ ký validator của header)
+        for header, body in zip(headers, bodies):
+            header.transactions = body.transactions
+        return headers
+
+    def _can_fetch(self) -> bool:
+        return bool(self._ranges) and self._ranges[0][0] < self._next + self.window
+
+    async def _fetch_loop(self, peer: Peer) -> None:
+        cond = self._cond
+        try:
+            while True:
+                async with cond:
+                    await cond.wait_for(
+                        lambda: self._next > self._target or peer.closed or peer in self.bad_peers
+                        or self._can_fetch()
+                    )
+                    if self._next > self._target or peer.closed or peer in self.bad_peers:
+                        return
+                    start, end = heapq.heappop(self._ranges)
+
+                try:
+                    blobs = await self.node.request(
+                        peer, protocol.GETBLOCKS, {"start": start, "end": end}, self.request_timeout
+                    )
+                    self.bytes_received += sum(map(len, blobs))
+                    blocks = await self._check_bodies(start, end, blobs)
+                except (ConnectionError, asyncio.TimeoutError, ValueError) as e:
+                    logger.warning(f"Bỏ peer {peer.address} khi tải block {start}-{end}: {e}")
+                    async with cond:
+                        heapq.heappush(self._ranges, (start, end))
+                        self.bad_peers.add(peer)
+                    return
+
+                async with cond:
+                    last = start + len(blocks) - 1
+                    if last < end:
+                        # Peer trả thiếu (giới hạn kích thước): phần còn lại xin lại sau
+                        heapq.heappush(self._ranges, (last + 1, end))
+                    self._ready[start] = blocks
+                    self.blocks_from[peer.node_id or peer.address] += len(blocks)
+                    cond.notify_all()
+        finally:
+            async with cond:
+                self._workers_alive -= 1
+                cond.notify_all()
+
+    def _apply(self, blocks: List[Block]) -> None:
+        for block in blocks:
+            # Block có thể đã tới qua gossip trong lúc đồng bộ
+            if block.index <= self.blockchain.get_last_block().index:
+                continue
+            BlockChainService.add_block(self.blockchain, block)
+            self.node.mark_block(block)
+            self._txs_applied += len(block.transactions)
+
+    async def _download_bodies(self, peers: List[Peer]) -> None:
+        self._cond = cond = asyncio.Condition()
+        first = self._headers[0].index
+        self._next = first
+        self._target = self._headers[-1].index
+        self._ranges = [
+            (start, min(start + self.batch_size - 1, self._target))
+            for start in range(first, self._target + 1, self.batch_size)
+        ]
+        heapq.heapify(self._ranges)
+
+        loop = asyncio.get_running_loop()
+        workers = [
+            loop.create_task(self._fetch_loop(peer))
+            for peer in peers if peer not in self.bad_peers
+            for _ in range(self.requests_per_peer)
+        ]
+        self._workers_alive = len(workers)
+        total = self._target - first + 1
+        try:
+            while self._next <= self._target:
+                async with cond:
+                    await cond.wait_for(lambda: self._next in self._ready or self._workers_alive == 0)
+                    blocks = self._ready.pop(self._next, None)
+                if blocks is None:
+                    # Không còn peer nào tải được
+                    return
+                self._apply(blocks)
+                async with cond:
+                    self._next += len(blocks)
+                    cond.notify_all()
+                if self.progress:
+                    self.progress(self._next - first, total)
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            self._ready.clear()
+
+    # ==================== Chạy ====================
+    async def run(self, peers: Optional[List[Peer]] = None) -> Dict[str, Any]:
+        """Đồng bộ tới đỉnh chain của peer cao nhất; trả về báo cáo tốc độ."""
+        started = time.perf_counter()
+        candidates = sorted(
+            (p for p in (peers if peers is not None else self.node.peers) if not p.closed),
+            key=lambda p: p.height, reverse=True,
+        )
+        if not self.blockchain.chain and not await self._bootstrap_genesis(candidates):
+            raise ConnectionError("không lấy được genesis từ peer nào")
+        candidates = [p for p in candidates if p not in self.bad_peers]
+        start_height = self.blockchain.get_last_block().index
+
+        self._headers = []
+        self._txs_applied = 0
+        await self._download_headers(candidates)
+        headers_seconds = time.perf_counter() - started
+        target = self._headers[-1].index if self._headers else start_height
+
+        if self._headers:
+            await self._download_bodies(candidates)
+
+        elapsed = time.perf_counter() - started
+        height = self.blockchain.get_last_block().index
+        blocks = height - start_height
+        txs = self._txs_applied
+        report = {
+            "complete": height >= target,
+            "start_height": start_height,
+            "height": height,
+            "target_height": target,
+            "headers": len(self._headers),
+            "headers_seconds": headers_seconds,
+            "blocks": blocks,
+            "txs": txs,
+            "seconds": elapsed,
+            "blocks_per_s": blocks / elapsed if elapsed > 0 else float("inf"),
+            "txs_per_s": txs / elapsed if elapsed > 0 else float("inf"),
+            "bytes_received": self.bytes_received,
+            "blocks_from": dict(self.blocks_from),
+            "bad_peers": sorted(p.node_id or p.address for p in self.bad_peers),
+        }
+        self._headers = []
+        logger.info(
+            f"Đồng bộ {'xong' if report['complete'] else 'dừng'} tại {height}/{target}: "
+            f"{blocks} block, {report['blocks_per_s']:.1f} blocks/s, {report['txs_per_s']:.1f} tx/s"
+        )
+        return report
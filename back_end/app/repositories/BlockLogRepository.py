@@ -0,0 +1,403 @@
+import hashlib
+import mmap
+import os
+import re
+import struct
+import zlib
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.core import codec
+from app.core.hexfield import to_raw
+from app.models.Block import Block
+from app.utils import metrics
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_LOG_FLUSH_SECONDS = metrics.histogram("block_log_flush_seconds", "Thời gian một lần ghi block vào block log")
+_LOG_BLOCKS_WRITTEN = metrics.counter("block_log_blocks_written_total", "Số block đã ghi vào block log")
+
+_SEGMENT_MAGIC = b"NCKH-SEG1"
+_INDEX_MAGIC = b"NCKH-IDX1"
+_SEGMENT_NAME = re.compile(r"^seg_(\d{6})\.log$")
+_INDEX_NAME = "index.bin"
+
+# Bản ghi trong segment: độ dài, crc32 của block đã mã hoá, chiều cao
+_RECORD = struct.Struct(">IIQ")
+# Mục index (cố định 48 byte / block): segment, offset của block, độ dài, khoá hash
+_ENTRY = struct.Struct(">IQI32s")
+
+DEFAULT_SEGMENT_SIZE = 64 * 1024 * 1024
+
+
+def _hash_key(block_hash: str) -> bytes:
+    """Khoá 32 byte của block_hash (hash không theo khuôn thì băm lại chuỗi)."""
+    raw = to_raw(block_hash)
+    if isinstance(raw, bytes) and len(raw) == 32:
+        return raw
+    return hashlib.sha256(block_hash.encode("utf-8")).digest()
+
+
+class _Segment:
+    """Một file segment: ghi nối đuôi, đọc qua mmap (map lại khi file dài ra)."""
+
+    def __init__(self, number: int, path: str):
+        self.number = number
+        self.path = path
+        self.size = os.path.getsize(path)
+        self._map: Optional[mmap.mmap] = None
+
+    def view(self, offset: int, length: int) -> memoryview:
+        if self._map is None or offset + length > len(self._map):
+            self.unmap()
+            with open(self.path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(self._map)[offset:offset + length]
+
+    def unmap(self) -> None:
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                # Còn memoryview bên ngoài trỏ vào: để GC đóng khi view được giải phóng
+                pass
+            self._map = None
+
+
+class BlockLogRepository:
+    """
+    Lưu block dạng log chỉ ghi nối đuôi, cùng giao diện với BlockRepository.
+
+    - Block mã hoá bằng codec được ghi liên tiếp vào các file segment
+      (seg_000000.log, ...); đủ segment_size thì chuyển sang segment mới.
+    - index.bin: mỗi chiều cao một mục 48 byte (segment, offset, độ dài,
+      block_hash) nên tìm theo chiều cao là O(1), theo hash qua dict.
+    - Đọc block bằng mmap, cắt thẳng trên vùng nhớ đã map (không copy cả
+      block); transaction chỉ được giải mã khi truy cập.
+    - Khởi động lại sau crash: bản ghi cuối ghi dở (thiếu byte, sai crc32)
+      bị cắt bỏ, block đã ghi đủ mà index chưa có được thêm lại vào index.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        group_commit: int = 1,
+        segment_size: int = DEFAULT_SEGMENT_SIZE,
+        fsync: bool = True,
+        read_only: bool = False,
+    ):
+        if group_commit < 1:
+            raise ValueError("group_commit phải >= 1")
+        if segment_size < 1:
+            raise ValueError("segment_size phải >= 1")
+        self.directory = directory
+        self.group_commit = group_commit
+        self.segment_size = segment_size
+        self.fsync = fsync
+        self.read_only = read_only
+        # (chiều cao, khoá hash, block đã mã hoá) chưa ghi xuống file
+        self._pending: List[Tuple[int, bytes, bytes]] = []
+
+        self._segments: List[_Segment] = []
+        self._index = bytearray()
+        self._by_hash: Dict[bytes, int] = {}
+        self._segment_file = None
+        self._index_file = None
+
+        if not read_only:
+            os.makedirs(directory, exist_ok=True)
+        self._open()
+
+    # ==================== Mở / khôi phục ====================
+    def _segment_path(self, number: int) -> str:
+        return os.path.join(self.directory, f"seg_{number:06d}.log")
+
+    def _open(self) -> None:
+        numbers = sorted(
+            int(m.group(1)) for m in map(_SEGMENT_NAME.match, os.listdir(self.directory)) if m
+        )
+        self._segments = [_Segment(n, self._segment_path(n)) for n in numbers]
+
+        index_path = os.path.join(self.directory, _INDEX_NAME)
+        index = b""
+        if os.path.exists(index_path):
+            with open(index_path, "rb") as f:
+                index = f.read()
+        body = index[len(_INDEX_MAGIC):] if index.startswith(_INDEX_MAGIC) else b""
+        self._index = bytearray(body[:len(body) - len(body) % _ENTRY.size])
+
+        repaired = self._recover()
+        for height in range(len(self)):
+            self._by_hash[self._entry(height)[3]] = height
+
+        if self.read_only:
+            return
+        if not self._segments:
+            self._new_segment(0)
+        # Index thiếu, hỏng hoặc vừa được sửa: ghi lại toàn bộ
+        if repaired or index != _INDEX_MAGIC + self._index:
+            with open(index_path + ".tmp", "wb") as f:
+                f.write(_INDEX_MAGIC + self._index)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(index_path + ".tmp", index_path)
+        self._segment_file = open(self._segments[-1].path, "ab")
+        self._index_file = open(index_path, "ab")
+
+    def _read_record(self, segment: _Segment, offset: int) -> Optional[Tuple[int, int, int]]:
+        """(chiều cao, offset của block, độ dài) nếu bản ghi tại offset nguyên vẹn."""
+        if offset < 0 or offset + _RECORD.size > segment.size:
+            return None
+        length, crc, height = _RECORD.unpack(segment.view(offset, _RECORD.size))
+        start = offset + _RECORD.size
+        if start + length > segment.size or zlib.crc32(segment.view(start, length)) != crc:
+            return None
+        return height, start, length
+
+    def _recover(self) -> bool:
+        """Đối chiếu index với segment; True nếu phải sửa index hoặc segment."""
+        by_number = {s.number: s for s in self._segments}
+        repaired = False
+
+        # Bỏ các mục cuối trỏ ra ngoài segment hoặc vào bản ghi hỏng
+        while len(self):
+            number, offset, length, _ = self._entry(len(self) - 1)
+            segment = by_number.get(number)
+            record = None if segment is None else self._read_record(segment, offset - _RECORD.size)
+            if record == (len(self) - 1, offset, length):
+                break
+            del self._index[-_ENTRY.size:]
+            repaired = True
+
+        # Quét tiếp từ sau block cuối của index: thêm block đã ghi đủ, cắt phần ghi dở
+        if len(self):
+            number, offset, length, _ = self._entry(len(self) - 1)
+            position = (number, offset + length)
+        elif self._segments:
+            position = (self._segments[0].number, len(_SEGMENT_MAGIC))
+        else:
+            return repaired
+
+        for i, segment in enumerate(self._segments):
+            if segment.number < position[0]:
+                continue
+            offset = position[1] if segment.number == position[0] else len(_SEGMENT_MAGIC)
+            if segment.size < len(_SEGMENT_MAGIC) or segment.view(0, len(_SEGMENT_MAGIC)) != _SEGMENT_MAGIC:
+                offset = 0
+            while offset < segment.size:
+                record = self._read_record(segment, offset)
+                if record is None or record[0] != len(self):
+                    break
+                height, start, length = record
+                block_hash = codec.decode_block(segment.view(start, length)).block_hash
+                self._index += _ENTRY.pack(segment.number, start, length, _hash_key(block_hash))
+                offset = start + length
+                repaired = True
+            if offset < segment.size:
+                # Phần đuôi ghi dở: mọi thứ phía sau đều không dùng được
+                logger.warning(f"Block log: cắt {segment.size - offset} byte ghi dở ở {segment.path}")
+                self._truncate(segment, offset, self._segments[i + 1:])
+                return True
+        return repaired
+
+    def _truncate(self, segment: _Segment, offset: int, later: List[_Segment]) -> None:
+        if self.read_only:
+            return
+        segment.unmap()
+        with open(segment.path, "r+b") as f:
+            if offset < len(_SEGMENT_MAGIC):
+                f.truncate(0)
+                f.write(_SEGMENT_MAGIC)
+                offset = len(_SEGMENT_MAGIC)
+            else:
+                f.truncate(offset)
+            os.fsync(f.fileno())
+        segment.size = offset
+        for other in later:
+            other.unmap()
+            os.remove(other.path)
+        self._segments = self._segments[:len(self._segments) - len(later)]
+
+    def _new_segment(self, number: int) -> None:
+        path = self._segment_path(number)
+        with open(path, "wb") as f:
+            f.write(_SEGMENT_MAGIC)
+            f.flush()
+            os.fsync(f.fileno())
+        self._segments.append(_Segment(number, path))
+
+    # ==================== Ghi ====================
+    def save_block(self, block: Block) -> None:
+        """Lưu block; với group_commit > 1 có thể chỉ nằm trong bộ đệm."""
+        if self.read_only:
+            raise PermissionError("repository mở ở chế độ chỉ đọc")
+        self._check_order([block.index])
+        # Mã hoá ngay: transaction còn memo, chưa bị compact()
+        self._pending.append((block.index, _hash_key(block.block_hash), codec.encode_block(block)))
+        if len(self._pending) >= self.group_commit:
+            self.flush()
+
+    def save_blocks(self, blocks: List[Block]) -> None:
+        """Lưu nhiều block trong một lần ghi."""
+        if self.read_only:
+            raise PermissionError("repository mở ở chế độ chỉ đọc")
+        self._check_order([b.index for b in blocks])
+        self._pending.extend((b.index, _hash_key(b.block_hash), codec.encode_block(b)) for b in blocks)
+        self.flush()
+
+    def _sync_segment(self) -> None:
+        self._segment_file.flush()
+        if self.fsync:
+            os.fsync(self._segment_file.fileno())
+
+    def _check_order(self, indexes: List[int]) -> None:
+        """Block mới phải nối tiếp block cuối (kể cả block còn trong bộ đệm)."""
+        start = len(self) + len(self._pending)
+        for i, index in enumerate(indexes):
+            if index != start + i:
+                raise ValueError(f"block log chỉ ghi nối đuôi: cần block {start + i}, nhận {index}")
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        # Kiểm tra trước khi lấy bộ đệm ra: lỗi thì các block đang chờ vẫn còn
+        for i, (index, _, _) in enumerate(self._pending):
+            if index != len(self) + i:
+                raise ValueError(f"block log chỉ ghi nối đuôi: cần block {len(self) + i}, nhận {index}")
+        pending, self._pending = self._pending, []
+        segment_count, segment_size = len(self._segments), self._segments[-1].size
+        try:
+            self._write(pending)
+        except Exception:
+            # Giữ lại các block chưa ghi được và bỏ phần đã ghi dở để lần flush sau ghi lại
+            self._pending = pending + self._pending
+            self._rewind(segment_count, segment_size)
+            raise
+        _LOG_BLOCKS_WRITTEN.inc(len(pending))
+
+    def _write(self, pending: List[Tuple[int, bytes, bytes]]) -> None:
+        with _LOG_FLUSH_SECONDS.time():
+            entries = bytearray()
+            for index, key, data in pending:
+                segment = self._segments[-1]
+                record_size = _RECORD.size + len(data)
+                if segment.size > len(_SEGMENT_MAGIC) and segment.size + record_size > self.segment_size:
+                    # Chuyển segment: segment cũ phải xuống đĩa trước
+                    self._sync_segment()
+                    self._segment_file.close()
+                    self._new_segment(segment.number + 1)
+                    segment = self._segments[-1]
+                    self._segment_file = open(segment.path, "ab")
+
+                self._segment_file.write(_RECORD.pack(len(data), zlib.crc32(data), index))
+                self._segment_file.write(data)
+                entries += _ENTRY.pack(segment.number, segment.size + _RECORD.size, len(data), key)
+                segment.size += record_size
+
+            # Block phải bền trước khi index trỏ tới (index hỏng thì dựng lại được từ segment)
+            self._sync_segment()
+            self._index_file.write(entries)
+            self._index_file.flush()
+            if self.fsync:
+                os.fsync(self._index_file.fileno())
+            start = len(self)
+            self._index += entries
+            for i, (_, key, _) in enumerate(pending):
+                self._by_hash[key] = start + i
+
+    def _rewind(self, segment_count: int, segment_size: int) -> None:
+        """Cắt segment và index về trạng thái trước lần flush lỗi."""
+        index_path = os.path.join(self.directory, _INDEX_NAME)
+        try:
+            self._segment_file.close()
+            self._truncate(self._segments[segment_count - 1], segment_size, self._segments[segment_count:])
+            self._segment_file = open(self._segments[-1].path, "ab")
+            self._index_file.close()
+            with open(index_path, "r+b") as f:
+                f.truncate(len(_INDEX_MAGIC) + len(self._index))
+            self._index_file = open(index_path, "ab")
+        except OSError as e:
+            # Mở lại repository sẽ tự cắt phần ghi dở (_recover)
+            logger.error(f"Block log: không dọn được lần ghi lỗi: {e}")
+
+    def truncate(self, height: int) -> None:
+        """
+        Bỏ các block cao hơn height (khi đổi nhánh). Cắt segment trước rồi
+        mới cắt index: crash giữa chừng thì _recover bỏ các mục index thừa.
+        """
+        if self.read_only:
+            raise PermissionError("repository mở ở chế độ chỉ đọc")
+        self.flush()
+        keep = max(height + 1, 0)
+        if keep >= len(self):
+            return
+
+        number, offset, _, _ = self._entry(keep)
+        position = number - self._segments[0].number
+        self._segment_file.close()
+        self._truncate(self._segments[position], offset - _RECORD.size, self._segments[position + 1:])
+        self._segment_file = open(self._segments[-1].path, "ab")
+
+        for h in range(keep, len(self)):
+            del self._by_hash[self._entry(h)[3]]
+        del self._index[keep * _ENTRY.size:]
+        self._index_file.truncate(len(_INDEX_MAGIC) + len(self._index))
+        self._index_file.flush()
+        if self.fsync:
+            os.fsync(self._index_file.fileno())
+
+    # ==================== Đọc ====================
+    def __len__(self) -> int:
+        return len(self._index) // _ENTRY.size
+
+    def _entry(self, height: int) -> Tuple[int, int, int, bytes]:
+        return _ENTRY.unpack_from(self._index, height * _ENTRY.size)
+
+    def get_height(self) -> int:
+        """Chiều cao block cao nhất đã lưu (-1 nếu chưa có block)."""
+        self.flush()
+        return len(self) - 1
+
+    def read_encoded(self, height: int) -> Optional[memoryview]:
+        """Block đã mã hoá: vùng nhớ cắt thẳng từ mmap của segment (không copy)."""
+        self.flush()
+        if not 0 <= height < len(self):
+            return None
+        number, offset, length, _ = self._entry(height)
+        segment = self._segments[number - self._segments[0].number]
+        return segment.view(offset, length)
+
+    def get_block_by_height(self, height: int) -> Optional[Block]:
+        """Block tại chiều cao; transaction chỉ được giải mã khi truy cập (LazyTransactions)."""
+        data = self.read_encoded(height)
+        return codec.decode_block_lazy(data) if data is not None else None
+
+    def get_block_by_hash(self, block_hash: str) -> Optional[Block]:
+        self.flush()
+        height = self._by_hash.get(_hash_key(block_hash))
+        if height is None:
+            return None
+        block = self.get_block_by_height(height)
+        return block if block.block_hash == block_hash else None
+
+    def iter_blocks(self, start: int = 0, end: Optional[int] = None) -> Iterator[Block]:
+        """Duyệt block theo chiều cao trong [start, end]."""
+        self.flush()
+        if end is None:
+            end = len(self) - 1
+        for height in range(max(start, 0), min(end, len(self) - 1) + 1):
+            yield self.get_block_by_height(height)
+
+    def close(self) -> None:
+        if not self.read_only:
+            self.flush()
+            self._segment_file.close()
+            self._index_file.close()
+        for segment in self._segments:
+            segment.unmap()
+
+    def __enter__(self) -> "BlockLogRepository":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -0,0 +1,248 @@
+import json
+import sqlite3
+from typing import Iterator, List, Optional
+
+from app.database.database import DEFAULT_DB_PATH, schema_sql
+from app.models.Block import Block
+from app.models.BlockHeader import BlockHeader
+from app.models.Transaction import Transaction
+from app.utils import metrics
+
+_DB_COMMIT_SECONDS = metrics.histogram("db_commit_seconds", "Thời gian một lần commit block vào SQLite")
+_DB_BLOCKS_WRITTEN = metrics.counter("db_blocks_written_total", "Số block đã ghi vào SQLite")
+
+# Pragma cho ghi tuần tự nhiều: WAL + fsync ít hơn, cache lớn
+_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",
+    "PRAGMA mmap_size = 268435456",
+)
+
+# Câu lệnh cố định: sqlite3 giữ sẵn bản đã prepare trong statement cache
+_INSERT_HEADER = (
+    "INSERT INTO block_header (index_num, pre_hash, merkle_root, validator_pubkey, timestamp) "
+    "VALUES (?, ?, ?, ?, ?)"
+)
+_INSERT_BLOCK = (
+    "INSERT INTO block (block_id, index_num, header_id, block_hash, validator_signature) "
+    "VALUES (?, ?, ?, ?, ?)"
+)
+_INSERT_TX = (
+    "INSERT OR IGNORE INTO transactions "
+    "(tx_id, sender_pubkey, sender_address, recipient_address, signature, timestamp, tx_hash, payload) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_INSERT_BLOCK_TX = "INSERT INTO block_transactions (block_id, tx_id, position) VALUES (?, ?, ?)"
+
+_SELECT_BLOCK = (
+    "SELECT b.block_id, b.index_num, b.block_hash, b.validator_signature, "
+    "h.index_num, h.pre_hash, h.merkle_root, h.validator_pubkey, h.timestamp "
+    "FROM block b JOIN block_header h ON h.header_id = b.header_id "
+)
+_SELECT_BLOCK_TXS = (
+    "SELECT t.tx_id, t.sender_pubkey, t.sender_address, t.recipient_address, "
+    "t.signature, t.timestamp, t.tx_hash, t.payload "
+    "FROM block_transactions bt JOIN transactions t ON t.tx_id = bt.tx_id "
+    "WHERE bt.block_id = ? ORDER BY bt.position"
+)
+
+
+class BlockRepository:
+    """
+    Lưu block vào SQLite theo schema trong app/database/database.py.
+
+    - Mỗi block (header + block + transactions) được ghi trong một transaction.
+    - group_commit > 1: gom nhiều block vào cùng một lần commit (một fsync).
+      Block chưa commit nằm trong bộ đệm, gọi flush() để ghi ngay.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, group_commit: int = 1, read_only: bool = False):
+        if group_commit < 1:
+            raise ValueError("group_commit phải >= 1")
+        self.db_path = db_path
+        self.group_commit = group_commit
+        self.read_only = read_only
+        self._pending: List[Block] = []
+
+        if read_only:
+            # Chỉ đọc (vd: worker kiểm tra chain): không tạo schema, không đổi journal mode
+            self.conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, cached_statements=256)
+            return
+
+        # isolation_level=None: tự quản lý BEGIN/COMMIT
+        self.conn = sqlite3.connect(db_path, isolation_level=None, cached_statements=256)
+        for pragma in _PRAGMAS:
+            self.conn.execute(pragma)
+        self.conn.executescript(schema_sql)
+        self._migrate()
+
+    def _migrate(self) -> None:
+        # Database tạo trước khi có cột position
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(block_transactions)")}
+        if "position" not in columns:
+            self.conn.execute("ALTER TABLE block_transactions ADD COLUMN position INTEGER")
+
+    # ==================== Ghi ====================
+    def save_block(self, block: Block) -> None:
+        """Lưu block; với group_commit > 1 có thể chỉ nằm trong bộ đệm."""
+        if self.read_only:
+            raise PermissionError("repository mở ở chế độ chỉ đọc")
+        self._pending.append(block)
+        if len(self._pending) >= self.group_commit:
+            self.flush()
+
+    def save_blocks(self, blocks: List[Block]) -> None:
+        """Lưu nhiều block trong một lần commit."""
+        if self.read_only:
+            raise PermissionError("repository mở ở chế độ chỉ đọc")
+        self._pending.extend(blocks)
+        self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+
+        cursor = self.conn.cursor()
+        with _DB_COMMIT_SECONDS.time():
+            cursor.execute("BEGIN")
+            try:
+                for block in pending:
+                    self._insert_block(cursor, block)
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                # Giữ lại các block chưa ghi được để lần flush sau ghi lại
+                self._pending = pending + self._pending
+                raise
+            finally:
+                cursor.close()
+        _DB_BLOCKS_WRITTEN.inc(len(pending))
+
+    def truncate(self, height: int) -> None:
+        """Xoá các block cao hơn height (khi đổi nhánh)."""
+        if self.read_only:
+            raise PermissionError("repository mở ở chế độ chỉ đọc")
+        self.flush()
+        removed = "SELECT block_id FROM block WHERE index_num > ?"
+        cursor = self.conn.cursor()
+        cursor.execute("BEGIN")
+        try:
+            cursor.execute(
+                f"DELETE FROM transactions WHERE tx_id IN "
+                f"(SELECT tx_id FROM block_transactions WHERE block_id IN ({removed}))",
+                (height,),
+            )
+            cursor.execute(f"DELETE FROM block_transactions WHERE block_id IN ({removed})", (height,))
+            cursor.execute(
+                "DELETE FROM block_header WHERE header_id IN (SELECT header_id FROM block WHERE index_num > ?)",
+                (height,),
+            )
+            cursor.execute("DELETE FROM block WHERE index_num > ?", (height,))
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def _insert_block(cursor: sqlite3.Cursor, block: Block) -> None:
+        header = block.block_header
+        cursor.execute(
+            _INSERT_HEADER,
+            (header.index, header.pre_hash, header.merkle_root, header.validator_pubkey, header.timestamp),
+        )
+        cursor.execute(
+            _INSERT_BLOCK,
+            (block.block_id, block.index, cursor.lastrowid, block.block_hash, block.validator_signature),
+        )
+        cursor.executemany(
+            _INSERT_TX,
+            [
+                (
+                    tx.tx_id,
+                    tx.sender_pubkey,
+                    tx.sender_address,
+                    tx.recipient_address,
+                    tx.signature,
+                    tx.timestamp,
+                    tx.tx_hash,
+                    tx.payload_json(),
+                )
+                for tx in block.transactions
+            ],
+        )
+        cursor.executemany(
+            _INSERT_BLOCK_TX,
+            [(block.block_id, tx.tx_id, position) for position, tx in enumerate(block.transactions)],
+        )
+
+    # ==================== Đọc ====================
+    def get_height(self) -> int:
+        """Chiều cao block cao nhất đã lưu (-1 nếu chưa có block)."""
+        self.flush()
+        row = self.conn.execute("SELECT MAX(index_num) FROM block").fetchone()
+        return -1 if row[0] is None else row[0]
+
+    def get_block_by_height(self, height: int) -> Optional[Block]:
+        self.flush()
+        row = self.conn.execute(_SELECT_BLOCK + "WHERE b.index_num = ?", (height,)).fetchone()
+        return self._row_to_block(row) if row else None
+
+    def get_block_by_hash(self, block_hash: str) -> Optional[Block]:
+        self.flush()
+        row = self.conn.execute(_SELECT_BLOCK + "WHERE b.block_hash = ?", (block_hash,)).fetchone()
+        return self._row_to_block(row) if row else None
+
+    def iter_blocks(self, start: int = 0, end: Optional[int] = None) -> Iterator[Block]:
+        """Duyệt block theo chiều cao trong [start, end]."""
+        self.flush()
+        if end is None:
+            end = self.get_height()
+        rows = self.conn.execute(
+            _SELECT_BLOCK + "WHERE b.index_num BETWEEN ? AND ? ORDER BY b.index_num", (start, end)
+        ).fetchall()
+        for row in rows:
+            yield self._row_to_block(row)
+
+    def _row_to_block(self, row: tuple) -> Block:
+        block_id, index, block_hash, signature, h_index, pre_hash, merkle_root, validator_pubkey, timestamp = row
+        header = BlockHeader(
+            index=h_index,
+            pre_hash=pre_hash,
+            merkle_root=merkle_root,
+            validator_pubkey=validator_pubkey,
+            timestamp=timestamp,
+        )
+        transactions = [
+            Transaction(
+                tx_id=tx_id,
+                sender_pubkey=sender_pubkey,
+                sender_address=sender_address,
+                recipient_address=recipient_address,
+                payload=json.loads(payload) if payload else {},
+                signature=tx_signature,
+                timestamp=tx_timestamp,
+                tx_hash=tx_hash,
+            )
+            for tx_id, sender_pubkey, sender_address, recipient_address, tx_signature, tx_timestamp, tx_hash, payload
+            in self.conn.execute(_SELECT_BLOCK_TXS, (block_id,))
+        ]
+        block = Block(index=index, block_id=block_id, block_header=header, transactions=transactions)
+        block.block_hash = block_hash
+        block.validator_signature = signature
+        return block
+
+    def close(self) -> None:
+        self.flush()
+        self.conn.close()
+
+    def __enter__(self) -> "BlockRepository":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -0,0 +1,110 @@
+import sqlite3
+from typing import Optional, Tuple
+
+from app.core.hexfield import to_raw
+from app.database.database import DEFAULT_DB_PATH, schema_sql
+from app.models.Block import Block
+from app.models.ChainIndex import block_tx_keys, pack_location, unpack_location
+
+_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -16384",
+)
+
+_INSERT_BLOCK = "INSERT OR REPLACE INTO chain_block_index (block_hash, height) VALUES (?, ?)"
+_INSERT_TX = "INSERT OR REPLACE INTO chain_tx_index (tx_id, location) VALUES (?, ?)"
+
+
+class ChainIndexRepository:
+    """
+    Chỉ mục block_hash -> height và tx_id -> (height, position) trên SQLite,
+    cùng giao diện với ChainIndex nhưng không giữ trong RAM.
+    Bảng WITHOUT ROWID, khoá bytes thô: mỗi transaction chỉ tốn một dòng nhỏ.
+    Khi khởi động lại chỉ cần thêm các block sau `height` đã lưu.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, isolation_level=None, cached_statements=256)
+        for pragma in _PRAGMAS:
+            self.conn.execute(pragma)
+        self.conn.executescript(schema_sql)
+        row = self.conn.execute("SELECT MAX(height) FROM chain_block_index").fetchone()
+        self.height = -1 if row[0] is None else row[0]
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM chain_tx_index").fetchone()[0]
+
+    def add_block(self, block: Block) -> None:
+        """Thêm block kế tiếp; block đã có (vd: khi khởi động lại) được bỏ qua."""
+        if block.index <= self.height:
+            if self.block_height(block.block_hash) == block.index:
+                return
+            self.truncate(block.index - 1)
+
+        cursor = self.conn.cursor()
+        cursor.execute("BEGIN")
+        try:
+            cursor.execute(_INSERT_BLOCK, (block._block_hash, block.index))
+            cursor.executemany(
+                _INSERT_TX,
+                [(key, pack_location(block.index, position)) for position, key in enumerate(block_tx_keys(block))],
+            )
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+        finally:
+            cursor.close()
+        self.height = block.index
+
+    def remove_block(self, block: Block) -> None:
+        """Bỏ chỉ mục của block cuối (khi đổi nhánh), xoá theo khoá."""
+        if self.block_height(block.block_hash) != block.index:
+            return
+        cursor = self.conn.cursor()
+        cursor.execute("BEGIN")
+        try:
+            cursor.execute("DELETE FROM chain_block_index WHERE block_hash = ?", (block._block_hash,))
+            cursor.executemany("DELETE FROM chain_tx_index WHERE tx_id = ?", [(key,) for key in block_tx_keys(block)])
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+        finally:
+            cursor.close()
+        self.height = min(self.height, block.index - 1)
+
+    def truncate(self, height: int) -> None:
+        """Bỏ chỉ mục của các block cao hơn height (quét bảng, dùng khi khởi động lại)."""
+        if height >= self.height:
+            return
+        cursor = self.conn.cursor()
+        cursor.execute("BEGIN")
+        try:
+            cursor.execute("DELETE FROM chain_block_index WHERE height > ?", (height,))
+            cursor.execute("DELETE FROM chain_tx_index WHERE location >= ?", (pack_location(height + 1, 0),))
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+        finally:
+            cursor.close()
+        self.height = height
+
+    def block_height(self, block_hash: str) -> Optional[int]:
+        row = self.conn.execute(
+            "SELECT height FROM chain_block_index WHERE block_hash = ?", (to_raw(block_hash),)
+        ).fetchone()
+        return row[0] if row else None
+
+    def tx_location(self, tx_id: str) -> Optional[Tuple[int, int]]:
+        row = self.conn.execute("SELECT location FROM chain_tx_index WHERE tx_id = ?", (to_raw(tx_id),)).fetchone()
+        return unpack_location(row[0]) if row else None
+
+    def has_tx(self, tx_id: str) -> bool:
+        return self.tx_location(tx_id) is not None
+
+    def close(self) -> None:
+        self.conn.close()
@@ -0,0 +1,189 @@
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.database.database import DEFAULT_DB_PATH, schema_sql
+
+_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA cache_size = -65536",
+)
+
+_INSERT_METADATA = (
+    "INSERT INTO nft_metadata (student_id, degree_type, pdf_url, pdf_hash, institution, issued_at) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+_INSERT_CLIENT = "INSERT OR IGNORE INTO client (client_id, public_key, address) VALUES (?, ?, ?)"
+_SELECT_CLIENT_ID = "SELECT client_id FROM client WHERE address = ?"
+_INSERT_NFT = (
+    "INSERT OR IGNORE INTO nft (nft_id, issuer_pubkey, issuer_address, metadata_id, recipient_id, "
+    "issuer_signature, minted_at, tx_id, block_index) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+_SELECT_CREDENTIAL = (
+    "SELECT n.nft_id, n.issuer_pubkey, n.issuer_address, c.address, c.client_id, c.public_key, "
+    "m.student_id, m.degree_type, m.pdf_url, m.pdf_hash, m.institution, m.issued_at, "
+    "n.issuer_signature, n.minted_at, n.tx_id, n.block_index, m.metadata_id "
+    "FROM nft n JOIN nft_metadata m ON m.metadata_id = n.metadata_id "
+    "LEFT JOIN client c ON c.client_id = n.recipient_id "
+)
+
+_RECORD_FIELDS = (
+    "token_id", "issuer_pubkey", "issuer_address", "recipient_address", "recipient_client_id",
+    "recipient_pubkey", "student_id", "degree_type", "pdf_url", "pdf_hash", "institution",
+    "issued_at", "issuer_signature", "minted_at", "tx_id", "height",
+)
+
+
+class CredentialRepository:
+    """
+    Chỉ mục văn bằng trên SQLite (bảng nft, nft_metadata, client).
+    Các truy vấn tra cứu chạy trên index trong schema (idx_nft_metadata_*,
+    idx_nft_recipient), phân trang theo keyset (metadata_id), không dùng OFFSET.
+
+    API tra cứu chạy trong thread pool (xem dependencies.query_index) còn
+    add_block ghi trên event loop: mọi truy cập connection đi qua một lock.
+    """
+
+    # Số dòng mỗi lần lấy trong iter_records (nhả lock giữa các lần)
+    _ITER_FETCH = 500
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, isolation_level=None, cached_statements=256, check_same_thread=False)
+        for pragma in _PRAGMAS:
+            self.conn.execute(pragma)
+        self._migrate()
+        self.conn.executescript(schema_sql)
+
+    def _migrate(self) -> None:
+        # Database tạo trước khi bảng nft có cột tx_id / block_index
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(nft)")}
+        if columns and "tx_id" not in columns:
+            self.conn.execute("ALTER TABLE nft ADD COLUMN tx_id TEXT")
+        if columns and "block_index" not in columns:
+            self.conn.execute("ALTER TABLE nft ADD COLUMN block_index INTEGER")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM nft").fetchone()[0]
+
+    def add_many(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Thêm bản ghi của một block trong một transaction SQLite."""
+        with self._lock:
+            self._add_many(records)
+
+    def _add_many(self, records: Iterable[Dict[str, Any]]) -> None:
+        cursor = self.conn.cursor()
+        cursor.execute("BEGIN")
+        try:
+            for r in records:
+                if cursor.execute("SELECT 1 FROM nft WHERE nft_id = ?", (r["token_id"],)).fetchone():
+                    continue
+                cursor.execute(
+                    _INSERT_METADATA,
+                    (r["student_id"], r["degree_type"], r["pdf_url"], r["pdf_hash"], r["institution"], r["issued_at"]),
+                )
+                metadata_id = cursor.lastrowid
+
+                recipient_id = None
+                if r.get("recipient_address"):
+                    cursor.execute(
+                        _INSERT_CLIENT,
+                        (r.get("recipient_client_id") or r["recipient_address"], r.get("recipient_pubkey") or "",
+                         r["recipient_address"]),
+                    )
+                    recipient_id = cursor.execute(_SELECT_CLIENT_ID, (r["recipient_address"],)).fetchone()[0]
+
+                cursor.execute(
+                    _INSERT_NFT,
+                    (r["token_id"], r["issuer_pubkey"], r.get("issuer_address") or "", metadata_id, recipient_id,
+                     r.get("issuer_signature"), r.get("minted_at"), r.get("tx_id"), r.get("height")),
+                )
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+        finally:
+            cursor.close()
+
+    def remove_many(self, token_ids: Iterable[str]) -> None:
+        """Bỏ văn bằng của block bị huỷ khi đổi nhánh (xoá metadata, nft theo cascade)."""
+        rows = [(token_id,) for token_id in token_ids]
+        if not rows:
+            return
+        with self._lock:
+            self._remove_many(rows)
+
+    def _remove_many(self, rows: List[Tuple[str]]) -> None:
+        cursor = self.conn.cursor()
+        cursor.execute("BEGIN")
+        try:
+            cursor.executemany(
+                "DELETE FROM nft_metadata WHERE metadata_id = (SELECT metadata_id FROM nft WHERE nft_id = ?)", rows
+            )
+            cursor.executemany("DELETE FROM nft WHERE nft_id = ?", rows)
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def _to_record(row: tuple) -> Dict[str, Any]:
+        return dict(zip(_RECORD_FIELDS, row[:-1]))
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        after = 0
+        while True:
+            # Keyset theo metadata_id: không giữ lock trong lúc người gọi xử lý
+            with self._lock:
+                rows = self.conn.execute(
+                    _SELECT_CREDENTIAL + "WHERE m.metadata_id > ? ORDER BY m.metadata_id LIMIT ?",
+                    (after, self._ITER_FETCH),
+                ).fetchall()
+            for row in rows:
+                yield self._to_record(row)
+            if len(rows) < self._ITER_FETCH:
+                return
+            after = rows[-1][-1]
+
+    def get_by_token(self, token_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self.conn.execute(_SELECT_CREDENTIAL + "WHERE n.nft_id = ?", (token_id,)).fetchone()
+        return self._to_record(row) if row else None
+
+    def find_by_student(self, student_id: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self.conn.execute(
+                _SELECT_CREDENTIAL + "WHERE m.student_id = ? ORDER BY m.metadata_id", (student_id,)
+            ).fetchall()
+        return [self._to_record(row) for row in rows]
+
+    def find_by_recipient(self, address: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self.conn.execute(
+                _SELECT_CREDENTIAL + "WHERE c.address = ? ORDER BY n.nft_id", (address,)
+            ).fetchall()
+        return [self._to_record(row) for row in rows]
+
+    def list_by_institution(
+        self, institution: str, cursor: Optional[str] = None, limit: int = 50
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Trả về (trang kết quả, cursor của trang sau hoặc None)."""
+        after = int(cursor) if cursor else 0
+        with self._lock:
+            rows = self.conn.execute(
+                _SELECT_CREDENTIAL + "WHERE m.institution = ? AND m.metadata_id > ? ORDER BY m.metadata_id LIMIT ?",
+                (institution, after, limit + 1),
+            ).fetchall()
+        next_cursor = str(rows[limit - 1][-1]) if len(rows) > limit else None
+        return [self._to_record(row) for row in rows[:limit]], next_cursor
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
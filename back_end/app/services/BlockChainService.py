@@ -1,11 +1,35 @@
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
 from ecdsa import SigningKey
 
+from app.core import codec
+from app.core.crypto_utils import verifying_key_cache
 from app.models.BlockChain import BlockChain
 from app.models.Block import Block
 from app.models.BlockHeader import BlockHeader
+from app.models.BlockTemplate import BlockTemplate
+from app.models.BlockTree import BlockTree
 from app.models.Transaction import Transaction
 from app.services.BlockService import BlockService
-from app.services.TransactionService import TransactionService
+from app.services.CredentialIndexService import CredentialIndexService
+from app.services.ExecutionService import ExecutionService
+from app.services.SnapshotService import SnapshotService
+from app.services.TransactionService import TransactionService, DEFAULT_VERIFY_CHUNK_SIZE
+from app.utils import metrics
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_MEMPOOL_ADMITTED = metrics.counter("mempool_admitted_total", "Số transaction được nhận vào mempool")
+_MEMPOOL_REJECTED = metrics.counter("mempool_rejected_total", "Số transaction bị mempool từ chối")
+_MEMPOOL_DEPTH = metrics.gauge("mempool_depth", "Số transaction đang chờ trong mempool")
+_CHAIN_HEIGHT = metrics.gauge("chain_height", "Chiều cao block cuối cùng")
+_BLOCK_APPLY_SECONDS = metrics.histogram("block_apply_seconds", "Thời gian add_block (kiểm tra, thực thi, lưu)")
+_BLOCK_TXS = metrics.counter("block_txs_applied_total", "Số transaction đã thực thi trong các block")
+_FORK_BLOCKS = metrics.counter("fork_blocks_total", "Số block nhận vào nhánh phụ (không phải chain chính)")
+_REORGS = metrics.counter("chain_reorgs_total", "Số lần đổi nhánh")
+_REORG_REVERTED = metrics.counter("reorg_blocks_reverted_total", "Số block bị hoàn tác khi đổi nhánh")
 
 
 class BlockChainService:
@@ -13,6 +37,7 @@ class BlockChainService:
     def create_genesis_block(blockchain: BlockChain, pubkey_hex: str) -> Block:
         blockchain.super_validator_pubkey = pubkey_hex
         blockchain.authority_set.add(pubkey_hex)
+        verifying_key_cache.sync_pinned(blockchain.authority_set)
 
         header = BlockHeader(
             index=0,
@@ -28,24 +53,97 @@ class BlockChainService:
             transactions=[]
         )
 
-        blockchain.chain.append(genesis_block)
+        genesis_block.block_hash = BlockService.calculate_hash(genesis_block)
+        blockchain.append_block(genesis_block)
+        BlockChainService.refill_template(blockchain)
+        if blockchain.block_store is not None:
+            blockchain.block_store.save_block(genesis_block)
         return genesis_block
 
+    @staticmethod
+    def install_genesis(blockchain: BlockChain, genesis_block: Block) -> None:
+        """Dùng genesis có sẵn (vd: nhận từ peer khi đồng bộ lần đầu)."""
+        if blockchain.chain:
+            raise ValueError("chain đã có genesis")
+        pubkey_hex = genesis_block.block_header.validator_pubkey
+        blockchain.super_validator_pubkey = pubkey_hex
+        blockchain.authority_set.add(pubkey_hex)
+        verifying_key_cache.sync_pinned(blockchain.authority_set)
+
+        blockchain.append_block(genesis_block)
+        BlockChainService.refill_template(blockchain)
+        if blockchain.block_store is not None:
+            blockchain.block_store.save_block(genesis_block)
+
     @staticmethod
     def add_transaction_to_mempool(blockchain: BlockChain, tx: Transaction) -> bool:
         if TransactionService.is_valid(tx):
-            blockchain.mempool.append(tx)
-            return True
+            return BlockChainService._admit(blockchain, tx)
         return False
 
     @staticmethod
-    def execute_transaction(blockchain: BlockChain, tx: Transaction) -> bool:
-        payload = tx.payload
-        if payload.get("op") == "set":
-            blockchain.state_db[payload["key"]] = payload["value"]
-            return True
+    def add_transactions_to_mempool(
+        blockchain: BlockChain,
+        txs: Sequence[Transaction],
+        max_workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_VERIFY_CHUNK_SIZE,
+    ) -> List[bool]:
+        """
+        Nhận một lô transaction vào mempool. Chữ ký được kiểm tra song song,
+        kết quả chấp nhận/từ chối trả về theo đúng thứ tự đầu vào.
+        """
+        valid = TransactionService.is_valid_batch(txs, max_workers=max_workers, chunk_size=chunk_size)
+        return [ok and BlockChainService._admit(blockchain, tx) for tx, ok in zip(txs, valid)]
 
-        return False
+    @staticmethod
+    def add_signed_transactions_to_mempool(blockchain: BlockChain, txs: Sequence[Transaction]) -> List[bool]:
+        """
+        Nhận transaction do chính node vừa ký (vd: mint hàng loạt),
+        bỏ qua bước kiểm tra chữ ký.
+        """
+        return [BlockChainService._admit(blockchain, tx) for tx in txs]
+
+    @staticmethod
+    def _admit(blockchain: BlockChain, tx: Transaction) -> bool:
+        """Đưa transaction (đã kiểm tra chữ ký) vào mempool và block template."""
+        # Transaction lớn hơn cả một block, payload sai kiểu hoặc đã nằm trong chain
+        # thì không bao giờ mine được
+        evicted: List[Transaction] = []
+        admitted = not (
+            len(codec.encode_transaction(tx)) > blockchain.max_block_bytes
+            or not ExecutionService.is_well_formed(tx.payload)
+            or blockchain.chain_index.has_tx(tx.tx_id)
+            or not blockchain.mempool.add(tx, evicted)
+        )
+        template = blockchain.block_template
+        if any(old.tx_id in template.tx_ids for old in evicted):
+            template.stale = True
+        if not admitted:
+            _MEMPOOL_REJECTED.inc()
+            return False
+        if not template.stale:
+            template.try_add(tx)
+        _MEMPOOL_ADMITTED.inc()
+        _MEMPOOL_DEPTH.set(len(blockchain.mempool))
+        return True
+
+    @staticmethod
+    def refill_template(blockchain: BlockChain) -> BlockTemplate:
+        """
+        Dựng lại block template từ mempool (theo thứ tự đến), dừng khi đầy.
+        Chi phí tỉ lệ với giới hạn block, không phụ thuộc độ dài mempool.
+        """
+        template = BlockTemplate(blockchain.max_block_txs, blockchain.max_block_bytes)
+        for tx in blockchain.mempool.iter_pending():
+            if not template.try_add(tx):
+                break
+        blockchain.block_template = template
+        return template
+
+    @staticmethod
+    def execute_transaction(blockchain: BlockChain, tx: Transaction) -> bool:
+        effect = ExecutionService.compute_effect(blockchain.state_db, tx)
+        return ExecutionService.apply_effect(blockchain.state_db, effect)
 
     @staticmethod
     def is_valid_new_block(blockchain: BlockChain, new_block: Block, prev_block: Block) -> bool:
@@ -58,6 +156,14 @@ class BlockChainService:
         if new_block.block_header.validator_pubkey not in blockchain.authority_set:
             return False
 
+        # Chữ ký block chỉ phủ merkle_root: phải khớp với transactions thực tế
+        if new_block.block_header.merkle_root != BlockService.calculate_merkle_root(new_block.transactions):
+            return False
+
+        # Không nhận lại transaction đã có trong chain (tra chỉ mục, không quét chain)
+        if any(blockchain.chain_index.has_tx(tx.tx_id) for tx in new_block.transactions):
+            return False
+
         return True
 
     @staticmethod
@@ -67,12 +173,14 @@ class BlockChainService:
 
         prev_block = blockchain.get_last_block()
 
-        merkle_root = BlockService.calculate_merkle_root(blockchain.mempool)
+        template = blockchain.block_template
+        if template.stale or (not template.transactions and len(blockchain.mempool)):
+            template = BlockChainService.refill_template(blockchain)
 
         header = BlockHeader(
             index=prev_block.index + 1,
             pre_hash=prev_block.block_hash,
-            merkle_root=merkle_root,
+            merkle_root=template.merkle_root(),
             validator_pubkey=public_key_hex,
         )
 
@@ -80,21 +188,267 @@ class BlockChainService:
             block_id=f"BLOCK_{header.index}",
             index=header.index,
             block_header=header,
-            transactions=blockchain.mempool.copy()
+            transactions=list(template.transactions)
         )
 
         BlockService.sign_block(block, private_key)
+        block.block_hash = BlockService.calculate_hash(block)
 
         return block
 
     @staticmethod
     def add_block(blockchain: BlockChain, block: Block) -> bool:
+        """
+        Thêm block. Block nối tiếp đỉnh được áp dụng ngay; block rẽ nhánh từ một
+        block đã biết được giữ trong block_tree và chain đổi sang nhánh đó nếu
+        fork choice chọn nó. True nếu block nằm trên chain chính, False nếu chỉ
+        nằm trên nhánh phụ; ValueError nếu block không hợp lệ / không nối được.
+        """
+        if block.block_header.pre_hash != blockchain.get_last_block().block_hash:
+            return BlockChainService._add_fork_block(blockchain, block)
+        with _BLOCK_APPLY_SECONDS.time():
+            BlockChainService._apply_block(blockchain, block)
+        _BLOCK_TXS.inc(len(block.transactions))
+        _CHAIN_HEIGHT.set(block.index)
+        _MEMPOOL_DEPTH.set(len(blockchain.mempool))
+        return True
+
+    @staticmethod
+    def _apply_block(blockchain: BlockChain, block: Block) -> None:
         if not BlockChainService.is_valid_new_block(blockchain, block, blockchain.get_last_block()):
             raise ValueError("invalid block")
 
+        undo: Dict[str, Any] = {}
+        try:
+            results = ExecutionService.execute_block(
+                blockchain.state_db, block.transactions, max_workers=blockchain.execution_workers, undo=undo
+            )
+        except Exception as e:
+            # Không để lại state ghi dở: block thực thi lỗi coi như block không hợp lệ
+            ExecutionService.revert(blockchain.state_db, undo)
+            raise ValueError(f"block execution failed: {e}") from e
+        credentials: List[str] = []
+        if blockchain.credential_index is not None:
+            credentials = CredentialIndexService.index_block(blockchain.credential_index, block, results)
+
+        # Chỉ xoá transaction đã vào block, giữ lại transaction đến sau khi mine
+        blockchain.mempool.remove_included(block.transactions)
+        BlockChainService.refill_template(blockchain)
+        blockchain.append_block(block)
+        BlockChainService._push_undo(blockchain, block, undo, credentials)
+        if blockchain.block_store is not None:
+            blockchain.block_store.save_block(block)
+        # Transaction đã vào chain không đổi nữa: thu gọn để giữ được nhiều block
         for tx in block.transactions:
-            BlockChainService.execute_transaction(blockchain, tx)
+            tx.compact()
+
+        if blockchain.snapshot_dir and blockchain.snapshot_interval >= 1:
+            # Block của snapshot phải có trong store trước khi ghi snapshot
+            if blockchain.block_store is not None and block.index % blockchain.snapshot_interval == 0:
+                blockchain.block_store.flush()
+            SnapshotService.maybe_checkpoint(blockchain, blockchain.snapshot_dir, blockchain.snapshot_interval)
+
+    @staticmethod
+    def _push_undo(blockchain: BlockChain, block: Block, undo: Dict[str, Any], credentials: List[str]) -> None:
+        """Undo log của block vừa vào chain; chỉ giữ max_reorg_depth block cuối."""
+        blockchain.undo_logs.append({"block_hash": block.block_hash, "state": undo, "credentials": credentials})
+        while len(blockchain.undo_logs) > blockchain.max_reorg_depth:
+            blockchain.undo_logs.popleft()
+
+    # ==================== Nhánh / đổi nhánh ====================
+    @staticmethod
+    def _add_fork_block(blockchain: BlockChain, block: Block) -> bool:
+        """Block không nối tiếp đỉnh: giữ trong block_tree, đổi nhánh nếu fork choice chọn nó."""
+        parent_height = blockchain.known_height(block.block_header.pre_hash)
+        if (
+            parent_height is None
+            or block.index != parent_height + 1
+            or block.block_header.validator_pubkey not in blockchain.authority_set
+            or blockchain.known_height(block.block_hash) is not None
+        ):
+            raise ValueError("invalid block")
+
+        tree = blockchain.block_tree
+        tip = blockchain.get_last_block()
+        tree.add(block)
+        try:
+            if not BlockTree.prefers(block, tip):
+                _FORK_BLOCKS.inc()
+                return False
+            BlockChainService.reorg(blockchain, block)
+            return True
+        finally:
+            # Nhánh rẽ sâu hơn undo log thì không bao giờ đổi sang được nữa
+            tree.prune(blockchain.get_last_block().index - blockchain.max_reorg_depth + 1)
+
+    @staticmethod
+    def reorg(blockchain: BlockChain, new_tip: Block) -> Dict[str, Any]:
+        """
+        Đổi chain chính sang nhánh trong block_tree kết thúc ở new_tip: hoàn tác
+        các block từ đỉnh về chỗ rẽ bằng undo log, áp dụng các block của nhánh
+        mới rồi đưa transaction của block bị bỏ (chưa có trong nhánh mới) về lại
+        mempool. Chi phí theo số block đổi, không phụ thuộc độ dài chain.
+        Nhánh mới có block không hợp lệ (ValueError) hoặc lỗi khi áp dụng thì quay
+        lại nhánh cũ rồi báo lại lỗi đó.
+        """
+        tree = blockchain.block_tree
+        branch = tree.branch(new_tip, lambda block_hash: blockchain.chain_index.block_height(block_hash) is not None)
+        if branch is None:
+            raise ValueError("nhánh thiếu block")
+        fork_height = branch[0].index - 1
+        depth = blockchain.get_last_block().index - fork_height
+        if depth > len(blockchain.undo_logs):
+            tree.remove(new_tip.block_hash)
+            raise ValueError(f"đổi nhánh sâu {depth} block, undo log chỉ có {len(blockchain.undo_logs)}")
+
+        start = time.perf_counter()
+        orphaned = BlockChainService._rollback(blockchain, fork_height)
+        applied = 0
+        # Transaction mà các block của nhánh mới đã lấy khỏi mempool
+        taken: List[Transaction] = []
+        try:
+            for block in branch:
+                pending = [tx for tx in block.transactions if tx in blockchain.mempool]
+                BlockChainService._apply_block(blockchain, block)
+                taken.extend(pending)
+                applied += 1
+        except Exception:
+            # Lỗi bất kỳ (không riêng block không hợp lệ) cũng phải quay về nhánh cũ
+            logger.warning(f"Không áp dụng được block {branch[applied].index} của nhánh mới, giữ nhánh cũ")
+            BlockChainService._rollback(blockchain, fork_height)
+            for block in orphaned:
+                BlockChainService._apply_block(blockchain, block)
+            tree.remove_descendants(branch[applied].block_hash)
+            # Trả lại mempool (transaction đã có trong nhánh cũ bị loại qua chain_index)
+            BlockChainService.add_signed_transactions_to_mempool(blockchain, taken)
+            BlockChainService.refill_template(blockchain)
+            raise
 
-        blockchain.mempool.clear()
-        blockchain.chain.append(block)
-        return True
\ No newline at end of file
+        for block in branch:
+            tree.remove(block.block_hash)
+        # Giữ nhánh cũ để có thể đổi lại nếu nó dài ra
+        for block in orphaned:
+            tree.add(block)
+        # Transaction đã có trong nhánh mới bị loại qua chain_index khi nhận lại
+        reinjected = sum(BlockChainService.add_signed_transactions_to_mempool(
+            blockchain, [tx for block in orphaned for tx in block.transactions]
+        ))
+        BlockChainService.refill_template(blockchain)
+
+        _REORGS.inc()
+        _REORG_REVERTED.inc(len(orphaned))
+        _CHAIN_HEIGHT.set(new_tip.index)
+        _MEMPOOL_DEPTH.set(len(blockchain.mempool))
+        report = {
+            "fork_height": fork_height,
+            "reverted_blocks": len(orphaned),
+            "applied_blocks": len(branch),
+            "reinjected_txs": reinjected,
+            "seconds": time.perf_counter() - start,
+        }
+        logger.info(
+            f"Đổi nhánh tại block {fork_height}: bỏ {len(orphaned)} block, áp dụng {len(branch)} block, "
+            f"đưa lại {reinjected} transaction vào mempool"
+        )
+        return report
+
+    @staticmethod
+    def _rollback(blockchain: BlockChain, height: int) -> List[Block]:
+        """Hoàn tác các block cao hơn height bằng undo log; trả về các block đã bỏ (tăng dần)."""
+        removed = []
+        while blockchain.get_last_block().index > height:
+            undo = blockchain.undo_logs.pop()
+            block = blockchain.pop_block()
+            if undo["block_hash"] != block.block_hash:
+                raise RuntimeError(f"undo log không khớp block {block.index}")
+            ExecutionService.revert(blockchain.state_db, undo["state"])
+            if blockchain.credential_index is not None:
+                CredentialIndexService.unindex_block(blockchain.credential_index, undo["credentials"])
+            removed.append(block)
+        if blockchain.block_store is not None:
+            blockchain.block_store.truncate(height)
+        removed.reverse()
+        return removed
+
+    @staticmethod
+    def restore_from_store(blockchain: BlockChain, snapshot_dir: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Khởi động node từ block_store: nạp snapshot hợp lệ mới nhất rồi chỉ
+        chạy lại transaction của các block sau snapshot. Snapshot hỏng hoặc
+        không khớp với block đã lưu sẽ bị bỏ qua để thử bản cũ hơn.
+        """
+        if blockchain.block_store is None:
+            raise ValueError("blockchain chưa có block_store")
+
+        start = time.perf_counter()
+        store = blockchain.block_store
+        snapshot_dir = snapshot_dir or blockchain.snapshot_dir
+
+        snapshot = None
+        for height, path in SnapshotService.list_snapshots(snapshot_dir) if snapshot_dir else []:
+            try:
+                candidate = SnapshotService.load_snapshot(path)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Bỏ qua snapshot hỏng {path.name}: {e}")
+                continue
+            block = store.get_block_by_height(height)
+            if block is None or block.block_hash != candidate["block_hash"]:
+                logger.warning(f"Bỏ qua snapshot {path.name}: không khớp với block đã lưu")
+                continue
+            snapshot = candidate
+            break
+
+        blockchain.reset_blocks()
+        blockchain.state_db = {}
+        if snapshot is not None:
+            blockchain.state_db = snapshot["state_db"]
+            blockchain.authority_set = set(snapshot["authority_set"])
+            blockchain.super_validator_pubkey = snapshot["super_validator_pubkey"]
+        snapshot_height = snapshot["height"] if snapshot is not None else -1
+
+        replayed = 0
+        # Undo log của max_reorg_depth block cuối để vẫn đổi nhánh được sau khi khởi động:
+        # block sau snapshot được chạy lại kèm undo log, block tới snapshot lấy undo log lưu trong snapshot
+        undo_from = store.get_height() - blockchain.max_reorg_depth + 1
+        saved_undo = {entry["block_hash"]: entry for entry in snapshot["undo_logs"]} if snapshot is not None else {}
+        for block in store.iter_blocks(0):
+            if block.index == 0 and snapshot is None:
+                blockchain.super_validator_pubkey = block.block_header.validator_pubkey
+                blockchain.authority_set = {block.block_header.validator_pubkey}
+            in_window = block.index >= undo_from and block.index > 0
+            if block.index > snapshot_height:
+                undo = {} if in_window else None
+                results = ExecutionService.execute_block(blockchain.state_db, block.transactions, undo=undo)
+                replayed += 1
+                blockchain.append_block(block)
+                if undo is not None:
+                    credentials = [r["token_id"] for r in CredentialIndexService.credentials_in_block(block, results)]
+                    BlockChainService._push_undo(blockchain, block, undo, credentials)
+            else:
+                blockchain.append_block(block)
+                entry = saved_undo.get(block.block_hash) if in_window else None
+                if entry is not None:
+                    BlockChainService._push_undo(blockchain, block, entry["state"], entry["credentials"])
+                elif in_window:
+                    # Snapshot cũ không có undo log: không đổi nhánh qua block này được
+                    blockchain.undo_logs.clear()
+            if not isinstance(block.transactions, codec.LazyTransactions):
+                for tx in block.transactions:
+                    tx.compact()
+        # Chỉ mục trên đĩa có thể đi trước store (vd: store bị cắt đuôi khi phục hồi)
+        blockchain.chain_index.truncate(len(blockchain.chain) - 1)
+
+        verifying_key_cache.sync_pinned(blockchain.authority_set)
+        BlockChainService.refill_template(blockchain)
+
+        report = {
+            "snapshot_height": snapshot_height,
+            "replayed_blocks": replayed,
+            "height": blockchain.get_last_block().index if blockchain.chain else -1,
+            "seconds": time.perf_counter() - start,
+        }
+        logger.info(
+            f"Khởi động xong: snapshot tại {report['snapshot_height']}, "
+            f"chạy lại {replayed} block, mất {report['seconds']:.3f}s"
+        )
+        return report
\ No newline at end of file
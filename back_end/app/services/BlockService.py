@@ -1,82 +1,122 @@
 import hashlib
-import json
-from typing import List
+from typing import Collection, List, Optional, Tuple, Union
 from ecdsa import SigningKey, VerifyingKey
 
+from app.core import codec
+from app.core.crypto_utils import verifying_key_cache
+from app.core.merkle import MerkleTree, ProofStep
 from app.models.Block import Block
 from app.models.Transaction import Transaction
+from app.utils import metrics
+
+_MERKLE_SECONDS = metrics.histogram("merkle_root_seconds", "Thời gian tính Merkle root của block")
+_BLOCK_SIGN_SECONDS = metrics.histogram("block_sign_seconds", "Thời gian ký block")
 
 
 class BlockService:
+    # Hash lá Merkle của một transaction (digest nhị phân, được memo)
+    @staticmethod
+    def tx_leaf_hash(tx: Transaction) -> bytes:
+        return codec.transaction_leaf_hash(tx)
+
+    # Dựng Merkle tree từ danh sách transactions
+    @staticmethod
+    def build_merkle_tree(transactions: List[Transaction]) -> MerkleTree:
+        return MerkleTree(BlockService.tx_leaf_hash(tx) for tx in transactions)
+
     # Tính Merkle Root từ danh sách transactions
     @staticmethod
     def calculate_merkle_root(transactions: List[Transaction]) -> str:
         if not transactions:
             return ""
+        with _MERKLE_SECONDS.time():
+            return BlockService.build_merkle_tree(transactions).root_hex()
 
-        tx_hashes = [
-            hashlib.sha256(json.dumps(tx.to_dict()).encode()).hexdigest()
-            for tx in transactions
-        ]
-
-        while len(tx_hashes) > 1:
-            temp = []
-
-            for i in range(0, len(tx_hashes), 2):
-                left = tx_hashes[i]
-                right = tx_hashes[i] if i + 1 >= len(tx_hashes) else tx_hashes[i + 1]
-                combined = left + right
-
-                temp.append(hashlib.sha256(combined.encode()).hexdigest())
-
-            tx_hashes = temp
+    # Inclusion proof cho một transaction trong block (None nếu không có)
+    @staticmethod
+    def get_merkle_proof(block: Block, tx_id: str) -> Optional[Tuple[bytes, List[ProofStep]]]:
+        for position, tx in enumerate(block.transactions):
+            if tx.tx_id == tx_id:
+                tree = BlockService.build_merkle_tree(block.transactions)
+                return tree.leaf(position), tree.proof(position)
+        return None
+
+    # Kiểm tra proof với merkle_root trong header (không cần cả block)
+    @staticmethod
+    def verify_merkle_proof(tx: Transaction, proof: List[ProofStep], merkle_root: str) -> bool:
+        if not merkle_root:
+            return False
+        return MerkleTree.verify_proof(BlockService.tx_leaf_hash(tx), proof, bytes.fromhex(merkle_root))
 
-        return tx_hashes[0]
-    
-    # Lấy data để ký block (không bao gồm signature)
+    # Lấy data để ký block (không bao gồm signature).
+    # Transactions được cam kết qua merkle_root trong header.
     @staticmethod
     def get_signing_data(block: Block) -> bytes:
-        data = {
-            "block_id": block.block_id,
-            "index": block.index,
-            "header": {
-                "index": block.block_header.index,
-                "pre_hash": block.block_header.pre_hash,
-                "merkle_root": block.block_header.merkle_root,
-                "validator_pubkey": block.block_header.validator_pubkey,
-                "timestamp": block.block_header.timestamp,
-            },
-            "transactions": [tx.to_dict() for tx in block.transactions],
-        }
-
-        return json.dumps(data, sort_keys=True).encode()
+        return codec.block_signing_data(block)
+
+    # Dữ liệu ký JSON cũ (chế độ tương thích)
+    @staticmethod
+    def get_legacy_signing_data(block: Block) -> bytes:
+        return codec.legacy_block_signing_data(block)
 
 
     # Tính block_hash bằng SHA256
     @staticmethod
     def calculate_hash(block: Block) -> str:
-        content = BlockService.get_signing_data(block)
-        return hashlib.sha256(content).hexdigest()
+        return codec.block_hash(block).hex()
 
 
     # Ký block bằng ECDSA SECP256k1
     @staticmethod
     def sign_block(block: Block, private_key: SigningKey) -> str:
-        message = BlockService.get_signing_data(block)
-
-        message_hash = hashlib.sha256(message).digest()
-        signature = private_key.sign(message_hash)
+        with _BLOCK_SIGN_SECONDS.time():
+            message_hash = codec.block_hash(block)
+            signature = private_key.sign(message_hash)
         block.validator_signature = signature.hex()
 
         return block.validator_signature
 
+    # Kiểm tra chữ ký validator của block.
+    # public_key có thể là VerifyingKey, pubkey hex, hoặc None (lấy từ header)
     @staticmethod
-    def verify_block(block: Block, public_key: VerifyingKey) -> bool:
-        message = BlockService.get_signing_data(block)
-        message_hash = hashlib.sha256(message).digest()
-
+    def verify_block(block: Block, public_key: Optional[Union[VerifyingKey, str]] = None) -> bool:
         try:
+            if public_key is None:
+                public_key = block.block_header.validator_pubkey
+            if isinstance(public_key, str):
+                public_key = verifying_key_cache.get(public_key)
             signature_bytes = bytes.fromhex(block.validator_signature)
-            return public_key.verify(signature_bytes, message_hash)
-        except:
-            return False
\ No newline at end of file
+        except Exception:
+            return False
+
+        try:
+            return public_key.verify(signature_bytes, codec.block_hash(block))
+        except Exception:
+            pass
+
+        # Block cũ được ký trên dữ liệu JSON (gồm cả transactions)
+        if codec.LEGACY_JSON_COMPAT:
+            try:
+                legacy_hash = hashlib.sha256(BlockService.get_legacy_signing_data(block)).digest()
+                return public_key.verify(signature_bytes, legacy_hash)
+            except Exception:
+                return False
+        return False
+
+    # Kiểm tra header đã ký nối tiếp block (prev_index, prev_hash) mà không cần
+    # transactions; trả về lý do lỗi hoặc None
+    @staticmethod
+    def check_signed_header(
+        header: Block, prev_index: int, prev_hash: str, authority_set: Collection[str]
+    ) -> Optional[str]:
+        if header.index != prev_index + 1 or header.block_header.index != header.index:
+            return "index không liên tiếp"
+        if header.block_header.pre_hash != prev_hash:
+            return "pre_hash không khớp block trước"
+        if BlockService.calculate_hash(header) != header.block_hash:
+            return "block_hash sai"
+        if header.block_header.validator_pubkey not in authority_set:
+            return "validator không thuộc authority set"
+        if not BlockService.verify_block(header):
+            return "chữ ký validator sai"
+        return None
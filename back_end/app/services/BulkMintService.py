@@ -0,0 +1,284 @@
+"""
+Mint văn bằng NFT hàng loạt từ danh sách tốt nghiệp (CSV hoặc JSON lines).
+
+Mỗi lô: bỏ qua văn bằng đã mint -> ký song song (mỗi worker parse key một lần)
+-> đưa vào mempool -> mine thành các block theo giới hạn max_block_txs /
+max_block_bytes -> ghi block_store một lần -> ghi checkpoint.
+
+token_id được suy ra cố định từ (issuer, student_id, issued_at, địa chỉ người
+nhận), state_db là nguồn sự thật: chạy lại sau khi crash không mint trùng.
+
+Cách chạy (từ thư mục back_end):
+    python -m app.services.BulkMintService graduates.csv --key issuer.key --db NCKH_educhain.db \
+        --checkpoint mint.ckpt --workers 4
+"""
+import argparse
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from ecdsa import SigningKey, SECP256k1
+
+from app.core import codec
+from app.models.BlockChain import BlockChain
+from app.models.Client import client
+from app.models.NFT import NFT
+from app.models.NFTmetadata import NFTmetadata
+from app.models.Transaction import Transaction
+from app.services.BlockChainService import BlockChainService
+from app.services.ExecutionService import NFT_KEY_PREFIX
+from app.services.NFTService import NFTService
+from app.services.TransactionService import TransactionService
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_BATCH_SIZE = 2_000
+DEFAULT_SIGN_CHUNK_SIZE = 250
+
+_METADATA_FIELDS = ("student_id", "degree_type", "pdf_url", "pdf_hash", "institution", "issued_at")
+
+# Key của issuer trong worker process, parse một lần khi khởi tạo worker
+_worker_sk: Optional[SigningKey] = None
+
+
+def _init_signer(private_key: bytes) -> None:
+    global _worker_sk
+    _worker_sk = SigningKey.from_string(private_key, curve=SECP256k1)
+
+
+def build_nft(row: Dict[str, Any], issuer_pubkey: str) -> NFT:
+    metadata = NFTmetadata(**{field: row.get(field) for field in _METADATA_FIELDS})
+    recipient = client(
+        pubkey=row.get("recipient_pubkey", ""),
+        address=row["recipient_address"],
+        client_id=row.get("client_id") or row["recipient_address"],
+    )
+    return NFT(issuer_pubkey, metadata, recipient)
+
+
+def _sign_rows(
+    rows: List[Dict[str, Any]], issuer_pubkey: str, issuer_address: str, sk: Optional[SigningKey] = None
+) -> List[bytes]:
+    """Dựng và ký transaction mint cho một chunk; trả về bản mã hoá (gửi qua pipe gọn)."""
+    sk = sk or _worker_sk
+    encoded = []
+    for row in rows:
+        tx = NFTService.build_mint_transaction(build_nft(row, issuer_pubkey), issuer_address)
+        TransactionService.sign_with_key(tx, sk)
+        encoded.append(codec.encode_transaction(tx))
+    return encoded
+
+
+class BulkMintService:
+    # Đọc danh sách tốt nghiệp: .csv có dòng tiêu đề, còn lại là JSON lines
+    @staticmethod
+    def load_graduates(path: str) -> List[Dict[str, Any]]:
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            if path.lower().endswith(".csv"):
+                rows = [dict(row) for row in csv.DictReader(f)]
+            else:
+                rows = [json.loads(line) for line in f if line.strip()]
+
+        for number, row in enumerate(rows, start=1):
+            # issued_at thiếu thì NFTmetadata lấy giờ hiện tại -> token_id đổi mỗi lần chạy
+            if not row.get("issued_at") or not row.get("student_id") or not row.get("recipient_address"):
+                raise ValueError(f"dòng {number}: thiếu student_id / issued_at / recipient_address")
+            if isinstance(row["issued_at"], str) and row["issued_at"].isdigit():
+                row["issued_at"] = int(row["issued_at"])
+        return rows
+
+    @staticmethod
+    def load_checkpoint(checkpoint_path: Optional[str]) -> int:
+        """Số dòng đầu đã xử lý xong (0 nếu chưa có checkpoint)."""
+        if not checkpoint_path or not os.path.exists(checkpoint_path):
+            return 0
+        with open(checkpoint_path, "r", encoding="utf-8") as f:
+            return int(json.load(f)["next_row"])
+
+    @staticmethod
+    def save_checkpoint(checkpoint_path: str, next_row: int, height: int) -> None:
+        path = Path(checkpoint_path)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"next_row": next_row, "height": height}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _sign_batch(
+        rows: List[Dict[str, Any]],
+        sk: SigningKey,
+        issuer_pubkey: str,
+        issuer_address: str,
+        pool: Optional[ProcessPoolExecutor],
+        chunk_size: int,
+    ) -> List[Transaction]:
+        if pool is None:
+            return [codec.decode_transaction(data) for data in _sign_rows(rows, issuer_pubkey, issuer_address, sk)]
+        chunks = [rows[i:i + chunk_size] for i in range(0, len(rows), chunk_size)]
+        futures = [pool.submit(_sign_rows, chunk, issuer_pubkey, issuer_address) for chunk in chunks]
+        return [codec.decode_transaction(data) for future in futures for data in future.result()]
+
+    @staticmethod
+    def _mine_pending(blockchain: BlockChain, validator_sk: SigningKey, validator_pubkey: str) -> int:
+        blocks = 0
+        while len(blockchain.mempool):
+            block = BlockChainService.mine_block(blockchain, validator_sk, validator_pubkey)
+            if not block.transactions:
+                break
+            BlockChainService.add_block(blockchain, block)
+            blocks += 1
+        return blocks
+
+    @staticmethod
+    def _admit_and_mine(
+        blockchain: BlockChain, txs: List[Transaction], validator_sk: SigningKey, validator_pubkey: str
+    ) -> int:
+        """
+        Đưa txs vào mempool theo từng phần vừa giới hạn max_count / max_per_sender
+        (vượt giới hạn thì mempool từ chối hoặc bỏ transaction cũ), mine hết sau mỗi phần.
+        """
+        mempool = blockchain.mempool
+        step = max(1, min(mempool.max_count, mempool.max_per_sender))
+        blocks = 0
+        for i in range(0, len(txs), step):
+            BlockChainService.add_signed_transactions_to_mempool(blockchain, txs[i:i + step])
+            blocks += BulkMintService._mine_pending(blockchain, validator_sk, validator_pubkey)
+        return blocks
+
+    @staticmethod
+    def run(
+        blockchain: BlockChain,
+        rows: Sequence[Dict[str, Any]],
+        issuer_sk: SigningKey,
+        issuer_address: str = "",
+        validator_sk: Optional[SigningKey] = None,
+        checkpoint_path: Optional[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_SIGN_CHUNK_SIZE,
+    ) -> Dict[str, Any]:
+        """
+        Mint toàn bộ `rows` lên `blockchain` (issuer mặc định cũng là validator).
+
+        Returns:
+            {"rows", "minted", "skipped", "failed", "blocks", "start_row", "seconds", "mints_per_s"}
+            Lô có văn bằng không lên được chain thì dừng, checkpoint không đi qua lô đó.
+        """
+        started = time.perf_counter()
+        issuer_pubkey = issuer_sk.get_verifying_key().to_string().hex()
+        validator_sk = validator_sk or issuer_sk
+        validator_pubkey = validator_sk.get_verifying_key().to_string().hex()
+
+        start_row = BulkMintService.load_checkpoint(checkpoint_path)
+        workers = max_workers or os.cpu_count() or 1
+        pool = (
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_signer, initargs=(issuer_sk.to_string(),))
+            if workers > 1 else None
+        )
+
+        minted = skipped = failed = blocks = 0
+        try:
+            for batch_start in range(start_row, len(rows), batch_size):
+                batch = rows[batch_start:batch_start + batch_size]
+                # Văn bằng đã có trên chain (vd: crash sau khi lưu block, trước khi ghi checkpoint)
+                # hoặc trùng với một dòng trước đó trong lô
+                pending = []
+                keys = set()
+                for row in batch:
+                    key = NFT_KEY_PREFIX + build_nft(row, issuer_pubkey).token_id
+                    if key in blockchain.state_db or key in keys:
+                        skipped += 1
+                    else:
+                        keys.add(key)
+                        pending.append(row)
+
+                txs = BulkMintService._sign_batch(pending, issuer_sk, issuer_pubkey, issuer_address, pool, chunk_size)
+                blocks += BulkMintService._admit_and_mine(blockchain, txs, validator_sk, validator_pubkey)
+                # Chỉ đếm văn bằng thực sự có trong state sau khi mine
+                batch_minted = sum(1 for key in keys if key in blockchain.state_db)
+                minted += batch_minted
+
+                # Block của lô phải nằm trên đĩa trước khi checkpoint đi qua lô đó
+                if blockchain.block_store is not None:
+                    blockchain.block_store.flush()
+                if batch_minted < len(keys):
+                    failed += len(keys) - batch_minted
+                    logger.error(
+                        f"{len(keys) - batch_minted} văn bằng của lô từ dòng {batch_start} không lên được chain; "
+                        f"dừng, checkpoint giữ ở dòng {batch_start}"
+                    )
+                    break
+                next_row = batch_start + len(batch)
+                if checkpoint_path:
+                    BulkMintService.save_checkpoint(checkpoint_path, next_row, blockchain.get_last_block().index)
+                logger.info(f"Đã xử lý {next_row}/{len(rows)} dòng, {minted} văn bằng mới")
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True)
+
+        elapsed = time.perf_counter() - started
+        return {
+            "rows": len(rows),
+            "start_row": start_row,
+            "minted": minted,
+            "skipped": skipped,
+            "failed": failed,
+            "blocks": blocks,
+            "seconds": elapsed,
+            "mints_per_s": minted / elapsed if elapsed > 0 else 0.0,
+        }
+
+
+def main() -> None:
+    from app.repositories.BlockRepository import BlockRepository
+
+    parser = argparse.ArgumentParser(description="Mint văn bằng NFT hàng loạt")
+    parser.add_argument("graduates", help="File CSV / JSONL danh sách tốt nghiệp")
+    parser.add_argument("--key", required=True, help="File chứa private key (hex) của issuer")
+    parser.add_argument("--issuer-address", default="")
+    parser.add_argument("--db", default="NCKH_educhain.db")
+    parser.add_argument("--checkpoint", default=None)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    with open(args.key, "r", encoding="utf-8") as f:
+        issuer_sk = SigningKey.from_string(bytes.fromhex(f.read().strip()), curve=SECP256k1)
+    issuer_pubkey = issuer_sk.get_verifying_key().to_string().hex()
+
+    blockchain = BlockChain()
+    blockchain.block_store = BlockRepository(args.db, group_commit=64)
+    try:
+        if blockchain.block_store.get_height() >= 0:
+            BlockChainService.restore_from_store(blockchain)
+        else:
+            BlockChainService.create_genesis_block(blockchain, issuer_pubkey)
+
+        report = BulkMintService.run(
+            blockchain,
+            BulkMintService.load_graduates(args.graduates),
+            issuer_sk,
+            issuer_address=args.issuer_address,
+            checkpoint_path=args.checkpoint,
+            batch_size=args.batch_size,
+            max_workers=args.workers,
+        )
+    finally:
+        blockchain.block_store.close()
+
+    logger.info(
+        f"Mint xong {report['minted']} văn bằng ({report['skipped']} đã có, {report['failed']} lỗi) "
+        f"trong {report['blocks']} block, "
+        f"{report['seconds']:.1f}s, {report['mints_per_s']:.1f} mints/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
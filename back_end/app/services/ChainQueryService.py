@@ -0,0 +1,103 @@
+import json
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.models.Block import Block
+from app.models.BlockChain import BlockChain
+from app.models.Transaction import Transaction
+
+# Block sâu hơn số block này tính từ đỉnh chain được coi là đã chốt (không đổi nữa)
+DEFAULT_FINALITY_DEPTH = 6
+DEFAULT_RESPONSE_CACHE_SIZE = 4096
+
+
+class ChainQueryService:
+    """
+    Truy vấn chỉ đọc trên chain cho API.
+
+    - Tra block theo hash và transaction theo tx_id qua blockchain.chain_index
+      (cập nhật ngay trong add_block), không quét chain.
+    - JSON của block đã chốt không bao giờ đổi nên được cache (LRU) theo block_hash.
+    """
+
+    def __init__(
+        self,
+        blockchain: BlockChain,
+        finality_depth: int = DEFAULT_FINALITY_DEPTH,
+        cache_size: int = DEFAULT_RESPONSE_CACHE_SIZE,
+    ):
+        self.blockchain = blockchain
+        self.finality_depth = finality_depth
+        self.cache_size = cache_size
+        self._json_cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    # ==================== Block ====================
+    def height(self) -> int:
+        return len(self.blockchain.chain) - 1
+
+    def head(self) -> Optional[Dict[str, Any]]:
+        if not self.blockchain.chain:
+            return None
+        block = self.blockchain.get_last_block()
+        return {
+            "height": block.index,
+            "block_hash": block.block_hash,
+            "timestamp": block.block_header.timestamp,
+            "finalized_height": max(block.index - self.finality_depth, -1),
+            "tx_count": len(block.transactions),
+        }
+
+    def is_finalized(self, height: int) -> bool:
+        return 0 <= height <= self.height() - self.finality_depth
+
+    def block_by_height(self, height: int) -> Optional[Block]:
+        if 0 <= height < len(self.blockchain.chain):
+            return self.blockchain.chain[height]
+        return None
+
+    def block_by_hash(self, block_hash: str) -> Optional[Block]:
+        height = self.blockchain.chain_index.block_height(block_hash)
+        return self.block_by_height(height) if height is not None else None
+
+    def block_json(self, block: Block) -> bytes:
+        """JSON của block; block đã chốt được lấy từ cache."""
+        finalized = self.is_finalized(block.index)
+        if finalized:
+            data = self._json_cache.get(block.block_hash)
+            if data is not None:
+                self._json_cache.move_to_end(block.block_hash)
+                self.cache_hits += 1
+                return data
+            self.cache_misses += 1
+
+        data = json.dumps(block.to_dict(), separators=(",", ":")).encode("utf-8")
+        if finalized:
+            self._json_cache[block.block_hash] = data
+            if len(self._json_cache) > self.cache_size:
+                self._json_cache.popitem(last=False)
+        return data
+
+    def list_blocks(self, cursor: Optional[str] = None, limit: int = 20) -> Tuple[List[Block], Optional[str]]:
+        """Duyệt block từ mới đến cũ; cursor là chiều cao block kế tiếp cần trả."""
+        # Cursor vượt quá đỉnh chain (vd: sau khi đổi nhánh ngắn hơn) bắt đầu từ đỉnh
+        start = min(int(cursor), self.height()) if cursor else self.height()
+        stop = max(start - limit, -1)
+        blocks = [self.blockchain.chain[h] for h in range(start, stop, -1)]
+        return blocks, (str(stop) if stop >= 0 else None)
+
+    def iter_range(self, start: int, end: int) -> Iterator[Block]:
+        """Duyệt block trong [start, end] (đã cắt theo chiều cao hiện tại)."""
+        end = min(end, self.height())
+        for height in range(max(start, 0), end + 1):
+            yield self.blockchain.chain[height]
+
+    # ==================== Transaction ====================
+    def transaction(self, tx_id: str) -> Optional[Tuple[Transaction, int, int]]:
+        """(transaction, height, position) hoặc None."""
+        location = self.blockchain.chain_index.tx_location(tx_id)
+        if location is None:
+            return None
+        height, position = location
+        return self.blockchain.chain[height].transactions[position], height, position
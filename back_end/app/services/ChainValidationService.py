@@ -0,0 +1,253 @@
+"""
+Kiểm tra toàn bộ chain: block_hash, Merkle root, chữ ký validator,
+chữ ký từng transaction và liên kết pre_hash.
+
+Các đoạn (chunk) block được kiểm tra độc lập trên process pool, sau đó
+nối các đoạn lại bằng cách kiểm tra liên kết hash ở ranh giới.
+
+Cách chạy (từ thư mục back_end):
+    python -m app.services.ChainValidationService --db NCKH_educhain.db --workers 4
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from app.core import codec
+from app.core.crypto_utils import verifying_key_cache
+from app.models.Block import Block
+from app.repositories.BlockRepository import BlockRepository
+from app.services.BlockService import BlockService
+from app.services.TransactionService import TransactionService
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_VALIDATION_CHUNK_SIZE = 500
+
+# progress(số block đã kiểm tra, tổng số block)
+ProgressCallback = Callable[[int, int], None]
+
+
+def _check_block(block: Block, authority_set: Sequence[str]) -> Optional[str]:
+    """Kiểm tra một block độc lập; trả về lý do lỗi hoặc None."""
+    if block.block_header.index != block.index:
+        return "header index không khớp"
+    if BlockService.calculate_hash(block) != block.block_hash:
+        return "block_hash sai"
+    if block.block_header.merkle_root != BlockService.calculate_merkle_root(block.transactions):
+        return "merkle_root sai"
+
+    # Genesis không có chữ ký validator
+    if block.index > 0:
+        if block.block_header.validator_pubkey not in authority_set:
+            return "validator không thuộc authority set"
+        if not BlockService.verify_block(block):
+            return "chữ ký validator sai"
+
+    for position, tx in enumerate(block.transactions):
+        if not TransactionService.is_valid(tx):
+            return f"chữ ký transaction #{position} ({tx.tx_id}) sai"
+    return None
+
+
+def _check_blocks(blocks: Iterable[Block], authority_set: Sequence[str]) -> Dict[str, Any]:
+    """Kiểm tra một đoạn block liên tiếp (chạy trong worker)."""
+    verifying_key_cache.sync_pinned(authority_set)
+
+    result: Dict[str, Any] = {
+        "first_index": None,
+        "first_pre_hash": None,
+        "last_index": None,
+        "last_hash": None,
+        "count": 0,
+        "failure": None,
+    }
+    prev: Optional[Block] = None
+    for block in blocks:
+        if prev is None:
+            result["first_index"] = block.index
+            result["first_pre_hash"] = block.block_header.pre_hash
+        else:
+            if block.index != prev.index + 1:
+                result["failure"] = (block.index, "index không liên tiếp")
+                break
+            if block.block_header.pre_hash != prev.block_hash:
+                result["failure"] = (block.index, "pre_hash không khớp block trước")
+                break
+
+        reason = _check_block(block, authority_set)
+        if reason is not None:
+            result["failure"] = (block.index, reason)
+            break
+
+        result["count"] += 1
+        result["last_index"] = block.index
+        result["last_hash"] = block.block_hash
+        prev = block
+    return result
+
+
+def _check_encoded_chunk(encoded_blocks: List[bytes], authority_set: List[str]) -> Dict[str, Any]:
+    return _check_blocks((codec.decode_block(data) for data in encoded_blocks), authority_set)
+
+
+def _check_store_range(db_path: str, start: int, end: int, authority_set: List[str]) -> Dict[str, Any]:
+    # Mỗi worker tự đọc đoạn của mình từ SQLite, không phải gửi block qua pipe
+    repo = BlockRepository(db_path, read_only=True)
+    try:
+        return _check_blocks(repo.iter_blocks(start, end), authority_set)
+    finally:
+        repo.close()
+
+
+class ChainValidationService:
+    @staticmethod
+    def _stitch(
+        results: List[Dict[str, Any]], total: int, started: float
+    ) -> Dict[str, Any]:
+        """Ghép kết quả các đoạn theo thứ tự, kiểm tra liên kết ở ranh giới."""
+        failure = None
+        prev = None
+        for result in results:
+            if result["first_index"] is not None:
+                if prev is None and result["first_index"] != 0:
+                    failure = (result["first_index"], "chain không bắt đầu từ genesis")
+                elif prev is not None and result["first_index"] != prev["last_index"] + 1:
+                    failure = (result["first_index"], "index không liên tiếp")
+                elif prev is not None and result["first_pre_hash"] != prev["last_hash"]:
+                    failure = (result["first_index"], "pre_hash không khớp block trước")
+            if failure is None and result["failure"] is not None:
+                failure = result["failure"]
+            if failure is not None:
+                break
+            if result["last_index"] is not None:
+                prev = result
+
+        elapsed = time.perf_counter() - started
+        return {
+            "ok": failure is None,
+            "blocks": total,
+            "first_failing_height": failure[0] if failure else None,
+            "reason": failure[1] if failure else None,
+            "seconds": elapsed,
+            "blocks_per_s": total / elapsed if elapsed > 0 else float("inf"),
+        }
+
+    @staticmethod
+    def _run(
+        jobs: List[tuple],
+        job_sizes: List[int],
+        inline: Callable[..., Dict[str, Any]],
+        max_workers: int,
+        progress: Optional[ProgressCallback],
+    ) -> List[Dict[str, Any]]:
+        total = sum(job_sizes)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+        done = 0
+
+        if max_workers <= 1 or len(jobs) <= 1:
+            for i, job in enumerate(jobs):
+                results[i] = inline(*job)
+                done += job_sizes[i]
+                if progress:
+                    progress(done, total)
+            return results
+
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = {pool.submit(inline, *job): i for i, job in enumerate(jobs)}
+            for future in as_completed(futures):
+                i = futures[future]
+                results[i] = future.result()
+                done += job_sizes[i]
+                if progress:
+                    progress(done, total)
+        return results
+
+    # Kiểm tra danh sách block trong bộ nhớ (vd: chain nhận từ peer)
+    @staticmethod
+    def validate_blocks(
+        blocks: Sequence[Block],
+        authority_set: Optional[Iterable[str]] = None,
+        max_workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_VALIDATION_CHUNK_SIZE,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Dict[str, Any]:
+        started = time.perf_counter()
+        if not blocks:
+            return ChainValidationService._stitch([], 0, started)
+
+        authority = sorted(authority_set) if authority_set is not None else [blocks[0].block_header.validator_pubkey]
+        workers = max_workers or os.cpu_count() or 1
+
+        if workers <= 1 or len(blocks) <= chunk_size:
+            jobs = [(blocks[i:i + chunk_size], authority) for i in range(0, len(blocks), chunk_size)]
+            inline = _check_blocks
+        else:
+            jobs = [
+                ([codec.encode_block(b) for b in blocks[i:i + chunk_size]], authority)
+                for i in range(0, len(blocks), chunk_size)
+            ]
+            inline = _check_encoded_chunk
+        sizes = [len(job[0]) for job in jobs]
+
+        results = ChainValidationService._run(jobs, sizes, inline, workers, progress)
+        return ChainValidationService._stitch(results, len(blocks), started)
+
+    # Kiểm tra toàn bộ chain đã lưu trong SQLite
+    @staticmethod
+    def validate_store(
+        db_path: str,
+        authority_set: Optional[Iterable[str]] = None,
+        max_workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_VALIDATION_CHUNK_SIZE,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Dict[str, Any]:
+        started = time.perf_counter()
+        repo = BlockRepository(db_path, read_only=True)
+        try:
+            height = repo.get_height()
+            genesis = repo.get_block_by_height(0) if height >= 0 else None
+        finally:
+            repo.close()
+        if genesis is None:
+            return ChainValidationService._stitch([], 0, started)
+
+        authority = sorted(authority_set) if authority_set is not None else [genesis.block_header.validator_pubkey]
+        jobs = [
+            (db_path, start, min(start + chunk_size - 1, height), authority)
+            for start in range(0, height + 1, chunk_size)
+        ]
+        sizes = [end - start + 1 for _, start, end, _ in jobs]
+
+        results = ChainValidationService._run(
+            jobs, sizes, _check_store_range, max_workers or os.cpu_count() or 1, progress
+        )
+        return ChainValidationService._stitch(results, height + 1, started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Kiểm tra toàn bộ chain đã lưu")
+    parser.add_argument("--db", default="NCKH_educhain.db")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_VALIDATION_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    def progress(done: int, total: int) -> None:
+        logger.info(f"Đã kiểm tra {done}/{total} block")
+
+    report = ChainValidationService.validate_store(
+        args.db, max_workers=args.workers, chunk_size=args.chunk_size, progress=progress
+    )
+    if report["ok"]:
+        logger.info(f"Chain hợp lệ: {report['blocks']} block, {report['blocks_per_s']:.1f} blocks/s")
+    else:
+        logger.error(
+            f"Chain không hợp lệ tại block {report['first_failing_height']}: {report['reason']} "
+            f"({report['blocks_per_s']:.1f} blocks/s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+from typing import Any, Dict, List, Optional, Sequence
+
+from app.models.Block import Block
+from app.services.NFTService import NFTService
+
+
+class CredentialIndexService:
+    # Bản ghi văn bằng của các transaction mint thành công trong block
+    @staticmethod
+    def credentials_in_block(block: Block, results: Optional[Sequence[bool]] = None) -> List[Dict[str, Any]]:
+        records = []
+        for position, tx in enumerate(block.transactions):
+            if results is not None and not results[position]:
+                continue
+            payload = NFTService.mint_payload(tx)
+            if payload is None:
+                continue
+            # Không có kết quả thực thi (dựng lại chỉ mục): tự loại mint giả mạo
+            if results is None and not NFTService.is_authorized_mint(tx, payload):
+                continue
+            records.append(NFTService.credential_record(tx, block.index, payload))
+        return records
+
+    # Cập nhật chỉ mục khi có block mới (gọi từ add_block); trả về token_id đã thêm
+    @staticmethod
+    def index_block(index, block: Block, results: Optional[Sequence[bool]] = None) -> List[str]:
+        records = CredentialIndexService.credentials_in_block(block, results)
+        if records:
+            index.add_many(records)
+        return [record["token_id"] for record in records]
+
+    # Gỡ văn bằng của block bị huỷ khi đổi nhánh (token_id lấy từ undo log)
+    @staticmethod
+    def unindex_block(index, token_ids: Sequence[str]) -> int:
+        if token_ids:
+            index.remove_many(token_ids)
+        return len(token_ids)
+
+    # Dựng lại chỉ mục từ block store (vd: khi bật chỉ mục trên node đã chạy)
+    @staticmethod
+    def rebuild(index, block_store, start: int = 0) -> int:
+        count = 0
+        for block in block_store.iter_blocks(start):
+            count += len(CredentialIndexService.index_block(index, block))
+        return count
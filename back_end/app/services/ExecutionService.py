@@ -0,0 +1,303 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, Optional, Tuple
+
+from app.models.NFT import NFT
+from app.models.Transaction import Transaction
+
+# Kết quả thực thi một transaction: (thành công?, các key được ghi -> giá trị mới)
+Effect = Tuple[bool, Dict[str, Any]]
+# Tập key đọc / ghi của một transaction
+AccessSets = Tuple[FrozenSet[str], FrozenSet[str]]
+
+_EMPTY: FrozenSet[str] = frozenset()
+
+# Giá trị trong undo log: key chưa có trong state trước block
+ABSENT = object()
+
+
+# ==================== Các op được hỗ trợ ====================
+def _set_valid(payload: Dict[str, Any]) -> bool:
+    return isinstance(payload.get("key"), str) and "value" in payload
+
+
+def _set_access(payload: Dict[str, Any]) -> AccessSets:
+    return _EMPTY, frozenset((payload["key"],))
+
+
+def _set_effect(state: Mapping[str, Any], tx: Transaction, payload: Dict[str, Any]) -> Effect:
+    if not _set_valid(payload):
+        return False, {}
+    return True, {payload["key"]: payload["value"]}
+
+
+def _set_apply(state: Dict[str, Any], tx: Transaction, payload: Dict[str, Any], undo: Optional[Dict[str, Any]]) -> bool:
+    if not _set_valid(payload):
+        return False
+    key = payload["key"]
+    if undo is not None and key not in undo:
+        undo[key] = state.get(key, ABSENT)
+    state[key] = payload["value"]
+    return True
+
+
+# Key trong state_db của NFT đã mint
+NFT_KEY_PREFIX = "nft:"
+
+
+def _mint_valid(payload: Dict[str, Any]) -> bool:
+    # Kiểm tra kiểu trước khi ghép key: token_id không phải chuỗi làm hỏng cả block
+    return isinstance(payload.get("token_id"), str) and isinstance(payload.get("nft"), dict)
+
+
+def _mint_access(payload: Dict[str, Any]) -> AccessSets:
+    key = frozenset((NFT_KEY_PREFIX + payload["token_id"],))
+    return key, key
+
+
+def is_authorized_mint(tx: Transaction, payload: Dict[str, Any]) -> bool:
+    """
+    Mint hợp lệ về nội dung: người ký transaction chính là issuer của NFT và
+    token_id khớp với giá trị tính lại từ issuer, sinh viên, ngày cấp, người nhận.
+    """
+    nft = payload.get("nft")
+    if not isinstance(nft, dict):
+        return False
+    token_id = payload.get("token_id")
+    return (
+        bool(tx.sender_pubkey)
+        and nft.get("issuer_pubkey") == tx.sender_pubkey
+        and nft.get("token_id") == token_id
+        and NFT.token_id_of(nft) == token_id
+    )
+
+
+def _mint_effect(state: Mapping[str, Any], tx: Transaction, payload: Dict[str, Any]) -> Effect:
+    if not _mint_valid(payload):
+        return False, {}
+    key = NFT_KEY_PREFIX + payload["token_id"]
+    # Không mint lại token đã tồn tại, không mint thay issuer khác
+    if key in state or not is_authorized_mint(tx, payload):
+        return False, {}
+    return True, {key: payload["nft"]}
+
+
+def _mint_apply(state: Dict[str, Any], tx: Transaction, payload: Dict[str, Any], undo: Optional[Dict[str, Any]]) -> bool:
+    ok, writes = _mint_effect(state, tx, payload)
+    if ok:
+        key, = writes
+        if undo is not None and key not in undo:
+            undo[key] = ABSENT
+        state[key] = writes[key]
+    return ok
+
+
+ValidFn = Callable[[Dict[str, Any]], bool]
+AccessFn = Callable[[Dict[str, Any]], AccessSets]
+EffectFn = Callable[[Mapping[str, Any], Transaction, Dict[str, Any]], Effect]
+ApplyFn = Callable[[Dict[str, Any], Transaction, Dict[str, Any], Optional[Dict[str, Any]]], bool]
+
+# op -> (hàm lấy tập đọc/ghi, hàm tính kết quả trên state chỉ đọc,
+#        hàm ghi thẳng vào state khi chạy tuần tự, hàm kiểm tra kiểu payload)
+_OPS: Dict[str, Tuple[AccessFn, EffectFn, ApplyFn, ValidFn]] = {
+    "set": (_set_access, _set_effect, _set_apply, _set_valid),
+    "mint_nft": (_mint_access, _mint_effect, _mint_apply, _mint_valid),
+}
+
+# Op mà phần tính kết quả nhả GIL (băm, kiểm tra chữ ký trong C...): chỉ block
+# gồm toàn các op này mới đáng chạy theo wave trên thread. Các op hiện tại chỉ
+# thao tác dict nên chạy song song luôn chậm hơn tuần tự.
+GIL_RELEASING_OPS: FrozenSet[str] = frozenset()
+
+
+class ExecutionService:
+    """
+    Thực thi transaction của block theo "wave":
+    - Mỗi transaction có tập key đọc/ghi suy ra từ payload.
+    - Transaction không xung đột được xếp cùng wave và tính kết quả song song
+      trên state chỉ đọc; kết quả được ghi vào state theo đúng thứ tự block.
+    - Transaction không phân tích được (op lạ, payload lỗi) là "rào chắn":
+      chạy tuần tự, các wave sau nó bắt đầu lại từ đầu.
+    State cuối cùng luôn giống hệt chạy tuần tự. Wave chỉ được dùng khi mọi
+    op của block nằm trong GIL_RELEASING_OPS; ngoài ra block chạy tuần tự.
+
+    Truyền `undo` (dict rỗng) để ghi lại giá trị cũ của mọi key bị ghi;
+    revert() dùng nó hoàn tác block, chi phí theo số key block đã ghi.
+    """
+
+    @staticmethod
+    def is_well_formed(payload: Any) -> bool:
+        """
+        Payload là dict và đúng kiểu cho op của nó (kiểm tra khi nhận vào mempool).
+        Không có op hoặc op lạ vẫn được nhận: chỉ thất bại khi thực thi.
+        """
+        if not isinstance(payload, dict):
+            return False
+        op = payload.get("op")
+        if op is None:
+            return True
+        if not isinstance(op, str):
+            return False
+        spec = _OPS.get(op)
+        return spec is None or spec[3](payload)
+
+    @staticmethod
+    def access_sets(tx: Transaction) -> Optional[AccessSets]:
+        """Tập key đọc/ghi; None nếu không phân tích được (chạy tuần tự)."""
+        payload = tx.payload
+        try:
+            op = _OPS.get(payload.get("op")) if isinstance(payload, dict) else None
+            if op is None:
+                return None
+            return op[0](payload)
+        except (KeyError, TypeError):
+            return None
+
+    @staticmethod
+    def compute_effect(state: Mapping[str, Any], tx: Transaction) -> Effect:
+        """Tính kết quả của transaction mà không sửa state (payload hỏng: thất bại)."""
+        try:
+            payload = tx.payload
+            op = _OPS.get(payload.get("op"))
+            if op is None:
+                return False, {}
+            return op[1](state, tx, payload)
+        except Exception:
+            return False, {}
+
+    @staticmethod
+    def apply_effect(state: Dict[str, Any], effect: Effect, undo: Optional[Dict[str, Any]] = None) -> bool:
+        ok, writes = effect
+        if undo is not None:
+            for key in writes:
+                # Chỉ giữ giá trị trước lần ghi đầu tiên trong block
+                if key not in undo:
+                    undo[key] = state.get(key, ABSENT)
+        state.update(writes)
+        return ok
+
+    @staticmethod
+    def revert(state: Dict[str, Any], undo: Dict[str, Any]) -> None:
+        """Hoàn tác các ghi đã lưu trong undo log."""
+        for key, value in undo.items():
+            if value is ABSENT:
+                state.pop(key, None)
+            else:
+                state[key] = value
+
+    @staticmethod
+    def schedule(transactions: List[Transaction]) -> List[List[int]]:
+        """
+        Chia transaction thành các nhóm chạy theo thứ tự. Mỗi nhóm là một wave
+        (các transaction không xung đột) hoặc một transaction rào chắn đứng riêng.
+        """
+        groups: List[List[int]] = []
+        waves: List[List[int]] = []
+        last_write: Dict[str, int] = {}
+        last_read: Dict[str, int] = {}
+
+        for i, tx in enumerate(transactions):
+            sets = ExecutionService.access_sets(tx)
+            if sets is None:
+                groups.extend(waves)
+                groups.append([i])
+                waves, last_write, last_read = [], {}, {}
+                continue
+
+            reads, writes = sets
+            wave = 0
+            for key in reads:
+                wave = max(wave, last_write.get(key, -1) + 1)
+            for key in writes:
+                wave = max(wave, last_write.get(key, -1) + 1, last_read.get(key, -1) + 1)
+
+            if wave == len(waves):
+                waves.append([])
+            waves[wave].append(i)
+            for key in reads:
+                last_read[key] = max(last_read.get(key, -1), wave)
+            for key in writes:
+                last_write[key] = wave
+
+        groups.extend(waves)
+        return groups
+
+    @staticmethod
+    def _parallelizable(transactions: List[Transaction], parallel_ops: FrozenSet[str]) -> bool:
+        if not parallel_ops:
+            return False
+        for tx in transactions:
+            payload = tx.payload
+            if not isinstance(payload, dict) or payload.get("op") not in parallel_ops:
+                return False
+        return True
+
+    @staticmethod
+    def _execute_serial(
+        state: Dict[str, Any],
+        transactions: List[Transaction],
+        undo: Optional[Dict[str, Any]],
+    ) -> List[bool]:
+        # Ghi thẳng vào state theo thứ tự, không dựng Effect cho từng transaction
+        ops = _OPS
+        results: List[bool] = []
+        append = results.append
+        for tx in transactions:
+            try:
+                payload = tx.payload
+                op = ops.get(payload.get("op"))
+                ok = op[2](state, tx, payload, undo) if op is not None else False
+            except Exception:
+                # Lỗi của một transaction chỉ làm transaction đó thất bại, không làm hỏng block
+                ok = False
+            append(ok)
+        return results
+
+    @staticmethod
+    def execute_block(
+        state: Dict[str, Any],
+        transactions: List[Transaction],
+        max_workers: int = 1,
+        min_parallel: int = 64,
+        undo: Optional[Dict[str, Any]] = None,
+        parallel_ops: FrozenSet[str] = GIL_RELEASING_OPS,
+    ) -> List[bool]:
+        """
+        Thực thi toàn bộ transaction của block trên `state`.
+
+        Args:
+            max_workers: Số thread tính kết quả song song (1: không dùng pool)
+            min_parallel: Wave nhỏ hơn ngưỡng này được chạy ngay, không qua pool
+            undo: Nếu có, nhận giá trị cũ của các key bị ghi (xem revert)
+            parallel_ops: Op được phép tính trên thread (mặc định GIL_RELEASING_OPS)
+        """
+        if max_workers <= 1 or not ExecutionService._parallelizable(transactions, parallel_ops):
+            return ExecutionService._execute_serial(state, transactions, undo)
+
+        results: List[bool] = [False] * len(transactions)
+        groups = ExecutionService.schedule(transactions)
+
+        pool = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            for group in groups:
+                if len(group) >= min_parallel:
+                    # Mỗi worker nhận một đoạn liên tiếp của wave
+                    step = -(-len(group) // max_workers)
+                    chunks = [group[j:j + step] for j in range(0, len(group), step)]
+                    effects = [
+                        effect
+                        for chunk_effects in pool.map(
+                            lambda chunk: [ExecutionService.compute_effect(state, transactions[i]) for i in chunk],
+                            chunks,
+                        )
+                        for effect in chunk_effects
+                    ]
+                else:
+                    effects = [ExecutionService.compute_effect(state, transactions[i]) for i in group]
+
+                # Ghi theo thứ tự block: trong wave không có xung đột nên
+                # kết quả giống hệt chạy tuần tự
+                for i, effect in zip(group, effects):
+                    results[i] = ExecutionService.apply_effect(state, effect, undo)
+        finally:
+            pool.shutdown(wait=True)
+        return results
@@ -0,0 +1,158 @@
+"""
+Light client xác minh văn bằng mà không cần giữ cả chain.
+
+- Bên xác minh (nhà tuyển dụng) chỉ giữ HeaderChain: các header đã kiểm tra
+  (liên kết pre_hash, authority set, chữ ký validator), mỗi block 64 byte.
+- Node đầy đủ cấp "proof bundle" cho một transaction: chiều cao block,
+  transaction, Merkle inclusion proof và kết quả thực thi (build_proof,
+  API /txs/{id}/proof).
+- verify_credential băm transaction và đường Merkle rồi so với merkle_root đã
+  lưu, kiểm tra người ký mint là issuer và token_id khớp nội dung (dưới 1 ms).
+  Không verify lại chữ ký ECDSA (khoảng 2 ms): hash lá phủ cả chữ ký, và block
+  chứa transaction đã được validator trong authority set ký.
+
+Lưu ý: header không cam kết kết quả thực thi. Mint bị từ chối khi thực thi
+(trùng token_id) vẫn nằm trong block; "executed" trong bundle là khẳng định
+của node cấp proof, bundle có executed=false hoặc thiếu field bị coi là không
+hợp lệ. Cần chắc chắn hơn thì hỏi nhiều node.
+"""
+import asyncio
+import itertools
+from typing import Any, Dict, Iterable, Optional
+
+from app.core import codec
+from app.core.merkle import MerkleTree
+from app.models.Block import Block
+from app.models.HeaderChain import HeaderChain
+from app.models.Transaction import Transaction
+from app.network import protocol
+from app.services.BlockService import BlockService
+from app.services.ChainQueryService import ChainQueryService
+from app.services.ExecutionService import NFT_KEY_PREFIX
+from app.services.NFTService import NFTService
+
+_request_ids = itertools.count()
+
+
+class LightClientService:
+    @staticmethod
+    def from_genesis(genesis: Block) -> HeaderChain:
+        """Header chain mới; validator của genesis là authority set ban đầu."""
+        if genesis.index != 0 or BlockService.calculate_hash(genesis) != genesis.block_hash:
+            raise ValueError("genesis không hợp lệ")
+        chain = HeaderChain([genesis.block_header.validator_pubkey])
+        chain.append(bytes.fromhex(genesis.block_hash), bytes.fromhex(genesis.block_header.merkle_root))
+        return chain
+
+    @staticmethod
+    def add_headers(chain: HeaderChain, headers: Iterable[Block]) -> int:
+        """Kiểm tra và thêm các header nối tiếp đỉnh; ValueError ở header sai đầu tiên."""
+        added = 0
+        for header in headers:
+            reason = BlockService.check_signed_header(
+                header, chain.height, chain.block_hash(chain.height).hex(), chain.authority_set
+            )
+            if reason is not None:
+                raise ValueError(f"header {header.index}: {reason}")
+            chain.append(bytes.fromhex(header.block_hash), bytes.fromhex(header.block_header.merkle_root))
+            added += 1
+        return added
+
+    @staticmethod
+    async def sync_from_peer(chain: HeaderChain, host: str, port: int, timeout: float = 30.0) -> int:
+        """Tải header mới từ một node (GETHEADERS qua giao thức P2P)."""
+        reader, writer = await asyncio.open_connection(host, port)
+        added = 0
+        try:
+            while True:
+                req = f"light:{next(_request_ids)}"
+                query = {"req": req, "start": chain.height + 1, "limit": protocol.MAX_HEADERS}
+                writer.write(protocol.frame(protocol.GETHEADERS, protocol.encode_json(query)))
+                await writer.drain()
+
+                # Bỏ qua các message khác (HELLO, INV, ...) cho tới câu trả lời
+                while True:
+                    msg_type, body = await asyncio.wait_for(protocol.read_frame(reader), timeout)
+                    if msg_type != protocol.HEADERS:
+                        continue
+                    blobs = protocol.unpack_blobs(body)
+                    if blobs[0].decode("utf-8") == req:
+                        break
+
+                added += LightClientService.add_headers(chain, map(codec.decode_signed_header, blobs[1:]))
+                if len(blobs) - 1 < protocol.MAX_HEADERS:
+                    return added
+        finally:
+            writer.close()
+
+    # ==================== Node đầy đủ ====================
+    @staticmethod
+    def build_proof(query: ChainQueryService, tx_id: str) -> Optional[Dict[str, Any]]:
+        """Proof bundle cho transaction đã vào block (None nếu chưa có)."""
+        found = query.transaction(tx_id)
+        if found is None:
+            return None
+        tx, height, position = found
+        block = query.block_by_height(height)
+        tree = BlockService.build_merkle_tree(block.transactions)
+        return {
+            "height": height,
+            "block_hash": block.block_hash,
+            "position": position,
+            "transaction": tx.to_dict(),
+            "proof": MerkleTree.proof_to_hex(tree.proof(position)),
+            "executed": LightClientService._executed(query, tx),
+        }
+
+    @staticmethod
+    def _executed(query: ChainQueryService, tx: Transaction) -> bool:
+        # Mint có hiệu lực khi văn bằng trong state đúng là văn bằng của transaction này
+        payload = NFTService.mint_payload(tx)
+        if payload is None:
+            return False
+        return query.blockchain.state_db.get(NFT_KEY_PREFIX + payload["token_id"]) == payload["nft"]
+
+    # ==================== Xác minh ====================
+    @staticmethod
+    def verify_credential(chain: HeaderChain, bundle: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Xác minh proof bundle với header chain đã kiểm tra.
+        Trả về {"valid", "reason", "height", "confirmations", "credential"}.
+        """
+        result: Dict[str, Any] = {
+            "valid": False, "reason": None, "height": None, "confirmations": None, "credential": None,
+        }
+        try:
+            height = int(bundle["height"])
+            tx = Transaction.from_dict(bundle["transaction"])
+            proof = MerkleTree.proof_from_hex(bundle["proof"])
+            block_hash = bytes.fromhex(bundle["block_hash"]) if "block_hash" in bundle else None
+        except (KeyError, TypeError, ValueError) as e:
+            result["reason"] = f"proof bundle lỗi: {e}"
+            return result
+
+        result["height"] = height
+        if not 0 <= height <= chain.height:
+            result["reason"] = "block chưa có trong header chain"
+            return result
+        if block_hash is not None and block_hash != chain.block_hash(height):
+            result["reason"] = "block_hash không khớp header chain"
+            return result
+        if not MerkleTree.verify_proof(codec.transaction_leaf_hash(tx), proof, chain.merkle_root(height)):
+            result["reason"] = "Merkle proof không khớp merkle_root"
+            return result
+        payload = NFTService.mint_payload(tx)
+        if payload is None:
+            result["reason"] = "transaction không phải mint văn bằng"
+            return result
+        if not NFTService.is_authorized_mint(tx, payload):
+            result["reason"] = "người ký mint không phải issuer hoặc token_id sai"
+            return result
+        if bundle.get("executed") is not True:
+            result["reason"] = "mint không có hiệu lực khi thực thi (vd: trùng token_id)"
+            return result
+
+        result["valid"] = True
+        result["confirmations"] = chain.height - height + 1
+        result["credential"] = NFTService.credential_record(tx, height, payload)
+        return result
@@ -0,0 +1,78 @@
+from typing import Any, Dict, Optional
+
+from app.models.NFT import NFT
+from app.models.Transaction import Transaction
+from app.services.ExecutionService import NFT_KEY_PREFIX, is_authorized_mint
+
+
+class NFTService:
+    # Payload của transaction mint văn bằng NFT
+    @staticmethod
+    def build_mint_payload(nft: NFT) -> Dict[str, Any]:
+        return {
+            "op": "mint_nft",
+            "token_id": nft.token_id,
+            "nft": nft.to_dict(),
+        }
+
+    # Tạo transaction mint (chưa ký) từ NFT, người gửi là đơn vị cấp bằng
+    @staticmethod
+    def build_mint_transaction(nft: NFT, issuer_address: str = "", timestamp: Optional[float] = None) -> Transaction:
+        return Transaction(
+            sender_pubkey=nft.isssuer_pubkey,
+            sender_address=issuer_address,
+            recipient_address=nft.recipient_address.address,
+            payload=NFTService.build_mint_payload(nft),
+            timestamp=timestamp,
+        )
+
+    # Payload của transaction mint, None nếu không phải mint.
+    # Payload của transaction đã compact() được giải mã lại mỗi lần đọc tx.payload:
+    # gọi một lần rồi truyền dict cho is_authorized_mint / credential_record.
+    @staticmethod
+    def mint_payload(tx: Transaction) -> Optional[Dict[str, Any]]:
+        payload = tx.payload
+        return payload if isinstance(payload, dict) and payload.get("op") == "mint_nft" else None
+
+    @staticmethod
+    def is_mint(tx: Transaction) -> bool:
+        return NFTService.mint_payload(tx) is not None
+
+    # Mint do chính issuer ký và token_id khớp nội dung (xem ExecutionService)
+    @staticmethod
+    def is_authorized_mint(tx: Transaction, payload: Optional[Dict[str, Any]] = None) -> bool:
+        if payload is None:
+            payload = NFTService.mint_payload(tx)
+        return payload is not None and is_authorized_mint(tx, payload)
+
+    # Bản ghi tra cứu văn bằng (dạng phẳng) từ transaction mint
+    @staticmethod
+    def credential_record(tx: Transaction, height: int, payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        if payload is None:
+            payload = tx.payload
+        nft = payload["nft"]
+        metadata = nft.get("metadata", {})
+        return {
+            "token_id": payload["token_id"],
+            "issuer_pubkey": nft.get("issuer_pubkey", ""),
+            "issuer_address": tx.sender_address,
+            "recipient_address": nft.get("recipient", {}).get("address", ""),
+            "recipient_client_id": nft.get("recipient", {}).get("client_id", ""),
+            "recipient_pubkey": nft.get("recipient", {}).get("pubkey", ""),
+            "student_id": metadata.get("student_id"),
+            "degree_type": metadata.get("degree_type"),
+            "pdf_url": metadata.get("pdf_url"),
+            "pdf_hash": metadata.get("pdf_hash"),
+            "institution": metadata.get("institution"),
+            "issued_at": metadata.get("issued_at"),
+            "issuer_signature": nft.get("issuer_signature"),
+            "minted_at": tx.timestamp,
+            "tx_id": tx.tx_id,
+            "height": height,
+        }
+
+    # Lấy NFT đã mint từ state_db
+    @staticmethod
+    def get_minted(state_db: Dict[str, Any], token_id: str) -> Optional[NFT]:
+        data = state_db.get(NFT_KEY_PREFIX + token_id)
+        return NFT.from_dict(data) if data is not None else None
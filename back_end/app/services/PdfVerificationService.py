@@ -0,0 +1,239 @@
+"""
+Đối chiếu file PDF văn bằng với pdf_hash đã ghi trên chain.
+
+Nguồn file:
+- manifest CSV / JSONL với các cột token_id, path (pdf_hash tuỳ chọn, chỉ dùng
+  khi token_id chưa có trên chain);
+- hoặc một thư mục: file được ghép với văn bằng theo đường dẫn trong pdf_url
+  (hoặc tên file là token_id).
+
+Cách chạy (từ thư mục back_end):
+    python -m app.services.PdfVerificationService --dir archive/ --db NCKH_educhain.db \
+        --cache .pdf_hash_cache.json --workers 8 --out report.json
+"""
+import argparse
+import csv
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+from app.core.file_hash import FileHashCache, file_stamp, hash_file
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Trạng thái của từng dòng báo cáo
+MATCH = "match"
+MISMATCH = "mismatch"
+MISSING = "missing"        # văn bằng có trong danh sách nhưng không có file
+UNKNOWN = "unknown"        # file không ghép được với văn bằng nào / không có hash trên chain
+ERROR = "error"            # lỗi đọc file
+
+
+def _normalize_hash(value: Optional[str]) -> Optional[str]:
+    if not value:
+        return None
+    value = value.strip().lower()
+    return value[len("sha256:"):] if value.startswith("sha256:") else value
+
+
+class PdfVerificationService:
+    # Đọc manifest: .csv có dòng tiêu đề, còn lại là JSON lines
+    @staticmethod
+    def load_manifest(manifest_path: str) -> List[Dict[str, Any]]:
+        base = Path(manifest_path).parent
+        with open(manifest_path, "r", encoding="utf-8", newline="") as f:
+            if manifest_path.lower().endswith(".csv"):
+                rows = list(csv.DictReader(f))
+            else:
+                rows = [json.loads(line) for line in f if line.strip()]
+
+        jobs = []
+        for row in rows:
+            path = Path(row["path"])
+            jobs.append({
+                "token_id": row.get("token_id") or None,
+                "path": str(path if path.is_absolute() else base / path),
+                "expected": _normalize_hash(row.get("pdf_hash")),
+            })
+        return jobs
+
+    # Ghép file trong thư mục với văn bằng trong chỉ mục (CredentialIndex / CredentialRepository)
+    @staticmethod
+    def jobs_from_directory(directory: str, index=None) -> List[Dict[str, Any]]:
+        root = Path(directory)
+        # Key theo đường dẫn tương đối: file trùng tên ở thư mục con khác nhau không đè nhau
+        files = {p.relative_to(root).as_posix(): p for p in sorted(root.rglob("*")) if p.is_file()}
+        by_name: Dict[str, List[str]] = {}
+        for rel in files:
+            by_name.setdefault(rel.rsplit("/", 1)[-1], []).append(rel)
+        jobs = []
+        used = set()
+
+        for record in index.iter_records() if index is not None else []:
+            parts = [part for part in urlparse(record.get("pdf_url") or "").path.split("/") if part]
+            rel = PdfVerificationService._match_file(files, by_name, parts, f"{record['token_id']}.pdf")
+            jobs.append({
+                "token_id": record["token_id"],
+                "path": str(files[rel]) if rel else None,
+                "expected": _normalize_hash(record.get("pdf_hash")),
+            })
+            if rel is not None:
+                used.add(rel)
+
+        # File không thuộc văn bằng nào vẫn được băm để báo cáo
+        for rel, path in files.items():
+            if rel not in used:
+                jobs.append({"token_id": None, "path": str(path), "expected": None})
+        return jobs
+
+    @staticmethod
+    def _match_file(
+        files: Dict[str, Path], by_name: Dict[str, List[str]], url_parts: List[str], fallback_name: str
+    ) -> Optional[str]:
+        """
+        File của văn bằng: đuôi dài nhất của đường dẫn trong pdf_url trùng với một
+        đường dẫn tương đối; không thì tên file (hoặc <token_id>.pdf) nếu chỉ có một file mang tên đó.
+        """
+        for start in range(len(url_parts)):
+            rel = "/".join(url_parts[start:])
+            if rel in files:
+                return rel
+        for name in (url_parts[-1] if url_parts else None, fallback_name):
+            if name in files:
+                return name
+            candidates = by_name.get(name) if name else None
+            if candidates is not None and len(candidates) == 1:
+                return candidates[0]
+        return None
+
+    @staticmethod
+    def _verify_one(job: Dict[str, Any], cache: Optional[FileHashCache], use_mmap: bool) -> Dict[str, Any]:
+        result = {**job, "actual": None, "status": None, "cached": False, "size": 0}
+        if job["path"] is None or not os.path.isfile(job["path"]):
+            result["status"] = MISSING
+            return result
+
+        try:
+            stamp = file_stamp(job["path"])
+            result["size"] = stamp[0]
+            digest = cache.get(job["path"], stamp) if cache is not None else None
+            if digest is not None:
+                result["cached"] = True
+            else:
+                digest = hash_file(job["path"], use_mmap=use_mmap)
+                if cache is not None:
+                    cache.put(job["path"], stamp, digest)
+        except OSError as e:
+            result["status"] = ERROR
+            result["error"] = str(e)
+            return result
+
+        result["actual"] = digest
+        if job["expected"] is None:
+            result["status"] = UNKNOWN
+        else:
+            result["status"] = MATCH if digest == job["expected"] else MISMATCH
+        return result
+
+    @staticmethod
+    def verify(
+        jobs: List[Dict[str, Any]],
+        index=None,
+        cache: Optional[FileHashCache] = None,
+        max_workers: Optional[int] = None,
+        use_mmap: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Băm và đối chiếu song song. Văn bằng có trong `index` (theo token_id)
+        luôn được đối chiếu với pdf_hash trên chain; pdf_hash của manifest chỉ
+        dùng khi chain không có, nếu khác chain thì giữ lại ở "manifest_hash".
+
+        Returns:
+            {"results": [...], "summary": {...}}, results giữ thứ tự của jobs
+        """
+        started = time.perf_counter()
+        for job in jobs:
+            if job["token_id"] and index is not None:
+                record = index.get_by_token(job["token_id"])
+                on_chain = _normalize_hash(record.get("pdf_hash")) if record else None
+                if on_chain is not None:
+                    if job["expected"] is not None and job["expected"] != on_chain:
+                        job["manifest_hash"] = job["expected"]
+                    job["expected"] = on_chain
+
+        workers = max_workers or min(32, (os.cpu_count() or 1) * 2)
+        if workers <= 1 or len(jobs) <= 1:
+            results = [PdfVerificationService._verify_one(job, cache, use_mmap) for job in jobs]
+        else:
+            # hashlib nhả GIL khi băm: thread là đủ, không cần process
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(lambda job: PdfVerificationService._verify_one(job, cache, use_mmap), jobs))
+        if cache is not None:
+            cache.save()
+
+        elapsed = time.perf_counter() - started
+        hashed_bytes = sum(r["size"] for r in results if not r["cached"])
+        summary: Dict[str, Any] = {status: 0 for status in (MATCH, MISMATCH, MISSING, UNKNOWN, ERROR)}
+        for r in results:
+            summary[r["status"]] += 1
+        summary.update({
+            "files": len(results),
+            "cached": sum(1 for r in results if r["cached"]),
+            "manifest_conflicts": sum(1 for r in results if "manifest_hash" in r),
+            "hashed_bytes": hashed_bytes,
+            "seconds": elapsed,
+            "mb_per_s": hashed_bytes / elapsed / 1e6 if elapsed > 0 else 0.0,
+        })
+        return {"results": results, "summary": summary}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Đối chiếu PDF văn bằng với pdf_hash trên chain")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--dir")
+    source.add_argument("--manifest")
+    parser.add_argument("--db", default=None, help="SQLite có chỉ mục văn bằng (CredentialRepository)")
+    parser.add_argument("--cache", default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--no-mmap", action="store_true")
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args()
+
+    index = None
+    if args.db:
+        from app.repositories.CredentialRepository import CredentialRepository
+        index = CredentialRepository(args.db)
+
+    try:
+        if args.dir:
+            jobs = PdfVerificationService.jobs_from_directory(args.dir, index)
+        else:
+            jobs = PdfVerificationService.load_manifest(args.manifest)
+        report = PdfVerificationService.verify(
+            jobs, index=index, cache=FileHashCache(args.cache), max_workers=args.workers,
+            use_mmap=not args.no_mmap,
+        )
+    finally:
+        if index is not None:
+            index.close()
+
+    summary = report["summary"]
+    if summary["manifest_conflicts"]:
+        logger.warning(f"{summary['manifest_conflicts']} dòng manifest có pdf_hash khác với chain (xem manifest_hash)")
+    logger.info(
+        f"{summary['files']} file: {summary[MATCH]} khớp, {summary[MISMATCH]} sai, "
+        f"{summary[MISSING]} thiếu, {summary[UNKNOWN]} không rõ, {summary[ERROR]} lỗi; "
+        f"{summary['cached']} lấy từ cache, {summary['mb_per_s']:.1f} MB/s"
+    )
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
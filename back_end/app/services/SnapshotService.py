@@ -0,0 +1,136 @@
+import hashlib
+import json
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.models.BlockChain import BlockChain
+from app.services.ExecutionService import ABSENT
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SNAPSHOT_MAGIC = b"EDUSNAP\x01"
+SNAPSHOT_SUFFIX = ".snap"
+# height (u64) | block_hash (32 byte) | độ dài payload (u64) | sha256(payload) (32 byte)
+_HEADER = struct.Struct(">Q32sQ32s")
+
+
+class SnapshotService:
+    """
+    Checkpoint trạng thái (state_db, authority set) gắn với một block, kèm
+    undo log của các block cuối để node khởi động từ snapshot vẫn đổi nhánh được.
+
+    File snapshot: magic + header cố định + payload JSON nén zlib.
+    Checksum SHA256 của payload nằm trong header, snapshot hỏng sẽ bị bỏ qua.
+    """
+
+    @staticmethod
+    def snapshot_path(snapshot_dir: str, height: int) -> Path:
+        return Path(snapshot_dir) / f"snapshot_{height:012d}{SNAPSHOT_SUFFIX}"
+
+    # Ghi snapshot cho block cuối cùng của chain
+    @staticmethod
+    def create_snapshot(blockchain: BlockChain, snapshot_dir: str) -> Path:
+        last_block = blockchain.get_last_block()
+        state = {
+            "state_db": blockchain.state_db,
+            "authority_set": sorted(blockchain.authority_set),
+            "super_validator_pubkey": blockchain.super_validator_pubkey,
+            "undo_logs": [SnapshotService._encode_undo(entry) for entry in blockchain.undo_logs],
+        }
+        payload = zlib.compress(json.dumps(state, sort_keys=True, separators=(",", ":")).encode("utf-8"))
+        header = _HEADER.pack(
+            last_block.index,
+            bytes.fromhex(last_block.block_hash),
+            len(payload),
+            hashlib.sha256(payload).digest(),
+        )
+
+        Path(snapshot_dir).mkdir(parents=True, exist_ok=True)
+        path = SnapshotService.snapshot_path(snapshot_dir, last_block.index)
+        tmp_path = path.with_suffix(".tmp")
+        # Ghi file tạm rồi rename: không bao giờ để lại snapshot ghi dở
+        with open(tmp_path, "wb") as f:
+            f.write(SNAPSHOT_MAGIC + header + payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+        logger.info(f"Snapshot tại block {last_block.index}: {path.name} ({len(payload)} bytes)")
+        return path
+
+    # Tạo snapshot định kỳ mỗi `interval` block, giữ lại `keep` bản mới nhất
+    @staticmethod
+    def maybe_checkpoint(blockchain: BlockChain, snapshot_dir: str, interval: int, keep: int = 3) -> Optional[Path]:
+        height = blockchain.get_last_block().index
+        if interval < 1 or height == 0 or height % interval != 0:
+            return None
+
+        path = SnapshotService.create_snapshot(blockchain, snapshot_dir)
+        for _, old_path in SnapshotService.list_snapshots(snapshot_dir)[keep:]:
+            old_path.unlink(missing_ok=True)
+        return path
+
+    # Danh sách snapshot, mới nhất trước
+    @staticmethod
+    def list_snapshots(snapshot_dir: str) -> List[Tuple[int, Path]]:
+        directory = Path(snapshot_dir)
+        if not directory.is_dir():
+            return []
+
+        snapshots = []
+        for path in directory.glob(f"snapshot_*{SNAPSHOT_SUFFIX}"):
+            try:
+                height = int(path.stem.split("_", 1)[1])
+            except ValueError:
+                continue
+            snapshots.append((height, path))
+        snapshots.sort(reverse=True)
+        return snapshots
+
+    # Đọc và kiểm tra snapshot; raise ValueError nếu file hỏng
+    @staticmethod
+    def load_snapshot(path: Path) -> Dict[str, Any]:
+        data = Path(path).read_bytes()
+        if not data.startswith(SNAPSHOT_MAGIC):
+            raise ValueError(f"{path}: sai magic")
+
+        offset = len(SNAPSHOT_MAGIC)
+        if len(data) < offset + _HEADER.size:
+            raise ValueError(f"{path}: header bị cắt cụt")
+        height, block_hash, length, checksum = _HEADER.unpack_from(data, offset)
+
+        payload = data[offset + _HEADER.size:]
+        if len(payload) != length or hashlib.sha256(payload).digest() != checksum:
+            raise ValueError(f"{path}: checksum không khớp")
+
+        try:
+            state = json.loads(zlib.decompress(payload).decode("utf-8"))
+        except (zlib.error, ValueError) as e:
+            raise ValueError(f"{path}: payload hỏng ({e})")
+
+        state["height"] = height
+        state["block_hash"] = block_hash.hex()
+        # Snapshot ghi trước khi có undo log: coi như rỗng
+        state["undo_logs"] = [SnapshotService._decode_undo(entry) for entry in state.get("undo_logs", [])]
+        return state
+
+    # Undo log dạng JSON: key chưa có trước block (ABSENT) được liệt kê riêng
+    @staticmethod
+    def _encode_undo(entry: Dict[str, Any]) -> Dict[str, Any]:
+        undo = entry["state"]
+        return {
+            "block_hash": entry["block_hash"],
+            "credentials": entry["credentials"],
+            "state": {key: value for key, value in undo.items() if value is not ABSENT},
+            "absent": sorted(key for key, value in undo.items() if value is ABSENT),
+        }
+
+    @staticmethod
+    def _decode_undo(data: Dict[str, Any]) -> Dict[str, Any]:
+        undo = dict(data["state"])
+        undo.update(dict.fromkeys(data["absent"], ABSENT))
+        return {"block_hash": data["block_hash"], "state": undo, "credentials": data["credentials"]}
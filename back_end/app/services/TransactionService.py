@@ -1,7 +1,49 @@
 import hashlib
-import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence
+
 from ecdsa import SigningKey, VerifyingKey, SECP256k1
+from ..core import codec
+from ..core.crypto_utils import verifying_key_cache
 from ..models.Transaction import Transaction
+from ..utils import metrics
+
+
+_TX_VERIFY_SECONDS = metrics.histogram("tx_verify_seconds", "Thời gian kiểm tra chữ ký một transaction")
+_TX_VERIFY_FAILED = metrics.counter("tx_verify_failed_total", "Số transaction có chữ ký không hợp lệ")
+_TX_VERIFY_BATCH_SECONDS = metrics.histogram("tx_verify_batch_seconds", "Thời gian kiểm tra chữ ký một lô transaction")
+
+# Số transaction mỗi chunk gửi sang một worker khi kiểm tra theo lô
+DEFAULT_VERIFY_CHUNK_SIZE = 256
+
+_verify_pool: Optional[ProcessPoolExecutor] = None
+_verify_pool_workers = 0
+
+
+def _get_verify_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Tạo (hoặc dùng lại) process pool dùng cho kiểm tra chữ ký theo lô."""
+    global _verify_pool, _verify_pool_workers
+    if _verify_pool is None or _verify_pool_workers != max_workers:
+        if _verify_pool is not None:
+            _verify_pool.shutdown(wait=True)
+        _verify_pool = ProcessPoolExecutor(max_workers=max_workers)
+        _verify_pool_workers = max_workers
+    return _verify_pool
+
+
+def shutdown_verify_pool() -> None:
+    """Đóng process pool kiểm tra chữ ký (gọi khi tắt node)."""
+    global _verify_pool, _verify_pool_workers
+    if _verify_pool is not None:
+        _verify_pool.shutdown(wait=True)
+    _verify_pool = None
+    _verify_pool_workers = 0
+
+
+def _verify_chunk(encoded_txs: List[bytes]) -> List[bool]:
+    """Chạy trong worker process: kiểm tra một chunk transaction đã mã hoá."""
+    return [TransactionService.is_valid(codec.decode_transaction(data)) for data in encoded_txs]
 
 
 class TransactionService:
@@ -11,15 +53,14 @@ class TransactionService:
         """
         Dữ liệu thô cần ký (không bao gồm signature, tx_id, tx_hash).
         Chỉ bao gồm: sender_pubkey, sender_address, recipient_address, payload, timestamp.
+        Mã hoá nhị phân chuẩn, được memo trên transaction (xem app/core/codec.py).
         """
-        data = {
-            "sender_pubkey": transaction.sender_pubkey,
-            "sender_address": transaction.sender_address,
-            "recipient_address": transaction.recipient_address,
-            "payload": transaction.payload,
-            "timestamp": transaction.timestamp,
-        }
-        return json.dumps(data, sort_keys=True).encode()
+        return codec.transaction_signing_data(transaction)
+
+    # Dữ liệu ký JSON cũ (chế độ tương thích)
+    @staticmethod
+    def get_legacy_signing_data(transaction: Transaction) -> bytes:
+        return codec.legacy_transaction_signing_data(transaction)
 
     # Tính hash của transaction
     @staticmethod
@@ -28,8 +69,7 @@ class TransactionService:
         Tính hash của giao dịch (SHA256).
         Hash được tính từ signing_data (không bao gồm signature).
         """
-        signing_data = TransactionService.get_signing_data(transaction)
-        return hashlib.sha256(signing_data).hexdigest()
+        return codec.transaction_hash(transaction).hex()
 
     # Ký transaction bằng private key
     @staticmethod
@@ -44,6 +84,11 @@ class TransactionService:
             str: Chữ ký dạng hex string
         """
         sk = SigningKey.from_string(bytes.fromhex(private_key), curve=SECP256k1)
+        return TransactionService.sign_with_key(transaction, sk)
+
+    # Ký bằng SigningKey đã parse sẵn (ký hàng loạt, không parse lại key mỗi lần)
+    @staticmethod
+    def sign_with_key(transaction: Transaction, sk: SigningKey) -> str:
         signing_data = TransactionService.get_signing_data(transaction)
         message_hash = hashlib.sha256(signing_data).digest()
         signature_bytes = sk.sign(message_hash)
@@ -65,14 +110,81 @@ class TransactionService:
         """
         Kiểm tra chữ ký người gửi có khớp với payload không.
         """
+        with _TX_VERIFY_SECONDS.time():
+            ok = TransactionService._check_signature(transaction)
+        if not ok:
+            _TX_VERIFY_FAILED.inc()
+        return ok
+
+    @staticmethod
+    def _check_signature(transaction: Transaction) -> bool:
         if not transaction.sender_pubkey or not transaction.signature:
             return False
 
         try:
-            vk = VerifyingKey.from_string(bytes.fromhex(transaction.sender_pubkey), curve=SECP256k1)
-            signing_data = TransactionService.get_signing_data(transaction)
-            message_hash = hashlib.sha256(signing_data).digest()
+            vk = verifying_key_cache.get(transaction.sender_pubkey)
             signature_bytes = bytes.fromhex(transaction.signature)
-            return vk.verify(signature_bytes, message_hash)
         except Exception:
-            return False
\ No newline at end of file
+            return False
+
+        if TransactionService._verify(vk, signature_bytes, TransactionService.get_signing_data(transaction)):
+            return True
+
+        # Transaction cũ được ký trên dữ liệu JSON
+        if codec.LEGACY_JSON_COMPAT:
+            return TransactionService._verify(
+                vk, signature_bytes, TransactionService.get_legacy_signing_data(transaction)
+            )
+        return False
+
+    @staticmethod
+    def _verify(vk: VerifyingKey, signature_bytes: bytes, signing_data: bytes) -> bool:
+        try:
+            return vk.verify(signature_bytes, hashlib.sha256(signing_data).digest())
+        except Exception:
+            return False
+
+    # Kiểm tra nhiều transaction song song bằng process pool
+    @staticmethod
+    def is_valid_batch(
+        transactions: Sequence[Transaction],
+        max_workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_VERIFY_CHUNK_SIZE,
+    ) -> List[bool]:
+        """
+        Kiểm tra chữ ký cho cả lô transaction, chia thành các chunk và
+        phân phối cho các worker process.
+
+        Args:
+            transactions: Danh sách transaction cần kiểm tra
+            max_workers: Số worker process (mặc định: số CPU)
+            chunk_size: Số transaction trong một chunk
+
+        Returns:
+            List[bool]: Kết quả hợp lệ/không hợp lệ, đúng thứ tự đầu vào
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size phải >= 1")
+
+        with _TX_VERIFY_BATCH_SECONDS.time():
+            return TransactionService._check_batch(transactions, max_workers, chunk_size)
+
+    @staticmethod
+    def _check_batch(transactions: Sequence[Transaction], max_workers: Optional[int], chunk_size: int) -> List[bool]:
+        workers = max_workers or os.cpu_count() or 1
+
+        # Lô nhỏ hoặc chỉ 1 worker: kiểm tra ngay trên thread hiện tại,
+        # tránh chi phí pickle và gửi dữ liệu sang process khác
+        if workers == 1 or len(transactions) <= chunk_size:
+            return [TransactionService.is_valid(tx) for tx in transactions]
+
+        chunks = [
+            [codec.encode_transaction(tx) for tx in transactions[i:i + chunk_size]]
+            for i in range(0, len(transactions), chunk_size)
+        ]
+
+        pool = _get_verify_pool(workers)
+        results: List[bool] = []
+        for chunk_result in pool.map(_verify_chunk, chunks):
+            results.extend(chunk_result)
+        return results
@@ -1,10 +1,13 @@
 # core/utils/logger.py
+import atexit
 import logging
+import queue
 import sys
 import os
+import threading
 from pathlib import Path
-from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
-from typing import Optional
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
+from typing import Dict, List, Optional
 
 try:
     from pythonjsonlogger import jsonlogger
@@ -14,8 +17,8 @@ except ImportError:  # pip install python-json-logger (tùy chọn)
 
 # ==================== CẤU HÌNH CHUNG ====================
 PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
-LOG_DIR = PROJECT_ROOT / "logs"
-LOG_DIR.mkdir(exist_ok=True)
+LOG_DIR = Path(os.getenv("LOG_DIR", PROJECT_ROOT / "logs"))
+LOG_DIR.mkdir(parents=True, exist_ok=True)
 
 # Env config (có thể override)
 LOG_LEVEL = os.getenv("LOG_LEVEL", "DEBUG").upper()
@@ -23,6 +26,12 @@ LOG_TO_CONSOLE = os.getenv("LOG_TO_CONSOLE", "True").lower() == "true"
 LOG_TO_FILE = os.getenv("LOG_TO_FILE", "True").lower() == "true"
 LOG_JSON_FORMAT = os.getenv("LOG_JSON_FORMAT", "False").lower() == "true"
 
+# Chế độ hàng đợi: thread gọi log chỉ đưa record vào queue, một thread nền ghi ra handler
+LOG_QUEUED = os.getenv("LOG_QUEUED", "False").lower() == "true"
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+# Khi queue đầy quá 80%: chỉ giữ 1/LOG_DEBUG_SAMPLE bản ghi DEBUG
+LOG_DEBUG_SAMPLE = int(os.getenv("LOG_DEBUG_SAMPLE", "10"))
+
 
 def _get_console_formatter(json_format: bool = False) -> logging.Formatter:
     if json_format:
@@ -48,10 +57,13 @@ def _get_file_formatter(json_format: bool = False) -> logging.Formatter:
 def get_logger(
     name: Optional[str] = None,
     level: Optional[str] = None,
+    queued: Optional[bool] = None,
 ) -> logging.Logger:
     """
     Lấy logger đã được config sẵn.
     Cách dùng: logger = get_logger(__name__)
+
+    queued: ghi log qua hàng đợi (mặc định theo LOG_QUEUED), xem _DroppingQueueHandler
     """
     logger_name = name or "app"
     logger = logging.getLogger(logger_name)
@@ -62,12 +74,23 @@ def get_logger(
 
     logger.setLevel(getattr(logging, level or LOG_LEVEL))
 
+    if LOG_QUEUED if queued is None else queued:
+        logger.addHandler(_get_queue_handler())
+    else:
+        for handler in _build_handlers():
+            logger.addHandler(handler)
+    return logger
+
+
+def _build_handlers() -> List[logging.Handler]:
+    handlers: List[logging.Handler] = []
+
     # ==================== 1. Console Handler ====================
     if LOG_TO_CONSOLE:
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(logging.DEBUG)
         console_handler.setFormatter(_get_console_formatter(LOG_JSON_FORMAT))
-        logger.addHandler(console_handler)
+        handlers.append(console_handler)
 
     # ==================== 2. File Handler - Rotate theo dung lượng ====================
     if LOG_TO_FILE:
@@ -80,7 +103,7 @@ def get_logger(
         )
         all_file_handler.setLevel(logging.DEBUG)
         all_file_handler.setFormatter(_get_file_formatter(LOG_JSON_FORMAT))
-        logger.addHandler(all_file_handler)
+        handlers.append(all_file_handler)
 
         # ==================== 3. Daily Handler - FIX 100% CHO WINDOWS ====================
         daily_dir = LOG_DIR / "daily"
@@ -98,7 +121,7 @@ def get_logger(
         daily_handler.setFormatter(_get_file_formatter(LOG_JSON_FORMAT))
         daily_handler.suffix = "%Y-%m-%d.log"   # Tự động đổi tên: app.2025-11-27.log
         daily_handler.namer = lambda name: name.replace(".log", "") + ".log"  # Fix tên file khi rotate
-        logger.addHandler(daily_handler)
+        handlers.append(daily_handler)
 
     # ==================== 4. Error-only File ====================
     error_handler = RotatingFileHandler(
@@ -110,9 +133,97 @@ def get_logger(
     )
     error_handler.setLevel(logging.ERROR)
     error_handler.setFormatter(_get_file_formatter(LOG_JSON_FORMAT))
-    logger.addHandler(error_handler)
+    handlers.append(error_handler)
 
-    return logger
+    return handlers
+
+
+# ==================== Chế độ hàng đợi (LOG_QUEUED) ====================
+class _DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler không chặn thread gọi log:
+    - không format trên thread gọi (prepare trả nguyên record), việc format
+      chỉ làm trong thread nền với các handler thực sự ghi record đó;
+    - queue đầy quá `high_watermark`: DEBUG chỉ giữ 1/`debug_sample` bản ghi;
+    - queue đầy hẳn: bỏ DEBUG/INFO (có đếm), WARNING trở lên vẫn chờ để ghi.
+    Vì format muộn, tham số %-style phải là giá trị không bị sửa sau khi log.
+    """
+
+    def __init__(self, log_queue: queue.Queue, debug_sample: int = LOG_DEBUG_SAMPLE, high_watermark: float = 0.8):
+        super().__init__(log_queue)
+        self.debug_sample = max(debug_sample, 1)
+        self.high_watermark = int(log_queue.maxsize * high_watermark) if log_queue.maxsize > 0 else 0
+        self.dropped = 0
+        self.sampled_out = 0
+        self._debug_seen = 0
+        # Sau stop_queued_logging không còn thread đọc queue: không được chờ
+        self.closed = False
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if record.levelno <= logging.DEBUG and self.high_watermark and self.queue.qsize() >= self.high_watermark:
+            self._debug_seen += 1
+            if self._debug_seen % self.debug_sample:
+                self.sampled_out += 1
+                return
+
+        if record.levelno >= logging.WARNING and not self.closed:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _QueueListener(QueueListener):
+    # Queue có giới hạn: chờ chỗ trống để gửi sentinel khi dừng (thread nền vẫn đang đọc)
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+_queue_lock = threading.Lock()
+_queue_handler: Optional[_DroppingQueueHandler] = None
+_queue_listener: Optional[_QueueListener] = None
+
+
+def _get_queue_handler() -> _DroppingQueueHandler:
+    """Một queue và một thread nền dùng chung cho mọi logger ở chế độ hàng đợi."""
+    global _queue_handler, _queue_listener
+    with _queue_lock:
+        if _queue_handler is None:
+            log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+            _queue_handler = _DroppingQueueHandler(log_queue)
+            _queue_listener = _QueueListener(log_queue, *_build_handlers(), respect_handler_level=True)
+            _queue_listener.start()
+            atexit.register(stop_queued_logging)
+        return _queue_handler
+
+
+def stop_queued_logging() -> None:
+    """Ghi nốt các record còn trong queue và dừng thread nền."""
+    global _queue_handler, _queue_listener
+    with _queue_lock:
+        if _queue_handler is not None:
+            _queue_handler.closed = True
+            _queue_handler = None
+        if _queue_listener is not None:
+            _queue_listener.stop()
+            for handler in _queue_listener.handlers:
+                handler.close()
+            _queue_listener = None
+
+
+def queued_logging_stats() -> Dict[str, int]:
+    if _queue_handler is None:
+        return {"queued": 0, "dropped": 0, "sampled_out": 0}
+    return {
+        "queued": _queue_handler.queue.qsize(),
+        "dropped": _queue_handler.dropped,
+        "sampled_out": _queue_handler.sampled_out,
+    }
 
 
 # ==================== Logger toàn cục (dùng nhanh) ====================
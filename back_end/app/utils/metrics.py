@@ -0,0 +1,281 @@
+"""
+Metrics cho các đường nóng của ledger: counter, gauge và histogram độ trễ.
+
+- Tắt mặc định (METRICS_ENABLED=false): mỗi lần gọi chỉ tốn một phép kiểm tra
+  cờ, time() trả về một context manager rỗng dùng chung.
+- Xuất dạng Prometheus text (render_prometheus) hoặc snapshot định kỳ ra logger
+  (MetricsReporter).
+
+Cách dùng:
+    from app.utils import metrics
+    TX_VERIFY_SECONDS = metrics.histogram("tx_verify_seconds", "Thời gian kiểm tra chữ ký transaction")
+    with TX_VERIFY_SECONDS.time():
+        ...
+"""
+import bisect
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "False").lower() == "true"
+METRICS_PREFIX = "educhain_"
+
+# Bucket độ trễ (giây): 50us .. 10s
+DEFAULT_LATENCY_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class MetricsRegistry:
+    def __init__(self, enabled: bool = METRICS_ENABLED):
+        self.enabled = enabled
+        self._metrics: Dict[str, "Metric"] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: "Metric") -> "Metric":
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                # Import lại module: dùng lại metric đã có
+                if type(existing) is not type(metric):
+                    raise ValueError(f"metric {metric.name} đã đăng ký với kiểu khác")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def metrics(self) -> List["Metric"]:
+        return sorted(self._metrics.values(), key=lambda m: m.name)
+
+    def reset(self) -> None:
+        for metric in self._metrics.values():
+            metric.reset()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {metric.name: metric.value() for metric in self.metrics()}
+
+    def render_prometheus(self) -> str:
+        lines: List[str] = []
+        for metric in self.metrics():
+            name = METRICS_PREFIX + metric.name
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            lines.extend(metric.render(name))
+        return "\n".join(lines) + "\n"
+
+
+class Metric(ABC):
+    kind = ""
+
+    def __init__(self, registry: MetricsRegistry, name: str, help: str):
+        self._registry = registry
+        self.name = name
+        self.help = help
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def reset(self) -> None:
+        ...
+
+    @abstractmethod
+    def value(self) -> Any:
+        ...
+
+    @abstractmethod
+    def render(self, name: str) -> List[str]:
+        ...
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, registry: MetricsRegistry, name: str, help: str):
+        super().__init__(registry, name, help)
+        self._value = 0
+
+    def inc(self, amount: Union[int, float] = 1) -> None:
+        if not self._registry.enabled:
+            return
+        with self._lock:
+            self._value += amount
+
+    def reset(self) -> None:
+        self._value = 0
+
+    def value(self) -> Union[int, float]:
+        return self._value
+
+    def render(self, name: str) -> List[str]:
+        return [f"{name} {self._value}"]
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def __init__(self, registry: MetricsRegistry, name: str, help: str):
+        super().__init__(registry, name, help)
+        self._value: Union[int, float] = 0
+
+    def set(self, value: Union[int, float]) -> None:
+        if not self._registry.enabled:
+            return
+        self._value = value
+
+    def reset(self) -> None:
+        self._value = 0
+
+    def value(self) -> Union[int, float]:
+        return self._value
+
+    def render(self, name: str) -> List[str]:
+        return [f"{name} {self._value}"]
+
+
+class _NoopTimer:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopTimer":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+
+_NOOP_TIMER = _NoopTimer()
+
+
+class _Timer:
+    __slots__ = ("_histogram", "_start")
+
+    def __init__(self, histogram: "Histogram"):
+        self._histogram = histogram
+
+    def __enter__(self) -> "_Timer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._histogram.observe(time.perf_counter() - self._start)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, registry: MetricsRegistry, name: str, help: str, buckets: Sequence[float]):
+        super().__init__(registry, name, help)
+        self.buckets = tuple(sorted(buckets))
+        self.reset()
+
+    def observe(self, value: float) -> None:
+        if not self._registry.enabled:
+            return
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[i] += 1
+            self._sum += value
+            self._count += 1
+
+    def time(self) -> Union[_Timer, _NoopTimer]:
+        """Context manager đo thời gian khối lệnh; rỗng khi metrics tắt."""
+        if not self._registry.enabled:
+            return _NOOP_TIMER
+        return _Timer(self)
+
+    def reset(self) -> None:
+        # Ô cuối cùng là +Inf
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Ước lượng phân vị theo cận trên của bucket (None nếu chưa có mẫu)."""
+        if self._count == 0:
+            return None
+        target = q * self._count
+        cumulative = 0
+        for i, count in enumerate(self._counts):
+            cumulative += count
+            if cumulative >= target:
+                return self.buckets[i] if i < len(self.buckets) else float("inf")
+        return float("inf")
+
+    def value(self) -> Dict[str, Any]:
+        return {
+            "count": self._count,
+            "sum": self._sum,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+        }
+
+    def render(self, name: str) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self._counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{le="+Inf"}} {self._count}')
+        lines.append(f"{name}_sum {self._sum}")
+        lines.append(f"{name}_count {self._count}")
+        return lines
+
+
+# ==================== Registry toàn cục ====================
+registry = MetricsRegistry()
+
+
+def counter(name: str, help: str) -> Counter:
+    return registry.register(Counter(registry, name, help))
+
+
+def gauge(name: str, help: str) -> Gauge:
+    return registry.register(Gauge(registry, name, help))
+
+
+def histogram(name: str, help: str, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> Histogram:
+    return registry.register(Histogram(registry, name, help, buckets))
+
+
+def enable() -> None:
+    registry.enabled = True
+
+
+def disable() -> None:
+    registry.enabled = False
+
+
+def render_prometheus() -> str:
+    return registry.render_prometheus()
+
+
+class MetricsReporter:
+    """Ghi snapshot metrics ra logger mỗi `interval` giây (thread nền)."""
+
+    def __init__(self, logger, interval: float = 60.0, metrics_registry: Optional[MetricsRegistry] = None):
+        self.logger = logger
+        self.interval = interval
+        self.registry = metrics_registry or registry
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def report(self) -> None:
+        self.logger.info(f"metrics {json.dumps(self.registry.snapshot(), sort_keys=True)}")
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.report()
+
+    def start(self) -> "MetricsReporter":
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="metrics-reporter", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
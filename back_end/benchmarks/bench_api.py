@@ -0,0 +1,120 @@
+"""
+Đo độ trễ API đọc trên server aiohttp chạy trong cùng process (localhost).
+
+Cách chạy (từ thư mục back_end):
+    python -m benchmarks.bench_api --blocks 2000 --txs-per-block 50 --requests 2000 --concurrency 16
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from aiohttp import ClientSession, web
+from ecdsa import SigningKey, SECP256k1
+
+from app.main import create_app
+from app.models.BlockChain import BlockChain
+from app.models.Transaction import Transaction
+from app.services.BlockChainService import BlockChainService
+
+
+def build_chain(blocks: int, txs_per_block: int) -> BlockChain:
+    sk = SigningKey.generate(curve=SECP256k1)
+    pubkey = sk.get_verifying_key().to_string().hex()
+    blockchain = BlockChain()
+    BlockChainService.create_genesis_block(blockchain, pubkey)
+    for height in range(1, blocks + 1):
+        txs = [
+            Transaction(
+                tx_id=f"{height:032x}{i:032x}",
+                sender_pubkey=pubkey,
+                payload={"op": "set", "key": f"k{height}_{i}", "value": i},
+                signature="bb" * 64,
+            )
+            for i in range(txs_per_block)
+        ]
+        # Dữ liệu giả cho benchmark: bỏ qua ký từng transaction
+        BlockChainService.add_signed_transactions_to_mempool(blockchain, txs)
+        BlockChainService.add_block(blockchain, BlockChainService.mine_block(blockchain, sk, pubkey))
+    return blockchain
+
+
+async def measure(session: ClientSession, base: str, name: str, make: Callable[[int], tuple],
+                  requests: int, concurrency: int) -> None:
+    latencies: List[float] = []
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        for i in counter:
+            path, headers = make(i)
+            start = time.perf_counter()
+            async with session.get(base + path, headers=headers) as resp:
+                await resp.read()
+            latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(f"  {name:<26} p50={statistics.median(latencies) * 1000:7.2f} ms  "
+          f"p99={p99 * 1000:7.2f} ms  {requests / elapsed:8.0f} req/s")
+
+
+async def run(args) -> None:
+    blockchain = build_chain(args.blocks, args.txs_per_block)
+    app = create_app(blockchain)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    base = f"http://127.0.0.1:{port}/api/v1"
+
+    rng = random.Random(5)
+    heights = [rng.randrange(1, args.blocks - 10) for _ in range(args.requests)]
+    etags = {h: f'"{blockchain.chain[h].block_hash}"' for h in heights}
+    tx_ids = [blockchain.chain[h].transactions[0].tx_id for h in heights]
+    print(f"blocks={args.blocks} txs/block={args.txs_per_block} concurrency={args.concurrency}")
+
+    async with ClientSession() as session:
+        await measure(session, base, "head", lambda i: ("/head", {}), args.requests, args.concurrency)
+        await measure(session, base, "block (first, serialize)", lambda i: (f"/blocks/{heights[i]}", {}),
+                      args.requests, args.concurrency)
+        await measure(session, base, "block (cached JSON)", lambda i: (f"/blocks/{heights[i]}", {}),
+                      args.requests, args.concurrency)
+        await measure(session, base, "block (ETag -> 304)",
+                      lambda i: (f"/blocks/{heights[i]}", {"If-None-Match": etags[heights[i]]}),
+                      args.requests, args.concurrency)
+        await measure(session, base, "tx by id", lambda i: (f"/txs/{tx_ids[i]}", {}), args.requests, args.concurrency)
+
+        start = time.perf_counter()
+        size = 0
+        async with session.get(f"{base}/export/blocks?start=0&end={args.blocks}") as resp:
+            async for chunk in resp.content.iter_chunked(1 << 16):
+                size += len(chunk)
+        elapsed = time.perf_counter() - start
+        print(f"  export {args.blocks + 1} blocks: {size / 1e6:.1f} MB in {elapsed:.2f}s ({size / elapsed / 1e6:.1f} MB/s)")
+
+    await runner.cleanup()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Read API latency")
+    parser.add_argument("--blocks", type=int, default=2_000)
+    parser.add_argument("--txs-per-block", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
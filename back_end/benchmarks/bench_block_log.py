@@ -0,0 +1,105 @@
+"""
+So sánh block log (segment + mmap) với SQLite: ghi nối đuôi và đọc ngẫu nhiên.
+
+Cách chạy (từ thư mục back_end):
+    python -m benchmarks.bench_block_log --blocks 200 --txs-per-block 500 --reads 2000
+    python -m benchmarks.bench_block_log --group-commit 8 --segment-mb 16
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models.Block import Block
+from app.repositories.BlockLogRepository import BlockLogRepository
+from app.repositories.BlockRepository import BlockRepository
+from benchmarks.bench_block_store import make_blocks
+
+
+def bench_store(name: str, open_store: Callable[[], Any], blocks: List[Block], reads: int, seed: int) -> Dict[str, Any]:
+    n_txs = sum(len(b.transactions) for b in blocks)
+    store = open_store()
+    start = time.perf_counter()
+    for block in blocks:
+        store.save_block(block)
+    store.flush()
+    write_seconds = time.perf_counter() - start
+    store.close()
+
+    # Mở lại như khi node khởi động
+    start = time.perf_counter()
+    store = open_store()
+    open_seconds = time.perf_counter() - start
+
+    rng = random.Random(seed)
+    heights = [rng.randrange(len(blocks)) for _ in range(reads)]
+    start = time.perf_counter()
+    for height in heights:
+        store.get_block_by_height(height)
+    height_seconds = time.perf_counter() - start
+
+    # Block log: chỉ lấy bản mã hoá qua mmap (vd: gửi cho peer), không giải mã
+    raw_seconds = None
+    if hasattr(store, "read_encoded"):
+        start = time.perf_counter()
+        for height in heights:
+            len(store.read_encoded(height))
+        raw_seconds = time.perf_counter() - start
+
+    hashes = [blocks[h].block_hash for h in heights]
+    start = time.perf_counter()
+    for block_hash in hashes:
+        store.get_block_by_hash(block_hash)
+    hash_seconds = time.perf_counter() - start
+    store.close()
+
+    return {
+        "store": name,
+        "blocks_per_s": len(blocks) / write_seconds,
+        "txs_per_s": n_txs / write_seconds,
+        "open_ms": open_seconds * 1000,
+        "read_height_ms": height_seconds / reads * 1000,
+        "read_hash_ms": hash_seconds / reads * 1000,
+        "read_raw_ms": raw_seconds / reads * 1000 if raw_seconds is not None else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Block log vs SQLite: append và random read")
+    parser.add_argument("--blocks", type=int, default=200)
+    parser.add_argument("--txs-per-block", type=int, default=500)
+    parser.add_argument("--reads", type=int, default=2000)
+    parser.add_argument("--group-commit", type=int, default=1)
+    parser.add_argument("--segment-mb", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    blocks = make_blocks(args.blocks, args.txs_per_block)
+    with tempfile.TemporaryDirectory() as tmp:
+        stores = {
+            "sqlite": lambda: BlockRepository(os.path.join(tmp, "bench.db"), group_commit=args.group_commit),
+            "block_log": lambda: BlockLogRepository(
+                os.path.join(tmp, "blocks"), group_commit=args.group_commit,
+                segment_size=args.segment_mb * 1024 * 1024,
+            ),
+        }
+        print(f"blocks={args.blocks} txs/block={args.txs_per_block} group_commit={args.group_commit}")
+        for name, open_store in stores.items():
+            r = bench_store(name, open_store, blocks, args.reads, args.seed)
+            print(
+                f"{r['store']:<10} ghi {r['blocks_per_s']:>8.1f} blocks/s {r['txs_per_s']:>10.1f} tx/s  "
+                f"mở {r['open_ms']:>7.1f} ms  "
+                f"đọc theo height {r['read_height_ms']:>7.3f} ms  theo hash {r['read_hash_ms']:>7.3f} ms"
+                + (f"  bản mã hoá {r['read_raw_ms']:.4f} ms" if r["read_raw_ms"] is not None else "")
+            )
+
+
+if __name__ == "__main__":
+    main()
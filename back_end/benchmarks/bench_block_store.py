@@ -0,0 +1,90 @@
+"""
+Đo throughput ghi của BlockRepository (blocks/s và tx/s).
+
+Cách chạy (từ thư mục back_end):
+    python -m benchmarks.bench_block_store --blocks 200 --txs-per-block 500 --group-commit 1 8
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models.Block import Block
+from app.models.BlockHeader import BlockHeader
+from app.models.Transaction import Transaction
+from app.repositories.BlockRepository import BlockRepository
+
+
+def make_blocks(n_blocks: int, txs_per_block: int) -> List[Block]:
+    """Tạo block giả (không ký) chỉ để đo tốc độ ghi."""
+    blocks = []
+    pre_hash = "0" * 64
+    for height in range(n_blocks):
+        txs = [
+            Transaction(
+                tx_id=f"{height:08x}{i:08x}".ljust(64, "0"),
+                sender_pubkey="ab" * 64,
+                sender_address="addr_sender",
+                recipient_address="addr_recipient",
+                payload={"op": "set", "key": f"k{height}_{i}", "value": i},
+                signature="cd" * 64,
+                timestamp=1_700_000_000.0 + i,
+                tx_hash="ef" * 32,
+            )
+            for i in range(txs_per_block)
+        ]
+        header = BlockHeader(height, pre_hash, "12" * 32, "ab" * 64, timestamp=1_700_000_000.0 + height)
+        block = Block(index=height, block_id=f"BLOCK_{height}", block_header=header, transactions=txs)
+        block.block_hash = f"{height:064x}"
+        block.validator_signature = "cd" * 64
+        pre_hash = block.block_hash
+        blocks.append(block)
+    return blocks
+
+
+def bench_writes(blocks: List[Block], group_commit: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = BlockRepository(os.path.join(tmp, "bench.db"), group_commit=group_commit)
+        start = time.perf_counter()
+        for block in blocks:
+            repo.save_block(block)
+        repo.flush()
+        elapsed = time.perf_counter() - start
+        repo.close()
+
+    n_txs = sum(len(b.transactions) for b in blocks)
+    return {
+        "group_commit": group_commit,
+        "blocks": len(blocks),
+        "txs": n_txs,
+        "seconds": elapsed,
+        "blocks_per_s": len(blocks) / elapsed,
+        "txs_per_s": n_txs / elapsed,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="BlockRepository write throughput")
+    parser.add_argument("--blocks", type=int, default=200)
+    parser.add_argument("--txs-per-block", type=int, default=500)
+    parser.add_argument("--group-commit", type=int, nargs="+", default=[1, 8, 32])
+    args = parser.parse_args()
+
+    blocks = make_blocks(args.blocks, args.txs_per_block)
+    for group_commit in args.group_commit:
+        result = bench_writes(blocks, group_commit)
+        print(
+            f"group_commit={result['group_commit']:<4} "
+            f"{result['blocks_per_s']:>10.1f} blocks/s  {result['txs_per_s']:>12.1f} tx/s  "
+            f"({result['seconds']:.2f}s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Đo chỉ mục block_hash/tx_id: dựng lại từ block log khi khởi động và tra cứu,
+so với quét tuyến tính chain; chỉ mục trong RAM so với SQLite.
+
+Cách chạy (từ thư mục back_end):
+    python -m benchmarks.bench_chain_index --blocks 200 --txs-per-block 500 --lookups 5000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models.Block import Block
+from app.models.ChainIndex import ChainIndex
+from app.repositories.BlockLogRepository import BlockLogRepository
+from app.repositories.ChainIndexRepository import ChainIndexRepository
+from benchmarks.bench_block_store import make_blocks
+
+
+def linear_scan(blocks: List[Block], tx_id: str):
+    for height, block in enumerate(blocks):
+        for position, tx in enumerate(block.transactions):
+            if tx.tx_id == tx_id:
+                return height, position
+    return None
+
+
+def bench_index(name: str, open_index: Callable[[], Any], store: BlockLogRepository, tx_ids: List[str]) -> Dict[str, Any]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    index = open_index()
+    for block in store.iter_blocks(0):
+        index.add_block(block)
+    build_seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for tx_id in tx_ids:
+        index.tx_location(tx_id)
+    lookup_seconds = time.perf_counter() - start
+    index.close()
+    return {
+        "index": name,
+        "build_ms": build_seconds * 1000,
+        "peak_mb": peak / 2**20,
+        "lookup_us": lookup_seconds / len(tx_ids) * 1e6,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Chỉ mục block_hash/tx_id: dựng lại và tra cứu")
+    parser.add_argument("--blocks", type=int, default=200)
+    parser.add_argument("--txs-per-block", type=int, default=500)
+    parser.add_argument("--lookups", type=int, default=5000)
+    parser.add_argument("--scans", type=int, default=20, help="Số lần quét tuyến tính để so sánh")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    blocks = make_blocks(args.blocks, args.txs_per_block)
+    rng = random.Random(args.seed)
+    tx_ids = [rng.choice(rng.choice(blocks).transactions).tx_id for _ in range(args.lookups)]
+
+    start = time.perf_counter()
+    for tx_id in tx_ids[: args.scans]:
+        linear_scan(blocks, tx_id)
+    scan_us = (time.perf_counter() - start) / args.scans * 1e6
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with BlockLogRepository(os.path.join(tmp, "blocks")) as store:
+            store.save_blocks(blocks)
+            store.flush()
+            indexes = {
+                "ram": ChainIndex,
+                "sqlite": lambda: ChainIndexRepository(os.path.join(tmp, "index.db")),
+            }
+            print(f"blocks={args.blocks} txs/block={args.txs_per_block} quét tuyến tính {scan_us:>12.1f} us/tx")
+            for name, open_index in indexes.items():
+                r = bench_index(name, open_index, store, tx_ids)
+                print(
+                    f"{r['index']:<8} dựng lại {r['build_ms']:>9.1f} ms  đỉnh bộ nhớ {r['peak_mb']:>7.1f} MiB  "
+                    f"tra cứu {r['lookup_us']:>8.2f} us/tx"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Bộ nhớ và tốc độ đọc của chain khi chỉ giữ cửa sổ block mới nhất
+(ChainWindow + block log) so với giữ cả chain trong RAM.
+
+Cách chạy (từ thư mục back_end):
+    python -m benchmarks.bench_chain_window --blocks 200 --txs-per-block 500 --hot-blocks 20
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core import codec
+from app.models.ChainWindow import ChainWindow
+from app.models.HeaderColumns import HeaderColumns
+from app.repositories.BlockLogRepository import BlockLogRepository
+from benchmarks.bench_memory import make_encoded_blocks
+
+
+def load_chain(encoded, store, hot_blocks: int, cache_blocks: int) -> ChainWindow:
+    chain = ChainWindow(HeaderColumns(), hot_blocks=hot_blocks, cache_blocks=cache_blocks)
+    chain.store = store
+    for data in encoded:
+        block = codec.decode_block(data)
+        chain.append(block)
+        for tx in block.transactions:
+            tx.compact()
+    return chain
+
+
+def measure(encoded, store, hot_blocks: int, cache_blocks: int):
+    gc.collect()
+    tracemalloc.start()
+    chain = load_chain(encoded, store, hot_blocks, cache_blocks)
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return chain, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ChainWindow: bộ nhớ và hit rate khi đọc block cũ")
+    parser.add_argument("--blocks", type=int, default=200)
+    parser.add_argument("--txs-per-block", type=int, default=500)
+    parser.add_argument("--hot-blocks", type=int, default=20)
+    parser.add_argument("--cache-blocks", type=int, default=32)
+    parser.add_argument("--reads", type=int, default=5000)
+    parser.add_argument("--recent-share", type=float, default=0.9, help="Tỉ lệ lượt đọc rơi vào 10%% block mới nhất")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    encoded = make_encoded_blocks(args.blocks, args.txs_per_block)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = BlockLogRepository(os.path.join(tmp, "blocks"))
+        for data in encoded:
+            store.save_block(codec.decode_block(data))
+
+        full, full_size = measure(encoded, None, args.hot_blocks, args.cache_blocks)
+        del full
+        window, window_size = measure(encoded, store, args.hot_blocks, args.cache_blocks)
+
+        # Đọc lệch về block mới (như API / explorer), còn lại rải đều
+        rng = random.Random(args.seed)
+        recent = max(len(window) // 10, 1)
+        heights = [
+            len(window) - 1 - rng.randrange(recent) if rng.random() < args.recent_share else rng.randrange(len(window))
+            for _ in range(args.reads)
+        ]
+        start = time.perf_counter()
+        for height in heights:
+            window[height].transactions[0]
+        elapsed = time.perf_counter() - start
+        stats = window.stats()
+        store.close()
+
+    print(f"blocks={args.blocks} txs/block={args.txs_per_block} hot={args.hot_blocks} cache={args.cache_blocks}")
+    print(f"cả chain trong RAM : {full_size / 2**20:8.1f} MiB")
+    print(f"ChainWindow        : {window_size / 2**20:8.1f} MiB (header theo cột {window.headers.nbytes() / 2**10:.1f} KiB)")
+    print(
+        f"đọc ngẫu nhiên     : {elapsed / args.reads * 1e6:8.1f} us/lượt, hit rate cache {stats['hit_rate']:.1%} "
+        f"({stats['cache_hits']} hit / {stats['cache_misses']} miss)"
+    )
+
+
+if __name__ == "__main__":
+    main()
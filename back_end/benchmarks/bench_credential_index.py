@@ -0,0 +1,102 @@
+"""
+Đo độ trễ tra cứu văn bằng (token_id, student_id, người nhận, phân trang
+theo trường) trên chỉ mục bộ nhớ và SQLite với N bản ghi.
+
+Cách chạy (từ thư mục back_end):
+    python -m benchmarks.bench_credential_index --records 100000 --lookups 2000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models.CredentialIndex import CredentialIndex
+from app.repositories.CredentialRepository import CredentialRepository
+
+
+def make_records(n: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "token_id": f"{i:064x}",
+            "issuer_pubkey": "aa" * 64,
+            "issuer_address": "addr_issuer",
+            "recipient_address": f"addr_{i % (n // 2 or 1)}",
+            "recipient_client_id": f"client_{i % (n // 2 or 1)}",
+            "recipient_pubkey": "cc" * 64,
+            "student_id": f"SV{i % (n // 2 or 1):08d}",
+            "degree_type": "Bachelor",
+            "pdf_url": f"https://example.edu/{i}.pdf",
+            "pdf_hash": f"{i:064x}",
+            "institution": f"Uni{i % 20}",
+            "issued_at": 1_700_000_000 + i,
+            "issuer_signature": None,
+            "minted_at": 1_700_000_000.0 + i,
+            "tx_id": f"{i:064x}",
+            "height": i // 1000,
+        }
+        for i in range(n)
+    ]
+
+
+def measure(name: str, fn: Callable[[int], Any], keys: List[int]) -> None:
+    start = time.perf_counter()
+    for k in keys:
+        fn(k)
+    elapsed = time.perf_counter() - start
+    print(f"  {name:<22} {elapsed / len(keys) * 1e6:9.1f} us/op")
+
+
+def run(label: str, index, n: int, lookups: int) -> None:
+    rng = random.Random(3)
+    keys = [rng.randrange(n) for _ in range(lookups)]
+    half = n // 2 or 1
+    print(f"{label}:")
+    measure("get_by_token", lambda k: index.get_by_token(f"{k:064x}"), keys)
+    measure("find_by_student", lambda k: index.find_by_student(f"SV{k % half:08d}"), keys)
+    measure("find_by_recipient", lambda k: index.find_by_recipient(f"addr_{k % half}"), keys)
+
+    # Trang sâu: dùng cursor nên chi phí không tăng theo độ sâu
+    cursors = {}
+    page, cursor = index.list_by_institution("Uni0", None, 50)
+    depth = 0
+    while cursor is not None and depth < 200:
+        cursors[depth] = cursor
+        page, cursor = index.list_by_institution("Uni0", cursor, 50)
+        depth += 1
+    measure("list_by_institution", lambda k: index.list_by_institution("Uni0", cursors.get(k % max(depth, 1)), 50),
+            keys[: max(lookups // 10, 1)])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Credential index lookup latency")
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=2_000)
+    args = parser.parse_args()
+
+    records = make_records(args.records)
+
+    memory = CredentialIndex()
+    start = time.perf_counter()
+    memory.add_many(records)
+    print(f"records={args.records} memory build={time.perf_counter() - start:.2f}s")
+    run("memory", memory, args.records, args.lookups)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = CredentialRepository(os.path.join(tmp, "credentials.db"))
+        start = time.perf_counter()
+        for i in range(0, len(records), 5_000):
+            repo.add_many(records[i:i + 5_000])
+        print(f"sqlite build={time.perf_counter() - start:.2f}s")
+        run("sqlite", repo, args.records, args.lookups)
+        repo.close()
+
+
+if __name__ == "__main__":
+    main()
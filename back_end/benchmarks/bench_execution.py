@@ -0,0 +1,81 @@
+"""
+So sánh thực thi block bằng ExecutionService với vòng lặp tuần tự cũ.
+Op "set" không nhả GIL nên mọi số worker đều chạy tuần tự (speedup ~1x);
+--force-waves ép chạy theo wave trên thread để thấy chi phí của pool.
+
+Cách chạy (từ thư mục back_end):
+    python -m benchmarks.bench_execution --txs 10000 --conflict-ratio 0.1 --workers 1 4
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models.Transaction import Transaction
+from app.services.ExecutionService import GIL_RELEASING_OPS, ExecutionService
+
+
+def make_txs(n: int, conflict_ratio: float, seed: int = 7) -> List[Transaction]:
+    """Block kiểu mint NFT: phần lớn key độc lập, một phần ghi đè key chung."""
+    rng = random.Random(seed)
+    txs = []
+    for i in range(n):
+        key = f"shared_{rng.randrange(16)}" if rng.random() < conflict_ratio else f"nft:{i}"
+        txs.append(Transaction(tx_id=f"{i:064x}", payload={"op": "set", "key": key, "value": i}))
+    return txs
+
+
+def execute_transaction(state: Dict[str, Any], tx: Transaction) -> bool:
+    # BlockChainService.execute_transaction trước khi có ExecutionService
+    payload = tx.payload
+    if payload.get("op") == "set":
+        state[payload["key"]] = payload["value"]
+        return True
+    return False
+
+
+def serial_loop(state: Dict[str, Any], txs: List[Transaction]) -> None:
+    # Vòng lặp của add_block trước khi có ExecutionService
+    for tx in txs:
+        execute_transaction(state, tx)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Wave-parallel execution vs serial loop")
+    parser.add_argument("--txs", type=int, default=10_000)
+    parser.add_argument("--conflict-ratio", type=float, default=0.1)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--force-waves", action="store_true", help="Coi op set như nhả GIL")
+    args = parser.parse_args()
+
+    txs = make_txs(args.txs, args.conflict_ratio)
+    parallel_ops = frozenset({"set"}) if args.force_waves else GIL_RELEASING_OPS
+
+    serial_state: Dict[str, Any] = {}
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        serial_state = {}
+        serial_loop(serial_state, txs)
+    serial_time = (time.perf_counter() - start) / args.repeat
+
+    waves = ExecutionService.schedule(txs)
+    print(f"txs={args.txs} groups={len(waves)} serial={serial_time * 1000:.2f} ms")
+
+    for workers in args.workers:
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            state: Dict[str, Any] = {}
+            ExecutionService.execute_block(state, txs, max_workers=workers, parallel_ops=parallel_ops)
+        elapsed = (time.perf_counter() - start) / args.repeat
+        assert state == serial_state, "state khác với chạy tuần tự"
+        print(f"workers={workers:<3} engine={elapsed * 1000:8.2f} ms  speedup={serial_time / elapsed:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Đo độ trễ lan truyền transaction và block giữa các node gossip trên localhost
+(nối thành hàng: node 0 - node 1 - ... - node N-1), so sánh block rút gọn
+(CMPCTBLOCK) với block đầy đủ.
+
+Cách chạy (từ thư mục back_end):
+    python -m benchmarks.bench_gossip --nodes 4 --txs 2000 --blocks 5
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ecdsa import SigningKey, SECP256k1
+
+from app.core import codec
+from app.models.BlockChain import BlockChain
+from app.models.Transaction import Transaction
+from app.network.gossip import GossipNode
+from app.services.BlockChainService import BlockChainService
+from app.services.TransactionService import TransactionService
+
+
+def make_chains(count: int, sk: SigningKey, pubkey: str):
+    first = BlockChain()
+    genesis = BlockChainService.create_genesis_block(first, pubkey)
+    chains = [first]
+    for _ in range(count - 1):
+        blockchain = BlockChain()
+        BlockChainService.install_genesis(blockchain, codec.decode_block(codec.encode_block(genesis)))
+        chains.append(blockchain)
+    for blockchain in chains:
+        blockchain.mempool.max_per_sender = blockchain.mempool.max_count
+    return chains
+
+
+def make_txs(sk: SigningKey, start: int, count: int):
+    pubkey = sk.get_verifying_key().to_string().hex()
+    txs = []
+    for i in range(start, start + count):
+        tx = Transaction(sender_pubkey=pubkey, payload={"op": "set", "key": f"k{i}", "value": i},
+                         timestamp=1_700_000_000.0 + i)
+        TransactionService.sign_with_key(tx, sk)
+        txs.append(tx)
+    return txs
+
+
+def percentile(values, q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+async def wait_for(condition, timeout: float = 120.0) -> None:
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("hết thời gian chờ lan truyền")
+        await asyncio.sleep(0.001)
+
+
+async def run(nodes_count: int, tx_count: int, blocks: int, single: int, compact: bool) -> None:
+    sk = SigningKey.generate(curve=SECP256k1)
+    pubkey = sk.get_verifying_key().to_string().hex()
+    nodes = [GossipNode(chain, node_id=f"n{i}", compact_blocks=compact)
+             for i, chain in enumerate(make_chains(nodes_count, sk, pubkey))]
+    ports = [await node.start() for node in nodes]
+    for i in range(nodes_count - 1):
+        await nodes[i].connect("127.0.0.1", ports[i + 1])
+    await wait_for(lambda: all(node.peers for node in nodes))
+
+    source, far = nodes[0], nodes[-1]
+    # Độ trễ từng transaction khi mạng rảnh
+    single_latencies = []
+    for tx in make_txs(sk, tx_count, single):
+        sent = time.perf_counter()
+        source.submit_transaction(tx)
+        await wait_for(lambda: tx.tx_id in far.arrivals)
+        single_latencies.append(far.arrivals[tx.tx_id] - sent)
+
+    # Cả loạt transaction rồi mine: độ trễ khi có hàng đợi + độ trễ block
+    tx_latencies, block_latencies = [], []
+    burst_started = time.perf_counter()
+    per_block = max(1, tx_count // blocks)
+    for b in range(blocks):
+        txs = make_txs(sk, b * per_block, per_block)
+        sent_at = {}
+        for tx in txs:
+            sent_at[tx.tx_id] = time.perf_counter()
+            source.submit_transaction(tx)
+        await wait_for(lambda: all(tx.tx_id in far.arrivals for tx in txs))
+        tx_latencies.extend(far.arrivals[tx.tx_id] - sent_at[tx.tx_id] for tx in txs)
+
+        started = time.perf_counter()
+        block = await source.mine(sk, pubkey)
+        await wait_for(lambda: block.block_hash in far.arrivals)
+        block_latencies.append(far.arrivals[block.block_hash] - started)
+
+    burst_seconds = time.perf_counter() - burst_started
+    duplicates = sum(node.stats["duplicate_tx"] for node in nodes)
+    for node in nodes:
+        await node.stop()
+
+    mode = "compact" if compact else "full"
+    print(
+        f"[{mode:<7}] nodes={nodes_count} hops={nodes_count - 1} "
+        f"tx(idle) p50={statistics.median(single_latencies) * 1000:6.2f} ms | "
+        f"tx(burst) p50={statistics.median(tx_latencies) * 1000:7.1f} ms p95={percentile(tx_latencies, 0.95) * 1000:7.1f} ms "
+        f"{len(tx_latencies) / burst_seconds:6.0f} tx/s | "
+        f"block p50={statistics.median(block_latencies) * 1000:7.2f} ms max={max(block_latencies) * 1000:7.2f} ms | "
+        f"block_msg={len(codec.encode_compact_block(block) if compact else codec.encode_block(block))} B "
+        f"dup_tx={duplicates}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Gossip propagation latency on localhost")
+    parser.add_argument("--nodes", type=int, default=4)
+    parser.add_argument("--txs", type=int, default=2_000)
+    parser.add_argument("--blocks", type=int, default=5)
+    parser.add_argument("--single", type=int, default=50, help="Số transaction gửi lẻ khi mạng rảnh")
+    args = parser.parse_args()
+
+    for compact in (True, False):
+        asyncio.run(run(args.nodes, args.txs, args.blocks, args.single, compact))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Đo light client: bộ nhớ mỗi block của header chain so với giữ block đầy đủ,
+tốc độ nạp header và độ trễ xác minh một văn bằng từ proof bundle.
+
+Cách chạy (từ thư mục back_end):
+    python -m benchmarks.bench_light_client --blocks 1000 --mints-per-block 4
+"""
+import argparse
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ecdsa import SigningKey, SECP256k1
+
+from app.core import codec
+from app.models.BlockChain import BlockChain
+from app.models.Client import client
+from app.models.NFT import NFT
+from app.models.NFTmetadata import NFTmetadata
+from app.services.BlockChainService import BlockChainService
+from app.services.ChainQueryService import ChainQueryService
+from app.services.LightClientService import LightClientService
+from app.services.NFTService import NFTService
+from app.services.TransactionService import TransactionService
+
+
+def build_chain(blocks: int, mints_per_block: int) -> BlockChain:
+    sk = SigningKey.generate(curve=SECP256k1)
+    pubkey = sk.get_verifying_key().to_string().hex()
+    blockchain = BlockChain()
+    BlockChainService.create_genesis_block(blockchain, pubkey)
+    blockchain.mempool.max_per_sender = blockchain.mempool.max_count
+    for height in range(1, blocks + 1):
+        txs = []
+        for i in range(mints_per_block):
+            student = f"SV{height}_{i}"
+            metadata = NFTmetadata(student, "Bachelor", "u", "ab" * 32, "Uni0", 1_700_000_000)
+            nft = NFT(pubkey, metadata, client("cc" * 64, f"addr_{student}", student))
+            tx = NFTService.build_mint_transaction(nft, timestamp=1_700_000_000.0 + height * 10 + i)
+            TransactionService.sign_with_key(tx, sk)
+            txs.append(tx)
+        BlockChainService.add_signed_transactions_to_mempool(blockchain, txs)
+        BlockChainService.add_block(blockchain, BlockChainService.mine_block(blockchain, sk, pubkey))
+    return blockchain
+
+
+def traced_size(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    value = build()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return value, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Light client memory and verification latency")
+    parser.add_argument("--blocks", type=int, default=1_000)
+    parser.add_argument("--mints-per-block", type=int, default=4)
+    parser.add_argument("--samples", type=int, default=2_000)
+    args = parser.parse_args()
+
+    print(f"Tạo chain {args.blocks} block x {args.mints_per_block} mint ...")
+    blockchain = build_chain(args.blocks, args.mints_per_block)
+    encoded_blocks = [codec.encode_block(b) for b in blockchain.chain]
+    encoded_headers = [codec.encode_signed_header(b) for b in blockchain.chain]
+    blocks = len(encoded_blocks)
+
+    _, full_size = traced_size(lambda: [codec.decode_block(data) for data in encoded_blocks])
+
+    _, light_size = traced_size(lambda: _ingest(encoded_headers))
+    # Đo thời gian riêng: tracemalloc làm chậm đáng kể
+    started = time.perf_counter()
+    chain = _ingest(encoded_headers)
+    ingest_seconds = time.perf_counter() - started
+
+    query = ChainQueryService(blockchain)
+    txs = [tx for block in blockchain.chain for tx in block.transactions]
+    bundles = [LightClientService.build_proof(query, txs[i % len(txs)].tx_id) for i in range(args.samples)]
+    timings = []
+    for bundle in bundles:
+        start = time.perf_counter()
+        ok = LightClientService.verify_credential(chain, bundle)["valid"]
+        timings.append(time.perf_counter() - start)
+        assert ok
+    timings.sort()
+
+    print(f"full blocks   : {full_size / blocks:10.0f} B/block")
+    print(f"header chain  : {light_size / blocks:10.0f} B/block (dữ liệu {chain.nbytes() / blocks:.0f} B/block)")
+    print(f"nạp header    : {blocks / ingest_seconds:10.0f} headers/s (kiểm tra chữ ký validator)")
+    print(
+        f"verify        : p50={statistics.median(timings) * 1e6:7.1f} us "
+        f"p99={timings[int(0.99 * len(timings))] * 1e6:7.1f} us max={timings[-1] * 1e6:7.1f} us"
+    )
+
+
+def _ingest(encoded_headers):
+    chain = LightClientService.from_genesis(codec.decode_signed_header(encoded_headers[0]))
+    LightClientService.add_headers(chain, (codec.decode_signed_header(data) for data in encoded_headers[1:]))
+    return chain
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Đo chi phí mỗi lần gọi log trên thread gọi: chế độ ghi trực tiếp (mặc định)
+so với chế độ hàng đợi (LOG_QUEUED). Log được ghi vào thư mục tạm.
+
+Cách chạy (từ thư mục back_end):
+    python -m benchmarks.bench_logger --calls 20000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Phải đặt trước khi import app.utils.logger
+_tmp = tempfile.TemporaryDirectory()
+os.environ["LOG_DIR"] = _tmp.name
+os.environ.setdefault("LOG_TO_CONSOLE", "False")
+
+from app.utils import logger as logger_module  # noqa: E402
+
+
+def per_call(logger, level: str, calls: int) -> float:
+    log = getattr(logger, level)
+    start = time.perf_counter()
+    for i in range(calls):
+        log("block %d applied, %d txs, root=%s", i, 5_000, "ab" * 32)
+    return (time.perf_counter() - start) / calls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-call logging cost, sync vs queued")
+    parser.add_argument("--calls", type=int, default=20_000)
+    args = parser.parse_args()
+
+    sync_logger = logger_module.get_logger("bench.sync", queued=False)
+    queued_logger = logger_module.get_logger("bench.queued", queued=True)
+    # Chỉ đo chi phí của từng chế độ, không để record lan lên logger cha
+    sync_logger.propagate = queued_logger.propagate = False
+
+    for level in ("info", "debug"):
+        sync_cost = per_call(sync_logger, level, args.calls)
+        queued_cost = per_call(queued_logger, level, args.calls)
+        print(f"{level:<6} sync={sync_cost * 1e6:7.2f} us/call  queued={queued_cost * 1e6:7.2f} us/call  "
+              f"({sync_cost / queued_cost:4.1f}x)")
+
+    stats = logger_module.queued_logging_stats()
+    start = time.perf_counter()
+    logger_module.stop_queued_logging()
+    print(f"queued: {stats['queued']} chờ ghi, {stats['dropped']} bị bỏ, {stats['sampled_out']} DEBUG bị lấy mẫu bỏ; "
+          f"ghi nốt mất {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
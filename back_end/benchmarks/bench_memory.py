@@ -0,0 +1,99 @@
+"""
+Đo bộ nhớ mỗi transaction khi giữ chain trong RAM (block đã áp dụng, như
+trong BlockChain.chain) với transaction mint văn bằng thực tế.
+
+Chạy được trên cả bản cũ (model dùng dict) để so sánh trước / sau.
+
+Cách chạy (từ thư mục back_end):
+    python -m benchmarks.bench_memory --blocks 200 --txs-per-block 500
+"""
+import argparse
+import gc
+import sys
+import tracemalloc
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core import codec
+from app.models.Block import Block
+from app.models.BlockHeader import BlockHeader
+from app.models.Client import client
+from app.models.NFT import NFT
+from app.models.NFTmetadata import NFTmetadata
+from app.services.BlockService import BlockService
+from app.services.NFTService import NFTService
+
+
+def make_encoded_blocks(blocks: int, txs_per_block: int):
+    """Block đã mã hoá (chữ ký giả: chỉ đo bộ nhớ, không kiểm tra)."""
+    issuer = "ab" * 64
+    encoded, prev_hash = [], "0" * 64
+    for height in range(blocks):
+        txs = []
+        for i in range(txs_per_block):
+            n = height * txs_per_block + i
+            metadata = NFTmetadata(f"SV{n:08d}", "Bachelor", f"https://uni.example/pdf/{n}.pdf",
+                                   f"{n:064x}", "Uni0", 1_700_000_000 + n)
+            nft = NFT(issuer, metadata, client(f"{n:0128x}", f"{n:040x}", f"c{n}"))
+            nft.issuer_signature = f"{n:0128x}"
+            tx = NFTService.build_mint_transaction(nft, issuer_address="1f" * 20, timestamp=1_700_000_000.0 + n)
+            tx.signature = "cd" * 64
+            tx.tx_hash = codec.transaction_hash(tx).hex()
+            tx.tx_id = tx.tx_hash
+            txs.append(tx)
+        header = BlockHeader(height, prev_hash, BlockService.calculate_merkle_root(txs), "ef" * 64, 1_700_000_000.0 + height)
+        block = Block(height, f"BLOCK_{height}", header, txs)
+        block.block_hash = BlockService.calculate_hash(block)
+        block.validator_signature = "12" * 64
+        prev_hash = block.block_hash
+        encoded.append(codec.encode_block(block))
+    return encoded
+
+
+def resident_chain(encoded_blocks):
+    """Giải mã và giữ block như chain sau add_block (thu gọn nếu bản model hỗ trợ)."""
+    chain = []
+    for data in encoded_blocks:
+        block = codec.decode_block(data)
+        for tx in block.transactions:
+            if hasattr(tx, "compact"):
+                tx.compact()
+        chain.append(block)
+    return chain
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Resident memory per transaction")
+    parser.add_argument("--blocks", type=int, default=200)
+    parser.add_argument("--txs-per-block", type=int, default=500)
+    args = parser.parse_args()
+
+    encoded = make_encoded_blocks(args.blocks, args.txs_per_block)
+    txs = args.blocks * args.txs_per_block
+    wire = sum(map(len, encoded))
+
+    gc.collect()
+    tracemalloc.start()
+    chain = resident_chain(encoded)
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(f"txs={txs} blocks={args.blocks}")
+    print(f"bản mã hoá (codec)  : {wire / txs:8.0f} B/tx")
+    print(f"chain trong bộ nhớ  : {size / txs:8.0f} B/tx ({size / 2**20:.1f} MiB)")
+
+    try:
+        from app.models.HeaderColumns import HeaderColumns
+    except ImportError:
+        return
+    columns = HeaderColumns()
+    for block in chain:
+        columns.append(block)
+    print(f"header theo cột     : {columns.nbytes() / len(columns):8.0f} B/block")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Đo độ trễ mine_block theo độ dài backlog trong mempool.
+Với block template, độ trễ chỉ phụ thuộc giới hạn block, không phụ thuộc backlog.
+
+Cách chạy (từ thư mục back_end):
+    python -m benchmarks.bench_mine_block --backlog 1000 10000 50000 --max-block-txs 2000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ecdsa import SigningKey, SECP256k1
+
+from app.models.BlockChain import BlockChain
+from app.models.Transaction import Transaction
+from app.services.BlockChainService import BlockChainService
+
+
+def bench_mine(backlog: int, max_block_txs: int) -> float:
+    sk = SigningKey.generate(curve=SECP256k1)
+    pubkey = sk.get_verifying_key().to_string().hex()
+    blockchain = BlockChain()
+    blockchain.max_block_txs = max_block_txs
+    blockchain.mempool.max_count = backlog
+    blockchain.mempool.max_per_sender = backlog
+    BlockChainService.create_genesis_block(blockchain, pubkey)
+
+    # Transaction giả (không ký): chỉ đo phần lắp và niêm phong block
+    for i in range(backlog):
+        tx = Transaction(
+            tx_id=f"{i:064x}",
+            sender_pubkey="ab" * 64,
+            payload={"op": "set", "key": f"k{i}", "value": i},
+            signature="cd" * 64,
+            timestamp=1_700_000_000.0 + i,
+        )
+        BlockChainService._admit(blockchain, tx)
+
+    start = time.perf_counter()
+    BlockChainService.mine_block(blockchain, sk, pubkey)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="mine_block latency vs mempool backlog")
+    parser.add_argument("--backlog", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--max-block-txs", type=int, default=2_000)
+    args = parser.parse_args()
+
+    for backlog in args.backlog:
+        elapsed = bench_mine(backlog, args.max_block_txs)
+        print(f"backlog={backlog:<8} mine_block={elapsed * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
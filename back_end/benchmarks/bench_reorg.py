@@ -0,0 +1,105 @@
+"""
+Đo chi phí đổi nhánh bằng undo log theo độ dài chain, so với dựng lại
+state_db từ đầu (chạy lại mọi block) như trước khi có undo log.
+
+Cách chạy (từ thư mục back_end):
+    python -m benchmarks.bench_reorg --blocks 250 1000 --txs-per-block 100 --depth 3
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ecdsa import SigningKey, SECP256k1
+
+from app.models.BlockChain import BlockChain
+from app.models.Transaction import Transaction
+from app.services.BlockChainService import BlockChainService
+from app.services.ExecutionService import ExecutionService
+
+
+def make_txs(tag: int, height: int, count: int) -> List[Transaction]:
+    """Transaction giả (không ký): nhận thẳng vào mempool qua add_signed_transactions_to_mempool."""
+    return [
+        Transaction(
+            tx_id=f"{tag:x}{height:08x}{i:08x}".ljust(64, "0"),
+            sender_pubkey="ab" * 64,
+            sender_address="addr_sender",
+            recipient_address="addr_recipient",
+            payload={"op": "set", "key": f"k{i}", "value": [tag, height]},
+            signature="cd" * 64,
+            timestamp=1_700_000_000.0 + i,
+            tx_hash="ef" * 32,
+        )
+        for i in range(count)
+    ]
+
+
+def mine(blockchain: BlockChain, sk: SigningKey, pubkey: str, txs: List[Transaction]):
+    BlockChainService.add_signed_transactions_to_mempool(blockchain, txs)
+    block = BlockChainService.mine_block(blockchain, sk, pubkey)
+    BlockChainService.add_block(blockchain, block)
+    return block
+
+
+def bench_reorg(n_blocks: int, txs_per_block: int, depth: int) -> Dict[str, Any]:
+    sk = SigningKey.generate(curve=SECP256k1)
+    pubkey = sk.get_verifying_key().to_string().hex()
+    main = BlockChain()
+    main.max_block_txs = txs_per_block
+    genesis = BlockChainService.create_genesis_block(main, pubkey)
+    rival = BlockChain()
+    rival.max_block_txs = txs_per_block
+    BlockChainService.install_genesis(rival, genesis)
+
+    for height in range(1, n_blocks + 1):
+        block = mine(main, sk, pubkey, make_txs(1, height, txs_per_block))
+        if height <= n_blocks - depth:
+            BlockChainService.add_block(rival, block)
+    # Nhánh cạnh tranh dài hơn nhánh chính một block
+    for height in range(n_blocks - depth + 1, n_blocks + 2):
+        mine(rival, sk, pubkey, make_txs(2, height, txs_per_block))
+
+    start = time.perf_counter()
+    for block in rival.chain[n_blocks - depth + 1:]:
+        BlockChainService.add_block(main, block)
+    reorg_seconds = time.perf_counter() - start
+    assert main.state_db == rival.state_db
+
+    # Cách cũ: không có undo log thì phải chạy lại toàn bộ chain
+    start = time.perf_counter()
+    state: Dict[str, Any] = {}
+    for block in main.chain:
+        ExecutionService.execute_block(state, block.transactions)
+    replay_seconds = time.perf_counter() - start
+
+    return {
+        "blocks": n_blocks,
+        "reorg_ms": reorg_seconds * 1000,
+        "replay_ms": replay_seconds * 1000,
+        "reinjected": len(main.mempool),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Đổi nhánh bằng undo log vs chạy lại toàn bộ chain")
+    parser.add_argument("--blocks", type=int, nargs="+", default=[250, 1000])
+    parser.add_argument("--txs-per-block", type=int, default=100)
+    parser.add_argument("--depth", type=int, default=3, help="Số block bị hoàn tác")
+    args = parser.parse_args()
+
+    print(f"txs/block={args.txs_per_block} depth={args.depth}")
+    for n_blocks in args.blocks:
+        r = bench_reorg(n_blocks, args.txs_per_block, args.depth)
+        print(
+            f"chain {r['blocks']:>6} blocks  đổi nhánh {r['reorg_ms']:>8.1f} ms  "
+            f"chạy lại từ đầu {r['replay_ms']:>9.1f} ms  đưa lại mempool {r['reinjected']} tx"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+"""
+Bộ micro-benchmark cho các đường nóng: ký / kiểm tra transaction, Merkle root,
+ký / kiểm tra block, mine_block, add_block và ghi SQLite, ở 1k / 10k / 100k tx.
+
+Kết quả dạng JSON; chế độ so sánh báo các case chậm hơn baseline quá ngưỡng
+(thoát với mã 1 để dùng trong CI).
+
+Cách chạy (từ thư mục back_end):
+    python -m benchmarks.bench_suite --sizes 1000 10000 100000 --out bench.json
+    python -m benchmarks.bench_suite --sizes 1000 10000 --compare bench.json --threshold 0.15
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ecdsa import SigningKey, SECP256k1
+
+from app.models.Block import Block
+from app.models.BlockChain import BlockChain
+from app.models.Mempool import Mempool
+from app.models.Transaction import Transaction
+from app.repositories.BlockRepository import BlockRepository
+from app.services.BlockChainService import BlockChainService
+from app.services.BlockService import BlockService
+from app.services.TransactionService import TransactionService
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+# ECDSA thuần Python ~1-3 ms/lần: ký / kiểm tra chỉ chạy trên một mẫu
+DEFAULT_CRYPTO_SAMPLE = 1_000
+DEFAULT_DB_BLOCK_TXS = 1_000
+
+# Một case: hàm(ctx, n) -> (thời gian đo, số thao tác, có lấy mẫu hay không)
+Case = Callable[["Context", int], Tuple[float, int, bool]]
+
+
+class Context:
+    """Khoá và transaction dùng chung giữa các case (tạo một lần cho mỗi n)."""
+
+    def __init__(self, crypto_sample: int):
+        self.sk = SigningKey.generate(curve=SECP256k1)
+        self.sk_hex = self.sk.to_string().hex()
+        self.pubkey = self.sk.get_verifying_key().to_string().hex()
+        self.crypto_sample = crypto_sample
+        self._fake: Dict[int, List[Transaction]] = {}
+        self._signed: List[Transaction] = []
+
+    def fake_txs(self, n: int) -> List[Transaction]:
+        """Transaction có chữ ký giả: đủ cho Merkle, mine, add_block và ghi DB."""
+        if n not in self._fake:
+            self._fake[n] = [
+                Transaction(
+                    tx_id=f"{i:064x}",
+                    sender_pubkey=self.pubkey,
+                    sender_address="addr_sender",
+                    recipient_address="addr_recipient",
+                    payload={"op": "set", "key": f"k{i}", "value": i},
+                    signature="cd" * 64,
+                    timestamp=1_700_000_000.0 + i,
+                    tx_hash="ef" * 32,
+                )
+                for i in range(n)
+            ]
+        return self._fake[n]
+
+    def unsigned(self, n: int) -> List[Transaction]:
+        return [
+            Transaction(
+                sender_pubkey=self.pubkey,
+                sender_address="addr_sender",
+                payload={"op": "set", "key": f"k{i}", "value": i},
+                timestamp=1_700_000_000.0 + i,
+            )
+            for i in range(n)
+        ]
+
+    def signed(self, n: int) -> List[Transaction]:
+        while len(self._signed) < n:
+            tx = self.unsigned(1)[0]
+            tx.payload = {"op": "set", "key": f"k{len(self._signed)}", "value": len(self._signed)}
+            TransactionService.sign_with_key(tx, self.sk)
+            self._signed.append(tx)
+        return self._signed[:n]
+
+    def blockchain(self, n: int) -> BlockChain:
+        blockchain = BlockChain()
+        blockchain.max_block_txs = n
+        blockchain.max_block_bytes = 1 << 40
+        blockchain.mempool = Mempool(max_count=n, max_bytes=1 << 40, max_per_sender=n)
+        BlockChainService.create_genesis_block(blockchain, self.pubkey)
+        return blockchain
+
+    def block(self, n: int) -> Block:
+        blockchain = self.blockchain(n)
+        BlockChainService.add_signed_transactions_to_mempool(blockchain, self.fake_txs(n))
+        return BlockChainService.mine_block(blockchain, self.sk, self.pubkey)
+
+
+def _timed(fn: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+# ==================== Các case ====================
+def case_tx_sign(ctx: Context, n: int) -> Tuple[float, int, bool]:
+    m = min(n, ctx.crypto_sample)
+    txs = ctx.unsigned(m)
+    return _timed(lambda: [TransactionService.sign(tx, ctx.sk_hex) for tx in txs]), m, m < n
+
+
+def case_tx_is_valid(ctx: Context, n: int) -> Tuple[float, int, bool]:
+    m = min(n, ctx.crypto_sample)
+    txs = ctx.signed(m)
+    for tx in txs:
+        tx.invalidate()
+    return _timed(lambda: [TransactionService.is_valid(tx) for tx in txs]), m, m < n
+
+
+def case_merkle_root(ctx: Context, n: int) -> Tuple[float, int, bool]:
+    # Transaction mới mỗi lần: không dùng leaf hash đã memo từ lần trước
+    txs = [Transaction.from_dict(tx.to_dict()) for tx in ctx.fake_txs(n)]
+    return _timed(lambda: BlockService.calculate_merkle_root(txs)), n, False
+
+
+def case_sign_block(ctx: Context, n: int) -> Tuple[float, int, bool]:
+    block = ctx.block(n)
+    repeat = 50
+
+    def run():
+        for _ in range(repeat):
+            block._memo.clear()
+            BlockService.sign_block(block, ctx.sk)
+
+    return _timed(run), repeat, False
+
+
+def case_verify_block(ctx: Context, n: int) -> Tuple[float, int, bool]:
+    block = ctx.block(n)
+    repeat = 50
+
+    def run():
+        for _ in range(repeat):
+            block._memo.clear()
+            BlockService.verify_block(block)
+
+    return _timed(run), repeat, False
+
+
+def case_mempool_admit(ctx: Context, n: int) -> Tuple[float, int, bool]:
+    blockchain = ctx.blockchain(n)
+    txs = ctx.fake_txs(n)
+    return _timed(lambda: BlockChainService.add_signed_transactions_to_mempool(blockchain, txs)), n, False
+
+
+def case_mine_block(ctx: Context, n: int) -> Tuple[float, int, bool]:
+    blockchain = ctx.blockchain(n)
+    BlockChainService.add_signed_transactions_to_mempool(blockchain, ctx.fake_txs(n))
+    return _timed(lambda: BlockChainService.mine_block(blockchain, ctx.sk, ctx.pubkey)), n, False
+
+
+def case_add_block(ctx: Context, n: int) -> Tuple[float, int, bool]:
+    blockchain = ctx.blockchain(n)
+    BlockChainService.add_signed_transactions_to_mempool(blockchain, ctx.fake_txs(n))
+    block = BlockChainService.mine_block(blockchain, ctx.sk, ctx.pubkey)
+    return _timed(lambda: BlockChainService.add_block(blockchain, block)), n, False
+
+
+def case_db_insert(ctx: Context, n: int) -> Tuple[float, int, bool]:
+    txs = ctx.fake_txs(n)
+    blockchain = ctx.blockchain(DEFAULT_DB_BLOCK_TXS)
+    blocks = []
+    for i in range(0, n, DEFAULT_DB_BLOCK_TXS):
+        BlockChainService.add_signed_transactions_to_mempool(blockchain, txs[i:i + DEFAULT_DB_BLOCK_TXS])
+        block = BlockChainService.mine_block(blockchain, ctx.sk, ctx.pubkey)
+        BlockChainService.add_block(blockchain, block)
+        blocks.append(block)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = BlockRepository(os.path.join(tmp, "bench.db"))
+        elapsed = _timed(lambda: repo.save_blocks(blocks))
+        repo.close()
+    return elapsed, n, False
+
+
+CASES: Dict[str, Case] = {
+    "tx.sign": case_tx_sign,
+    "tx.is_valid": case_tx_is_valid,
+    "block.merkle_root": case_merkle_root,
+    "block.sign": case_sign_block,
+    "block.verify": case_verify_block,
+    "mempool.admit": case_mempool_admit,
+    "chain.mine_block": case_mine_block,
+    "chain.add_block": case_add_block,
+    "db.insert": case_db_insert,
+}
+
+
+def run_suite(sizes: List[int], cases: List[str], repeat: int, crypto_sample: int) -> Dict[str, Any]:
+    results = []
+    ctx = Context(crypto_sample)
+    for n in sizes:
+        for name in cases:
+            # Lấy lần nhanh nhất: ít nhiễu nhất khi so sánh giữa các lần chạy
+            best = None
+            for _ in range(repeat):
+                elapsed, ops, sampled = CASES[name](ctx, n)
+                if best is None or elapsed < best[0]:
+                    best = (elapsed, ops, sampled)
+            elapsed, ops, sampled = best
+            result = {
+                "case": name,
+                "n": n,
+                "ops": ops,
+                "sampled": sampled,
+                "seconds": elapsed,
+                "us_per_op": elapsed / ops * 1e6,
+                "ops_per_s": ops / elapsed if elapsed > 0 else float("inf"),
+            }
+            results.append(result)
+            print(f"{name:<18} n={n:<7} {result['us_per_op']:10.2f} us/op {result['ops_per_s']:12.0f} ops/s"
+                  f"{' (sampled)' if sampled else ''}", flush=True)
+    return {"meta": _meta(repeat, crypto_sample), "results": results}
+
+
+def _meta(repeat: int, crypto_sample: int) -> Dict[str, Any]:
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+    return {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_revision": revision,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "repeat": repeat,
+        "crypto_sample": crypto_sample,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """Các case có us_per_op tăng quá `threshold` (tỉ lệ) so với baseline."""
+    base = {(r["case"], r["n"]): r for r in baseline["results"]}
+    regressions = []
+    for r in current["results"]:
+        old = base.get((r["case"], r["n"]))
+        if old is None:
+            continue
+        ratio = r["us_per_op"] / old["us_per_op"] if old["us_per_op"] > 0 else 1.0
+        r["baseline_us_per_op"] = old["us_per_op"]
+        r["ratio"] = ratio
+        if ratio > 1.0 + threshold:
+            regressions.append(r)
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Micro-benchmark suite for crypto and ledger hot paths")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--cases", nargs="+", default=list(CASES), choices=list(CASES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--crypto-sample", type=int, default=DEFAULT_CRYPTO_SAMPLE)
+    parser.add_argument("--out", default=None, help="Ghi kết quả JSON ra file")
+    parser.add_argument("--compare", default=None, help="File JSON baseline để so sánh")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Chậm hơn bao nhiêu (tỉ lệ) thì báo lỗi")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.sizes, args.cases, args.repeat, args.crypto_sample)
+
+    exit_code = 0
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        report["baseline"] = baseline.get("meta")
+        report["regressions"] = [(r["case"], r["n"]) for r in regressions]
+        for r in report["results"]:
+            if "ratio" in r:
+                flag = "REGRESSION" if r in regressions else "ok"
+                print(f"{r['case']:<18} n={r['n']:<7} {r['ratio']:6.2f}x baseline  {flag}")
+        exit_code = 1 if regressions else 0
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""
+Đo tốc độ đồng bộ ban đầu (headers-first) từ các peer localhost, so với tải
+từng block một từ một peer. Peer giả lập độ trễ mạng (--latency-ms) trước
+mỗi câu trả lời, vì trên localhost độ trễ gần như bằng 0.
+
+Cách chạy (từ thư mục back_end):
+    python -m benchmarks.bench_sync --blocks 200 --txs-per-block 20 --peers 3 --latency-ms 20
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ecdsa import SigningKey, SECP256k1
+
+from app.models.BlockChain import BlockChain
+from app.models.Transaction import Transaction
+from app.network.gossip import GossipNode
+from app.network.sync import DEFAULT_BATCH_SIZE, DEFAULT_REQUESTS_PER_PEER, DEFAULT_WINDOW, InitialSync
+from app.services.BlockChainService import BlockChainService
+from app.services.TransactionService import TransactionService
+
+
+class LaggyNode(GossipNode):
+    """Peer trả lời GETHEADERS / GETBLOCKS sau một khoảng trễ (không chặn các câu hỏi khác)."""
+
+    def __init__(self, blockchain: BlockChain, latency: float):
+        super().__init__(blockchain)
+        self.latency = latency
+
+    async def _on_getheaders(self, peer, query):
+        await asyncio.sleep(self.latency)
+        await super()._on_getheaders(peer, query)
+
+    async def _on_getblocks(self, peer, query):
+        asyncio.get_running_loop().create_task(self._delayed_blocks(peer, query))
+
+    async def _delayed_blocks(self, peer, query):
+        await asyncio.sleep(self.latency)
+        await GossipNode._on_getblocks(self, peer, query)
+
+
+def build_chain(blocks: int, txs_per_block: int) -> BlockChain:
+    sk = SigningKey.generate(curve=SECP256k1)
+    pubkey = sk.get_verifying_key().to_string().hex()
+    blockchain = BlockChain()
+    BlockChainService.create_genesis_block(blockchain, pubkey)
+    blockchain.mempool.max_per_sender = blockchain.mempool.max_count
+    for height in range(1, blocks + 1):
+        txs = []
+        for i in range(txs_per_block):
+            tx = Transaction(sender_pubkey=pubkey, payload={"op": "set", "key": f"k{height}_{i}", "value": i},
+                             timestamp=1_700_000_000.0 + height * txs_per_block + i)
+            TransactionService.sign_with_key(tx, sk)
+            txs.append(tx)
+        BlockChainService.add_signed_transactions_to_mempool(blockchain, txs)
+        BlockChainService.add_block(blockchain, BlockChainService.mine_block(blockchain, sk, pubkey))
+    return blockchain
+
+
+async def run(source: BlockChain, peers: int, batch_size: int, window: int, per_peer: int, latency: float) -> dict:
+    servers = [LaggyNode(source, latency) for _ in range(peers)]
+    ports = [await server.start() for server in servers]
+    node = GossipNode(BlockChain())
+    for port in ports:
+        await node.connect("127.0.0.1", port)
+    await asyncio.sleep(0.05)
+    try:
+        return await InitialSync(node, batch_size=batch_size, window=window, requests_per_peer=per_peer).run()
+    finally:
+        await node.stop()
+        for server in servers:
+            await server.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Headers-first initial sync rate")
+    parser.add_argument("--blocks", type=int, default=200)
+    parser.add_argument("--txs-per-block", type=int, default=20)
+    parser.add_argument("--peers", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--window", type=int, default=DEFAULT_WINDOW)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    print(f"Tạo chain {args.blocks} block x {args.txs_per_block} tx ...")
+    source = build_chain(args.blocks, args.txs_per_block)
+
+    cases = [
+        ("từng block, 1 peer", 1, 1, 1, 1),
+        (f"headers-first, {args.peers} peer", args.peers, args.batch_size, args.window, DEFAULT_REQUESTS_PER_PEER),
+    ]
+    for name, peers, batch_size, window, per_peer in cases:
+        report = asyncio.run(run(source, peers, batch_size, window, per_peer, args.latency_ms / 1000))
+        print(
+            f"{name:<24} complete={report['complete']} blocks={report['blocks']} "
+            f"headers={report['headers_seconds'] * 1000:7.1f} ms total={report['seconds']:6.2f} s "
+            f"{report['blocks_per_s']:7.1f} blocks/s {report['txs_per_s']:7.1f} tx/s "
+            f"{report['bytes_received'] / 1024:8.0f} KiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from aiohttp.test_utils import AioHTTPTestCase
+from ecdsa import SigningKey, SECP256k1
+
+from app.main import create_app
+from app.models.BlockChain import BlockChain
+from app.models.Client import client
+from app.models.CredentialIndex import CredentialIndex
+from app.models.NFT import NFT
+from app.models.NFTmetadata import NFTmetadata
+from app.models.Transaction import Transaction
+from app.repositories.CredentialRepository import CredentialRepository
+from app.services.BlockChainService import BlockChainService
+from app.services.CredentialIndexService import CredentialIndexService
+from app.services.LightClientService import LightClientService
+from app.services.NFTService import NFTService
+from app.services.TransactionService import TransactionService
+
+
+def build_chain(blocks: int) -> tuple:
+    sk = SigningKey.generate(curve=SECP256k1)
+    pubkey = sk.get_verifying_key().to_string().hex()
+    blockchain = BlockChain()
+    blockchain.credential_index = CredentialIndex()
+    BlockChainService.create_genesis_block(blockchain, pubkey)
+    for height in range(1, blocks + 1):
+        metadata = NFTmetadata(f"SV{height}", "Bachelor", "u", "ab" * 32, "Uni0", 1_700_000_000)
+        tx = NFTService.build_mint_transaction(NFT(pubkey, metadata, client("cc" * 64, f"addr_{height}", f"c{height}")))
+        TransactionService.sign(tx, sk.to_string().hex())
+        BlockChainService.add_transaction_to_mempool(blockchain, tx)
+        BlockChainService.add_block(blockchain, BlockChainService.mine_block(blockchain, sk, pubkey))
+    return blockchain, sk, pubkey
+
+
+class TestReadApi(AioHTTPTestCase):
+    """Test suite for the async read API"""
+
+    async def get_application(self):
+        self.blockchain, self.sk, self.pubkey = build_chain(12)
+        return create_app(self.blockchain, finality_depth=6)
+
+    async def test_head_and_blocks(self):
+        """Test if head, block by height and block by hash agree"""
+        head = await (await self.client.get("/api/v1/head")).json()
+        self.assertEqual(head["height"], 12)
+        self.assertEqual(head["finalized_height"], 6)
+
+        by_height = await (await self.client.get("/api/v1/blocks/12")).json()
+        by_hash = await (await self.client.get(f"/api/v1/blocks/hash/{head['block_hash']}")).json()
+        self.assertEqual(by_height, by_hash)
+        self.assertEqual((await self.client.get("/api/v1/blocks/99")).status, 404)
+
+    async def test_finalized_block_etag(self):
+        """Test if finalized blocks are immutable-cached and revalidate to 304"""
+        resp = await self.client.get("/api/v1/blocks/3")
+        self.assertIn("immutable", resp.headers["Cache-Control"])
+        etag = resp.headers["ETag"]
+        again = await self.client.get("/api/v1/blocks/3", headers={"If-None-Match": etag})
+        self.assertEqual(again.status, 304)
+
+        tip = await self.client.get("/api/v1/blocks/12")
+        self.assertEqual(tip.headers["Cache-Control"], "no-cache")
+
+    async def test_cursor_pagination(self):
+        """Test if block pages walk the whole chain newest-first without gaps"""
+        heights, cursor = [], None
+        while True:
+            url = "/api/v1/blocks?limit=5" + (f"&cursor={cursor}" if cursor else "")
+            page = await (await self.client.get(url)).json()
+            heights.extend(item["height"] for item in page["items"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        self.assertEqual(heights, list(range(12, -1, -1)))
+
+        # Cursor vượt quá đỉnh chain bắt đầu từ đỉnh thay vì lỗi 500
+        resp = await self.client.get("/api/v1/blocks?limit=3&cursor=50")
+        self.assertEqual(resp.status, 200)
+        self.assertEqual([item["height"] for item in (await resp.json())["items"]], [12, 11, 10])
+        self.assertEqual((await self.client.get("/api/v1/blocks?cursor=-1")).status, 400)
+
+    async def test_transactions_and_credentials(self):
+        """Test if tx and credential lookups resolve confirmed and pending data"""
+        tx = self.blockchain.chain[4].transactions[0]
+        found = await (await self.client.get(f"/api/v1/txs/{tx.tx_id}")).json()
+        self.assertEqual((found["status"], found["height"]), ("confirmed", 4))
+
+        pending = Transaction(sender_pubkey=self.pubkey, payload={"op": "set", "key": "k", "value": 1})
+        TransactionService.sign(pending, self.sk.to_string().hex())
+        BlockChainService.add_transaction_to_mempool(self.blockchain, pending)
+        found = await (await self.client.get(f"/api/v1/txs/{pending.tx_id}")).json()
+        self.assertEqual(found["status"], "pending")
+
+        token_id = tx.payload["token_id"]
+        credential = await (await self.client.get(f"/api/v1/credentials/{token_id}")).json()
+        self.assertEqual(credential["student_id"], "SV4")
+        by_student = await (await self.client.get("/api/v1/credentials?student_id=SV4")).json()
+        self.assertEqual([r["token_id"] for r in by_student["items"]], [token_id])
+
+    async def test_transaction_proof(self):
+        """Test if the proof endpoint yields a bundle the light client accepts"""
+        tx = self.blockchain.chain[5].transactions[0]
+        bundle = await (await self.client.get(f"/api/v1/txs/{tx.tx_id}/proof")).json()
+
+        chain = LightClientService.from_genesis(self.blockchain.chain[0])
+        LightClientService.add_headers(chain, self.blockchain.chain[1:])
+        self.assertTrue(LightClientService.verify_credential(chain, bundle)["valid"])
+
+        missing = await self.client.get(f"/api/v1/txs/{'00' * 32}/proof")
+        self.assertEqual(missing.status, 404)
+
+    async def test_streaming_export(self):
+        """Test if the NDJSON export yields every block in the range"""
+        resp = await self.client.get("/api/v1/export/blocks?start=2&end=11")
+        lines = [line for line in (await resp.text()).split("\n") if line]
+        self.assertEqual(len(lines), 10)
+        self.assertEqual((await self.client.get("/api/v1/export/blocks?start=5&end=1")).status, 400)
+
+
+class TestCredentialRepositoryApi(AioHTTPTestCase):
+    """Test suite for credential lookups served from the SQLite index"""
+
+    async def get_application(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.blockchain = BlockChain()
+        self.blockchain.credential_index = CredentialRepository(os.path.join(self.tmp.name, "credentials.db"))
+        source, _, _ = build_chain(4)
+        for block in source.chain:
+            CredentialIndexService.index_block(self.blockchain.credential_index, block)
+        self.source = source
+        return create_app(self.blockchain)
+
+    async def tearDownAsync(self):
+        self.blockchain.credential_index.close()
+        self.tmp.cleanup()
+
+    async def test_lookups_off_the_event_loop(self):
+        """Test if SQLite-backed credential lookups answer through the thread pool"""
+        token_id = self.source.chain[2].transactions[0].payload["token_id"]
+        credential = await (await self.client.get(f"/api/v1/credentials/{token_id}")).json()
+        self.assertEqual(credential["student_id"], "SV2")
+        page = await (await self.client.get("/api/v1/credentials?institution=Uni0&limit=3")).json()
+        self.assertEqual(len(page["items"]), 3)
+        rest = await (await self.client.get(f"/api/v1/credentials?institution=Uni0&cursor={page['next_cursor']}")).json()
+        self.assertEqual(len(rest["items"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,170 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ecdsa import SigningKey, SECP256k1
+
+from app.models.BlockChain import BlockChain
+from app.models.Transaction import Transaction
+from app.repositories.BlockLogRepository import BlockLogRepository
+from app.services.BlockChainService import BlockChainService
+from app.services.BlockService import BlockService
+from app.services.TransactionService import TransactionService
+
+
+class TestBlockLogRepository(unittest.TestCase):
+    """Test suite for the append-only segmented block log"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.log_dir = os.path.join(self.tmp.name, "blocks")
+        self.sk = SigningKey.generate(curve=SECP256k1)
+        self.pubkey = self.sk.get_verifying_key().to_string().hex()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _build_chain(self, repo: BlockLogRepository, n_blocks: int = 3) -> BlockChain:
+        blockchain = BlockChain()
+        blockchain.block_store = repo
+        BlockChainService.create_genesis_block(blockchain, self.pubkey)
+        for height in range(1, n_blocks + 1):
+            for i in range(4):
+                tx = Transaction(
+                    sender_pubkey=self.pubkey,
+                    sender_address="addr_sender",
+                    recipient_address="addr_recipient",
+                    payload={"op": "set", "key": f"k{height}_{i}", "value": {"n": i}},
+                )
+                TransactionService.sign(tx, self.sk.to_string().hex())
+                BlockChainService.add_transaction_to_mempool(blockchain, tx)
+            block = BlockChainService.mine_block(blockchain, self.sk, self.pubkey)
+            BlockChainService.add_block(blockchain, block)
+        return blockchain
+
+    def _last_segment(self) -> str:
+        return os.path.join(self.log_dir, sorted(n for n in os.listdir(self.log_dir) if n.endswith(".log"))[-1])
+
+    def test_round_trip(self):
+        """Test if stored blocks read back by height and hash with identical hashes"""
+        with BlockLogRepository(self.log_dir) as repo:
+            blockchain = self._build_chain(repo)
+            self.assertEqual(repo.get_height(), 3)
+
+            for original in blockchain.chain:
+                loaded = repo.get_block_by_height(original.index)
+                self.assertEqual(BlockService.calculate_hash(loaded), original.block_hash)
+                self.assertEqual(
+                    [tx.tx_id for tx in loaded.transactions],
+                    [tx.tx_id for tx in original.transactions],
+                )
+                if original.index > 0:
+                    self.assertTrue(BlockService.verify_block(loaded))
+
+            last = blockchain.get_last_block()
+            self.assertEqual(repo.get_block_by_hash(last.block_hash).index, last.index)
+            self.assertIsNone(repo.get_block_by_hash("ab" * 32))
+            self.assertIsNone(repo.get_block_by_height(4))
+            self.assertEqual([b.index for b in repo.iter_blocks(1)], [1, 2, 3])
+
+    def test_out_of_order_block_keeps_buffer(self):
+        """Test if a non-appending block is refused without dropping blocks still waiting to be flushed"""
+        with BlockLogRepository(os.path.join(self.tmp.name, "source")) as source_repo:
+            source = self._build_chain(source_repo, n_blocks=3)
+        with BlockLogRepository(self.log_dir, group_commit=8) as repo:
+            repo.save_block(source.chain[0])
+            repo.save_block(source.chain[1])
+            with self.assertRaises(ValueError):
+                repo.save_block(source.chain[3])
+            with self.assertRaises(ValueError):
+                repo.save_blocks([source.chain[2], source.chain[2]])
+            repo.save_block(source.chain[2])
+            repo.flush()
+            self.assertEqual([b.block_hash for b in repo.iter_blocks()], [b.block_hash for b in source.chain[:3]])
+
+    def test_failed_flush_keeps_buffer(self):
+        """Test if a flush that fails on write keeps its blocks and leaves no partial records behind"""
+        with BlockLogRepository(os.path.join(self.tmp.name, "source")) as source_repo:
+            source = self._build_chain(source_repo, n_blocks=4)
+        with BlockLogRepository(self.log_dir, group_commit=8, segment_size=2048) as repo:
+            repo.save_blocks(source.chain[:2])
+            repo.save_block(source.chain[2])
+            repo.save_block(source.chain[3])
+            # Lỗi đĩa sau khi segment đã được ghi (và đã chuyển segment)
+            with mock.patch.object(repo, "_sync_segment", side_effect=[None, OSError("disk full")]):
+                with self.assertRaises(OSError):
+                    repo.save_block(source.chain[4])
+                    repo.flush()
+            self.assertEqual((len(repo), len(repo._pending)), (2, 3))
+            self.assertEqual(repo.get_height(), 4)
+
+        with BlockLogRepository(self.log_dir, segment_size=2048) as repo:
+            self.assertEqual([b.block_hash for b in repo.iter_blocks()], [b.block_hash for b in source.chain])
+
+    def test_segment_rollover(self):
+        """Test if the log rolls over to new segments and still reads every block"""
+        with BlockLogRepository(self.log_dir, segment_size=2048) as repo:
+            blockchain = self._build_chain(repo, n_blocks=6)
+
+        self.assertGreater(len([n for n in os.listdir(self.log_dir) if n.endswith(".log")]), 2)
+        with BlockLogRepository(self.log_dir, segment_size=2048) as repo:
+            self.assertEqual(
+                [b.block_hash for b in repo.iter_blocks()],
+                [b.block_hash for b in blockchain.chain],
+            )
+
+    def test_torn_tail_is_truncated(self):
+        """Test if a torn tail write is cut off on reopen and appends continue after it"""
+        with BlockLogRepository(self.log_dir) as repo:
+            blockchain = self._build_chain(repo)
+        segment = self._last_segment()
+        size = os.path.getsize(segment)
+        with open(segment, "r+b") as f:
+            f.truncate(size - 7)
+
+        with BlockLogRepository(self.log_dir) as repo:
+            self.assertEqual(repo.get_height(), 2)
+            self.assertIsNone(repo.get_block_by_hash(blockchain.chain[3].block_hash))
+            # Ghi lại block bị mất
+            repo.save_block(blockchain.chain[3])
+
+        with BlockLogRepository(self.log_dir) as repo:
+            self.assertEqual(repo.get_height(), 3)
+            self.assertEqual(repo.get_block_by_height(3).block_hash, blockchain.chain[3].block_hash)
+
+    def test_index_rebuilt_from_segments(self):
+        """Test if blocks written without an index entry are recovered from the segments"""
+        with BlockLogRepository(self.log_dir, segment_size=2048) as repo:
+            blockchain = self._build_chain(repo, n_blocks=4)
+        index_path = os.path.join(self.log_dir, "index.bin")
+        with open(index_path, "r+b") as f:
+            f.truncate(os.path.getsize(index_path) - 60)
+
+        with BlockLogRepository(self.log_dir, segment_size=2048) as repo:
+            self.assertEqual(repo.get_height(), 4)
+            for original in blockchain.chain:
+                self.assertEqual(repo.get_block_by_hash(original.block_hash).index, original.index)
+
+    def test_restore_from_log(self):
+        """Test if a node restarts from the block log with the same state"""
+        with BlockLogRepository(self.log_dir) as repo:
+            blockchain = self._build_chain(repo)
+
+        restored = BlockChain()
+        restored.block_store = BlockLogRepository(self.log_dir)
+        report = BlockChainService.restore_from_store(restored)
+        restored.block_store.close()
+
+        self.assertEqual(report["height"], 3)
+        self.assertEqual(restored.state_db, blockchain.state_db)
+        self.assertEqual(restored.get_last_block().block_hash, blockchain.get_last_block().block_hash)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
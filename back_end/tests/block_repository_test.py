@@ -0,0 +1,114 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ecdsa import SigningKey, SECP256k1
+
+from app.models.BlockChain import BlockChain
+from app.models.Transaction import Transaction
+from app.repositories.BlockRepository import BlockRepository
+from app.services.BlockChainService import BlockChainService
+from app.services.BlockService import BlockService
+from app.services.TransactionService import TransactionService
+
+
+class TestBlockRepository(unittest.TestCase):
+    """Test suite for the SQLite block store"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "chain.db")
+        self.sk = SigningKey.generate(curve=SECP256k1)
+        self.pubkey = self.sk.get_verifying_key().to_string().hex()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _build_chain(self, repo: BlockRepository, n_blocks: int = 3) -> BlockChain:
+        blockchain = BlockChain()
+        blockchain.block_store = repo
+        BlockChainService.create_genesis_block(blockchain, self.pubkey)
+        for height in range(1, n_blocks + 1):
+            for i in range(4):
+                tx = Transaction(
+                    sender_pubkey=self.pubkey,
+                    sender_address="addr_sender",
+                    recipient_address="addr_recipient",
+                    payload={"op": "set", "key": f"k{height}_{i}", "value": {"n": i}},
+                )
+                TransactionService.sign(tx, self.sk.to_string().hex())
+                BlockChainService.add_transaction_to_mempool(blockchain, tx)
+            block = BlockChainService.mine_block(blockchain, self.sk, self.pubkey)
+            BlockChainService.add_block(blockchain, block)
+        return blockchain
+
+    def test_round_trip(self):
+        """Test if stored blocks read back with identical hashes and tx order"""
+        with BlockRepository(self.db_path) as repo:
+            blockchain = self._build_chain(repo)
+            self.assertEqual(repo.get_height(), 3)
+
+            for original in blockchain.chain:
+                loaded = repo.get_block_by_height(original.index)
+                self.assertEqual(BlockService.calculate_hash(loaded), original.block_hash)
+                self.assertEqual(
+                    [tx.tx_id for tx in loaded.transactions],
+                    [tx.tx_id for tx in original.transactions],
+                )
+                if original.index > 0:
+                    self.assertTrue(BlockService.verify_block(loaded))
+
+            last = blockchain.get_last_block()
+            self.assertEqual(repo.get_block_by_hash(last.block_hash).index, last.index)
+            self.assertEqual([b.index for b in repo.iter_blocks(1)], [1, 2, 3])
+
+    def test_group_commit_buffers_until_flush(self):
+        """Test if group commit keeps blocks pending until the group is full"""
+        repo = BlockRepository(self.db_path, group_commit=10)
+        self._build_chain(repo, n_blocks=2)
+
+        other = BlockRepository(self.db_path)
+        self.assertEqual(other.get_height(), -1)
+        repo.flush()
+        self.assertEqual(other.get_height(), 2)
+        other.close()
+        repo.close()
+
+    def test_failed_flush_keeps_buffer(self):
+        """Test if blocks stay buffered when the group commit is rolled back"""
+        with BlockRepository(os.path.join(self.tmp.name, "source.db")) as source_repo:
+            source = self._build_chain(source_repo, n_blocks=3)
+        with BlockRepository(self.db_path, group_commit=10) as repo:
+            repo.save_blocks(source.chain[:2])
+            insert_block = repo._insert_block
+
+            def failing_insert(cursor, block):
+                if block.index == 3:
+                    raise OSError("disk full")
+                insert_block(cursor, block)
+
+            repo.save_block(source.chain[2])
+            repo.save_block(source.chain[3])
+            with mock.patch.object(repo, "_insert_block", side_effect=failing_insert):
+                with self.assertRaises(OSError):
+                    repo.flush()
+            self.assertEqual(repo.conn.execute("SELECT MAX(index_num) FROM block").fetchone()[0], 1)
+            self.assertEqual(len(repo._pending), 2)
+            self.assertEqual(repo.get_height(), 3)
+            self.assertEqual(repo.get_block_by_height(3).block_hash, source.chain[3].block_hash)
+
+    def test_wal_mode_enabled(self):
+        """Test if the repository switches the database to WAL mode"""
+        with BlockRepository(self.db_path) as repo:
+            mode = repo.conn.execute("PRAGMA journal_mode").fetchone()[0]
+            self.assertEqual(mode.lower(), "wal")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,117 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ecdsa import SigningKey, SECP256k1
+
+from app.models.BlockChain import BlockChain
+from app.repositories.BlockRepository import BlockRepository
+from app.services.BlockChainService import BlockChainService
+from app.services.BulkMintService import BulkMintService
+from app.services.ExecutionService import NFT_KEY_PREFIX
+from app.services.NFTService import NFTService
+from app.services.TransactionService import TransactionService
+
+
+def write_graduates(path: str, n: int) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("student_id,degree_type,pdf_url,pdf_hash,institution,issued_at,recipient_pubkey,recipient_address\n")
+        for i in range(n):
+            f.write(f"SV{i:05d},Bachelor,https://example.edu/{i}.pdf,{i:064x},Uni0,1700000000,{'cc' * 64},addr_{i}\n")
+
+
+class TestBulkMint(unittest.TestCase):
+    """Test suite for the bulk NFT minting pipeline"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "chain.db")
+        self.csv_path = os.path.join(self.tmp.name, "graduates.csv")
+        self.checkpoint = os.path.join(self.tmp.name, "mint.ckpt")
+        self.sk = SigningKey.generate(curve=SECP256k1)
+        self.pubkey = self.sk.get_verifying_key().to_string().hex()
+        write_graduates(self.csv_path, 60)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _blockchain(self) -> BlockChain:
+        blockchain = BlockChain()
+        blockchain.max_block_txs = 16
+        blockchain.block_store = BlockRepository(self.db_path, group_commit=8)
+        if blockchain.block_store.get_height() >= 0:
+            BlockChainService.restore_from_store(blockchain)
+        else:
+            BlockChainService.create_genesis_block(blockchain, self.pubkey)
+        return blockchain
+
+    def test_mints_into_bounded_blocks(self):
+        """Test if every graduate is minted once in size-bounded signed blocks"""
+        blockchain = self._blockchain()
+        rows = BulkMintService.load_graduates(self.csv_path)
+        report = BulkMintService.run(blockchain, rows, self.sk, batch_size=25, max_workers=2, chunk_size=10)
+        blockchain.block_store.close()
+
+        self.assertEqual(report["minted"], 60)
+        self.assertEqual(sum(1 for key in blockchain.state_db if key.startswith(NFT_KEY_PREFIX)), 60)
+        for block in blockchain.chain[1:]:
+            self.assertLessEqual(len(block.transactions), 16)
+            self.assertTrue(all(TransactionService.is_valid(tx) and NFTService.is_mint(tx) for tx in block.transactions))
+
+    def test_resume_after_crash_does_not_double_mint(self):
+        """Test if a rerun after a crash past the checkpoint skips minted rows"""
+        rows = BulkMintService.load_graduates(self.csv_path)
+        blockchain = self._blockchain()
+        BulkMintService.run(blockchain, rows[:40], self.sk, checkpoint_path=self.checkpoint, batch_size=20, max_workers=1)
+        blockchain.block_store.close()
+        # Giả lập crash sau khi lưu block nhưng trước khi checkpoint tiến lên
+        BulkMintService.save_checkpoint(self.checkpoint, 20, 0)
+
+        blockchain = self._blockchain()
+        report = BulkMintService.run(blockchain, rows, self.sk, checkpoint_path=self.checkpoint, batch_size=20, max_workers=1)
+        blockchain.block_store.close()
+
+        self.assertEqual(report["start_row"], 20)
+        self.assertEqual((report["skipped"], report["minted"]), (20, 20))
+        self.assertEqual(BulkMintService.load_checkpoint(self.checkpoint), 60)
+        minted = [tx.payload["token_id"] for block in blockchain.chain for tx in block.transactions]
+        self.assertEqual(len(minted), len(set(minted)))
+        self.assertEqual(len(minted), 60)
+
+    def test_counts_only_rows_that_reach_the_chain(self):
+        """Test if mempool caps and duplicate rows neither inflate minted nor push the checkpoint past lost rows"""
+        rows = BulkMintService.load_graduates(self.csv_path)[:6]
+        blockchain = self._blockchain()
+        blockchain.mempool.max_per_sender = 3
+        report = BulkMintService.run(
+            blockchain, rows + rows[:2], self.sk, checkpoint_path=self.checkpoint, batch_size=8, max_workers=1
+        )
+        self.assertEqual((report["minted"], report["skipped"], report["failed"]), (6, 2, 0))
+        self.assertEqual(sum(1 for key in blockchain.state_db if key.startswith(NFT_KEY_PREFIX)), 6)
+        self.assertEqual(BulkMintService.load_checkpoint(self.checkpoint), 8)
+
+        # Mempool từ chối mọi transaction: lô không được tính, checkpoint đứng yên
+        more = BulkMintService.load_graduates(self.csv_path)[6:10]
+        blockchain.max_block_bytes = 1
+        report = BulkMintService.run(
+            blockchain, rows + rows[:2] + more, self.sk, checkpoint_path=self.checkpoint, batch_size=8, max_workers=1
+        )
+        blockchain.block_store.close()
+        self.assertEqual((report["minted"], report["failed"]), (0, 4))
+        self.assertEqual(BulkMintService.load_checkpoint(self.checkpoint), 8)
+
+    def test_rejects_rows_without_issued_at(self):
+        """Test if rows that would yield a non-deterministic token_id are refused"""
+        with open(self.csv_path, "a", encoding="utf-8") as f:
+            f.write(f"SV99999,Bachelor,u,h,Uni0,,{'cc' * 64},addr_x\n")
+        with self.assertRaises(ValueError):
+            BulkMintService.load_graduates(self.csv_path)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
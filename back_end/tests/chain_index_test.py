@@ -0,0 +1,153 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ecdsa import SigningKey, SECP256k1
+
+from app.core import codec
+from app.models.BlockChain import BlockChain
+from app.models.ChainIndex import ChainIndex, block_tx_keys
+from app.models.Transaction import Transaction
+from app.repositories.BlockLogRepository import BlockLogRepository
+from app.repositories.ChainIndexRepository import ChainIndexRepository
+from app.services.BlockChainService import BlockChainService
+from app.services.ChainQueryService import ChainQueryService
+from app.services.TransactionService import TransactionService
+
+
+class TestChainIndex(unittest.TestCase):
+    """Test suite for the block-hash and tx-location indexes on BlockChain"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.sk = SigningKey.generate(curve=SECP256k1)
+        cls.pubkey = cls.sk.get_verifying_key().to_string().hex()
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "index.db")
+        self.log_dir = os.path.join(self.tmp.name, "blocks")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _tx(self, key: str) -> Transaction:
+        tx = Transaction(
+            sender_pubkey=self.pubkey,
+            sender_address="addr_sender",
+            recipient_address="addr_recipient",
+            payload={"op": "set", "key": key, "value": 1},
+        )
+        TransactionService.sign(tx, self.sk.to_string().hex())
+        return tx
+
+    def _mine(self, blockchain: BlockChain, keys) -> None:
+        for key in keys:
+            BlockChainService.add_transaction_to_mempool(blockchain, self._tx(key))
+        block = BlockChainService.mine_block(blockchain, self.sk, self.pubkey)
+        BlockChainService.add_block(blockchain, block)
+
+    def _build_chain(self, index=None, store=None, n_blocks: int = 5) -> BlockChain:
+        blockchain = BlockChain()
+        if index is not None:
+            blockchain.chain_index = index
+        blockchain.block_store = store
+        BlockChainService.create_genesis_block(blockchain, self.pubkey)
+        for height in range(1, n_blocks + 1):
+            self._mine(blockchain, [f"k{height}_{i}" for i in range(3)])
+        return blockchain
+
+    def _check_lookups(self, blockchain: BlockChain, index) -> None:
+        for height, block in enumerate(blockchain.chain):
+            self.assertEqual(index.block_height(block.block_hash), height)
+            for position, tx in enumerate(block.transactions):
+                self.assertEqual(index.tx_location(tx.tx_id), (height, position))
+                self.assertTrue(index.has_tx(tx.tx_id))
+        self.assertIsNone(index.block_height("00" * 32))
+        self.assertIsNone(index.tx_location("00" * 32))
+
+    def test_incremental_lookups(self):
+        """Test if add_block keeps hash and tx_id lookups current without scanning the chain"""
+        blockchain = self._build_chain()
+        index = blockchain.chain_index
+        self.assertEqual(index.height, 5)
+        self.assertEqual(len(index), 15)
+        self._check_lookups(blockchain, index)
+
+        query = ChainQueryService(blockchain)
+        block = blockchain.chain[3]
+        self.assertIs(query.block_by_hash(block.block_hash), block)
+        self.assertEqual(query.transaction(block.transactions[2].tx_id)[1:], (3, 2))
+
+    def test_duplicate_transactions_rejected(self):
+        """Test if transactions already on chain are refused by the mempool and in new blocks"""
+        blockchain = self._build_chain(n_blocks=2)
+        included = blockchain.chain[1].transactions[0]
+        self.assertFalse(BlockChainService.add_transaction_to_mempool(blockchain, included))
+
+        block = BlockChainService.mine_block(blockchain, self.sk, self.pubkey)
+        block.transactions.append(included)
+        self.assertFalse(
+            BlockChainService.is_valid_new_block(blockchain, block, blockchain.get_last_block())
+        )
+
+    def test_replacing_block_drops_higher_entries(self):
+        """Test if indexing a different block at an existing height discards entries from that height up"""
+        blockchain = self._build_chain(n_blocks=3)
+        other = self._build_chain(n_blocks=2)
+        for index in (blockchain.chain_index, ChainIndexRepository(self.db_path)):
+            for block in blockchain.chain:
+                index.add_block(block)
+            index.add_block(other.chain[2])
+            self.assertEqual(index.height, 2)
+            self.assertEqual(index.block_height(other.chain[2].block_hash), 2)
+            self.assertIsNone(index.block_height(blockchain.chain[2].block_hash))
+            self.assertIsNone(index.block_height(blockchain.chain[3].block_hash))
+            self.assertFalse(index.has_tx(blockchain.chain[3].transactions[0].tx_id))
+            self.assertEqual(index.tx_location(blockchain.chain[1].transactions[1].tx_id), (1, 1))
+            index.close()
+
+    def test_disk_index_persists_and_catches_up(self):
+        """Test if the SQLite index survives a restart and only indexes blocks added since"""
+        with BlockLogRepository(self.log_dir) as store:
+            blockchain = self._build_chain(ChainIndexRepository(self.db_path), store, n_blocks=3)
+            blockchain.chain_index.close()
+            # Hai block không vào chỉ mục trên đĩa: khởi động lại phải bổ sung
+            blockchain.chain_index = ChainIndex()
+            for block in blockchain.chain:
+                blockchain.chain_index.add_block(block)
+            self._mine(blockchain, ["late_0"])
+            self._mine(blockchain, ["late_1"])
+
+        restored = BlockChain()
+        restored.chain_index = ChainIndexRepository(self.db_path)
+        self.assertEqual(restored.chain_index.height, 3)
+        restored.block_store = BlockLogRepository(self.log_dir)
+        BlockChainService.restore_from_store(restored)
+        self.assertEqual(restored.chain_index.height, 5)
+        self._check_lookups(blockchain, restored.chain_index)
+        restored.chain_index.close()
+        restored.block_store.close()
+
+    def test_rebuild_from_lazy_blocks(self):
+        """Test if the in-memory index rebuilds from block log tx_ids without decoding transactions"""
+        with BlockLogRepository(self.log_dir) as store:
+            blockchain = self._build_chain(store=store)
+            lazy = store.get_block_by_height(2)
+            self.assertIsInstance(lazy.transactions, codec.LazyTransactions)
+            self.assertEqual(block_tx_keys(lazy), [tx._tx_id for tx in blockchain.chain[2].transactions])
+            self.assertEqual(lazy.transactions._decoded, [None] * 3)
+
+            index = ChainIndex()
+            for block in store.iter_blocks(0):
+                index.add_block(block)
+            self._check_lookups(blockchain, index)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
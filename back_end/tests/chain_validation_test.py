@@ -0,0 +1,77 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ecdsa import SigningKey, SECP256k1
+
+from app.models.BlockChain import BlockChain
+from app.models.Transaction import Transaction
+from app.repositories.BlockRepository import BlockRepository
+from app.services.BlockChainService import BlockChainService
+from app.services.ChainValidationService import ChainValidationService
+from app.services.TransactionService import TransactionService
+
+
+class TestChainValidation(unittest.TestCase):
+    """Test suite for full-chain validation"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "chain.db")
+        self.sk = SigningKey.generate(curve=SECP256k1)
+        self.pubkey = self.sk.get_verifying_key().to_string().hex()
+
+        self.blockchain = BlockChain()
+        self.blockchain.block_store = BlockRepository(self.db_path)
+        BlockChainService.create_genesis_block(self.blockchain, self.pubkey)
+        for height in range(1, 9):
+            for i in range(2):
+                tx = Transaction(
+                    sender_pubkey=self.pubkey,
+                    payload={"op": "set", "key": f"k{height}_{i}", "value": i},
+                )
+                TransactionService.sign(tx, self.sk.to_string().hex())
+                BlockChainService.add_transaction_to_mempool(self.blockchain, tx)
+            block = BlockChainService.mine_block(self.blockchain, self.sk, self.pubkey)
+            BlockChainService.add_block(self.blockchain, block)
+        self.blockchain.block_store.close()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_valid_chain_in_parallel(self):
+        """Test if a good chain passes with chunks spread over a process pool"""
+        seen = []
+        report = ChainValidationService.validate_store(
+            self.db_path, max_workers=2, chunk_size=3, progress=lambda done, total: seen.append(done)
+        )
+        self.assertTrue(report["ok"], report)
+        self.assertEqual(report["blocks"], 9)
+        self.assertEqual(max(seen), 9)
+
+    def test_reports_first_failing_height(self):
+        """Test if a tampered transaction is reported at its block height"""
+        blocks = list(self.blockchain.chain)
+        blocks[5].transactions[1].payload = {"op": "set", "key": "evil", "value": 1}
+        blocks[7].validator_signature = "00" * 64
+
+        report = ChainValidationService.validate_blocks(blocks, max_workers=2, chunk_size=2)
+        self.assertFalse(report["ok"])
+        self.assertEqual(report["first_failing_height"], 5)
+
+    def test_broken_link_between_chunks(self):
+        """Test if a broken pre_hash link at a chunk boundary is detected"""
+        blocks = list(self.blockchain.chain)
+        del blocks[4]
+        report = ChainValidationService.validate_blocks(blocks, max_workers=1, chunk_size=4)
+        self.assertFalse(report["ok"])
+        self.assertEqual(report["first_failing_height"], 5)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
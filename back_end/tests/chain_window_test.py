@@ -0,0 +1,132 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ecdsa import SigningKey, SECP256k1
+
+from app.core import codec
+from app.models.BlockChain import BlockChain
+from app.models.Transaction import Transaction
+from app.repositories.BlockLogRepository import BlockLogRepository
+from app.repositories.BlockRepository import BlockRepository
+from app.services.BlockChainService import BlockChainService
+from app.services.BlockService import BlockService
+from app.services.ChainQueryService import ChainQueryService
+from app.services.TransactionService import TransactionService
+
+
+class TestChainWindow(unittest.TestCase):
+    """Test suite for the hot block window with cold blocks paged from the store"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.sk = SigningKey.generate(curve=SECP256k1)
+        cls.pubkey = cls.sk.get_verifying_key().to_string().hex()
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.log_dir = os.path.join(self.tmp.name, "blocks")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _build_chain(self, store, n_blocks: int = 10, hot_blocks: int = 3) -> BlockChain:
+        blockchain = BlockChain()
+        blockchain.chain.hot_blocks = hot_blocks
+        blockchain.block_store = store
+        BlockChainService.create_genesis_block(blockchain, self.pubkey)
+        for height in range(1, n_blocks + 1):
+            for i in range(2):
+                tx = Transaction(
+                    sender_pubkey=self.pubkey,
+                    sender_address="addr_sender",
+                    recipient_address="addr_recipient",
+                    payload={"op": "set", "key": f"k{height}_{i}", "value": height},
+                )
+                TransactionService.sign(tx, self.sk.to_string().hex())
+                BlockChainService.add_transaction_to_mempool(blockchain, tx)
+            block = BlockChainService.mine_block(blockchain, self.sk, self.pubkey)
+            BlockChainService.add_block(blockchain, block)
+        return blockchain
+
+    def test_only_hot_blocks_stay_in_memory(self):
+        """Test if only the latest blocks stay resident and older ones load from the store"""
+        with BlockLogRepository(self.log_dir) as store:
+            blockchain = self._build_chain(store)
+            chain = blockchain.chain
+            self.assertEqual(len(chain), 11)
+            self.assertEqual([b.index for b in chain.hot()], [8, 9, 10])
+            self.assertEqual(chain[-1].index, 10)
+
+            old = chain[2]
+            self.assertEqual(old.block_hash, blockchain.headers.block_hash(2))
+            self.assertEqual(BlockService.calculate_hash(old), old.block_hash)
+            self.assertIs(chain[2], old)
+            self.assertEqual([b.index for b in chain[1:4]], [1, 2, 3])
+            self.assertEqual(len(list(chain)), 11)
+
+            stats = chain.stats()
+            self.assertEqual(stats["hot_blocks"], 3)
+            self.assertGreater(stats["cache_hits"], 0)
+            self.assertGreater(stats["cache_misses"], 0)
+            self.assertIsNotNone(stats["hit_rate"])
+
+    def test_no_store_keeps_every_block(self):
+        """Test if a chain without a block store never drops blocks"""
+        blockchain = self._build_chain(None, n_blocks=5, hot_blocks=2)
+        self.assertEqual(len(blockchain.chain.hot()), 6)
+        self.assertEqual(blockchain.chain.stats()["cache_misses"], 0)
+
+    def test_memory_ceiling(self):
+        """Test if resident blocks stay under max_bytes, evicting cache then old hot blocks"""
+        with BlockRepository(os.path.join(self.tmp.name, "chain.db")) as store:
+            blockchain = self._build_chain(store, hot_blocks=10)
+            chain = blockchain.chain
+            block_size = len(codec.encode_block(chain[-1]))
+            chain.max_bytes = 3 * block_size
+            for height in range(len(chain)):
+                self.assertEqual(chain[height].index, height)
+                self.assertLessEqual(chain.stats()["resident_bytes"], chain.max_bytes)
+            self.assertLessEqual(len(chain.hot()), 3)
+            self.assertEqual(chain[-1].index, 10)
+
+    def test_cold_transactions_decoded_on_demand(self):
+        """Test if cold blocks from the block log decode transactions lazily and re-encode unchanged"""
+        with BlockLogRepository(self.log_dir) as store:
+            blockchain = self._build_chain(store)
+            block = store.get_block_by_height(4)
+            self.assertIsInstance(block.transactions, codec.LazyTransactions)
+            self.assertEqual(codec.encode_block(block), bytes(store.read_encoded(4)))
+            self.assertEqual(block.transactions._decoded, [None, None])
+
+            tx = block.transactions[1]
+            self.assertTrue(TransactionService.is_valid(tx))
+            self.assertIsNone(block.transactions._decoded[0])
+            self.assertTrue(BlockService.verify_block(blockchain.chain[4]))
+
+    def test_restore_and_query_cold_blocks(self):
+        """Test if a restarted node serves old blocks and transactions through the window"""
+        with BlockLogRepository(self.log_dir) as store:
+            blockchain = self._build_chain(store)
+            tx_id = blockchain.chain[3].transactions[0].tx_id
+
+        restored = BlockChain()
+        restored.chain.hot_blocks = 2
+        restored.block_store = BlockLogRepository(self.log_dir)
+        BlockChainService.restore_from_store(restored)
+        self.assertEqual(restored.state_db, blockchain.state_db)
+        self.assertEqual(len(restored.chain.hot()), 2)
+
+        query = ChainQueryService(restored)
+        self.assertEqual(query.block_by_height(1).block_hash, blockchain.headers.block_hash(1))
+        self.assertEqual(query.transaction(tx_id)[1:], (3, 0))
+        restored.block_store.close()
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
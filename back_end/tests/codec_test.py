@@ -0,0 +1,99 @@
+import hashlib
+import sys
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ecdsa import SigningKey, SECP256k1
+
+from app.core import codec
+from app.models.BlockChain import BlockChain
+from app.models.Transaction import Transaction
+from app.services.BlockChainService import BlockChainService
+from app.services.BlockService import BlockService
+from app.services.TransactionService import TransactionService
+
+
+class TestCodec(unittest.TestCase):
+    """Test suite for the canonical binary codec"""
+
+    def setUp(self):
+        self.sk = SigningKey.generate(curve=SECP256k1)
+        self.pubkey = self.sk.get_verifying_key().to_string().hex()
+        self.tx = Transaction(
+            sender_pubkey=self.pubkey,
+            sender_address="addr_sender",
+            recipient_address="ABCDEF",
+            payload={"op": "set", "key": "k", "value": [1, 2]},
+            timestamp=1_700_000_000.5,
+        )
+        TransactionService.sign(self.tx, self.sk.to_string().hex())
+
+    def test_transaction_round_trip(self):
+        """Test if a decoded transaction equals the original"""
+        decoded = codec.decode_transaction(codec.encode_transaction(self.tx))
+        self.assertEqual(decoded.to_dict(), self.tx.to_dict())
+        self.assertTrue(TransactionService.is_valid(decoded))
+
+    def test_memo_invalidated_on_field_change(self):
+        """Test if changing a signed field drops the memoized encoding"""
+        before = TransactionService.get_signing_data(self.tx)
+        self.assertIs(TransactionService.get_signing_data(self.tx), before)
+        self.tx.timestamp += 1
+        self.assertNotEqual(TransactionService.get_signing_data(self.tx), before)
+        self.assertFalse(TransactionService.is_valid(self.tx))
+
+    def test_legacy_json_signature_still_valid(self):
+        """Test if transactions signed over legacy JSON data still verify"""
+        legacy = TransactionService.get_legacy_signing_data(self.tx)
+        self.tx.signature = self.sk.sign(hashlib.sha256(legacy).digest()).hex()
+        self.assertTrue(TransactionService.is_valid(self.tx))
+
+        codec.LEGACY_JSON_COMPAT = False
+        try:
+            self.assertFalse(TransactionService.is_valid(self.tx))
+        finally:
+            codec.LEGACY_JSON_COMPAT = True
+
+    def test_block_round_trip_and_signature(self):
+        """Test if a mined block survives encoding and keeps a valid signature"""
+        blockchain = BlockChain()
+        BlockChainService.create_genesis_block(blockchain, self.pubkey)
+        BlockChainService.add_transaction_to_mempool(blockchain, self.tx)
+        block = BlockChainService.mine_block(blockchain, self.sk, self.pubkey)
+
+        decoded = codec.decode_block(codec.encode_block(block))
+        self.assertEqual(decoded.block_hash, block.block_hash)
+        self.assertEqual(BlockService.calculate_hash(decoded), block.block_hash)
+        self.assertEqual(decoded.block_header.pre_hash, blockchain.get_last_block().block_hash)
+        self.assertTrue(BlockService.verify_block(decoded))
+
+        decoded.block_header.merkle_root = "00" * 32
+        self.assertFalse(BlockService.verify_block(decoded))
+
+    def test_hex_with_whitespace_is_not_packed_raw(self):
+        """Test if a hex string with whitespace does not share the encoding of its compact form"""
+        spaced = Transaction.from_dict(self.tx.to_dict())
+        spaced.recipient_address = "ab  cd"
+        compact = Transaction.from_dict(self.tx.to_dict())
+        compact.recipient_address = "abcd"
+        self.assertNotEqual(codec.encode_transaction(spaced), codec.encode_transaction(compact))
+        self.assertEqual(codec.decode_transaction(codec.encode_transaction(spaced)).recipient_address, "ab  cd")
+
+    def test_block_with_wrong_transactions_is_rejected(self):
+        """Test if a signed block whose transactions do not match merkle_root is not applied"""
+        blockchain = BlockChain()
+        BlockChainService.create_genesis_block(blockchain, self.pubkey)
+        BlockChainService.add_transaction_to_mempool(blockchain, self.tx)
+        block = BlockChainService.mine_block(blockchain, self.sk, self.pubkey)
+        block.transactions = []
+
+        with self.assertRaises(ValueError):
+            BlockChainService.add_block(blockchain, block)
+        self.assertEqual(len(blockchain.chain), 1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
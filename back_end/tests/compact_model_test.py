@@ -0,0 +1,115 @@
+import sys
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ecdsa import SigningKey, SECP256k1
+
+from app.core import codec
+from app.models.Block import Block
+from app.models.BlockChain import BlockChain
+from app.models.BlockHeader import BlockHeader
+from app.models.HeaderColumns import HeaderColumns
+from app.models.NFT import NFT
+from app.models.NFTmetadata import NFTmetadata
+from app.models.Client import client
+from app.models.Transaction import Transaction
+from app.services.BlockChainService import BlockChainService
+from app.services.TransactionService import TransactionService
+
+
+def signed_tx(sk: SigningKey, i: int) -> Transaction:
+    tx = Transaction(
+        sender_pubkey=sk.get_verifying_key().to_string().hex(),
+        sender_address="addr_issuer",
+        recipient_address="ab" * 20,
+        payload={"op": "set", "key": f"k{i}", "value": {"n": i, "tags": ["a", "b"]}},
+        timestamp=1_700_000_000.5 + i,
+    )
+    TransactionService.sign_with_key(tx, sk)
+    return tx
+
+
+class TestCompactModels(unittest.TestCase):
+    """Test suite for the slots / raw-bytes / columnar in-memory representation"""
+
+    def setUp(self):
+        self.sk = SigningKey.generate(curve=SECP256k1)
+
+    def test_hex_fields_are_stored_raw(self):
+        """Test if hex fields are held as bytes while reading back the same strings"""
+        tx = signed_tx(self.sk, 1)
+        self.assertIsInstance(tx._tx_id, bytes)
+        self.assertIsInstance(tx._signature, bytes)
+        self.assertEqual(len(tx._sender_pubkey), 64)
+        # Chuỗi không phải hex thường được giữ nguyên
+        self.assertEqual(tx.sender_address, "addr_issuer")
+        tx.tx_hash = "ABCD"
+        self.assertEqual(tx.tx_hash, "ABCD")
+
+        restored = Transaction.from_dict(tx.to_dict())
+        self.assertEqual(restored.to_dict(), tx.to_dict())
+        self.assertEqual(codec.encode_transaction(restored), codec.encode_transaction(tx))
+        self.assertTrue(TransactionService.is_valid(codec.decode_transaction(codec.encode_transaction(tx))))
+
+    def test_models_have_no_instance_dict(self):
+        """Test if chain models use __slots__ instead of a per-instance dict"""
+        nft = NFT("ab" * 64, NFTmetadata("SV1", "Bachelor", "u", "cd" * 32, "Uni", 1), client("ee" * 64, "a", "c"))
+        header = BlockHeader(0, "0" * 64, "", "ab" * 64, 1.0)
+        objects = [signed_tx(self.sk, 1), header, Block(0, "GENESIS", header, []), nft, nft.metadata]
+        for obj in objects:
+            self.assertFalse(hasattr(obj, "__dict__"), type(obj).__name__)
+
+    def test_compact_keeps_encoding(self):
+        """Test if compacting a transaction keeps its encoding, hashes and dict form"""
+        tx = signed_tx(self.sk, 2)
+        encoded, leaf, as_dict = codec.encode_transaction(tx), codec.transaction_leaf_hash(tx), tx.to_dict()
+
+        tx.compact()
+        self.assertIsInstance(tx._payload, bytes)
+        self.assertEqual(codec.encode_transaction(tx), encoded)
+        self.assertEqual(codec.transaction_leaf_hash(tx), leaf)
+        self.assertEqual(tx.to_dict(), as_dict)
+        # Transaction trong chain không đổi: sửa bản đọc ra không ảnh hưởng
+        tx.payload["key"] = "changed"
+        self.assertEqual(tx.payload["key"], "k2")
+
+    def test_repeated_pubkeys_are_shared(self):
+        """Test if decoded transactions from the same sender share one pubkey object"""
+        a, b = (codec.decode_transaction(codec.encode_transaction(signed_tx(self.sk, i))) for i in range(2))
+        self.assertIs(a._sender_pubkey, b._sender_pubkey)
+
+    def test_header_columns_rebuild_exact_headers(self):
+        """Test if columnar headers rebuild byte-identical signed headers"""
+        pubkey = self.sk.get_verifying_key().to_string().hex()
+        blockchain = BlockChain()
+        BlockChainService.create_genesis_block(blockchain, pubkey)
+        for i in range(5):
+            BlockChainService.add_signed_transactions_to_mempool(blockchain, [signed_tx(self.sk, i)])
+            BlockChainService.add_block(blockchain, BlockChainService.mine_block(blockchain, self.sk, pubkey))
+
+        headers = blockchain.headers
+        self.assertEqual(len(headers), 6)
+        for block in blockchain.chain:
+            self.assertEqual(
+                codec.encode_signed_header(headers.signed_header(block.index)), codec.encode_signed_header(block)
+            )
+        self.assertEqual(headers.nbytes() / len(headers), 8 + 4 + 32 + 32 + 64)
+
+    def test_header_columns_keep_irregular_values(self):
+        """Test if headers outside the usual layout still round-trip exactly"""
+        header = BlockHeader(0, "not-a-hash", "", "ab" * 64, 2.0)
+        block = Block(0, "custom-id", header, [])
+        block.block_hash = "ff" * 16
+        block.validator_signature = "00" * 64
+
+        columns = HeaderColumns()
+        columns.append(block)
+        rebuilt = columns.signed_header(0)
+        self.assertEqual(rebuilt.to_dict(), block.to_dict())
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
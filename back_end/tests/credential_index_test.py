@@ -0,0 +1,174 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ecdsa import SigningKey, SECP256k1
+
+from app.models.Block import Block
+from app.models.BlockChain import BlockChain
+from app.models.BlockHeader import BlockHeader
+from app.models.Client import client
+from app.models.CredentialIndex import CredentialIndex
+from app.models.NFT import NFT
+from app.models.NFTmetadata import NFTmetadata
+from app.repositories.CredentialRepository import CredentialRepository
+from app.services.BlockChainService import BlockChainService
+from app.services.CredentialIndexService import CredentialIndexService
+from app.services.NFTService import NFTService
+from app.services.TransactionService import TransactionService
+
+
+def make_record(i: int) -> dict:
+    return {
+        "token_id": f"{i:064x}",
+        "issuer_pubkey": "aa" * 64,
+        "issuer_address": "addr_issuer",
+        "recipient_address": f"addr_{i % 10}",
+        "recipient_client_id": f"client_{i % 10}",
+        "recipient_pubkey": "cc" * 64,
+        "student_id": f"SV{i % 50:04d}",
+        "degree_type": "Bachelor",
+        "pdf_url": f"https://example.edu/{i}.pdf",
+        "pdf_hash": f"{i:064x}",
+        "institution": f"Uni{i % 3}",
+        "issued_at": 1_700_000_000 + i,
+        "issuer_signature": None,
+        "minted_at": 1_700_000_000.0 + i,
+        "tx_id": f"{i:064x}",
+        "height": i // 100,
+    }
+
+
+class TestCredentialIndex(unittest.TestCase):
+    """Test suite for the in-memory and SQLite credential indexes"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.repo = CredentialRepository(os.path.join(self.tmp.name, "chain.db"))
+
+    def tearDown(self):
+        self.repo.close()
+        self.tmp.cleanup()
+
+    def test_backends_agree(self):
+        """Test if both backends answer every lookup identically"""
+        records = [make_record(i) for i in range(500)]
+        memory = CredentialIndex()
+        memory.add_many(records)
+        self.repo.add_many(records)
+
+        self.assertEqual(len(memory), len(self.repo))
+        for index in (memory, self.repo):
+            self.assertEqual(index.get_by_token(f"{7:064x}"), make_record(7))
+            self.assertIsNone(index.get_by_token("ff" * 32))
+            self.assertEqual([r["token_id"] for r in index.find_by_student("SV0007")],
+                             [f"{i:064x}" for i in range(7, 500, 50)])
+            self.assertEqual(len(index.find_by_recipient("addr_3")), 50)
+
+    def test_pagination_walks_every_record_once(self):
+        """Test if cursor pagination by institution covers all records in order"""
+        records = [make_record(i) for i in range(300)]
+        memory = CredentialIndex()
+        memory.add_many(records)
+        self.repo.add_many(records)
+        expected = [r["token_id"] for r in records if r["institution"] == "Uni1"]
+
+        for index in (memory, self.repo):
+            seen, cursor = [], None
+            while True:
+                page, cursor = index.list_by_institution("Uni1", cursor, limit=30)
+                seen.extend(r["token_id"] for r in page)
+                if cursor is None:
+                    break
+            self.assertEqual(seen, expected)
+
+    def test_add_block_indexes_successful_mints(self):
+        """Test if add_block indexes a mint once and skips a double mint"""
+        sk = SigningKey.generate(curve=SECP256k1)
+        pubkey = sk.get_verifying_key().to_string().hex()
+        blockchain = BlockChain()
+        blockchain.credential_index = CredentialIndex()
+        BlockChainService.create_genesis_block(blockchain, pubkey)
+
+        metadata = NFTmetadata("SV0001", "Bachelor", "https://example.edu/1.pdf", "ab" * 32, "Uni0", 1_700_000_000)
+        nft = NFT(pubkey, metadata, client("cc" * 64, "addr_student", "client_1"))
+        for timestamp in (1.0, 2.0):
+            tx = NFTService.build_mint_transaction(nft, "addr_issuer", timestamp=timestamp)
+            TransactionService.sign(tx, sk.to_string().hex())
+            BlockChainService.add_transaction_to_mempool(blockchain, tx)
+        BlockChainService.add_block(blockchain, BlockChainService.mine_block(blockchain, sk, pubkey))
+
+        self.assertEqual(len(blockchain.credential_index), 1)
+        record = blockchain.credential_index.get_by_token(nft.token_id)
+        self.assertEqual(record["height"], 1)
+        self.assertEqual(record["student_id"], "SV0001")
+        self.assertEqual(NFTService.get_minted(blockchain.state_db, nft.token_id).token_id, nft.token_id)
+
+    def test_forged_mints_rejected(self):
+        """Test if mints not signed by the issuer or with a mismatched token_id are neither executed nor indexed"""
+        sk = SigningKey.generate(curve=SECP256k1)
+        pubkey = sk.get_verifying_key().to_string().hex()
+        attacker_sk = SigningKey.generate(curve=SECP256k1)
+        blockchain = BlockChain()
+        blockchain.credential_index = CredentialIndex()
+        BlockChainService.create_genesis_block(blockchain, pubkey)
+
+        metadata = NFTmetadata("SV0001", "Bachelor", "https://example.edu/1.pdf", "ab" * 32, "Uni0", 1_700_000_000)
+        nft = NFT(pubkey, metadata, client("cc" * 64, "addr_student", "client_1"))
+
+        # Kẻ tấn công ký mint mang issuer_pubkey của trường, pdf_hash giả
+        nft.metadata.pdf_hash = "ee" * 32
+        front_run = NFTService.build_mint_transaction(nft, "addr_attacker", timestamp=1.0)
+        front_run.sender_pubkey = attacker_sk.get_verifying_key().to_string().hex()
+        TransactionService.sign(front_run, attacker_sk.to_string().hex())
+        nft.metadata.pdf_hash = "ab" * 32
+
+        # Issuer ký nhưng token_id không khớp nội dung văn bằng
+        mismatched = NFTService.build_mint_transaction(nft, "addr_issuer", timestamp=2.0)
+        mismatched.payload["token_id"] = mismatched.payload["nft"]["token_id"] = "00" * 32
+        TransactionService.sign(mismatched, sk.to_string().hex())
+
+        genuine = NFTService.build_mint_transaction(nft, "addr_issuer", timestamp=3.0)
+        TransactionService.sign(genuine, sk.to_string().hex())
+
+        for tx in (front_run, mismatched, genuine):
+            self.assertTrue(BlockChainService.add_transaction_to_mempool(blockchain, tx))
+        block = BlockChainService.mine_block(blockchain, sk, pubkey)
+        BlockChainService.add_block(blockchain, block)
+
+        self.assertEqual(len(blockchain.credential_index), 1)
+        self.assertEqual(blockchain.credential_index.get_by_token(nft.token_id)["tx_id"], genuine.tx_id)
+        self.assertEqual(NFTService.get_minted(blockchain.state_db, nft.token_id).metadata.pdf_hash, "ab" * 32)
+        self.assertIsNone(NFTService.get_minted(blockchain.state_db, "00" * 32))
+
+        # Dựng lại từ block (không có kết quả thực thi) cũng bỏ qua mint giả
+        records = CredentialIndexService.credentials_in_block(blockchain.chain[1])
+        self.assertEqual([r["tx_id"] for r in records], [genuine.tx_id])
+
+
+    def test_compact_mint_payload_decoded_once(self):
+        """Test if extracting a credential from a compacted mint decodes its payload a single time"""
+        sk = SigningKey.generate(curve=SECP256k1)
+        pubkey = sk.get_verifying_key().to_string().hex()
+        metadata = NFTmetadata("SV0002", "Bachelor", "https://example.edu/2.pdf", "ab" * 32, "Uni0", 1_700_000_000)
+        tx = NFTService.build_mint_transaction(NFT(pubkey, metadata, client("cc" * 64, "addr_s", "c2")), timestamp=1.0)
+        TransactionService.sign(tx, sk.to_string().hex())
+        tx.compact()
+        block = Block(1, "00" * 32, BlockHeader(1, "00" * 32, "", pubkey), [tx])
+
+        for results in (None, [True]):
+            with mock.patch("app.models.Transaction.json.loads", wraps=json.loads) as loads:
+                records = CredentialIndexService.credentials_in_block(block, results)
+            self.assertEqual(records[0]["student_id"], "SV0002")
+            self.assertEqual(loads.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
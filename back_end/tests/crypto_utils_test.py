@@ -0,0 +1,61 @@
+import sys
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ecdsa import SigningKey, SECP256k1
+
+from app.core.crypto_utils import VerifyingKeyCache
+
+
+class TestVerifyingKeyCache(unittest.TestCase):
+    """Test suite for the parsed VerifyingKey cache"""
+
+    def setUp(self):
+        self.keys = [
+            SigningKey.generate(curve=SECP256k1).get_verifying_key().to_string().hex()
+            for _ in range(3)
+        ]
+
+    def test_hit_miss_counters(self):
+        """Test if repeated lookups are served from the cache"""
+        cache = VerifyingKeyCache(max_size=8)
+        first = cache.get(self.keys[0])
+        second = cache.get(self.keys[0])
+        self.assertIs(first, second)
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_lru_eviction(self):
+        """Test if the least recently used key is evicted first"""
+        cache = VerifyingKeyCache(max_size=2)
+        cache.get(self.keys[0])
+        cache.get(self.keys[1])
+        cache.get(self.keys[0])
+        cache.get(self.keys[2])
+        self.assertEqual(cache.stats()["size"], 2)
+        cache.get(self.keys[1])
+        self.assertEqual(cache.stats()["misses"], 4)
+
+    def test_pinned_keys_survive_eviction(self):
+        """Test if pinned authority keys are never evicted"""
+        cache = VerifyingKeyCache(max_size=1)
+        pinned = cache.pin(self.keys[0])
+        cache.get(self.keys[1])
+        cache.get(self.keys[2])
+        self.assertIs(cache.get(self.keys[0]), pinned)
+        cache.sync_pinned([self.keys[1]])
+        self.assertEqual(cache.stats()["pinned"], 1)
+
+    def test_hot_key_is_precomputed(self):
+        """Test if a frequently used key gets precomputed tables"""
+        cache = VerifyingKeyCache(max_size=4, hot_threshold=3)
+        for _ in range(3):
+            cache.get(self.keys[0])
+        self.assertEqual(cache.stats()["precomputed"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
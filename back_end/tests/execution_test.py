@@ -0,0 +1,90 @@
+import random
+import sys
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models.Transaction import Transaction
+from app.services.ExecutionService import ExecutionService
+
+
+def make_txs(n: int, seed: int = 1):
+    rng = random.Random(seed)
+    txs = []
+    for i in range(n):
+        roll = rng.random()
+        if roll < 0.05:
+            payload = {"op": "noop"}
+        elif roll < 0.3:
+            payload = {"op": "set", "key": f"shared_{rng.randrange(4)}", "value": i}
+        else:
+            payload = {"op": "set", "key": f"nft:{i}", "value": i}
+        txs.append(Transaction(tx_id=f"{i:064x}", payload=payload))
+    return txs
+
+
+class TestExecutionService(unittest.TestCase):
+    """Test suite for wave-parallel transaction execution"""
+
+    def test_parallel_matches_serial(self):
+        """Test if wave execution yields exactly the serial state and results"""
+        txs = make_txs(2_000)
+        serial_state = {}
+        serial_results = ExecutionService.execute_block(serial_state, txs, max_workers=1)
+
+        parallel_state = {}
+        parallel_results = ExecutionService.execute_block(
+            parallel_state, txs, max_workers=4, min_parallel=1, parallel_ops=frozenset({"set"})
+        )
+
+        self.assertEqual(parallel_state, serial_state)
+        self.assertEqual(parallel_results, serial_results)
+
+    def test_gil_bound_ops_run_serially(self):
+        """Test if blocks with ops that hold the GIL never go through the thread pool"""
+        txs = make_txs(200)
+        self.assertFalse(ExecutionService._parallelizable(txs, frozenset({"set"})))
+        self.assertFalse(ExecutionService._parallelizable(txs[:3], frozenset()))
+
+        undo = {}
+        state = {"shared_0": "old"}
+        ExecutionService.execute_block(state, txs, max_workers=4, undo=undo)
+        self.assertEqual(undo["shared_0"], "old")
+        ExecutionService.revert(state, undo)
+        self.assertEqual(state, {"shared_0": "old"})
+
+    def test_conflicting_writes_are_ordered(self):
+        """Test if writes to the same key land in later waves"""
+        txs = [
+            Transaction(payload={"op": "set", "key": "a", "value": 1}),
+            Transaction(payload={"op": "set", "key": "b", "value": 2}),
+            Transaction(payload={"op": "set", "key": "a", "value": 3}),
+        ]
+        self.assertEqual(ExecutionService.schedule(txs), [[0, 1], [2]])
+
+    def test_unknown_op_is_a_barrier(self):
+        """Test if an unanalysable transaction runs alone between waves"""
+        txs = [
+            Transaction(payload={"op": "set", "key": "a", "value": 1}),
+            Transaction(payload={"op": "unknown"}),
+            Transaction(payload={"op": "set", "key": "b", "value": 2}),
+        ]
+        self.assertEqual(ExecutionService.schedule(txs), [[0], [1], [2]])
+
+    def test_malformed_transaction_fails_alone(self):
+        """Test if a transaction whose op raises only fails itself"""
+        txs = [
+            Transaction(payload={"op": "set", "key": "a", "value": 1}),
+            Transaction(payload={"op": ["set"]}),
+            Transaction(payload=["set"]),
+            Transaction(payload={"op": "set", "key": "b", "value": 2}),
+        ]
+        state = {}
+        self.assertEqual(ExecutionService.execute_block(state, txs), [True, False, False, True])
+        self.assertEqual(state, {"a": 1, "b": 2})
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
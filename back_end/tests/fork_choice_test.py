@@ -0,0 +1,323 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ecdsa import SigningKey, SECP256k1
+
+from app.models.BlockChain import BlockChain
+from app.models.Client import client
+from app.models.CredentialIndex import CredentialIndex
+from app.models.NFT import NFT
+from app.models.NFTmetadata import NFTmetadata
+from app.models.Transaction import Transaction
+from app.repositories.BlockLogRepository import BlockLogRepository
+from app.repositories.BlockRepository import BlockRepository
+from app.services.BlockChainService import BlockChainService
+from app.services.ExecutionService import ExecutionService
+from app.services.NFTService import NFTService
+from app.services.TransactionService import TransactionService
+
+
+class TestForkChoice(unittest.TestCase):
+    """Test suite for the block tree, fork choice and undo-log reorgs"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.keys = [SigningKey.generate(curve=SECP256k1) for _ in range(3)]
+        cls.pubkeys = [sk.get_verifying_key().to_string().hex() for sk in cls.keys]
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _tx(self, key: str, value=1) -> Transaction:
+        tx = Transaction(
+            sender_pubkey=self.pubkeys[0],
+            sender_address="addr_sender",
+            recipient_address="addr_recipient",
+            payload={"op": "set", "key": key, "value": value},
+        )
+        TransactionService.sign(tx, self.keys[0].to_string().hex())
+        return tx
+
+    def _mine(self, blockchain: BlockChain, validator: int, txs):
+        for tx in txs:
+            BlockChainService.add_transaction_to_mempool(blockchain, tx)
+        block = BlockChainService.mine_block(blockchain, self.keys[validator], self.pubkeys[validator])
+        BlockChainService.add_block(blockchain, block)
+        return block
+
+    def _pair(self, common: int, main: BlockChain = None):
+        """Hai node cùng genesis và `common` block đầu, validator 0 và 1 đều được uỷ quyền."""
+        main = main or BlockChain()
+        genesis = BlockChainService.create_genesis_block(main, self.pubkeys[0])
+        rival = BlockChain()
+        BlockChainService.install_genesis(rival, genesis)
+        for node in (main, rival):
+            node.authority_set.add(self.pubkeys[1])
+        for height in range(1, common + 1):
+            block = self._mine(main, 0, [self._tx(f"k{height}_{i}") for i in range(2)])
+            BlockChainService.add_block(rival, block)
+        return main, rival
+
+    def _hashes(self, blockchain: BlockChain):
+        return [block.block_hash for block in blockchain.chain]
+
+    def test_longer_branch_triggers_reorg(self):
+        """Test if a longer competing branch replaces the tip and orphaned txs return to the mempool"""
+        main, rival = self._pair(common=3)
+        shared = self._tx("shared")
+        BlockChainService.add_transaction_to_mempool(rival, shared)
+        # Nhánh cũ ghi đè key chung và thêm key riêng
+        old = [
+            self._mine(main, 0, [shared, self._tx("k1_0", 99), self._tx("main_only")]),
+            self._mine(main, 0, [self._tx("main_only_2")]),
+        ]
+        for height in range(4, 7):
+            self._mine(rival, 1, [self._tx(f"rival{height}")])
+
+        results = [BlockChainService.add_block(main, block) for block in rival.chain[4:]]
+        self.assertFalse(results[0])
+        self.assertTrue(results[-1])
+
+        self.assertEqual(self._hashes(main), self._hashes(rival))
+        self.assertEqual(main.state_db, rival.state_db)
+        self.assertEqual(main.headers.block_hash(6), rival.chain[6].block_hash)
+        self.assertEqual(main.chain_index.tx_location(shared.tx_id), rival.chain_index.tx_location(shared.tx_id))
+        self.assertIsNone(main.chain_index.block_height(old[1].block_hash))
+        self.assertEqual(len(main.undo_logs), 6)
+
+        # Transaction chỉ có ở nhánh cũ quay lại mempool, transaction chung thì không
+        orphaned = {tx.tx_id for block in old for tx in block.transactions} - {shared.tx_id}
+        self.assertEqual({tx.tx_id for tx in main.mempool}, orphaned)
+        self.assertTrue(all(block.block_hash in main.block_tree for block in old))
+
+    def test_equal_height_tie_break_is_deterministic(self):
+        """Test if two nodes seeing the same competing tips pick the same one regardless of order"""
+        main, rival = self._pair(common=2)
+        a = self._mine(main, 0, [self._tx("a")])
+        b = self._mine(rival, 1, [self._tx("b")])
+        BlockChainService.add_block(main, b)
+        BlockChainService.add_block(rival, a)
+
+        winner = min(a.block_hash, b.block_hash)
+        self.assertEqual(main.get_last_block().block_hash, winner)
+        self.assertEqual(rival.get_last_block().block_hash, winner)
+        self.assertEqual(main.state_db, rival.state_db)
+
+    def test_reorg_deeper_than_undo_log_rejected(self):
+        """Test if a branch forking below the kept undo logs never replaces the chain"""
+        main = BlockChain()
+        main.max_reorg_depth = 2
+        main, rival = self._pair(common=1, main=main)
+        for height in range(2, 5):
+            self._mine(main, 0, [self._tx(f"main{height}")])
+        for height in range(2, 7):
+            self._mine(rival, 1, [self._tx(f"rival{height}")])
+        hashes, state = self._hashes(main), dict(main.state_db)
+
+        for block in rival.chain[2:]:
+            try:
+                BlockChainService.add_block(main, block)
+            except ValueError:
+                pass
+        self.assertEqual(self._hashes(main), hashes)
+        self.assertEqual(main.state_db, state)
+        self.assertEqual(len(main.undo_logs), 2)
+
+    def test_invalid_branch_restores_old_chain(self):
+        """Test if a reorg that hits an invalid block rolls back to the original chain"""
+        main, rival = self._pair(common=2)
+        for height in range(3, 5):
+            self._mine(main, 0, [self._tx(f"main{height}")])
+        rival.authority_set.add(self.pubkeys[2])
+        # Transaction đang chờ của main được nhánh mới lấy đi trước khi gặp block lỗi
+        pending = self._tx("pending")
+        BlockChainService.add_transaction_to_mempool(main, pending)
+        self._mine(rival, 1, [self._tx("rival3"), pending])
+        bad = self._mine(rival, 2, [self._tx("rival4")])
+        self._mine(rival, 1, [self._tx("rival5")])
+        hashes, state = self._hashes(main), dict(main.state_db)
+
+        self.assertFalse(BlockChainService.add_block(main, rival.chain[3]))
+        with self.assertRaises(ValueError):
+            BlockChainService.add_block(main, bad)
+        # Block của validator lạ lọt vào cây: phải phát hiện khi đổi nhánh
+        main.block_tree.add(bad)
+        with self.assertRaises(ValueError):
+            BlockChainService.add_block(main, rival.chain[5])
+
+        self.assertEqual(self._hashes(main), hashes)
+        self.assertEqual(main.state_db, state)
+        self.assertEqual([tx.tx_id for tx in main.mempool], [pending.tx_id])
+        self.assertNotIn(bad.block_hash, main.block_tree)
+        self.assertIn(rival.chain[3].block_hash, main.block_tree)
+
+    def test_reorg_restores_old_chain_on_unexpected_error(self):
+        """Test if a non-ValueError failure mid-branch still restores the old chain and mempool"""
+        main = BlockChain()
+        main.block_store = BlockRepository(os.path.join(self.tmp.name, "main.db"))
+        main, rival = self._pair(common=2, main=main)
+        for height in range(3, 5):
+            self._mine(main, 0, [self._tx(f"main{height}")])
+        pending = self._tx("pending")
+        BlockChainService.add_transaction_to_mempool(main, pending)
+        self._mine(rival, 1, [self._tx("rival3"), pending])
+        broken = self._mine(rival, 1, [self._tx("rival4")])
+        self._mine(rival, 1, [self._tx("rival5")])
+        hashes, state = self._hashes(main), dict(main.state_db)
+        save_block = main.block_store.save_block
+
+        def failing_save(block):
+            if block.block_hash == broken.block_hash:
+                raise OSError("disk full")
+            save_block(block)
+
+        main.block_tree.add(rival.chain[3])
+        main.block_tree.add(broken)
+        with mock.patch.object(main.block_store, "save_block", side_effect=failing_save):
+            with self.assertRaises(OSError):
+                BlockChainService.add_block(main, rival.chain[5])
+
+        self.assertEqual(self._hashes(main), hashes)
+        self.assertEqual(main.state_db, state)
+        self.assertEqual([tx.tx_id for tx in main.mempool], [pending.tx_id])
+        main.block_store.flush()
+        self.assertEqual(main.block_store.get_height(), 4)
+        main.block_store.close()
+
+    def test_failed_execution_leaves_state_untouched(self):
+        """Test if a block whose execution raises is rejected without partial state writes"""
+        main, rival = self._pair(common=1)
+        before = dict(main.state_db)
+        block = self._mine(rival, 1, [self._tx("a"), self._tx("b")])
+        execute_serial = ExecutionService._execute_serial
+
+        def broken(state, transactions, undo):
+            execute_serial(state, transactions[:1], undo)
+            raise RuntimeError("disk full")
+
+        with mock.patch.object(ExecutionService, "_execute_serial", staticmethod(broken)):
+            with self.assertRaises(ValueError):
+                BlockChainService.add_block(main, block)
+        self.assertEqual(main.state_db, before)
+        self.assertEqual(main.get_last_block().index, 1)
+        BlockChainService.add_block(main, block)
+        self.assertEqual(self._hashes(main), self._hashes(rival))
+
+    def test_store_truncate(self):
+        """Test if both block stores drop blocks above a height and accept a replacement"""
+        main, rival = self._pair(common=2)
+        for height in range(3, 5):
+            self._mine(main, 0, [self._tx(f"main{height}")])
+        replacement = self._mine(rival, 1, [self._tx("rival3")])
+
+        stores = {
+            "sqlite": lambda: BlockRepository(os.path.join(self.tmp.name, "chain.db")),
+            "block_log": lambda: BlockLogRepository(os.path.join(self.tmp.name, "blocks"), segment_size=4096),
+        }
+        for name, open_store in stores.items():
+            with self.subTest(store=name):
+                with open_store() as store:
+                    store.save_blocks(list(main.chain))
+                    store.truncate(2)
+                    self.assertEqual(store.get_height(), 2)
+                    self.assertIsNone(store.get_block_by_hash(main.chain[3].block_hash))
+                    store.save_block(replacement)
+                with open_store() as store:
+                    self.assertEqual(store.get_height(), 3)
+                    self.assertEqual(store.get_block_by_height(3).block_hash, replacement.block_hash)
+                    self.assertEqual(store.get_block_by_hash(replacement.block_hash).index, 3)
+                    self.assertEqual(
+                        [tx.tx_id for tx in store.get_block_by_height(3).transactions],
+                        [tx.tx_id for tx in replacement.transactions],
+                    )
+
+    def test_reorg_with_block_log_and_credentials_survives_restart(self):
+        """Test if a reorg reverts credentials, rewrites the block log and restores after restart"""
+        log_dir = os.path.join(self.tmp.name, "blocks")
+        main = BlockChain()
+        main.chain.hot_blocks = 2
+        main.block_store = BlockLogRepository(log_dir)
+        main.credential_index = CredentialIndex()
+        main, rival = self._pair(common=2, main=main)
+
+        metadata = NFTmetadata("SV0001", "Bachelor", "https://example.edu/1.pdf", "ab" * 32, "Uni0", 1_700_000_000)
+        nft = NFT(self.pubkeys[0], metadata, client("cc" * 64, "addr_student", "client_1"))
+        mint = NFTService.build_mint_transaction(nft, "addr_issuer", timestamp=1.0)
+        TransactionService.sign(mint, self.keys[0].to_string().hex())
+        self._mine(main, 0, [mint])
+        self._mine(main, 0, [self._tx("main4")])
+        self.assertIsNotNone(main.credential_index.get_by_token(nft.token_id))
+        for height in range(3, 6):
+            self._mine(rival, 1, [self._tx(f"rival{height}")])
+
+        for block in rival.chain[3:]:
+            BlockChainService.add_block(main, block)
+        self.assertEqual(self._hashes(main), self._hashes(rival))
+        self.assertIsNone(main.credential_index.get_by_token(nft.token_id))
+        self.assertIsNone(NFTService.get_minted(main.state_db, nft.token_id))
+        self.assertIn(mint.tx_id, main.mempool)
+        main.block_store.close()
+
+        restored = BlockChain()
+        restored.block_store = BlockLogRepository(log_dir)
+        BlockChainService.restore_from_store(restored)
+        restored.authority_set.add(self.pubkeys[1])
+        self.assertEqual(self._hashes(restored), self._hashes(rival))
+        self.assertEqual(restored.state_db, rival.state_db)
+        self.assertEqual(len(restored.undo_logs), 5)
+
+        # Undo log dựng lại khi khởi động: vẫn đổi nhánh được
+        longer = BlockChain()
+        BlockChainService.install_genesis(longer, main.chain[0])
+        longer.authority_set.add(self.pubkeys[1])
+        for block in main.chain[1:3]:
+            BlockChainService.add_block(longer, block)
+        for height in range(3, 7):
+            self._mine(longer, 0, [self._tx(f"longer{height}")])
+        for block in longer.chain[3:]:
+            BlockChainService.add_block(restored, block)
+        self.assertEqual(self._hashes(restored), self._hashes(longer))
+        self.assertEqual(restored.state_db, longer.state_db)
+        restored.block_store.close()
+
+
+    def test_reorg_below_snapshot_after_restart(self):
+        """Test if a node restored from a snapshot can still reorg across the snapshot height"""
+        log_dir = os.path.join(self.tmp.name, "blocks")
+        main = BlockChain()
+        main.block_store = BlockLogRepository(log_dir)
+        main.snapshot_dir = os.path.join(self.tmp.name, "snapshots")
+        main.snapshot_interval = 4
+        main, rival = self._pair(common=2, main=main)
+        for height in range(3, 6):
+            self._mine(main, 0, [self._tx(f"main{height}"), self._tx("k1_0", height)])
+        main.block_store.close()
+
+        restored = BlockChain()
+        restored.block_store = BlockLogRepository(log_dir)
+        report = BlockChainService.restore_from_store(restored, main.snapshot_dir)
+        restored.authority_set.add(self.pubkeys[1])
+        self.assertEqual((report["snapshot_height"], report["replayed_blocks"]), (4, 1))
+        self.assertEqual(len(restored.undo_logs), 5)
+
+        for height in range(3, 7):
+            self._mine(rival, 1, [self._tx(f"rival{height}")])
+        for block in rival.chain[3:]:
+            BlockChainService.add_block(restored, block)
+        self.assertEqual(self._hashes(restored), self._hashes(rival))
+        self.assertEqual(restored.state_db, rival.state_db)
+        restored.block_store.close()
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,154 @@
+import asyncio
+import sys
+import time
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ecdsa import SigningKey, SECP256k1
+
+from app.core import codec
+from app.models.BlockChain import BlockChain
+from app.models.Transaction import Transaction
+from app.network import protocol
+from app.network.gossip import GossipNode
+from app.services.BlockChainService import BlockChainService
+from app.services.TransactionService import TransactionService
+
+
+def make_chains(count: int):
+    """Các chain có chung genesis và validator."""
+    sk = SigningKey.generate(curve=SECP256k1)
+    pubkey = sk.get_verifying_key().to_string().hex()
+    first = BlockChain()
+    genesis = BlockChainService.create_genesis_block(first, pubkey)
+    chains = [first]
+    for _ in range(count - 1):
+        blockchain = BlockChain()
+        BlockChainService.install_genesis(blockchain, codec.decode_block(codec.encode_block(genesis)))
+        chains.append(blockchain)
+    return chains, sk, pubkey
+
+
+def make_tx(sk: SigningKey, i: int) -> Transaction:
+    tx = Transaction(
+        sender_pubkey=sk.get_verifying_key().to_string().hex(),
+        payload={"op": "set", "key": f"k{i}", "value": i},
+        timestamp=1_700_000_000.0 + i,
+    )
+    TransactionService.sign_with_key(tx, sk)
+    return tx
+
+
+async def wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("hết thời gian chờ")
+        await asyncio.sleep(0.01)
+
+
+class TestGossip(unittest.IsolatedAsyncioTestCase):
+    """Test suite for transaction and block gossip between localhost nodes"""
+
+    async def asyncSetUp(self):
+        chains, self.sk, self.pubkey = make_chains(3)
+        # Nối thành hàng: a - b - c
+        self.nodes = [GossipNode(chain, node_id=name, inv_interval=0.005) for chain, name in zip(chains, "abc")]
+        ports = [await node.start() for node in self.nodes]
+        await self.nodes[0].connect("127.0.0.1", ports[1])
+        await self.nodes[1].connect("127.0.0.1", ports[2])
+        await wait_for(lambda: all(len(node.peers) == (2 if node is self.nodes[1] else 1) for node in self.nodes))
+
+    async def asyncTearDown(self):
+        for node in self.nodes:
+            await node.stop()
+
+    async def test_transactions_reach_every_node_once(self):
+        """Test if transactions reach the far node and each peer receives each tx once"""
+        txs = [make_tx(self.sk, i) for i in range(50)]
+        for tx in txs:
+            self.assertTrue(self.nodes[0].submit_transaction(tx))
+
+        far = self.nodes[2].blockchain.mempool
+        await wait_for(lambda: len(far) == len(txs))
+        await asyncio.sleep(0.05)
+
+        for node in self.nodes:
+            self.assertEqual(node.stats["duplicate_tx"], 0)
+            for peer in node.peers:
+                self.assertLessEqual(peer.stats["recv_tx"], len(txs))
+        # Node xa nhận mỗi transaction đúng một lần
+        self.assertEqual(sum(peer.stats["recv_tx"] for peer in self.nodes[2].peers), len(txs))
+        # Node giữa không gửi ngược lại cho node nguồn
+        source_peer = next(iter(self.nodes[0].peers))
+        self.assertEqual(source_peer.stats["recv_tx"], 0)
+
+    async def test_compact_block_is_rebuilt_from_mempool(self):
+        """Test if a compact block is reconstructed without fetching any transaction"""
+        txs = [make_tx(self.sk, i) for i in range(20)]
+        for tx in txs:
+            self.nodes[0].submit_transaction(tx)
+        await wait_for(lambda: len(self.nodes[2].blockchain.mempool) == len(txs))
+
+        block = await self.nodes[0].mine(self.sk, self.pubkey)
+        await wait_for(lambda: len(self.nodes[2].blockchain.chain) == 2)
+
+        for node in self.nodes[1:]:
+            self.assertEqual(node.blockchain.get_last_block().block_hash, block.block_hash)
+            self.assertEqual(node.stats["compact_missing_txs"], 0)
+            self.assertEqual(len(node.blockchain.mempool), 0)
+            self.assertEqual(node.blockchain.state_db["k3"], 3)
+
+    async def test_missing_transactions_are_requested(self):
+        """Test if transactions not seen beforehand are fetched with GETBLOCKTXN"""
+        # Chỉ node a biết transaction này (đưa thẳng vào mempool, không gossip)
+        private_tx = make_tx(self.sk, 99)
+        BlockChainService.add_transaction_to_mempool(self.nodes[0].blockchain, private_tx)
+
+        block = await self.nodes[0].mine(self.sk, self.pubkey)
+        await wait_for(lambda: len(self.nodes[2].blockchain.chain) == 2)
+
+        self.assertEqual(self.nodes[2].blockchain.get_last_block().block_hash, block.block_hash)
+        self.assertEqual(self.nodes[1].stats["compact_missing_txs"], 1)
+        self.assertEqual(self.nodes[2].blockchain.state_db["k99"], 99)
+
+    async def test_unknown_compact_block_is_dropped_on_notfound(self):
+        """Test if a compact block its sender cannot serve is dropped and accepted when resent"""
+        private_tx = make_tx(self.sk, 99)
+        BlockChainService.add_transaction_to_mempool(self.nodes[0].blockchain, private_tx)
+        # Node a gửi block rút gọn mà chính nó chưa lưu: GETBLOCKTXN nhận NOTFOUND
+        block = BlockChainService.mine_block(self.nodes[0].blockchain, self.sk, self.pubkey)
+        peer = next(iter(self.nodes[0].peers))
+        await peer.send(protocol.CMPCTBLOCK, codec.encode_compact_block(block))
+        await wait_for(lambda: self.nodes[1].stats["compact_missing_txs"] == 1)
+        await wait_for(lambda: not self.nodes[1]._pending_compact)
+
+        BlockChainService.add_block(self.nodes[0].blockchain, block)
+        await peer.send(protocol.CMPCTBLOCK, codec.encode_compact_block(block))
+        await wait_for(lambda: len(self.nodes[1].blockchain.chain) == 2)
+        self.assertEqual(self.nodes[1].blockchain.state_db["k99"], 99)
+
+    async def test_expired_tx_request_is_retried(self):
+        """Test if a GETDATA that was never answered does not block the transaction forever"""
+        tx = make_tx(self.sk, 7)
+        stale_peer = next(iter(self.nodes[1].peers))
+        self.nodes[1]._requested_txs[tx.tx_id] = (stale_peer, time.monotonic() - 1)
+        self.assertTrue(self.nodes[0].submit_transaction(tx))
+        await wait_for(lambda: tx in self.nodes[2].blockchain.mempool)
+
+    async def test_tampered_block_is_rejected(self):
+        """Test if a block whose transactions do not match the merkle root is rejected"""
+        block = BlockChainService.mine_block(self.nodes[0].blockchain, self.sk, self.pubkey)
+        block.transactions = [make_tx(self.sk, 1)]
+        peer = next(iter(self.nodes[0].peers))
+        await peer.send(protocol.BLOCK, codec.encode_block(block))
+
+        await wait_for(lambda: self.nodes[1].stats["rejected_block"] == 1)
+        self.assertEqual(len(self.nodes[1].blockchain.chain), 1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,186 @@
+import asyncio
+import copy
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ecdsa import SigningKey, SECP256k1
+
+from app.core import codec
+from app.models.BlockChain import BlockChain
+from app.models.Client import client
+from app.models.HeaderChain import HeaderChain
+from app.models.NFT import NFT
+from app.models.NFTmetadata import NFTmetadata
+from app.models.Transaction import Transaction
+from app.network.gossip import GossipNode
+from app.services.BlockChainService import BlockChainService
+from app.services.BlockService import BlockService
+from app.services.ChainQueryService import ChainQueryService
+from app.services.LightClientService import LightClientService
+from app.services.NFTService import NFTService
+from app.services.TransactionService import TransactionService
+
+
+def build_chain(blocks: int, mints_per_block: int = 3):
+    sk = SigningKey.generate(curve=SECP256k1)
+    pubkey = sk.get_verifying_key().to_string().hex()
+    blockchain = BlockChain()
+    BlockChainService.create_genesis_block(blockchain, pubkey)
+    for height in range(1, blocks + 1):
+        for i in range(mints_per_block):
+            student = f"SV{height}_{i}"
+            metadata = NFTmetadata(student, "Bachelor", "u", "ab" * 32, "Uni0", 1_700_000_000)
+            nft = NFT(pubkey, metadata, client("cc" * 64, f"addr_{student}", student))
+            tx = NFTService.build_mint_transaction(nft, timestamp=1_700_000_000.0 + height * 10 + i)
+            TransactionService.sign_with_key(tx, sk)
+            BlockChainService.add_signed_transactions_to_mempool(blockchain, [tx])
+        BlockChainService.add_block(blockchain, BlockChainService.mine_block(blockchain, sk, pubkey))
+    return blockchain, sk
+
+
+def headers_of(blocks):
+    """Header đã ký như light client nhận qua mạng (không có transactions)."""
+    return [codec.decode_signed_header(codec.encode_signed_header(b)) for b in blocks]
+
+
+class TestLightClient(unittest.TestCase):
+    """Test suite for header-chain light client credential verification"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.blockchain, cls.sk = build_chain(10)
+        cls.query = ChainQueryService(cls.blockchain)
+
+    def header_chain(self) -> HeaderChain:
+        chain = LightClientService.from_genesis(headers_of(self.blockchain.chain[:1])[0])
+        LightClientService.add_headers(chain, headers_of(self.blockchain.chain[1:]))
+        return chain
+
+    def test_verify_credential(self):
+        """Test if a credential verifies from its proof bundle in under a millisecond"""
+        chain = self.header_chain()
+        tx = self.blockchain.chain[7].transactions[2]
+        bundle = LightClientService.build_proof(self.query, tx.tx_id)
+
+        timings = []
+        for _ in range(21):
+            started = time.perf_counter()
+            result = LightClientService.verify_credential(chain, bundle)
+            timings.append(time.perf_counter() - started)
+
+        self.assertTrue(result["valid"], result["reason"])
+        self.assertEqual(result["credential"]["student_id"], "SV7_2")
+        self.assertEqual(result["confirmations"], 4)
+        self.assertLess(sorted(timings)[10], 0.001)
+
+    def test_tampered_credential_is_rejected(self):
+        """Test if editing the credential or pointing at another block fails verification"""
+        chain = self.header_chain()
+        bundle = LightClientService.build_proof(self.query, self.blockchain.chain[3].transactions[0].tx_id)
+
+        forged = copy.deepcopy(bundle)
+        forged["transaction"]["payload"]["nft"]["metadata"]["degree_type"] = "PhD"
+        self.assertEqual(LightClientService.verify_credential(chain, forged)["reason"], "Merkle proof không khớp merkle_root")
+
+        moved = dict(bundle, height=4)
+        moved.pop("block_hash")
+        self.assertFalse(LightClientService.verify_credential(chain, moved)["valid"])
+
+        unknown = dict(bundle, height=11)
+        self.assertFalse(LightClientService.verify_credential(chain, unknown)["valid"])
+
+    def test_forged_and_duplicate_mints_are_rejected(self):
+        """Test if mints not signed by the issuer, duplicates and malformed block hashes fail verification"""
+        blockchain, sk = build_chain(1, mints_per_block=1)
+        pubkey = sk.get_verifying_key().to_string().hex()
+        original = blockchain.chain[1].transactions[0]
+
+        # Issuer mint lại cùng token_id với pdf_hash khác: thất bại khi thực thi
+        duplicate = Transaction.from_dict(copy.deepcopy(original.to_dict()))
+        duplicate.payload["nft"]["metadata"]["pdf_hash"] = "ee" * 32
+        duplicate.timestamp += 1
+        duplicate.tx_id = ""
+        TransactionService.sign_with_key(duplicate, sk)
+        # Kẻ tấn công tự ký mint mang issuer_pubkey của trường
+        attacker = SigningKey.generate(curve=SECP256k1)
+        forged = Transaction.from_dict(copy.deepcopy(original.to_dict()))
+        forged.sender_pubkey = attacker.get_verifying_key().to_string().hex()
+        forged.timestamp += 2
+        forged.tx_id = ""
+        TransactionService.sign_with_key(forged, attacker)
+        admitted = BlockChainService.add_signed_transactions_to_mempool(blockchain, [duplicate, forged])
+        self.assertEqual(admitted, [True, True])
+        BlockChainService.add_block(blockchain, BlockChainService.mine_block(blockchain, sk, pubkey))
+
+        chain = LightClientService.from_genesis(blockchain.chain[0])
+        LightClientService.add_headers(chain, headers_of(blockchain.chain[1:]))
+        query = ChainQueryService(blockchain)
+
+        def verify(tx):
+            return LightClientService.verify_credential(chain, LightClientService.build_proof(query, tx.tx_id))
+
+        self.assertTrue(verify(original)["valid"])
+        self.assertEqual(verify(duplicate)["reason"], "mint không có hiệu lực khi thực thi (vd: trùng token_id)")
+        self.assertEqual(verify(forged)["reason"], "người ký mint không phải issuer hoặc token_id sai")
+
+        bundle = dict(LightClientService.build_proof(query, original.tx_id), block_hash="zz")
+        result = LightClientService.verify_credential(chain, bundle)
+        self.assertFalse(result["valid"])
+        self.assertTrue(result["reason"].startswith("proof bundle lỗi"))
+
+    def test_invalid_headers_are_rejected(self):
+        """Test if headers outside the authority set or with a broken link are rejected"""
+        chain = LightClientService.from_genesis(self.blockchain.chain[0])
+        headers = headers_of(self.blockchain.chain[1:4])
+
+        rogue = SigningKey.generate(curve=SECP256k1)
+        forged = headers_of(self.blockchain.chain[1:2])[0]
+        forged.block_header.validator_pubkey = rogue.get_verifying_key().to_string().hex()
+        BlockService.sign_block(forged, rogue)
+        forged.block_hash = BlockService.calculate_hash(forged)
+        with self.assertRaises(ValueError):
+            LightClientService.add_headers(chain, [forged])
+
+        with self.assertRaises(ValueError):
+            LightClientService.add_headers(chain, [headers[1]])
+        self.assertEqual(LightClientService.add_headers(chain, headers), 3)
+
+    def test_compact_storage_and_reload(self):
+        """Test if the header chain keeps 64 bytes per block and survives save/load"""
+        chain = self.header_chain()
+        self.assertEqual(chain.nbytes() / len(chain), 64)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "headers.bin")
+            chain.save(path)
+            loaded = HeaderChain.load(path)
+        self.assertEqual(loaded.height, 10)
+        self.assertEqual(loaded.authority_set, chain.authority_set)
+        bundle = LightClientService.build_proof(self.query, self.blockchain.chain[9].transactions[1].tx_id)
+        self.assertTrue(LightClientService.verify_credential(loaded, bundle)["valid"])
+
+    def test_sync_from_peer(self):
+        """Test if the light client downloads and checks headers from a full node"""
+        async def run():
+            node = GossipNode(self.blockchain)
+            port = await node.start()
+            try:
+                chain = LightClientService.from_genesis(self.blockchain.chain[0])
+                added = await LightClientService.sync_from_peer(chain, "127.0.0.1", port)
+            finally:
+                await node.stop()
+            return chain, added
+
+        chain, added = asyncio.run(run())
+        self.assertEqual(added, 10)
+        self.assertEqual(chain.block_hash(10).hex(), self.blockchain.get_last_block().block_hash)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
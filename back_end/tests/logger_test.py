@@ -0,0 +1,87 @@
+import logging
+import queue
+import sys
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.utils.logger import _DroppingQueueHandler, _QueueListener
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+
+    def emit(self, record):
+        self.lines.append(self.format(record))
+
+
+class _CountingArg:
+    def __init__(self):
+        self.calls = 0
+
+    def __str__(self):
+        self.calls += 1
+        return "arg"
+
+
+def make_logger(name: str, handler: logging.Handler) -> logging.Logger:
+    logger = logging.getLogger(name)
+    logger.handlers = [handler]
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    return logger
+
+
+class TestQueuedLogging(unittest.TestCase):
+    """Test suite for the queued logging mode"""
+
+    def test_formatting_is_deferred_to_listener(self):
+        """Test if the caller thread never formats the message"""
+        log_queue = queue.Queue(maxsize=100)
+        logger = make_logger("test.queued.deferred", _DroppingQueueHandler(log_queue))
+        arg = _CountingArg()
+        logger.info("value=%s", arg)
+        self.assertEqual(arg.calls, 0)
+
+        sink = _ListHandler()
+        listener = _QueueListener(log_queue, sink, respect_handler_level=True)
+        listener.start()
+        listener.stop()
+        self.assertEqual(sink.lines, ["value=arg"])
+        self.assertEqual(arg.calls, 1)
+
+    def test_debug_is_sampled_and_dropped_under_pressure(self):
+        """Test if a flood of DEBUG never grows the queue past its bound"""
+        log_queue = queue.Queue(maxsize=10)
+        handler = _DroppingQueueHandler(log_queue, debug_sample=4)
+        logger = make_logger("test.queued.pressure", handler)
+        for i in range(100):
+            logger.debug("debug %d", i)
+
+        self.assertEqual(log_queue.qsize(), 10)
+        self.assertGreater(handler.sampled_out, 0)
+        self.assertEqual(handler.sampled_out + handler.dropped + log_queue.qsize(), 100)
+
+    def test_warnings_are_not_dropped(self):
+        """Test if WARNING records still reach the handlers when DEBUG is shed"""
+        log_queue = queue.Queue(maxsize=10)
+        handler = _DroppingQueueHandler(log_queue, debug_sample=4)
+        logger = make_logger("test.queued.warning", handler)
+        sink = _ListHandler()
+        listener = _QueueListener(log_queue, sink, respect_handler_level=True)
+        listener.start()
+        for i in range(1_000):
+            logger.debug("debug %d", i)
+            if i % 100 == 0:
+                logger.warning("warning %d", i)
+        listener.stop()
+        self.assertEqual([line for line in sink.lines if line.startswith("warning")],
+                         [f"warning {i}" for i in range(0, 1_000, 100)])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
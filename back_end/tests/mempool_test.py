@@ -0,0 +1,170 @@
+import sys
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ecdsa import SigningKey, SECP256k1
+
+from app.models.BlockChain import BlockChain
+from app.models.BlockTemplate import BlockTemplate
+from app.models.Mempool import Mempool
+from app.models.Transaction import Transaction
+from app.services.BlockChainService import BlockChainService
+from app.services.BlockService import BlockService
+from app.services.TransactionService import TransactionService
+
+
+def make_tx(i: int, sender: str = "aa" * 64, timestamp: float = None) -> Transaction:
+    return Transaction(
+        tx_id=f"{i:064x}",
+        sender_pubkey=sender,
+        sender_address="addr_sender",
+        recipient_address="addr_recipient",
+        payload={"op": "set", "key": f"k{i}", "value": i},
+        signature="bb" * 64,
+        timestamp=timestamp if timestamp is not None else 1_700_000_000.0 + i,
+    )
+
+
+class TestMempool(unittest.TestCase):
+    """Test suite for the indexed, bounded mempool"""
+
+    def test_rejects_duplicates(self):
+        """Test if a tx_id already in the mempool is rejected"""
+        mempool = Mempool()
+        self.assertTrue(mempool.add(make_tx(1)))
+        self.assertFalse(mempool.add(make_tx(1)))
+        self.assertEqual(len(mempool), 1)
+        self.assertIn(f"{1:064x}", mempool)
+
+    def test_per_sender_order_by_timestamp(self):
+        """Test if each sender queue is ordered by timestamp"""
+        mempool = Mempool()
+        mempool.add(make_tx(1, timestamp=30.0))
+        mempool.add(make_tx(2, timestamp=10.0))
+        mempool.add(make_tx(3, sender="cc" * 64, timestamp=20.0))
+        mempool.add(make_tx(4, timestamp=20.0))
+        self.assertEqual([tx.timestamp for tx in mempool.sender_queue("aa" * 64)], [10.0, 20.0, 30.0])
+        self.assertEqual([tx.timestamp for tx in mempool.ordered()], [10.0, 20.0, 20.0, 30.0])
+
+    def test_flood_stays_within_caps(self):
+        """Test if a sustained flood keeps count and bytes within the caps"""
+        mempool = Mempool(max_count=100, max_bytes=30_000, max_per_sender=10_000)
+        for i in range(2_000):
+            mempool.add(make_tx(i))
+            self.assertLessEqual(len(mempool), 100)
+            self.assertLessEqual(mempool.total_bytes, 30_000)
+        self.assertGreater(mempool.stats()["evicted"], 0)
+        # Transaction mới nhất luôn còn, transaction cũ nhất đã bị bỏ
+        self.assertIn(f"{1999:064x}", mempool)
+        self.assertNotIn(f"{0:064x}", mempool)
+
+    def test_per_sender_cap(self):
+        """Test if one sender cannot exceed its own cap"""
+        mempool = Mempool(max_per_sender=2)
+        self.assertTrue(mempool.add(make_tx(1)))
+        self.assertTrue(mempool.add(make_tx(2)))
+        self.assertFalse(mempool.add(make_tx(3)))
+        self.assertTrue(mempool.add(make_tx(4, sender="cc" * 64)))
+
+    def test_template_root_matches_rebuild(self):
+        """Test if the block template keeps a running Merkle root within limits"""
+        template = BlockTemplate(max_txs=5, max_bytes=1_000_000)
+        txs = [make_tx(i) for i in range(7)]
+        added = [template.try_add(tx) for tx in txs]
+        self.assertEqual(added, [True] * 5 + [False] * 2)
+        self.assertEqual(template.merkle_root(), BlockService.calculate_merkle_root(txs[:5]))
+
+    def test_no_loss_between_mine_and_add_block(self):
+        """Test if transactions admitted while mining survive add_block"""
+        sk = SigningKey.generate(curve=SECP256k1)
+        pubkey = sk.get_verifying_key().to_string().hex()
+        blockchain = BlockChain()
+        BlockChainService.create_genesis_block(blockchain, pubkey)
+
+        def signed(i):
+            tx = Transaction(sender_pubkey=pubkey, payload={"op": "set", "key": f"k{i}", "value": i})
+            TransactionService.sign(tx, sk.to_string().hex())
+            return tx
+
+        for i in range(3):
+            BlockChainService.add_transaction_to_mempool(blockchain, signed(i))
+        block = BlockChainService.mine_block(blockchain, sk, pubkey)
+        late = signed(99)
+        BlockChainService.add_transaction_to_mempool(blockchain, late)
+        BlockChainService.add_block(blockchain, block)
+
+        self.assertEqual(len(blockchain.mempool), 1)
+        self.assertIn(late, blockchain.mempool)
+
+    def test_mine_block_respects_limits(self):
+        """Test if backlog beyond the block limit carries over to the next block"""
+        sk = SigningKey.generate(curve=SECP256k1)
+        pubkey = sk.get_verifying_key().to_string().hex()
+        blockchain = BlockChain()
+        blockchain.max_block_txs = 4
+        BlockChainService.create_genesis_block(blockchain, pubkey)
+
+        for i in range(10):
+            tx = Transaction(sender_pubkey=pubkey, payload={"op": "set", "key": f"k{i}", "value": i})
+            TransactionService.sign(tx, sk.to_string().hex())
+            BlockChainService.add_transaction_to_mempool(blockchain, tx)
+
+        sizes = []
+        while len(blockchain.mempool):
+            block = BlockChainService.mine_block(blockchain, sk, pubkey)
+            self.assertEqual(block.block_header.merkle_root, BlockService.calculate_merkle_root(block.transactions))
+            BlockChainService.add_block(blockchain, block)
+            sizes.append(len(block.transactions))
+        self.assertEqual(sizes, [4, 4, 2])
+        self.assertEqual(len(blockchain.state_db), 10)
+
+    def test_evicted_transactions_leave_the_template(self):
+        """Test if transactions evicted from a full mempool are not mined"""
+        sk = SigningKey.generate(curve=SECP256k1)
+        pubkey = sk.get_verifying_key().to_string().hex()
+        blockchain = BlockChain()
+        blockchain.mempool = Mempool(max_count=3)
+        BlockChainService.create_genesis_block(blockchain, pubkey)
+
+        txs = []
+        for i in range(5):
+            tx = Transaction(sender_pubkey=pubkey, payload={"op": "set", "key": f"k{i}", "value": i})
+            TransactionService.sign(tx, sk.to_string().hex())
+            self.assertTrue(BlockChainService.add_transaction_to_mempool(blockchain, tx))
+            txs.append(tx)
+        self.assertEqual(blockchain.mempool.stats()["evicted"], 2)
+
+        block = BlockChainService.mine_block(blockchain, sk, pubkey)
+        self.assertEqual([tx.tx_id for tx in block.transactions], [tx.tx_id for tx in txs[2:]])
+        self.assertEqual(block.block_header.merkle_root, BlockService.calculate_merkle_root(block.transactions))
+        BlockChainService.add_block(blockchain, block)
+        self.assertEqual(len(blockchain.mempool), 0)
+
+    def test_malformed_mint_does_not_halt_blocks(self):
+        """Test if a mint with a non-string token_id is rejected and fails cleanly in a block"""
+        sk = SigningKey.generate(curve=SECP256k1)
+        pubkey = sk.get_verifying_key().to_string().hex()
+        blockchain = BlockChain()
+        BlockChainService.create_genesis_block(blockchain, pubkey)
+
+        bad = Transaction(sender_pubkey=pubkey, payload={"op": "mint_nft", "token_id": 5})
+        TransactionService.sign(bad, sk.to_string().hex())
+        good = Transaction(sender_pubkey=pubkey, payload={"op": "set", "key": "k", "value": 1})
+        TransactionService.sign(good, sk.to_string().hex())
+        self.assertFalse(BlockChainService.add_transaction_to_mempool(blockchain, bad))
+        self.assertTrue(BlockChainService.add_transaction_to_mempool(blockchain, good))
+
+        # Block của node khác vẫn có thể chứa nó: tx thất bại, block vẫn được nhận
+        blockchain.mempool.add(bad)
+        blockchain.block_template.try_add(bad)
+        block = BlockChainService.mine_block(blockchain, sk, pubkey)
+        self.assertTrue(BlockChainService.add_block(blockchain, block))
+        self.assertEqual(blockchain.state_db, {"k": 1})
+        self.assertEqual(len(blockchain.mempool), 0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
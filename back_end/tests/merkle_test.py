@@ -0,0 +1,53 @@
+import hashlib
+import sys
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.merkle import MerkleTree
+
+
+def naive_root(leaves):
+    level = list(leaves)
+    while len(level) > 1:
+        level = [
+            hashlib.sha256(level[i] + (level[i + 1] if i + 1 < len(level) else level[i])).digest()
+            for i in range(0, len(level), 2)
+        ]
+    return level[0]
+
+
+class TestMerkleTree(unittest.TestCase):
+    """Test suite for the incremental Merkle tree"""
+
+    def setUp(self):
+        self.leaves = [hashlib.sha256(str(i).encode()).digest() for i in range(37)]
+
+    def test_incremental_root_matches_full_rebuild(self):
+        """Test if the root after each append equals a full recomputation"""
+        tree = MerkleTree()
+        self.assertEqual(tree.root, b"")
+        for n, leaf in enumerate(self.leaves, start=1):
+            tree.append(leaf)
+            self.assertEqual(tree.root, naive_root(self.leaves[:n]))
+
+    def test_inclusion_proofs(self):
+        """Test if every leaf has a valid proof and tampering is detected"""
+        tree = MerkleTree(self.leaves)
+        for i, leaf in enumerate(self.leaves):
+            proof = tree.proof(i)
+            self.assertTrue(MerkleTree.verify_proof(leaf, proof, tree.root))
+            restored = MerkleTree.proof_from_hex(MerkleTree.proof_to_hex(proof))
+            self.assertTrue(MerkleTree.verify_proof(leaf, restored, tree.root))
+        self.assertFalse(MerkleTree.verify_proof(self.leaves[0], tree.proof(1), tree.root))
+
+    def test_rejects_non_digest_leaf(self):
+        """Test if leaves must be 32-byte digests"""
+        with self.assertRaises(ValueError):
+            MerkleTree().append(b"abc")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
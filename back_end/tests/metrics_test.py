@@ -0,0 +1,79 @@
+import sys
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ecdsa import SigningKey, SECP256k1
+
+from app.models.BlockChain import BlockChain
+from app.models.Transaction import Transaction
+from app.services.BlockChainService import BlockChainService
+from app.services.TransactionService import TransactionService
+from app.utils import metrics
+
+
+class TestMetrics(unittest.TestCase):
+    """Test suite for the ledger metrics module"""
+
+    def setUp(self):
+        metrics.registry.reset()
+
+    def tearDown(self):
+        metrics.disable()
+        metrics.registry.reset()
+
+    def _run_chain(self) -> None:
+        sk = SigningKey.generate(curve=SECP256k1)
+        pubkey = sk.get_verifying_key().to_string().hex()
+        blockchain = BlockChain()
+        BlockChainService.create_genesis_block(blockchain, pubkey)
+        for i in range(3):
+            tx = Transaction(sender_pubkey=pubkey, payload={"op": "set", "key": f"k{i}", "value": i})
+            TransactionService.sign(tx, sk.to_string().hex())
+            BlockChainService.add_transaction_to_mempool(blockchain, tx)
+        BlockChainService.add_transaction_to_mempool(blockchain, Transaction(sender_pubkey=pubkey, signature="00"))
+        BlockChainService.add_block(blockchain, BlockChainService.mine_block(blockchain, sk, pubkey))
+
+    def test_disabled_records_nothing(self):
+        """Test if instrumented paths leave every metric untouched when disabled"""
+        self._run_chain()
+        snapshot = metrics.registry.snapshot()
+        self.assertEqual(snapshot["mempool_admitted_total"], 0)
+        self.assertEqual(snapshot["tx_verify_seconds"]["count"], 0)
+
+    def test_enabled_tracks_hot_paths(self):
+        """Test if admission, verification, block apply and height are recorded"""
+        metrics.enable()
+        self._run_chain()
+        snapshot = metrics.registry.snapshot()
+        self.assertEqual(snapshot["mempool_admitted_total"], 3)
+        self.assertEqual(snapshot["tx_verify_seconds"]["count"], 4)
+        self.assertEqual(snapshot["tx_verify_failed_total"], 1)
+        self.assertEqual(snapshot["block_apply_seconds"]["count"], 1)
+        self.assertEqual(snapshot["block_sign_seconds"]["count"], 1)
+        self.assertEqual(snapshot["chain_height"], 1)
+        self.assertEqual(snapshot["mempool_depth"], 0)
+
+    def test_prometheus_text(self):
+        """Test if histograms export cumulative buckets in Prometheus format"""
+        metrics.enable()
+        hist = metrics.histogram("test_latency_seconds", "test", buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 5.0):
+            hist.observe(value)
+        text = metrics.render_prometheus()
+        self.assertIn("# TYPE educhain_test_latency_seconds histogram", text)
+        self.assertIn('educhain_test_latency_seconds_bucket{le="0.1"} 1', text)
+        self.assertIn('educhain_test_latency_seconds_bucket{le="1.0"} 2', text)
+        self.assertIn('educhain_test_latency_seconds_bucket{le="+Inf"} 3', text)
+        self.assertIn("educhain_test_latency_seconds_count 3", text)
+
+    def test_metric_is_abstract(self):
+        """Test if a metric kind missing reset/value/render cannot be instantiated"""
+        with self.assertRaises(TypeError):
+            metrics.Metric(metrics.registry, "test_abstract", "test")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,138 @@
+import hashlib
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.file_hash import FileHashCache, hash_file
+from app.models.CredentialIndex import CredentialIndex
+from app.services.PdfVerificationService import PdfVerificationService
+
+
+class TestPdfVerification(unittest.TestCase):
+    """Test suite for streaming PDF hash verification"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.archive = Path(self.tmp.name) / "archive"
+        self.archive.mkdir()
+        self.index = CredentialIndex()
+        records = []
+        for i in range(6):
+            content = os.urandom(1000 + i * 300_000)
+            (self.archive / f"diploma_{i}.pdf").write_bytes(content)
+            records.append({
+                "token_id": f"{i:064x}",
+                "pdf_url": f"https://example.edu/files/diploma_{i}.pdf",
+                "pdf_hash": hashlib.sha256(content).hexdigest(),
+                "student_id": f"SV{i}",
+                "recipient_address": f"addr_{i}",
+                "institution": "Uni0",
+            })
+        self.index.add_many(records)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_mmap_and_stream_agree(self):
+        """Test if both hashing modes equal hashlib over the whole file"""
+        path = self.archive / "diploma_5.pdf"
+        expected = hashlib.sha256(path.read_bytes()).hexdigest()
+        self.assertEqual(hash_file(str(path), use_mmap=True, chunk_size=4096), expected)
+        self.assertEqual(hash_file(str(path), use_mmap=False, chunk_size=4096), expected)
+        empty = self.archive / "empty.bin"
+        empty.write_bytes(b"")
+        self.assertEqual(hash_file(str(empty)), hashlib.sha256(b"").hexdigest())
+
+    def test_directory_report(self):
+        """Test if the report flags tampered, missing and unknown files by token_id"""
+        with open(self.archive / "diploma_2.pdf", "r+b") as f:
+            f.write(b"X")
+        os.remove(self.archive / "diploma_4.pdf")
+        (self.archive / "stray.pdf").write_bytes(b"stray")
+
+        jobs = PdfVerificationService.jobs_from_directory(str(self.archive), self.index)
+        report = PdfVerificationService.verify(jobs, max_workers=4)
+        status = {r["token_id"]: r["status"] for r in report["results"]}
+
+        self.assertEqual(status[f"{2:064x}"], "mismatch")
+        self.assertEqual(status[f"{4:064x}"], "missing")
+        self.assertEqual(status[None], "unknown")
+        self.assertEqual(report["summary"]["match"], 4)
+
+    def test_cache_skips_unchanged_files(self):
+        """Test if a rerun only re-hashes files whose size or mtime changed"""
+        cache_path = os.path.join(self.tmp.name, "cache.json")
+        jobs = PdfVerificationService.jobs_from_directory(str(self.archive), self.index)
+        first = PdfVerificationService.verify(jobs, cache=FileHashCache(cache_path), max_workers=2)
+        self.assertEqual(first["summary"]["cached"], 0)
+
+        changed = self.archive / "diploma_1.pdf"
+        changed.write_bytes(changed.read_bytes() + b"tail")
+        jobs = PdfVerificationService.jobs_from_directory(str(self.archive), self.index)
+        second = PdfVerificationService.verify(jobs, cache=FileHashCache(cache_path), max_workers=2)
+
+        self.assertEqual(second["summary"]["cached"], 5)
+        self.assertEqual(second["summary"]["mismatch"], 1)
+
+    def test_manifest_uses_on_chain_hash(self):
+        """Test if manifest rows without pdf_hash are checked against the index"""
+        manifest = Path(self.tmp.name) / "manifest.csv"
+        manifest.write_text(
+            "token_id,path\n"
+            f"{0:064x},archive/diploma_0.pdf\n"
+            f"{1:064x},archive/diploma_0.pdf\n"
+        )
+        jobs = PdfVerificationService.load_manifest(str(manifest))
+        report = PdfVerificationService.verify(jobs, index=self.index, max_workers=1)
+        self.assertEqual([r["status"] for r in report["results"]], ["match", "mismatch"])
+
+    def test_manifest_hash_cannot_override_chain(self):
+        """Test if an indexed token is checked against the on-chain hash and manifest disagreement is reported"""
+        forged = Path(self.tmp.name) / "forged.pdf"
+        forged.write_bytes(b"forged diploma")
+        manifest = Path(self.tmp.name) / "manifest.csv"
+        manifest.write_text(
+            "token_id,path,pdf_hash\n"
+            f"{0:064x},forged.pdf,{hashlib.sha256(b'forged diploma').hexdigest()}\n"
+            f"{'f' * 64},forged.pdf,{hashlib.sha256(b'forged diploma').hexdigest()}\n"
+        )
+        jobs = PdfVerificationService.load_manifest(str(manifest))
+        report = PdfVerificationService.verify(jobs, index=self.index, max_workers=1)
+        first, unindexed = report["results"]
+        self.assertEqual(first["status"], "mismatch")
+        self.assertEqual(first["expected"], self.index.get_by_token(f"{0:064x}")["pdf_hash"])
+        self.assertEqual(first["manifest_hash"], hashlib.sha256(b"forged diploma").hexdigest())
+        self.assertEqual(unindexed["status"], "match")
+        self.assertEqual(report["summary"]["manifest_conflicts"], 1)
+
+    def test_same_name_in_subdirectories(self):
+        """Test if files sharing a name in different subdirectories are matched by their pdf_url path"""
+        contents = {}
+        for year in ("2023", "2024"):
+            (self.archive / year).mkdir()
+            contents[year] = os.urandom(500)
+            (self.archive / year / "diploma.pdf").write_bytes(contents[year])
+        self.index.add_many([
+            {
+                "token_id": f"{0xa0 + i:064x}",
+                "pdf_url": f"https://example.edu/files/{year}/diploma.pdf",
+                "pdf_hash": hashlib.sha256(contents[year]).hexdigest(),
+                "student_id": f"SV{year}",
+                "recipient_address": f"addr_{year}",
+                "institution": "Uni0",
+            }
+            for i, year in enumerate(("2023", "2024"))
+        ])
+        jobs = PdfVerificationService.jobs_from_directory(str(self.archive), self.index)
+        report = PdfVerificationService.verify(jobs, max_workers=2)
+        self.assertEqual(report["summary"]["match"], 8)
+        self.assertEqual(report["summary"]["unknown"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
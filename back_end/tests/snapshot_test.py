@@ -0,0 +1,103 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ecdsa import SigningKey, SECP256k1
+
+from app.models.BlockChain import BlockChain
+from app.models.Transaction import Transaction
+from app.repositories.BlockRepository import BlockRepository
+from app.services.BlockChainService import BlockChainService
+from app.services.SnapshotService import SnapshotService
+from app.services.TransactionService import TransactionService
+
+
+class TestSnapshots(unittest.TestCase):
+    """Test suite for state checkpoints and fast restart"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "chain.db")
+        self.snapshot_dir = os.path.join(self.tmp.name, "snapshots")
+        self.blockchain = self._build_chain(self.db_path, snapshot_interval=2)
+        self.blockchain.block_store.close()
+
+    def _build_chain(self, db_path: str, snapshot_interval: int) -> BlockChain:
+        sk = SigningKey.generate(curve=SECP256k1)
+        pubkey = sk.get_verifying_key().to_string().hex()
+
+        blockchain = BlockChain()
+        blockchain.block_store = BlockRepository(db_path)
+        blockchain.snapshot_dir = self.snapshot_dir
+        blockchain.snapshot_interval = snapshot_interval
+        BlockChainService.create_genesis_block(blockchain, pubkey)
+        for height in range(1, 6):
+            tx = Transaction(
+                sender_pubkey=pubkey,
+                sender_address="addr_sender",
+                recipient_address="addr_recipient",
+                payload={"op": "set", "key": f"k{height % 3}", "value": height},
+            )
+            TransactionService.sign(tx, sk.to_string().hex())
+            BlockChainService.add_transaction_to_mempool(blockchain, tx)
+            BlockChainService.add_block(blockchain, BlockChainService.mine_block(blockchain, sk, pubkey))
+        return blockchain
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _restore(self) -> tuple:
+        restored = BlockChain()
+        restored.block_store = BlockRepository(self.db_path)
+        report = BlockChainService.restore_from_store(restored, self.snapshot_dir)
+        restored.block_store.close()
+        return restored, report
+
+    def test_restore_replays_only_blocks_after_snapshot(self):
+        """Test if startup loads the newest snapshot and replays the tail"""
+        self.assertEqual([h for h, _ in SnapshotService.list_snapshots(self.snapshot_dir)], [4, 2])
+        restored, report = self._restore()
+        self.assertEqual(report["snapshot_height"], 4)
+        self.assertEqual(report["replayed_blocks"], 1)
+        self.assertEqual(restored.state_db, self.blockchain.state_db)
+        self.assertEqual(restored.authority_set, self.blockchain.authority_set)
+        self.assertEqual(len(restored.chain), 6)
+
+    def test_corrupted_snapshot_falls_back(self):
+        """Test if a corrupted snapshot falls back to the previous checkpoint"""
+        newest = SnapshotService.snapshot_path(self.snapshot_dir, 4)
+        data = bytearray(newest.read_bytes())
+        data[-1] ^= 0xFF
+        newest.write_bytes(bytes(data))
+
+        restored, report = self._restore()
+        self.assertEqual(report["snapshot_height"], 2)
+        self.assertEqual(report["replayed_blocks"], 3)
+        self.assertEqual(restored.state_db, self.blockchain.state_db)
+
+    def test_restore_without_snapshots_replays_everything(self):
+        """Test if a node without snapshots replays from genesis"""
+        for _, path in SnapshotService.list_snapshots(self.snapshot_dir):
+            path.unlink()
+        restored, report = self._restore()
+        self.assertEqual(report["snapshot_height"], -1)
+        self.assertEqual(report["replayed_blocks"], 6)
+        self.assertEqual(restored.state_db, self.blockchain.state_db)
+
+    def test_zero_interval_disables_checkpoints(self):
+        """Test if snapshot_interval=0 with a snapshot_dir and block_store adds blocks without checkpoints"""
+        for _, path in SnapshotService.list_snapshots(self.snapshot_dir):
+            path.unlink()
+        blockchain = self._build_chain(os.path.join(self.tmp.name, "other.db"), snapshot_interval=0)
+        self.assertEqual(len(blockchain.chain), 6)
+        self.assertEqual(SnapshotService.list_snapshots(self.snapshot_dir), [])
+        blockchain.block_store.close()
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
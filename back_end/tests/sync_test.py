@@ -0,0 +1,171 @@
+import asyncio
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ecdsa import SigningKey, SECP256k1
+
+from app.core import codec
+from app.models.BlockChain import BlockChain
+from app.models.Transaction import Transaction
+from app.network import protocol
+from app.network.gossip import GossipNode
+from app.network.sync import InitialSync
+from app.repositories.BlockRepository import BlockRepository
+from app.services.BlockChainService import BlockChainService
+from app.services.TransactionService import TransactionService
+
+
+def build_chain(blocks: int, txs_per_block: int = 2, genesis=None, validator: SigningKey = None):
+    """Chain mẫu; dùng lại genesis (và validator khác nếu có) để tạo nhánh giả."""
+    sk = validator or SigningKey.generate(curve=SECP256k1)
+    pubkey = sk.get_verifying_key().to_string().hex()
+    blockchain = BlockChain()
+    if genesis is None:
+        BlockChainService.create_genesis_block(blockchain, pubkey)
+    else:
+        BlockChainService.install_genesis(blockchain, codec.decode_block(codec.encode_block(genesis)))
+        blockchain.authority_set.add(pubkey)
+    for height in range(1, blocks + 1):
+        for i in range(txs_per_block):
+            tx = Transaction(
+                sender_pubkey=pubkey,
+                payload={"op": "set", "key": f"k{height}_{i}", "value": height},
+                timestamp=1_700_000_000.0 + height * 10 + i,
+            )
+            TransactionService.sign_with_key(tx, sk)
+            BlockChainService.add_signed_transactions_to_mempool(blockchain, [tx])
+        BlockChainService.add_block(blockchain, BlockChainService.mine_block(blockchain, sk, pubkey))
+    return blockchain, sk
+
+
+class FlakyNode(GossipNode):
+    """Peer ngắt kết nối sau khi trả một số lần GETBLOCKS."""
+
+    def __init__(self, blockchain, serve_batches: int, **kwargs):
+        super().__init__(blockchain, **kwargs)
+        self.serve_batches = serve_batches
+
+    async def _on_getblocks(self, peer, query):
+        if self.serve_batches <= 0:
+            await peer.close()
+            return
+        self.serve_batches -= 1
+        await super()._on_getblocks(peer, query)
+
+
+class TestInitialSync(unittest.IsolatedAsyncioTestCase):
+    """Test suite for headers-first initial sync against localhost stand-in peers"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.source, cls.sk = build_chain(40)
+
+    async def asyncSetUp(self):
+        self.nodes = []
+
+    async def asyncTearDown(self):
+        for node in self.nodes:
+            await node.stop()
+
+    async def serve(self, node: GossipNode) -> int:
+        self.nodes.append(node)
+        return await node.start()
+
+    async def new_node(self, blockchain: BlockChain, ports) -> GossipNode:
+        node = GossipNode(blockchain)
+        self.nodes.append(node)
+        for port in ports:
+            await node.connect("127.0.0.1", port)
+        await asyncio.sleep(0.05)  # chờ HELLO
+        return node
+
+    async def test_sync_from_several_peers(self):
+        """Test if an empty node catches up from three peers in order"""
+        ports = [await self.serve(GossipNode(self.source)) for _ in range(3)]
+        node = await self.new_node(BlockChain(), ports)
+
+        progress = []
+        report = await InitialSync(node, batch_size=4, window=12, progress=lambda d, t: progress.append(d)).run()
+
+        self.assertTrue(report["complete"])
+        self.assertEqual(report["height"], 40)
+        self.assertEqual(report["txs"], 80)
+        self.assertGreater(len(report["blocks_from"]), 1)
+        self.assertEqual(progress[-1], 40)
+        self.assertEqual(node.blockchain.get_last_block().block_hash, self.source.get_last_block().block_hash)
+        self.assertEqual(node.blockchain.state_db, self.source.state_db)
+
+    async def test_forged_headers_are_rejected(self):
+        """Test if headers signed outside the authority set are rejected and another peer is used"""
+        rogue, _ = build_chain(45, txs_per_block=1, genesis=self.source.chain[0],
+                               validator=SigningKey.generate(curve=SECP256k1))
+        ports = [await self.serve(GossipNode(rogue)), await self.serve(GossipNode(self.source))]
+        blockchain = BlockChain()
+        BlockChainService.install_genesis(blockchain, codec.decode_block(codec.encode_block(self.source.chain[0])))
+        node = await self.new_node(blockchain, ports)
+
+        report = await InitialSync(node, batch_size=8).run()
+
+        self.assertTrue(report["complete"])
+        self.assertEqual(report["height"], 40)
+        self.assertEqual(len(report["bad_peers"]), 1)
+        self.assertEqual(node.blockchain.get_last_block().block_hash, self.source.get_last_block().block_hash)
+
+    async def test_tampered_bodies_are_refetched(self):
+        """Test if a body that does not match its header is fetched again from another peer"""
+
+        class Tampering(GossipNode):
+            async def _on_getblocks(self, peer, query):
+                blocks = list(self.query.iter_range(query["start"], query["end"]))
+                forged = [codec.decode_block(codec.encode_block(b)) for b in blocks]
+                for block in forged:
+                    block.transactions = block.transactions[:1]
+                blobs = [query["req"].encode("utf-8")] + [codec.encode_block(b) for b in forged]
+                await peer.send(protocol.BLOCKS, protocol.pack_blobs(blobs))
+
+        ports = [await self.serve(Tampering(self.source)), await self.serve(GossipNode(self.source))]
+        node = await self.new_node(BlockChain(), ports)
+
+        report = await InitialSync(node, batch_size=5, requests_per_peer=1).run()
+
+        self.assertTrue(report["complete"])
+        self.assertEqual(node.blockchain.state_db, self.source.state_db)
+
+    async def test_resume_after_interruption(self):
+        """Test if a restarted node resumes from its stored height"""
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = str(Path(tmp) / "node.db")
+            # Genesis + 2 đoạn 5 block rồi ngắt
+            flaky_port = await self.serve(FlakyNode(self.source, serve_batches=3))
+
+            blockchain = BlockChain()
+            blockchain.block_store = BlockRepository(db_path)
+            node = await self.new_node(blockchain, [flaky_port])
+            first = await InitialSync(node, batch_size=5, requests_per_peer=1).run()
+            self.assertFalse(first["complete"])
+            self.assertEqual(first["height"], 10)
+            await node.stop()
+            blockchain.block_store.close()
+
+            # Khởi động lại từ store rồi đồng bộ tiếp với peer khác
+            restarted = BlockChain()
+            restarted.block_store = BlockRepository(db_path)
+            BlockChainService.restore_from_store(restarted)
+            honest_port = await self.serve(GossipNode(self.source))
+            node = await self.new_node(restarted, [honest_port])
+            second = await InitialSync(node, batch_size=5).run()
+            restarted.block_store.close()
+
+        self.assertEqual(second["start_height"], 10)
+        self.assertEqual(second["blocks"], 30)
+        self.assertTrue(second["complete"])
+        self.assertEqual(restarted.state_db, self.source.state_db)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
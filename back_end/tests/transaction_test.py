@@ -0,0 +1,68 @@
+import sys
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ecdsa import SigningKey, SECP256k1
+
+from app.models.BlockChain import BlockChain
+from app.models.Transaction import Transaction
+from app.services.BlockChainService import BlockChainService
+from app.services.TransactionService import TransactionService, shutdown_verify_pool
+
+
+def make_signed_tx(sk: SigningKey, i: int) -> Transaction:
+    tx = Transaction(
+        sender_pubkey=sk.get_verifying_key().to_string().hex(),
+        sender_address="addr_sender",
+        recipient_address="addr_recipient",
+        payload={"op": "set", "key": f"k{i}", "value": i},
+        timestamp=1_700_000_000.0 + i,
+    )
+    TransactionService.sign(tx, sk.to_string().hex())
+    return tx
+
+
+class TestBatchVerification(unittest.TestCase):
+    """Test suite for batch signature verification"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.sk = SigningKey.generate(curve=SECP256k1)
+        cls.txs = [make_signed_tx(cls.sk, i) for i in range(12)]
+        # Làm hỏng một vài transaction
+        cls.txs[3].payload = {"op": "set", "key": "k3", "value": "tampered"}
+        cls.txs[7].signature = ""
+
+    @classmethod
+    def tearDownClass(cls):
+        shutdown_verify_pool()
+
+    def test_serial_and_parallel_results_match(self):
+        """Test if pool results are in input order and match serial checks"""
+        expected = [TransactionService.is_valid(tx) for tx in self.txs]
+        results = TransactionService.is_valid_batch(self.txs, max_workers=2, chunk_size=4)
+        self.assertEqual(results, expected)
+        self.assertFalse(results[3])
+        self.assertFalse(results[7])
+
+    def test_add_transactions_to_mempool(self):
+        """Test if only valid transactions are admitted to the mempool"""
+        blockchain = BlockChain()
+        results = BlockChainService.add_transactions_to_mempool(
+            blockchain, self.txs, max_workers=2, chunk_size=5
+        )
+        self.assertEqual(results.count(True), 10)
+        self.assertEqual(len(blockchain.mempool), 10)
+        self.assertNotIn(self.txs[3], blockchain.mempool)
+
+    def test_invalid_chunk_size(self):
+        """Test if chunk_size must be positive"""
+        with self.assertRaises(ValueError):
+            TransactionService.is_valid_batch(self.txs, chunk_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)